@@ -12,6 +12,7 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from sqlmodel import SQLModel  # noqa: E402
 
 # Import models for Alembic auto-generation
+import app.models.analytics  # noqa: E402, F401
 import app.models.client  # noqa: E402, F401
 import app.models.password_reset  # noqa: E402, F401
 import app.models.room  # noqa: E402, F401
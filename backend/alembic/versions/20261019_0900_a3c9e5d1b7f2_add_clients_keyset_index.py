@@ -0,0 +1,30 @@
+"""add clients (counselor_id, updated_at, id) index for keyset pagination
+
+Revision ID: a3c9e5d1b7f2
+Revises: f719605bbb30
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c9e5d1b7f2"
+down_revision: Union[str, None] = "f719605bbb30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_clients_counselor_updated_id",
+        "clients",
+        ["counselor_id", "updated_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_clients_counselor_updated_id", table_name="clients")
@@ -0,0 +1,163 @@
+"""add client_stats table maintained by triggers
+
+Revision ID: b7d2f4a8c1e3
+Revises: a3c9e5d1b7f2
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d2f4a8c1e3"
+down_revision: Union[str, None] = "a3c9e5d1b7f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Snapshot of app.models.client.CLIENT_STATS_DDL at this revision
+TRIGGER_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION refresh_client_stats(target uuid) RETURNS void AS $$
+    BEGIN
+        INSERT INTO client_stats (client_id, active_rooms_count,
+                                  total_consultations, updated_at)
+        SELECT id, 0, 0, now() AT TIME ZONE 'utc' FROM clients WHERE id = target
+        ON CONFLICT (client_id) DO NOTHING;
+
+        PERFORM 1 FROM client_stats WHERE client_id = target FOR UPDATE;
+
+        UPDATE client_stats AS s
+        SET active_rooms_count = agg.active_rooms_count,
+            total_consultations = agg.total_consultations,
+            last_consultation_date = (
+                SELECT max(cr.session_date) FROM consultation_records cr
+                WHERE cr.client_id = target
+            ),
+            updated_at = now() AT TIME ZONE 'utc'
+        FROM (
+            SELECT count(*) FILTER (WHERE r.is_active) AS active_rooms_count,
+                   coalesce(sum(r.session_count), 0) AS total_consultations
+            FROM clients c
+            JOIN room_clients rc ON rc.client_id = c.id
+            JOIN rooms r ON r.id = rc.room_id AND r.counselor_id = c.counselor_id
+            WHERE c.id = target
+        ) AS agg
+        WHERE s.client_id = target;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION client_stats_on_client() RETURNS trigger AS $$
+    BEGIN
+        PERFORM refresh_client_stats(NEW.id);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION client_stats_on_client_row() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM refresh_client_stats(OLD.client_id);
+        END IF;
+        IF TG_OP <> 'DELETE' AND (TG_OP = 'INSERT'
+                                  OR NEW.client_id <> OLD.client_id) THEN
+            PERFORM refresh_client_stats(NEW.client_id);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION client_stats_on_room() RETURNS trigger AS $$
+    BEGIN
+        PERFORM refresh_client_stats(rc.client_id)
+        FROM (SELECT client_id FROM room_clients
+              WHERE room_id = NEW.id ORDER BY client_id) AS rc;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER client_stats_clients
+    AFTER INSERT OR UPDATE OF counselor_id ON clients
+    FOR EACH ROW EXECUTE FUNCTION client_stats_on_client()
+    """,
+    """
+    CREATE TRIGGER client_stats_room_clients
+    AFTER INSERT OR UPDATE OR DELETE ON room_clients
+    FOR EACH ROW EXECUTE FUNCTION client_stats_on_client_row()
+    """,
+    """
+    CREATE TRIGGER client_stats_consultation_records
+    AFTER INSERT OR DELETE OR UPDATE OF client_id, session_date
+    ON consultation_records
+    FOR EACH ROW EXECUTE FUNCTION client_stats_on_client_row()
+    """,
+    """
+    CREATE TRIGGER client_stats_rooms
+    AFTER UPDATE OF is_active, session_count, counselor_id ON rooms
+    FOR EACH ROW
+    WHEN (OLD.is_active IS DISTINCT FROM NEW.is_active
+          OR OLD.session_count IS DISTINCT FROM NEW.session_count
+          OR OLD.counselor_id IS DISTINCT FROM NEW.counselor_id)
+    EXECUTE FUNCTION client_stats_on_room()
+    """,
+)
+
+BACKFILL = """
+INSERT INTO client_stats (client_id, active_rooms_count, total_consultations,
+                          last_consultation_date, updated_at)
+SELECT c.id,
+       coalesce(agg.active_rooms_count, 0),
+       coalesce(agg.total_consultations, 0),
+       (SELECT max(cr.session_date) FROM consultation_records cr
+        WHERE cr.client_id = c.id),
+       now() AT TIME ZONE 'utc'
+FROM clients c
+LEFT JOIN (
+    SELECT rc.client_id,
+           count(*) FILTER (WHERE r.is_active) AS active_rooms_count,
+           sum(r.session_count) AS total_consultations
+    FROM room_clients rc
+    JOIN clients c2 ON c2.id = rc.client_id
+    JOIN rooms r ON r.id = rc.room_id AND r.counselor_id = c2.counselor_id
+    GROUP BY rc.client_id
+) AS agg ON agg.client_id = c.id
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "client_stats",
+        sa.Column("client_id", sqlmodel.sql.sqltypes.GUID(), nullable=False),
+        sa.Column("active_rooms_count", sa.Integer(), nullable=False),
+        sa.Column("total_consultations", sa.Integer(), nullable=False),
+        sa.Column("last_consultation_date", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["client_id"], ["clients.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("client_id"),
+    )
+    for statement in TRIGGER_DDL:
+        op.execute(statement)
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS client_stats_rooms ON rooms")
+    op.execute(
+        "DROP TRIGGER IF EXISTS client_stats_consultation_records "
+        "ON consultation_records"
+    )
+    op.execute("DROP TRIGGER IF EXISTS client_stats_room_clients ON room_clients")
+    op.execute("DROP TRIGGER IF EXISTS client_stats_clients ON clients")
+    op.execute("DROP FUNCTION IF EXISTS client_stats_on_room()")
+    op.execute("DROP FUNCTION IF EXISTS client_stats_on_client_row()")
+    op.execute("DROP FUNCTION IF EXISTS client_stats_on_client()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_client_stats(uuid)")
+    op.drop_table("client_stats")
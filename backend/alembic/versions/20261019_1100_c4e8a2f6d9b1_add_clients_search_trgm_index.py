@@ -0,0 +1,30 @@
+"""add pg_trgm GIN index for client search
+
+Revision ID: c4e8a2f6d9b1
+Revises: b7d2f4a8c1e3
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e8a2f6d9b1"
+down_revision: Union[str, None] = "b7d2f4a8c1e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_clients_search_trgm ON clients USING gin "
+        "(name gin_trgm_ops, email gin_trgm_ops, phone gin_trgm_ops, "
+        "(tags::text) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_clients_search_trgm", table_name="clients")
@@ -0,0 +1,34 @@
+"""add consultation_records (client_id, session_date DESC, id DESC) index
+
+Revision ID: d1f5b9c3e7a2
+Revises: c4e8a2f6d9b1
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d1f5b9c3e7a2"
+down_revision: Union[str, None] = "c4e8a2f6d9b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_consultation_records_client_session",
+        "consultation_records",
+        ["client_id", sa.text("session_date DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_consultation_records_client_session", table_name="consultation_records"
+    )
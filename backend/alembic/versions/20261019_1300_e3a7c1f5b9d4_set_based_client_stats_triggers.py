@@ -0,0 +1,165 @@
+"""refresh client_stats once per statement on clients / room_clients inserts
+
+Revision ID: e3a7c1f5b9d4
+Revises: d1f5b9c3e7a2
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a7c1f5b9d4"
+down_revision: Union[str, None] = "d1f5b9c3e7a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Snapshot of the changed parts of app.models.client.CLIENT_STATS_DDL
+UPGRADE_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION refresh_client_stats(targets uuid[])
+    RETURNS void AS $$
+    BEGIN
+        INSERT INTO client_stats (client_id, active_rooms_count,
+                                  total_consultations, updated_at)
+        SELECT id, 0, 0, now() AT TIME ZONE 'utc' FROM clients
+        WHERE id = ANY(targets)
+        ON CONFLICT (client_id) DO NOTHING;
+
+        PERFORM 1 FROM client_stats WHERE client_id = ANY(targets)
+        ORDER BY client_id FOR UPDATE;
+
+        UPDATE client_stats AS s
+        SET active_rooms_count = agg.active_rooms_count,
+            total_consultations = agg.total_consultations,
+            last_consultation_date = (
+                SELECT max(cr.session_date) FROM consultation_records cr
+                WHERE cr.client_id = s.client_id
+            ),
+            updated_at = now() AT TIME ZONE 'utc'
+        FROM (
+            SELECT c.id AS client_id,
+                   count(r.id) FILTER (WHERE r.is_active) AS active_rooms_count,
+                   coalesce(sum(r.session_count), 0) AS total_consultations
+            FROM clients c
+            LEFT JOIN room_clients rc ON rc.client_id = c.id
+            LEFT JOIN rooms r
+                ON r.id = rc.room_id AND r.counselor_id = c.counselor_id
+            WHERE c.id = ANY(targets)
+            GROUP BY c.id
+        ) AS agg
+        WHERE s.client_id = agg.client_id;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION refresh_client_stats(target uuid) RETURNS void AS $$
+    BEGIN
+        PERFORM refresh_client_stats(ARRAY[target]);
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION client_stats_on_new_clients() RETURNS trigger AS $$
+    BEGIN
+        PERFORM refresh_client_stats(ARRAY(SELECT id FROM new_rows));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION client_stats_on_client_rows() RETURNS trigger AS $$
+    BEGIN
+        PERFORM refresh_client_stats(
+            ARRAY(SELECT DISTINCT client_id FROM new_rows)
+        );
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER client_stats_clients ON clients",
+    """
+    CREATE TRIGGER client_stats_clients
+    AFTER UPDATE OF counselor_id ON clients
+    FOR EACH ROW EXECUTE FUNCTION client_stats_on_client()
+    """,
+    """
+    CREATE TRIGGER client_stats_clients_insert
+    AFTER INSERT ON clients REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION client_stats_on_new_clients()
+    """,
+    "DROP TRIGGER client_stats_room_clients ON room_clients",
+    """
+    CREATE TRIGGER client_stats_room_clients
+    AFTER UPDATE OR DELETE ON room_clients
+    FOR EACH ROW EXECUTE FUNCTION client_stats_on_client_row()
+    """,
+    """
+    CREATE TRIGGER client_stats_room_clients_insert
+    AFTER INSERT ON room_clients REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION client_stats_on_client_rows()
+    """,
+)
+
+# Row-level triggers and refresh function as of b7d2f4a8c1e3
+DOWNGRADE_DDL = (
+    "DROP TRIGGER client_stats_room_clients_insert ON room_clients",
+    "DROP TRIGGER client_stats_room_clients ON room_clients",
+    """
+    CREATE TRIGGER client_stats_room_clients
+    AFTER INSERT OR UPDATE OR DELETE ON room_clients
+    FOR EACH ROW EXECUTE FUNCTION client_stats_on_client_row()
+    """,
+    "DROP TRIGGER client_stats_clients_insert ON clients",
+    "DROP TRIGGER client_stats_clients ON clients",
+    """
+    CREATE TRIGGER client_stats_clients
+    AFTER INSERT OR UPDATE OF counselor_id ON clients
+    FOR EACH ROW EXECUTE FUNCTION client_stats_on_client()
+    """,
+    "DROP FUNCTION client_stats_on_client_rows()",
+    "DROP FUNCTION client_stats_on_new_clients()",
+    """
+    CREATE OR REPLACE FUNCTION refresh_client_stats(target uuid) RETURNS void AS $$
+    BEGIN
+        INSERT INTO client_stats (client_id, active_rooms_count,
+                                  total_consultations, updated_at)
+        SELECT id, 0, 0, now() AT TIME ZONE 'utc' FROM clients WHERE id = target
+        ON CONFLICT (client_id) DO NOTHING;
+
+        PERFORM 1 FROM client_stats WHERE client_id = target FOR UPDATE;
+
+        UPDATE client_stats AS s
+        SET active_rooms_count = agg.active_rooms_count,
+            total_consultations = agg.total_consultations,
+            last_consultation_date = (
+                SELECT max(cr.session_date) FROM consultation_records cr
+                WHERE cr.client_id = target
+            ),
+            updated_at = now() AT TIME ZONE 'utc'
+        FROM (
+            SELECT count(*) FILTER (WHERE r.is_active) AS active_rooms_count,
+                   coalesce(sum(r.session_count), 0) AS total_consultations
+            FROM clients c
+            JOIN room_clients rc ON rc.client_id = c.id
+            JOIN rooms r ON r.id = rc.room_id AND r.counselor_id = c.counselor_id
+            WHERE c.id = target
+        ) AS agg
+        WHERE s.client_id = target;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP FUNCTION refresh_client_stats(uuid[])",
+)
+
+
+def upgrade() -> None:
+    for statement in UPGRADE_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in DOWNGRADE_DDL:
+        op.execute(statement)
@@ -0,0 +1,91 @@
+"""add analytics materialized views and refresh log
+
+Revision ID: f2c6e8a4d1b7
+Revises: e3a7c1f5b9d4
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c6e8a4d1b7"
+down_revision: Union[str, None] = "e3a7c1f5b9d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Snapshot of app.models.analytics.ANALYTICS_VIEWS at this revision
+VIEWS = {
+    "analytics_weekly_sessions": (
+        """
+        SELECT counselor_id,
+               date_trunc('week', session_date)::date AS week_start,
+               count(*) AS sessions,
+               count(DISTINCT client_id) AS clients
+        FROM consultation_records
+        GROUP BY counselor_id, date_trunc('week', session_date)::date
+        """,
+        "counselor_id, week_start",
+    ),
+    "analytics_client_activity": (
+        """
+        SELECT c.counselor_id,
+               count(*) AS total_clients,
+               count(*) FILTER (WHERE c.status = 'ACTIVE') AS active_clients,
+               count(*) FILTER (
+                   WHERE s.last_consultation_date
+                       >= now() AT TIME ZONE 'utc' - interval '30 days'
+               ) AS clients_seen_30d
+        FROM clients c
+        LEFT JOIN client_stats s ON s.client_id = c.id
+        GROUP BY c.counselor_id
+        """,
+        "counselor_id",
+    ),
+    "analytics_follow_ups": (
+        """
+        SELECT counselor_id, follow_up_date, count(*) AS follow_ups
+        FROM consultation_records
+        WHERE follow_up_required AND follow_up_date IS NOT NULL
+        GROUP BY counselor_id, follow_up_date
+        """,
+        "counselor_id, follow_up_date",
+    ),
+    "analytics_gameplay_usage": (
+        """
+        SELECT r.counselor_id, g.gameplay_id,
+               count(*) AS rooms,
+               max(g.last_played_at) AS last_played_at
+        FROM gameplay_states g
+        JOIN rooms r ON r.id = g.room_id
+        GROUP BY r.counselor_id, g.gameplay_id
+        """,
+        "counselor_id, gameplay_id",
+    ),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analytics_refreshes",
+        sa.Column(
+            "view_name", sqlmodel.sql.sqltypes.AutoString(length=63), nullable=False
+        ),
+        sa.Column("refreshed_at", sa.DateTime(), nullable=False),
+        sa.Column("duration_ms", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("view_name"),
+    )
+    for name, (query, key) in VIEWS.items():
+        op.execute(f"CREATE MATERIALIZED VIEW {name} AS {query.strip()}")
+        op.execute(f"CREATE UNIQUE INDEX ux_{name} ON {name} ({key})")
+
+
+def downgrade() -> None:
+    for name in VIEWS:
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {name}")
+    op.drop_table("analytics_refreshes")
@@ -16,7 +16,8 @@ from sqlalchemy import inspect, text
 from sqlmodel import Session, select
 
 from app.core.auth import get_current_user_from_token, get_password_hash
-from app.core.database import engine, get_session
+from app.core.database import engine, execute_concurrently, get_session
+from app.core.responses import skip_response_validation
 from app.core.seeds import run_all_seeds, run_test_seeds
 from app.models.user import User
 
@@ -114,23 +115,11 @@ def get_database_status(
 ) -> Dict[str, Any]:
     """Get database connection status and basic info"""
     try:
-        # Test connection
-        result = db.execute(text("SELECT 1"))
-        result.scalar()
-
-        # Get database name
-        db_name_result = db.execute(text("SELECT current_database()"))
-        db_name = db_name_result.scalar()
-
-        # Get database size
-        size_result = db.execute(
-            text(
-                """
-                SELECT pg_size_pretty(pg_database_size(current_database())) as size
-            """
-            )
-        )
-        db_size = size_result.scalar()
+        # Connection test, database name and size in one round trip
+        db_name, db_size = db.execute(text("""
+                SELECT current_database(),
+                       pg_size_pretty(pg_database_size(current_database()))
+            """)).one()
 
         return {
             "status": "connected",
@@ -151,30 +140,33 @@ def list_tables(
 ) -> List[Dict[str, Any]]:
     """List all tables with row counts"""
     try:
-        # Get all table names
-        inspector = inspect(engine)
-        tables = inspector.get_table_names()
-
-        table_info = []
-        for table in tables:
-            # Get row count for each table
-            count_result = db.execute(
-                text(f"SELECT COUNT(*) FROM {table}")  # nosec B608
-            )
-            row_count = count_result.scalar()
-
-            # Get column count
-            columns = inspector.get_columns(table)
-
-            table_info.append(
-                {
-                    "name": table,
-                    "row_count": row_count,
-                    "column_count": len(columns),
-                }
-            )
+        # Table names and column counts in one query
+        tables = db.execute(text("""
+                SELECT t.table_name, count(c.column_name)
+                FROM information_schema.tables t
+                JOIN information_schema.columns c
+                  ON c.table_schema = t.table_schema
+                 AND c.table_name = t.table_name
+                WHERE t.table_schema = current_schema()
+                  AND t.table_type = 'BASE TABLE'
+                GROUP BY t.table_name
+                ORDER BY t.table_name
+            """)).all()
+
+        # Exact row counts are independent, so they run concurrently
+        counts = execute_concurrently(
+            db,
+            [text(f'SELECT COUNT(*) FROM "{row[0]}"') for row in tables],  # nosec B608
+        )
 
-        return sorted(table_info, key=lambda x: x["name"])
+        return [
+            {
+                "name": table,
+                "row_count": count_rows[0][0],
+                "column_count": column_count,
+            }
+            for (table, column_count), count_rows in zip(tables, counts)
+        ]
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -183,6 +175,7 @@ def list_tables(
 
 
 @router.get("/db/table/{table_name}")
+@skip_response_validation
 def get_table_data(
     table_name: str,
     limit: int = 100,
@@ -550,6 +543,7 @@ def batch_create_users(
 
 
 @router.get("/users")
+@skip_response_validation
 def list_all_users(
     _: dict = Depends(require_admin),
     session: Session = Depends(get_session),
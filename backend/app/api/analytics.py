@@ -0,0 +1,73 @@
+"""
+Analytics API endpoints
+儀表板統計 API（需要 VIEW_ANALYTICS 權限）
+"""
+
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from sqlmodel import Session
+
+from app.core.auth import get_current_user_from_token
+from app.core.database import get_session
+from app.core.roles import Permission, has_permission
+from app.models.analytics import AnalyticsDashboard, AnalyticsFreshness
+from app.services.analytics import (
+    get_freshness,
+    load_dashboard,
+    refresh_analytics,
+    refresh_analytics_in_background,
+)
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+
+def require_analytics_permission(
+    current_user: dict = Depends(get_current_user_from_token),
+) -> dict:
+    if not has_permission(current_user.get("roles", []), Permission.VIEW_ANALYTICS):
+        raise HTTPException(
+            status_code=403, detail="Only administrators can view analytics"
+        )
+    return current_user
+
+
+@router.get("/dashboard", response_model=AnalyticsDashboard)
+async def get_dashboard(
+    background_tasks: BackgroundTasks,
+    counselor_id: Optional[UUID] = Query(
+        None, description="Limit to one counselor (default: all counselors)"
+    ),
+    weeks: int = Query(12, ge=1, le=104, description="Weeks of session history"),
+    top: int = Query(5, ge=1, le=20, description="Number of top gameplays"),
+    session: Session = Depends(get_session),
+    current_user: dict = Depends(require_analytics_permission),
+) -> AnalyticsDashboard:
+    """
+    Counselor dashboard rollups
+    諮商師儀表板統計
+
+    Served from materialized views. When they are older than the refresh
+    interval the stale data is returned and a refresh runs in the background.
+    """
+    dashboard = load_dashboard(session, counselor_id, weeks=weeks, top=top)
+    if dashboard.freshness.stale:
+        background_tasks.add_task(refresh_analytics_in_background, session.get_bind())
+        dashboard.freshness.refreshing = True
+    return dashboard
+
+
+@router.post("/refresh", response_model=AnalyticsFreshness)
+async def refresh_dashboard(
+    session: Session = Depends(get_session),
+    current_user: dict = Depends(require_analytics_permission),
+) -> AnalyticsFreshness:
+    """
+    Refresh the analytics views now
+    立即更新統計
+    """
+    if not refresh_analytics(session):
+        raise HTTPException(status_code=409, detail="A refresh is already running")
+    session.commit()
+    return get_freshness(session)
@@ -3,30 +3,57 @@ Client management API endpoints
 客戶管理 API 端點
 """
 
+import base64
 from datetime import datetime
-from typing import List, Optional
+from typing import Annotated, Dict, List, Literal, Optional, Set, Tuple, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+import orjson
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import TEXT, bindparam, case, cast, literal, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlmodel import Session, func, or_, select
 
 from app.core.auth import get_current_user_from_token, get_password_hash
-from app.core.database import get_session
+from app.core.database import execute_concurrently, get_session
+from app.core.responses import ORJSONResponse, skip_response_validation
 from app.core.roles import Permission, has_permission
 from app.models.client import (
     Client,
     ClientCreate,
     ClientEmailBind,
+    ClientImportResult,
     ClientResponse,
+    ClientSearchResult,
+    ClientStats,
     ClientStatus,
     ClientUpdate,
     ConsultationRecord,
     ConsultationRecordCreate,
     ConsultationRecordResponse,
+    ConsultationRecordSummary,
     RoomClient,
 )
 from app.models.room import Room
 from app.models.user import User
+from app.services.client_export import iter_export
+from app.services.client_import import (
+    ImportFileError,
+    import_clients,
+    parse_import_rows,
+)
+from app.services.client_search import search_clients
+from app.services.client_stats import load_client_detail
 
 router = APIRouter(prefix="/api/clients", tags=["clients"])
 
@@ -68,27 +95,149 @@ def ensure_user_exists(session: Session, current_user: dict) -> UUID:
     return user_id
 
 
+# Optional expansions for the client list (?include=rooms,stats)
+CLIENT_LIST_INCLUDES = ("rooms", "stats")
+
+
+def parse_client_includes(include: Optional[str]) -> Set[str]:
+    """Parse ?include=; omitted means every expansion (previous behaviour)."""
+    if include is None:
+        return set(CLIENT_LIST_INCLUDES)
+    includes = {part.strip() for part in include.split(",") if part.strip()}
+    unknown = includes.difference(CLIENT_LIST_INCLUDES)
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}",
+        )
+    return includes
+
+
+def encode_keyset_cursor(position: datetime, row_id: UUID) -> str:
+    """Opaque keyset cursor for a (timestamp, id) position."""
+    raw = f"{position.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_keyset_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, client_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(updated_at), UUID(client_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# Client columns of ClientResponse, in field order (list fast path)
+CLIENT_LIST_COLUMNS = (
+    Client.email,
+    Client.name,
+    Client.phone,
+    Client.notes,
+    Client.tags,
+    Client.status,
+    Client.id,
+    Client.counselor_id,
+    Client.email_verified,
+    Client.verified_at,
+    Client.created_at,
+    Client.updated_at,
+)
+CLIENT_LIST_STATS_COLUMNS = (
+    func.coalesce(ClientStats.active_rooms_count, 0).label("active_rooms_count"),
+    func.coalesce(ClientStats.total_consultations, 0).label("total_consultations"),
+    ClientStats.last_consultation_date,
+)
+# Room fields of GET /{client_id}/rooms, in response order
+CLIENT_ROOM_COLUMNS = (
+    Room.id,
+    Room.name,
+    Room.description,
+    Room.is_active,
+    Room.expires_at,
+    Room.session_count,
+    Room.created_at,
+)
+# ConsultationRecord columns of ConsultationRecordResponse, in field order
+CONSULTATION_RECORD_COLUMNS = tuple(
+    getattr(ConsultationRecord, name)
+    for name in ConsultationRecordResponse.model_fields
+)
+
+
+def client_list_rooms_query(client_ids: List[UUID], counselor_id: str):
+    """Rooms of a client list page (the rooms expansion of GET /api/clients)."""
+    return (
+        select(
+            RoomClient.client_id,
+            Room.id,
+            Room.name,
+            Room.description,
+            Room.share_code,
+            Room.is_active,
+            Room.expires_at,
+            Room.session_count,
+            Room.created_at,
+        )
+        .join(RoomClient)
+        .where(
+            RoomClient.client_id.in_(client_ids),
+            Room.counselor_id == counselor_id,
+        )
+        .order_by(RoomClient.client_id, Room.created_at.desc())
+    )
+
+
 @router.get("", response_model=List[ClientResponse])
 async def get_my_clients(
     session: Session = Depends(get_session),
     current_user: dict = Depends(get_current_user_from_token),
     status: Optional[ClientStatus] = Query(None, description="Filter by client status"),
     search: Optional[str] = Query(None, description="Search by name or email"),
-) -> List[ClientResponse]:
+    limit: Annotated[
+        Optional[int],
+        Query(ge=1, le=500, description="Page size; omit to return every client"),
+    ] = None,
+    cursor: Annotated[
+        Optional[str], Query(description="X-Next-Cursor from the previous page")
+    ] = None,
+    include: Annotated[
+        Optional[str],
+        Query(description="Comma-separated expansions: rooms,stats (default both)"),
+    ] = None,
+) -> Response:
     """
     Get all clients for the current counselor
     獲取當前諮商師的所有客戶
 
+    Clients are ordered by (updated_at, id) descending. With ?limit= the list
+    is paginated by keyset: the next page's cursor is returned in the
+    X-Next-Cursor header. ?include= selects the expansions to load; list
+    views can pass include=stats (or an empty value) to skip the rooms.
+
     Optimized to avoid N+1 queries using:
-    - Preload all statistics with JOIN + GROUP BY
-    - Preload all rooms with single query
+    - Join the page's statistics from client_stats (one row per client)
+    - Preload the page's rooms with single query
     - Cache counselor name (no need to query per room)
+    - Run those independent preloads concurrently
+    - Select only the response columns and return orjson bytes built from
+      the rows (no ORM instances, no response re-validation)
     """
     check_counselor_permission(current_user)
     counselor_id = str(current_user["user_id"])
+    includes = parse_client_includes(include)
 
     # Build base query - get clients directly by counselor_id
-    query = select(Client).where(Client.counselor_id == counselor_id)
+    query = (
+        select(*CLIENT_LIST_COLUMNS)
+        .where(Client.counselor_id == counselor_id)
+        .order_by(Client.updated_at.desc(), Client.id.desc())
+    )
+    if "stats" in includes:
+        # One client_stats row per client (kept up to date by triggers)
+        query = query.add_columns(*CLIENT_LIST_STATS_COLUMNS).outerjoin(
+            ClientStats, ClientStats.client_id == Client.id
+        )
 
     # Apply filters
     if status:
@@ -101,150 +250,147 @@ async def get_my_clients(
         )
         query = query.where(search_filter)
 
-    # Execute query to get all clients
+    if cursor:
+        query = query.where(
+            tuple_(Client.updated_at, Client.id) < decode_keyset_cursor(cursor)
+        )
+
+    if limit is not None:
+        # Fetch one extra row to know whether another page exists
+        query = query.limit(limit + 1)
+
     clients = session.exec(query).all()
 
+    headers = {}
+    if limit is not None and len(clients) > limit:
+        clients = clients[:limit]
+        last = clients[-1]
+        headers["X-Next-Cursor"] = encode_keyset_cursor(last.updated_at, last.id)
+
     if not clients:
-        return []
+        return ORJSONResponse([], headers=headers)
 
-    # Extract client IDs for batch queries
+    # Extract client IDs for batch queries (scoped to this page)
     client_ids = [client.id for client in clients]
 
-    # === OPTIMIZATION: Batch load all statistics with single queries ===
-
-    # 1. Preload active rooms count per client (single query with GROUP BY)
-    active_rooms_query = (
-        select(RoomClient.client_id, func.count(RoomClient.id).label("active_count"))
-        .join(Room)
-        .where(
-            RoomClient.client_id.in_(client_ids),
-            Room.is_active,
-            Room.counselor_id == counselor_id,
-        )
-        .group_by(RoomClient.client_id)
+    # The rooms expansion only depends on the page's client IDs, so its queries
+    # are issued concurrently on separate connections (see execute_concurrently)
+    preloads = {}
+    if "rooms" in includes:
+        # All rooms for the page's clients, plus the counselor name once
+        preloads["rooms"] = client_list_rooms_query(client_ids, counselor_id)
+        preloads["counselor"] = select(User.name).where(User.id == counselor_id)
+    results = dict(
+        zip(preloads, execute_concurrently(session, list(preloads.values())))
     )
-    active_rooms_results = session.exec(active_rooms_query).all()
-    active_rooms_map = {client_id: count for client_id, count in active_rooms_results}
 
-    # 2. Preload total consultations per client (single query with GROUP BY)
-    total_consultations_query = (
-        select(
-            RoomClient.client_id, func.sum(Room.session_count).label("total_sessions")
-        )
-        .join(Room)
-        .where(
-            RoomClient.client_id.in_(client_ids),
-            Room.counselor_id == counselor_id,
-        )
-        .group_by(RoomClient.client_id)
-    )
-    consultations_results = session.exec(total_consultations_query).all()
-    consultations_map = {
-        client_id: total or 0 for client_id, total in consultations_results
-    }
-
-    # 3. Preload last consultation record per client (subquery)
-    from sqlalchemy.sql import func as sql_func
+    counselor_name = "諮詢師"
+    if results.get("counselor"):
+        counselor_name = results["counselor"][0][0]
+    rooms_by_client: Dict[UUID, List[Dict]] = {}
+    for row in results.get("rooms", []):
+        room = dict(row._mapping)
+        client_id = room.pop("client_id")
+        room["session_count"] = room["session_count"] or 0
+        room["last_activity"] = None  # TODO: Add from card events if needed
+        room["counselor_name"] = counselor_name  # Reuse cached counselor name
+        rooms_by_client.setdefault(client_id, []).append(room)
+
+    # === Build response rows (ClientResponse shape) from preloaded data ===
+    responses = []
+    for client in clients:
+        # Get preloaded data (O(1) lookup)
+        rooms = rooms_by_client.get(client.id, [])
+        # Default room: first room by created_at
+        default_room = rooms[0] if rooms else None
 
-    # Use a subquery to get the latest consultation per client
-    subquery = (
-        select(
-            ConsultationRecord.client_id,
-            sql_func.max(ConsultationRecord.session_date).label("last_date"),
+        row = client._mapping
+        responses.append(
+            {
+                **row,
+                "tags": client.tags or [],
+                "active_rooms_count": row.get("active_rooms_count", 0),
+                "total_consultations": row.get("total_consultations", 0),
+                "last_consultation_date": row.get("last_consultation_date"),
+                "default_room_id": default_room["id"] if default_room else None,
+                "default_room_name": default_room["name"] if default_room else None,
+                "rooms": rooms,
+            }
         )
-        .where(ConsultationRecord.client_id.in_(client_ids))
-        .group_by(ConsultationRecord.client_id)
-        .subquery()
-    )
 
-    last_consultation_query = select(ConsultationRecord).join(
-        subquery,
-        (ConsultationRecord.client_id == subquery.c.client_id)
-        & (ConsultationRecord.session_date == subquery.c.last_date),
-    )
-    last_consultations = session.exec(last_consultation_query).all()
-    last_consultation_map = {rec.client_id: rec for rec in last_consultations}
+    return ORJSONResponse(responses, headers=headers)
 
-    # 4. Preload all rooms for all clients (single query)
-    rooms_query = (
-        select(Room, RoomClient.client_id)
-        .join(RoomClient)
-        .where(
-            RoomClient.client_id.in_(client_ids),
-            Room.counselor_id == counselor_id,
-        )
-        .order_by(RoomClient.client_id, Room.created_at.desc())
-    )
-    rooms_results = session.exec(rooms_query).all()
-
-    # Group rooms by client_id
-    rooms_by_client = {}
-    for room, client_id in rooms_results:
-        if client_id not in rooms_by_client:
-            rooms_by_client[client_id] = []
-        rooms_by_client[client_id].append(room)
 
-    # 5. Get counselor name once (no need to query per room)
-    counselor = session.get(User, counselor_id)
-    counselor_name = counselor.name if counselor else "諮詢師"
+@router.get("/search", response_model=List[ClientSearchResult])
+@skip_response_validation
+async def search_my_clients(
+    q: Annotated[str, Query(min_length=1, max_length=100, description="Search text")],
+    limit: Annotated[int, Query(ge=1, le=100, description="Maximum results")] = 20,
+    session: Session = Depends(get_session),
+    current_user: dict = Depends(get_current_user_from_token),
+) -> List[dict]:
+    """
+    Search the current counselor's clients ranked by relevance
+    依相關度搜尋當前諮商師的客戶
 
-    # === Build response using preloaded data ===
-    responses = []
-    for client in clients:
-        # Get preloaded data (O(1) lookup)
-        active_rooms_count = active_rooms_map.get(client.id, 0)
-        total_consultations = consultations_map.get(client.id, 0)
-        last_consultation = last_consultation_map.get(client.id)
-        rooms = rooms_by_client.get(client.id, [])
+    Matches name, email, phone and tags by substring and trigram word
+    similarity (pg_trgm). Each whitespace-separated term must match.
+    """
+    check_counselor_permission(current_user)
+    counselor_id = UUID(current_user["user_id"])
 
-        # Build rooms data
-        rooms_data = []
-        for room in rooms:
-            rooms_data.append(
-                {
-                    "id": str(room.id),
-                    "name": room.name,
-                    "description": room.description,
-                    "share_code": room.share_code,
-                    "is_active": room.is_active,
-                    "expires_at": (
-                        room.expires_at.isoformat() if room.expires_at else None
-                    ),
-                    "session_count": room.session_count or 0,
-                    "created_at": room.created_at.isoformat(),
-                    "last_activity": None,  # TODO: Add from card events if needed
-                    "counselor_name": counselor_name,  # Reuse cached counselor name
-                }
-            )
+    return [
+        {
+            "id": client.id,
+            "name": client.name,
+            "email": client.email,
+            "phone": client.phone,
+            "tags": client.tags or [],
+            "status": client.status,
+            "updated_at": client.updated_at,
+            "score": score,
+        }
+        for client, score in search_clients(session, counselor_id, q, limit)
+    ]
 
-        # Get default room (first room by created_at)
-        default_room = rooms[0] if rooms else None
 
-        response = ClientResponse(
-            id=client.id,
-            email=client.email,
-            name=client.name,
-            phone=client.phone,
-            notes=client.notes,
-            tags=client.tags,
-            status=client.status,
-            counselor_id=client.counselor_id,
-            email_verified=client.email_verified,
-            verified_at=client.verified_at,
-            created_at=client.created_at,
-            updated_at=client.updated_at,
-            active_rooms_count=active_rooms_count,
-            total_consultations=total_consultations,
-            last_consultation_date=(
-                last_consultation.session_date if last_consultation else None
-            ),
-            default_room_id=default_room.id if default_room else None,
-            default_room_name=default_room.name if default_room else None,
-            rooms=rooms_data,
-        )
-        responses.append(response)
+@router.get("/export")
+async def export_my_clients(
+    export_format: Annotated[
+        Literal["csv", "ndjson"], Query(alias="format", description="csv or ndjson")
+    ] = "csv",
+    dataset: Annotated[
+        Literal["clients", "consultations"],
+        Query(description="clients or consultations (history)"),
+    ] = "clients",
+    gzip: Annotated[bool, Query(description="Compress the download")] = False,
+    session: Session = Depends(get_session),
+    current_user: dict = Depends(get_current_user_from_token),
+) -> StreamingResponse:
+    """
+    Export the current counselor's clients or consultation history
+    匯出當前諮商師的客戶或諮詢記錄（串流）
 
-    return responses
+    Rows are streamed from a server-side cursor, so memory use does not grow
+    with the number of exported rows.
+    """
+    check_counselor_permission(current_user)
+    counselor_id = UUID(current_user["user_id"])
+
+    filename = f"{dataset}-{datetime.utcnow():%Y%m%d}.{export_format}"
+    media_types = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+    media_type = media_types[export_format]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        iter_export(
+            session.get_bind(), counselor_id, dataset, export_format, compress=gzip
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.post("", response_model=ClientResponse)
@@ -338,6 +484,61 @@ async def create_client(
     )
 
 
+@router.post("/import", response_model=ClientImportResult)
+async def import_my_clients(
+    file: UploadFile = File(..., description="CSV (with header) or NDJSON file"),
+    import_format: Annotated[
+        Optional[Literal["csv", "ndjson"]],
+        Query(alias="format", description="csv or ndjson (default: by filename)"),
+    ] = None,
+    session: Session = Depends(get_session),
+    current_user: dict = Depends(get_current_user_from_token),
+) -> ClientImportResult:
+    """
+    Bulk-create clients, each with a default room
+    批次匯入客戶（每位客戶建立預設諮詢室）
+
+    Columns: name, email, phone, notes, tags (";"-separated in CSV), so an
+    export can be imported again. Invalid rows and duplicate emails are
+    skipped and reported per row; the other rows are created together.
+    """
+    check_counselor_permission(current_user)
+    counselor_id = ensure_user_exists(session, current_user)
+
+    if import_format is None:
+        filename = (file.filename or "").lower()
+        is_ndjson = filename.endswith((".ndjson", ".jsonl"))
+        import_format = "ndjson" if is_ndjson else "csv"
+
+    try:
+        content = (await file.read()).decode("utf-8-sig")
+        rows, errors = parse_import_rows(content, import_format)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+    except ImportFileError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    result = import_clients(session, counselor_id, rows, errors)
+    session.commit()
+    return result
+
+
+def check_client_access(
+    client: Union[Client, ClientResponse],
+    current_user: dict,
+    action: str,
+    allow_admin: bool = True,
+) -> None:
+    """Raise 403 unless the current user owns the client (or is an admin)."""
+    is_owner = client.counselor_id == UUID(current_user["user_id"])
+    is_admin = allow_admin and "admin" in current_user.get("roles", [])
+    if not (is_owner or is_admin):
+        raise HTTPException(
+            status_code=403,
+            detail=f"You don't have permission to {action} this client",
+        )
+
+
 @router.get("/{client_id}", response_model=ClientResponse)
 async def get_client(
     client_id: UUID,
@@ -348,63 +549,13 @@ async def get_client(
     Get a specific client's details
     獲取特定客戶的詳細資料
     """
-    # Get client and check ownership
-    client = session.get(Client, client_id)
+    # Client and statistics in one query
+    client = load_client_detail(session, client_id)
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
 
-    # Check if this client belongs to the current counselor
-    if client.counselor_id != str(current_user["user_id"]) and not current_user.get(
-        "roles", []
-    ).count("admin"):
-        raise HTTPException(
-            status_code=403, detail="You don't have permission to view this client"
-        )
-
-    # Get statistics
-    active_rooms_count = (
-        session.exec(
-            select(func.count(RoomClient.id))
-            .join(Room)
-            .where(RoomClient.client_id == client.id, Room.is_active)
-        ).first()
-        or 0
-    )
-
-    total_consultations = (
-        session.exec(
-            select(func.count(ConsultationRecord.id)).where(
-                ConsultationRecord.client_id == client.id
-            )
-        ).first()
-        or 0
-    )
-
-    last_consultation = session.exec(
-        select(ConsultationRecord)
-        .where(ConsultationRecord.client_id == client.id)
-        .order_by(ConsultationRecord.session_date.desc())
-    ).first()
-
-    return ClientResponse(
-        id=client.id,
-        email=client.email,
-        name=client.name,
-        phone=client.phone,
-        notes=client.notes,
-        tags=client.tags,
-        status=client.status,
-        counselor_id=client.counselor_id,
-        email_verified=client.email_verified,
-        verified_at=client.verified_at,
-        created_at=client.created_at,
-        updated_at=client.updated_at,
-        active_rooms_count=active_rooms_count,
-        total_consultations=total_consultations,
-        last_consultation_date=(
-            last_consultation.session_date if last_consultation else None
-        ),
-    )
+    check_client_access(client, current_user, "view")
+    return client
 
 
 @router.put("/{client_id}", response_model=ClientResponse)
@@ -418,73 +569,19 @@ async def update_client(
     Update client information
     更新客戶資料
     """
-    # Get and check client ownership
-    client = session.get(Client, client_id)
+    client = load_client_detail(session, client_id)
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
 
-    # Check if this client belongs to the current counselor
-    if client.counselor_id != str(current_user["user_id"]) and not current_user.get(
-        "roles", []
-    ).count("admin"):
-        raise HTTPException(
-            status_code=403, detail="You don't have permission to update this client"
-        )
+    check_client_access(client, current_user, "update")
 
-    # Update fields
+    # Update fields; statistics are not affected, so no re-read is needed
     update_data = client_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(client, field, value)
-
-    client.updated_at = datetime.utcnow()
-    session.add(client)
+    update_data["updated_at"] = datetime.utcnow()
+    session.execute(update(Client).where(Client.id == client_id).values(update_data))
     session.commit()
-    session.refresh(client)
-
-    # Get statistics for response
-    active_rooms_count = (
-        session.exec(
-            select(func.count(RoomClient.id))
-            .join(Room)
-            .where(RoomClient.client_id == client.id, Room.is_active)
-        ).first()
-        or 0
-    )
-
-    total_consultations = (
-        session.exec(
-            select(func.count(ConsultationRecord.id)).where(
-                ConsultationRecord.client_id == client.id
-            )
-        ).first()
-        or 0
-    )
 
-    last_consultation = session.exec(
-        select(ConsultationRecord)
-        .where(ConsultationRecord.client_id == client.id)
-        .order_by(ConsultationRecord.session_date.desc())
-    ).first()
-
-    return ClientResponse(
-        id=client.id,
-        email=client.email,
-        name=client.name,
-        phone=client.phone,
-        notes=client.notes,
-        tags=client.tags,
-        status=client.status,
-        counselor_id=client.counselor_id,
-        email_verified=client.email_verified,
-        verified_at=client.verified_at,
-        created_at=client.created_at,
-        updated_at=client.updated_at,
-        active_rooms_count=active_rooms_count,
-        total_consultations=total_consultations,
-        last_consultation_date=(
-            last_consultation.session_date if last_consultation else None
-        ),
-    )
+    return client.model_copy(update=update_data)
 
 
 @router.post("/{client_id}/bind-email", response_model=ClientResponse)
@@ -500,16 +597,11 @@ async def bind_email_to_client(
     """
     check_counselor_permission(current_user)
 
-    # Get client and check ownership
-    client = session.get(Client, client_id)
+    client = load_client_detail(session, client_id)
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
 
-    # Check if this client belongs to the current counselor
-    if client.counselor_id != str(current_user["user_id"]):
-        raise HTTPException(
-            status_code=403, detail="You don't have permission to update this client"
-        )
+    check_client_access(client, current_user, "update", allow_admin=False)
 
     # Check if client already has email
     if client.email:
@@ -519,8 +611,8 @@ async def bind_email_to_client(
 
     # Check if this counselor already has a client with this email
     existing_client = session.exec(
-        select(Client).where(
-            Client.counselor_id == str(current_user["user_id"]),
+        select(Client.id).where(
+            Client.counselor_id == client.counselor_id,
             Client.email == bind_data.email,
             Client.id != client_id,
         )
@@ -533,76 +625,24 @@ async def bind_email_to_client(
         )
 
     # Update client with email
-    client.email = bind_data.email
-    client.email_verified = False
+    update_data = {
+        "email": bind_data.email,
+        "email_verified": False,
+        "updated_at": datetime.utcnow(),
+    }
+    values = dict(update_data)
 
     # Generate verification token if sending verification
     if bind_data.send_verification:
         import secrets
 
-        client.verification_token = secrets.token_urlsafe(32)
+        values["verification_token"] = secrets.token_urlsafe(32)
         # TODO: Send verification email here
 
-    client.updated_at = datetime.utcnow()
-
-    session.add(client)
+    session.execute(update(Client).where(Client.id == client_id).values(values))
     session.commit()
-    session.refresh(client)
-
-    # Get statistics for response
-    active_rooms_count = (
-        session.exec(
-            select(func.count(RoomClient.id))
-            .join(Room)
-            .where(
-                RoomClient.client_id == client.id,
-                Room.is_active,
-                Room.counselor_id == str(current_user["user_id"]),
-            )
-        ).first()
-        or 0
-    )
 
-    total_consultations = (
-        session.exec(
-            select(func.sum(Room.session_count))
-            .join(RoomClient)
-            .where(
-                RoomClient.client_id == client.id,
-                Room.counselor_id == str(current_user["user_id"]),
-            )
-        ).first()
-        or 0
-    )
-
-    last_consultation = session.exec(
-        select(ConsultationRecord)
-        .where(
-            ConsultationRecord.client_id == client.id,
-            ConsultationRecord.counselor_id == str(current_user["user_id"]),
-        )
-        .order_by(ConsultationRecord.session_date.desc())
-    ).first()
-
-    return ClientResponse(
-        id=client.id,
-        email=client.email,
-        name=client.name,
-        phone=client.phone,
-        notes=client.notes,
-        tags=client.tags,
-        status=client.status,
-        counselor_id=client.counselor_id,
-        email_verified=client.email_verified,
-        verified_at=client.verified_at,
-        created_at=client.created_at,
-        updated_at=client.updated_at,
-        active_rooms_count=active_rooms_count,
-        total_consultations=total_consultations,
-        last_consultation_date=(
-            last_consultation.session_date if last_consultation else None
-        ),
-    )
+    return client.model_copy(update=update_data)
 
 
 @router.delete("/{client_id}")
@@ -638,6 +678,7 @@ async def archive_client(
 
 
 @router.get("/{client_id}/rooms", response_model=List[dict])
+@skip_response_validation
 async def get_client_rooms(
     client_id: UUID,
     session: Session = Depends(get_session),
@@ -652,34 +693,17 @@ async def get_client_rooms(
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
 
-    if client.counselor_id != str(current_user["user_id"]) and not current_user.get(
-        "roles", []
-    ).count("admin"):
-        raise HTTPException(
-            status_code=403,
-            detail="You don't have permission to view this client's rooms",
-        )
+    check_client_access(client, current_user, "view the rooms of")
 
     # Get rooms
-    rooms = session.exec(
-        select(Room)
+    rows = session.exec(
+        select(*CLIENT_ROOM_COLUMNS)
         .join(RoomClient)
         .where(RoomClient.client_id == client_id)
         .order_by(Room.created_at.desc())
     ).all()
 
-    return [
-        {
-            "id": str(room.id),
-            "name": room.name,
-            "description": room.description,
-            "is_active": room.is_active,
-            "expires_at": room.expires_at.isoformat() if room.expires_at else None,
-            "session_count": room.session_count,
-            "created_at": room.created_at.isoformat(),
-        }
-        for room in rooms
-    ]
+    return [dict(row._mapping) for row in rows]
 
 
 @router.post(
@@ -723,18 +747,35 @@ async def create_consultation_record(
 
 
 @router.get(
-    "/{client_id}/consultation-records", response_model=List[ConsultationRecordResponse]
+    "/{client_id}/consultation-records",
+    response_model=Union[
+        List[ConsultationRecordResponse], List[ConsultationRecordSummary]
+    ],
 )
+@skip_response_validation
 async def get_consultation_records(
     client_id: UUID,
+    response: Response,
     session: Session = Depends(get_session),
     current_user: dict = Depends(get_current_user_from_token),
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
-) -> List[ConsultationRecordResponse]:
+    cursor: Annotated[
+        Optional[str], Query(description="X-Next-Cursor from the previous page")
+    ] = None,
+    view: Annotated[
+        Literal["full", "summary"],
+        Query(description="summary omits game_state and screenshot URLs"),
+    ] = "full",
+) -> List[dict]:
     """
     Get consultation records for a client
     獲取客戶的諮詢記錄
+
+    Records are ordered by (session_date, id) descending. Pass the
+    X-Next-Cursor header of a page as ?cursor= to fetch the next one.
+    view=summary returns only the gameplay name and screenshot count;
+    GET /api/clients/consultation-records/{record_id} returns a full record.
     """
     # Check client ownership
     client = session.get(Client, client_id)
@@ -753,79 +794,250 @@ async def get_consultation_records(
             detail="You don't have permission to view this client's records",
         )
 
-    # Get consultation records
-    records = session.exec(
-        select(ConsultationRecord)
-        .where(ConsultationRecord.client_id == client_id)
-        .order_by(ConsultationRecord.session_date.desc())
-        .offset(offset)
-        .limit(limit)
-    ).all()
-
-    # Build response
-    result = [ConsultationRecordResponse(**record.dict()) for record in records]
+    if view == "summary":
+        # Project in SQL so game_state and screenshot URLs never leave the database
+        columns = [
+            ConsultationRecord.id,
+            ConsultationRecord.room_id,
+            ConsultationRecord.client_id,
+            ConsultationRecord.counselor_id,
+            ConsultationRecord.session_date,
+            ConsultationRecord.duration_minutes,
+            ConsultationRecord.game_state["gameplay"].as_string().label("gameplay"),
+            func.coalesce(func.cardinality(ConsultationRecord.screenshots), 0).label(
+                "screenshot_count"
+            ),
+            ConsultationRecord.topics,
+            ConsultationRecord.notes,
+            ConsultationRecord.follow_up_required,
+            ConsultationRecord.follow_up_date,
+            ConsultationRecord.created_at,
+            ConsultationRecord.updated_at,
+        ]
+        query = select(*columns)
+    else:
+        query = select(*CONSULTATION_RECORD_COLUMNS)
+
+    query = (
+        query.where(ConsultationRecord.client_id == client_id)
+        .order_by(ConsultationRecord.session_date.desc(), ConsultationRecord.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        query = query.where(
+            tuple_(ConsultationRecord.session_date, ConsultationRecord.id)
+            < decode_keyset_cursor(cursor)
+        )
+    else:
+        query = query.offset(offset)
+
+    rows = session.exec(query).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_keyset_cursor(
+            rows[-1].session_date, rows[-1].id
+        )
 
-    return result
+    return [dict(row._mapping) for row in rows]
 
 
-@router.post("/consultation-records/{record_id}/screenshots")
-async def upload_consultation_screenshot(
+@router.get(
+    "/consultation-records/{record_id}", response_model=ConsultationRecordResponse
+)
+async def get_consultation_record(
     record_id: UUID,
-    file: UploadFile = File(...),
-    game_state: Optional[str] = Form(None),
     session: Session = Depends(get_session),
     current_user: dict = Depends(get_current_user_from_token),
-):
+) -> ConsultationRecordResponse:
     """
-    Upload screenshot for a consultation record with optional game state
-    上傳諮詢記錄的截圖並可選地保存遊戲狀態
+    Get a single consultation record with game_state and screenshots
+    獲取單筆完整諮詢記錄
     """
-    # Verify record exists and check ownership
     record = session.get(ConsultationRecord, record_id)
     if not record:
         raise HTTPException(status_code=404, detail="Consultation record not found")
 
-    # Check if this record belongs to the current counselor
     counselor_id = current_user.get("user_id")
     if isinstance(counselor_id, str):
         counselor_id = UUID(counselor_id)
 
-    if record.counselor_id != counselor_id:
+    if record.counselor_id != counselor_id and not current_user.get("roles", []).count(
+        "admin"
+    ):
+        raise HTTPException(
+            status_code=403, detail="You don't have permission to view this record"
+        )
+
+    return ConsultationRecordResponse(**record.dict())
+
+
+# Maximum screenshots accepted by one batch upload request
+MAX_SCREENSHOTS_PER_UPLOAD = 10
+
+
+def check_record_upload_permission(
+    session: Session, record_id: UUID, current_user: dict
+) -> UUID:
+    """Verify the record exists and belongs to the counselor; returns counselor id."""
+    # Only the owner column is read; screenshots and game_state stay in the database
+    owner_id = session.exec(
+        select(ConsultationRecord.counselor_id).where(
+            ConsultationRecord.id == record_id
+        )
+    ).first()
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Consultation record not found")
+
+    counselor_id = current_user.get("user_id")
+    if isinstance(counselor_id, str):
+        counselor_id = UUID(counselor_id)
+
+    if owner_id != counselor_id:
         raise HTTPException(
             status_code=403,
             detail="You don't have permission to upload screenshots for this record",
         )
+    return counselor_id
+
+
+def canonical_game_state(game_state: Optional[str]) -> Optional[str]:
+    """Parse the game_state form field into canonical JSON (sorted keys)."""
+    if not game_state:
+        return None
+    try:
+        return orjson.dumps(
+            orjson.loads(game_state), option=orjson.OPT_SORT_KEYS
+        ).decode()
+    except orjson.JSONDecodeError:
+        print(f"Invalid game_state JSON: {game_state}")
+        return None
+
+
+def append_record_screenshots(
+    session: Session,
+    record_id: UUID,
+    counselor_id: UUID,
+    urls: List[str],
+    game_state: Optional[str] = None,
+) -> int:
+    """
+    Append screenshot URLs (and game state) with one UPDATE ... RETURNING
+
+    The array is extended server side, so concurrent uploads never lose URLs.
+    game_state (canonical JSON text) is only rewritten when it differs from
+    the stored value as jsonb, so key order and whitespace of rows written by
+    other paths do not count as a change. Returns the new screenshot count.
+    """
+    table = ConsultationRecord.__table__
+    if len(urls) == 1:
+        screenshots = func.array_append(table.c.screenshots, urls[0])
+    else:
+        screenshots = func.array_cat(
+            table.c.screenshots, bindparam("urls", urls, type_=ARRAY(TEXT))
+        )
+    values = {"screenshots": screenshots, "updated_at": datetime.utcnow()}
+    if game_state is not None:
+        new_state = literal(game_state, TEXT)
+        values["game_state"] = case(
+            (
+                cast(table.c.game_state, JSONB).is_distinct_from(
+                    cast(new_state, JSONB)
+                ),
+                cast(new_state, table.c.game_state.type),
+            ),
+            else_=table.c.game_state,
+        )
+
+    total = session.execute(
+        update(table)
+        .where(table.c.id == record_id, table.c.counselor_id == counselor_id)
+        .values(**values)
+        .returning(func.cardinality(table.c.screenshots))
+    ).scalar_one_or_none()
+    if total is None:
+        raise HTTPException(status_code=404, detail="Consultation record not found")
+    session.commit()
+    return total
+
+
+@router.post("/consultation-records/{record_id}/screenshots")
+async def upload_consultation_screenshot(
+    record_id: UUID,
+    file: UploadFile = File(...),
+    game_state: Optional[str] = Form(None),
+    session: Session = Depends(get_session),
+    current_user: dict = Depends(get_current_user_from_token),
+):
+    """
+    Upload screenshot for a consultation record with optional game state
+    上傳諮詢記錄的截圖並可選地保存遊戲狀態
+    """
+    counselor_id = check_record_upload_permission(session, record_id, current_user)
 
     # Validate file type
     if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="Only image files are allowed")
 
     # Upload to GCS
-    import json
-
     from app.services.storage import upload_screenshot
 
     public_url = await upload_screenshot(
-        file=file, counselor_id=UUID(current_user["user_id"]), record_id=record_id
+        file=file, counselor_id=counselor_id, record_id=record_id
     )
 
-    # Update record with new screenshot URL
-    record.screenshots = record.screenshots + [public_url]
+    state = canonical_game_state(game_state)
+    total = append_record_screenshots(
+        session, record_id, counselor_id, [public_url], state
+    )
 
-    # Update game state if provided
-    if game_state:
-        try:
-            record.game_state = json.loads(game_state)
-        except json.JSONDecodeError:
-            print(f"Invalid game_state JSON: {game_state}")
+    return {
+        "url": public_url,
+        "record_id": record_id,
+        "total_screenshots": total,
+        "game_state_saved": state is not None,
+    }
 
-    record.updated_at = datetime.utcnow()
-    session.add(record)
-    session.commit()
+
+@router.post("/consultation-records/{record_id}/screenshots/batch")
+async def upload_consultation_screenshots(
+    record_id: UUID,
+    files: List[UploadFile] = File(...),
+    game_state: Optional[str] = Form(None),
+    session: Session = Depends(get_session),
+    current_user: dict = Depends(get_current_user_from_token),
+):
+    """
+    Upload several screenshots for a consultation record in one request
+    一次上傳多張諮詢記錄截圖（單一資料庫更新）
+    """
+    counselor_id = check_record_upload_permission(session, record_id, current_user)
+
+    if len(files) > MAX_SCREENSHOTS_PER_UPLOAD:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_SCREENSHOTS_PER_UPLOAD} screenshots per upload",
+        )
+    if any(
+        not file.content_type or not file.content_type.startswith("image/")
+        for file in files
+    ):
+        raise HTTPException(status_code=400, detail="Only image files are allowed")
+
+    from app.services.storage import upload_screenshot
+
+    urls = [
+        await upload_screenshot(
+            file=file, counselor_id=counselor_id, record_id=record_id
+        )
+        for file in files
+    ]
+
+    state = canonical_game_state(game_state)
+    total = append_record_screenshots(session, record_id, counselor_id, urls, state)
 
     return {
-        "url": public_url,
+        "urls": urls,
         "record_id": record_id,
-        "total_screenshots": len(record.screenshots),
-        "game_state_saved": game_state is not None,
+        "total_screenshots": total,
+        "game_state_saved": state is not None,
     }
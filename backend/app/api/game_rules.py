@@ -4,128 +4,117 @@ Game Rules API - 遊戲規則 API 端點 (Application Layer)
 根據 ARCHITECTURE.md 三層架構設計，提供遊戲規則選擇和管理功能
 """
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import Session, select
 
 from app.core.auth import get_current_user_from_token
 from app.core.database import get_session
+from app.core.responses import skip_response_validation
 from app.core.roles import Permission, has_permission
+from app.game.registry import CachedPayload, rule_registry
 from app.models.game_rule import GameRuleTemplate
 from app.models.user import User
+from app.services.card_catalog import EncodedPayload, card_catalog
 
 router = APIRouter()
 
+# 規則配置只在部署時改變，允許瀏覽器與 CDN 快取並以 ETag 重新驗證
+GAME_RULES_CACHE_CONTROL = "public, max-age=300, must-revalidate"
+
+
+def cached_json_response(
+    request: Request,
+    payload: CachedPayload,
+    cache_control: str = GAME_RULES_CACHE_CONTROL,
+) -> Response:
+    """返回預先序列化的 JSON，If-None-Match 命中時返回 304"""
+    headers = {"ETag": payload.etag, "Cache-Control": cache_control}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        if "*" in tags or payload.etag in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(
+        content=payload.body, media_type="application/json", headers=headers
+    )
+
+
+def negotiate_encoding(request: Request, payload: EncodedPayload) -> Optional[str]:
+    """依 Accept-Encoding 選擇預先壓縮的版本（br 優先於 gzip）"""
+    accepted = {}
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.lower()] = quality
+
+    for coding in ("br", "gzip"):
+        quality = accepted.get(coding, accepted.get("*", 0.0))
+        if quality > 0 and coding in payload.encodings:
+            return coding
+    return None
+
+
+def encoded_json_response(
+    request: Request,
+    payload: EncodedPayload,
+    cache_control: str = GAME_RULES_CACHE_CONTROL,
+) -> Response:
+    """返回預先壓縮的 JSON；ETag 依編碼區分，If-None-Match 比對內容雜湊"""
+    encoding = negotiate_encoding(request, payload)
+    etag = f'"{payload.etag}-{encoding}"' if encoding else f'"{payload.etag}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        for tag in if_none_match.split(","):
+            tag = tag.strip().removeprefix("W/").strip('"')
+            if tag == "*" or tag.split("-", 1)[0] == payload.etag:
+                return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        body = payload.encodings[encoding]
+    else:
+        body = payload.body
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 @router.get("/")
-async def list_game_rules():
+async def list_game_rules(request: Request):
     """
     獲取所有可用的遊戲規則
 
     返回系統內建的三種遊戲規則類型及其配置
     這個端點不需要認證，因為遊戲規則是公開資訊
     """
-    from app.game.config import GameRuleConfig
-
-    skill_config = GameRuleConfig.get_skill_assessment_config()
-    value_config = GameRuleConfig.get_value_navigation_config()
-    career_config = GameRuleConfig.get_career_personality_config()
-
-    rules = [
-        {
-            "id": "skill_assessment",
-            "slug": "skill_assessment",
-            "name": "職能盤點卡",
-            "description": "評估個人專業技能優勢與待改善領域",
-            "version": "1.0",
-            "layout_config": skill_config.layout.to_dict(),
-            "constraint_config": skill_config.constraints.to_dict(),
-            "is_active": True,
-        },
-        {
-            "id": "value_navigation",
-            "slug": "value_navigation",
-            "name": "價值導航卡",
-            "description": "探索個人價值觀與人生重要性排序",
-            "version": "1.0",
-            "layout_config": value_config.layout.to_dict(),
-            "constraint_config": value_config.constraints.to_dict(),
-            "is_active": True,
-        },
-        {
-            "id": "career_personality",
-            "slug": "career_personality",
-            "name": "職游旅人卡",
-            "description": "發現職業興趣偏好與性格特質",
-            "version": "1.0",
-            "layout_config": career_config.layout.to_dict(),
-            "constraint_config": career_config.constraints.to_dict(),
-            "is_active": True,
-        },
-    ]
-
-    return rules
+    return cached_json_response(request, rule_registry.list_payload)
 
 
-@router.get("/{rule_id}")
-async def get_game_rule(rule_id: str):
-    """
-    獲取特定遊戲規則的詳細配置
-
-    根據規則ID返回對應的遊戲規則配置
+@router.get("/types")
+async def list_game_rule_types(request: Request):
     """
-    from app.game.config import GameRuleConfig
-
-    if rule_id == "skill_assessment":
-        config = GameRuleConfig.get_skill_assessment_config()
-        return {
-            "id": "skill_assessment",
-            "slug": "skill_assessment",
-            "name": "職能盤點卡",
-            "description": "評估個人專業技能優勢與待改善領域",
-            "version": "1.0",
-            "layout_config": config.layout.to_dict(),
-            "constraint_config": config.constraints.to_dict(),
-            "is_active": True,
-        }
-    elif rule_id == "value_navigation":
-        config = GameRuleConfig.get_value_navigation_config()
-        return {
-            "id": "value_navigation",
-            "slug": "value_navigation",
-            "name": "價值導航卡",
-            "description": "探索個人價值觀與人生重要性排序",
-            "version": "1.0",
-            "layout_config": config.layout.to_dict(),
-            "constraint_config": config.constraints.to_dict(),
-            "is_active": True,
-        }
-    elif rule_id == "career_personality":
-        config = GameRuleConfig.get_career_personality_config()
-        return {
-            "id": "career_personality",
-            "slug": "career_personality",
-            "name": "職游旅人卡",
-            "description": "發現職業興趣偏好與性格特質",
-            "version": "1.0",
-            "layout_config": config.layout.to_dict(),
-            "constraint_config": config.constraints.to_dict(),
-            "is_active": True,
-        }
-    else:
-        raise HTTPException(status_code=404, detail="Game rule not found")
-
+    獲取支援的遊戲規則類型列表 (靜態配置)
 
-@router.get("/by-slug/{slug}")
-async def get_game_rule_by_slug(slug: str):
+    返回系統內建的三種遊戲規則類型及其基本資訊
     """
-    根據slug獲取遊戲規則
+    # TODO: Re-enable permission check after testing
+    # if not has_permission(current_user, Permission.MANAGE_ROOM):
+    #     raise HTTPException(status_code=403, detail="Insufficient permissions")
 
-    slug即規則的標識符，與ID相同
-    """
-    return await get_game_rule(slug)
+    return cached_json_response(request, rule_registry.types_payload)
 
 
 @router.get("/templates", response_model=List[GameRuleTemplate])
@@ -178,49 +167,94 @@ async def get_game_rule_template(
     return template
 
 
-@router.get("/types")
-async def list_game_rule_types():
+@router.get("/decks/{deck_id}/cards")
+def get_deck_cards(
+    deck_id: UUID,
+    request: Request,
+    since: Optional[str] = Query(
+        default=None, description="客戶端已持有的目錄版本，只返回差異"
+    ),
+    session: Session = Depends(get_session),
+):
     """
-    獲取支援的遊戲規則類型列表 (靜態配置)
+    獲取牌組的所有牌卡
 
-    返回系統內建的三種遊戲規則類型及其基本資訊
+    牌組目錄在版本改變時才重新載入，回應預先壓縮並附上內容雜湊 ETag。
+    帶上 since 時返回 upserted / removed 差異；since 未知時返回完整目錄。
     """
-    # TODO: Re-enable permission check after testing
-    # if not has_permission(current_user, Permission.MANAGE_ROOM):
-    #     raise HTTPException(status_code=403, detail="Insufficient permissions")
+    catalog = card_catalog.get(session, deck_id)
+    if catalog is None:
+        raise HTTPException(status_code=404, detail="Card deck not found")
+
+    payload = catalog.payload
+    if since:
+        payload = catalog.delta_payload(since) or catalog.payload
+    return encoded_json_response(request, payload)
+
+
+@router.get("/decks/{deck_id}/search")
+@skip_response_validation
+def search_deck_cards(
+    deck_id: UUID,
+    q: str = Query(default="", max_length=100, description="搜尋字詞（空白分隔）"),
+    category: List[str] = Query(default=[]),
+    subcategory: List[str] = Query(default=[]),
+    metadata: List[str] = Query(
+        default=[], description="card_metadata 篩選，格式為 key:value"
+    ),
+    limit: int = Query(default=50, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
+    session: Session = Depends(get_session),
+):
+    """
+    搜尋牌組中的牌卡
 
-    from app.game.config import GameRuleConfig
-
-    rule_types = [
-        {
-            "id": "skill_assessment",
-            "name": "職能盤點卡",
-            "description": "評估個人專業技能優勢與待改善領域",
-            "zones": 2,
-            "max_cards_per_zone": 5,
-            "config": GameRuleConfig.get_skill_assessment_config(),
-        },
-        {
-            "id": "value_navigation",
-            "name": "價值導航卡",
-            "description": "探索個人價值觀與人生重要性排序",
-            "zones": 9,
-            "max_cards_per_zone": 1,
-            "config": GameRuleConfig.get_value_navigation_config(),
-        },
-        {
-            "id": "career_personality",
-            "name": "職游旅人卡",
-            "description": "發現職業興趣偏好與性格特質",
-            "zones": 3,
-            "max_cards_per_zone": [20, None, 20],  # [喜歡, 中立, 討厭]
-            "config": GameRuleConfig.get_career_personality_config(),
-        },
-    ]
-
-    return {
-        "rule_types": rule_types,
-        "total": len(rule_types),
-        "architecture": "three_layer_engine",
-        "engine_version": "1.0",
-    }
+    支援分面篩選（category / subcategory / metadata）與
+    title / description 的前綴、子字串搜尋（含中文），依相關度排序
+    """
+    metadata_filters = []
+    for item in metadata:
+        key, separator, value = item.partition(":")
+        if not separator or not key:
+            raise HTTPException(
+                status_code=422, detail="metadata filter must be key:value"
+            )
+        metadata_filters.append((key, value))
+
+    catalog = card_catalog.get(session, deck_id)
+    if catalog is None:
+        raise HTTPException(status_code=404, detail="Card deck not found")
+
+    result = catalog.search_index.search(
+        q,
+        category=category,
+        subcategory=subcategory,
+        metadata=metadata_filters,
+        limit=limit,
+        offset=offset,
+    )
+    return {"deck_id": str(deck_id), "version": catalog.version, "query": q, **result}
+
+
+@router.get("/{rule_id}")
+async def get_game_rule(rule_id: str, request: Request):
+    """
+    獲取特定遊戲規則的詳細配置
+
+    根據規則ID返回對應的遊戲規則配置
+    """
+    rule = rule_registry.get(rule_id)
+    if rule is None:
+        raise HTTPException(status_code=404, detail="Game rule not found")
+
+    return cached_json_response(request, rule.payload)
+
+
+@router.get("/by-slug/{slug}")
+async def get_game_rule_by_slug(slug: str, request: Request):
+    """
+    根據slug獲取遊戲規則
+
+    slug即規則的標識符，與ID相同
+    """
+    return await get_game_rule(slug, request)
@@ -1,25 +1,43 @@
 """Gameplay states API endpoints."""
 
+from dataclasses import replace
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import TEXT, cast, literal
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
 from app.core.auth import get_current_user_from_token
 from app.core.database import get_session
+from app.core.responses import ORJSONResponse
+from app.game.config import ActionType, GameRuleConfig
+from app.game.engine import GameAction, GameEngine, GameState
+from app.game.merge import MAX_CLOCK_DRIFT_MS, HybridClock, MergeableBoard
+from app.game.registry import rule_registry
+from app.game.serialization import dumps_state
 from app.models.gameplay_state import (
+    GameplayActionsRequest,
+    GameplayActionsResponse,
+    GameplayMergeRequest,
+    GameplayMergeResponse,
     GameplayState,
     GameplayStateResponse,
     GameplayStateUpdate,
     RoomGameplayStatesResponse,
 )
 from app.models.room import Room
+from app.services.undo_history import UndoStep, undo_history
 
 router = APIRouter()
 
+# 合併用的盤面中繼資料存放在 state 的此鍵下
+MERGE_METADATA_KEY = "crdt"
+MERGE_NODE_ID = "server"
+
 
 def verify_room_access(room_id: UUID, user: dict, session: Session) -> Room:
     """Verify user has access to the room."""
@@ -41,6 +59,53 @@ def verify_room_access(room_id: UUID, user: dict, session: Session) -> Room:
     return room
 
 
+def validate_engine_state(state: Dict[str, Any]) -> None:
+    """Validate engine-format states (GameState.to_dict) against their rule.
+
+    Free-form frontend snapshots (cardPlacements, ...) carry no rule_id and
+    are stored as-is.
+    """
+    rule_id = state.get("rule_id")
+    if not isinstance(rule_id, str) or "zones" not in state:
+        return
+
+    config = rule_registry.get_config(rule_id)
+    if config is None:
+        return
+
+    errors = config.validator.validate_state_dict(state)
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "message": "Game state violates rule constraints",
+                "errors": errors,
+            },
+        )
+
+
+# GameplayState columns of GameplayStateResponse, in field order
+GAMEPLAY_STATE_COLUMNS = (
+    GameplayState.gameplay_id,
+    GameplayState.state,
+    GameplayState.id,
+    GameplayState.room_id,
+    GameplayState.last_played_at,
+    GameplayState.created_at,
+    GameplayState.updated_at,
+)
+
+
+def gameplay_state_response(gameplay_state: GameplayState) -> Response:
+    """GameplayStateResponse of a row, encoded with orjson (no re-validation)."""
+    return ORJSONResponse(
+        {
+            column.key: getattr(gameplay_state, column.key)
+            for column in GAMEPLAY_STATE_COLUMNS
+        }
+    )
+
+
 @router.get(
     "/rooms/{room_id}/gameplay-states",
     response_model=RoomGameplayStatesResponse,
@@ -49,29 +114,30 @@ def get_room_gameplay_states(
     room_id: UUID,
     user: dict = Depends(get_current_user_from_token),
     session: Session = Depends(get_session),
-):
-    """Get all gameplay states for a room with summary statistics."""
+) -> Response:
+    """Get all gameplay states for a room with summary statistics.
+
+    Selects the response columns directly and returns orjson bytes, skipping
+    ORM instances and response re-validation.
+    """
     verify_room_access(room_id, user, session)
 
     # Get all gameplay states for this room
     statement = (
-        select(GameplayState)
+        select(*GAMEPLAY_STATE_COLUMNS)
         .where(GameplayState.room_id == room_id)
         .order_by(GameplayState.last_played_at.desc())
     )
-    states = session.exec(statement).all()
+    states = [dict(row._mapping) for row in session.exec(statement).all()]
 
     # Build summary
     summary: Dict[str, Any] = {
         "total_gameplays_played": len(states),
-        "most_recent_gameplay": states[0].gameplay_id if states else None,
-        "last_played_at": states[0].last_played_at.isoformat() if states else None,
+        "most_recent_gameplay": states[0]["gameplay_id"] if states else None,
+        "last_played_at": states[0]["last_played_at"].isoformat() if states else None,
     }
 
-    return RoomGameplayStatesResponse(
-        states=[GameplayStateResponse.model_validate(s) for s in states],
-        summary=summary,
-    )
+    return ORJSONResponse({"states": states, "summary": summary})
 
 
 @router.get(
@@ -83,7 +149,7 @@ def get_gameplay_state(
     gameplay_id: str,
     user: dict = Depends(get_current_user_from_token),
     session: Session = Depends(get_session),
-):
+) -> Response:
     """Get specific gameplay state."""
     verify_room_access(room_id, user, session)
 
@@ -99,7 +165,7 @@ def get_gameplay_state(
             detail=f"Gameplay state not found for {gameplay_id}",
         )
 
-    return GameplayStateResponse.model_validate(gameplay_state)
+    return gameplay_state_response(gameplay_state)
 
 
 @router.put(
@@ -112,9 +178,10 @@ def upsert_gameplay_state(
     state_update: GameplayStateUpdate,
     user: dict = Depends(get_current_user_from_token),
     session: Session = Depends(get_session),
-):
+) -> Response:
     """Create or update gameplay state (upsert)."""
     verify_room_access(room_id, user, session)
+    validate_engine_state(state_update.state)
 
     # Try to find existing state
     statement = select(GameplayState).where(
@@ -125,6 +192,9 @@ def upsert_gameplay_state(
 
     now = datetime.utcnow()
 
+    # A full snapshot replaces the board, so earlier undo steps no longer apply
+    undo_history.discard((room_id, gameplay_id))
+
     if gameplay_state:
         # Update existing
         gameplay_state.state = state_update.state
@@ -152,7 +222,7 @@ def upsert_gameplay_state(
             detail=f"Failed to save gameplay state: {str(e)}",
         )
 
-    return GameplayStateResponse.model_validate(gameplay_state)
+    return gameplay_state_response(gameplay_state)
 
 
 @router.delete("/rooms/{room_id}/gameplay-states/{gameplay_id}")
@@ -179,5 +249,301 @@ def delete_gameplay_state(
 
     session.delete(gameplay_state)
     session.commit()
+    undo_history.discard((room_id, gameplay_id))
 
     return {"success": True, "message": "Gameplay state deleted"}
+
+
+def load_engine_state(
+    room_id: UUID, gameplay_id: str, session: Session
+) -> Tuple[GameplayState, GameState, GameRuleConfig]:
+    """Load an engine-format gameplay state, locking its row for the update."""
+    statement = (
+        select(GameplayState)
+        .where(
+            GameplayState.room_id == room_id,
+            GameplayState.gameplay_id == gameplay_id,
+        )
+        .with_for_update()
+    )
+    gameplay_state = session.exec(statement).first()
+    if not gameplay_state:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Gameplay state not found for {gameplay_id}",
+        )
+
+    data = gameplay_state.state or {}
+    config = rule_registry.get_config(data.get("rule_id"))
+    if config is None or "zones" not in data:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Gameplay state is not an engine state",
+        )
+    return gameplay_state, GameState.from_dict(data), config
+
+
+def save_engine_state(
+    gameplay_state: GameplayState,
+    state: GameState,
+    session: Session,
+    merge_metadata: Optional[Dict[str, Any]] = None,
+) -> None:
+    now = datetime.utcnow()
+    # Encoded straight from the GameState with orjson (same JSON as to_dict())
+    body = dumps_state(state)
+    if merge_metadata is not None:
+        body = b"".join(
+            (
+                body[:-1],
+                b",",
+                orjson.dumps(MERGE_METADATA_KEY),
+                b":",
+                orjson.dumps(merge_metadata),
+                b"}",
+            )
+        )
+    gameplay_state.state = cast(
+        literal(body.decode(), TEXT), GameplayState.__table__.c.state.type
+    )
+    gameplay_state.last_played_at = now
+    gameplay_state.updated_at = now
+    session.add(gameplay_state)
+    session.commit()
+
+
+def build_actions_response(
+    key: Tuple[UUID, str],
+    version: int,
+    actions: List[GameAction],
+    applied: List[int],
+    failures: Dict[int, str],
+) -> GameplayActionsResponse:
+    can_undo, can_redo = undo_history.status(key, version)
+    return GameplayActionsResponse(
+        version=version,
+        applied=applied,
+        failures=failures,
+        actions=[action.to_dict() for action in actions],
+        can_undo=can_undo,
+        can_redo=can_redo,
+    )
+
+
+@router.post(
+    "/rooms/{room_id}/gameplay-states/{gameplay_id}/actions",
+    response_model=GameplayActionsResponse,
+)
+def apply_gameplay_actions(
+    room_id: UUID,
+    gameplay_id: str,
+    request: GameplayActionsRequest,
+    user: dict = Depends(get_current_user_from_token),
+    session: Session = Depends(get_session),
+):
+    """Apply engine actions to a stored state and record an undo step."""
+    verify_room_access(room_id, user, session)
+    gameplay_state, state, config = load_engine_state(room_id, gameplay_id, session)
+
+    if (
+        request.expected_version is not None
+        and request.expected_version != state.version
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"State version is {state.version}",
+        )
+
+    try:
+        actions = [
+            GameAction(
+                type=ActionType(item.type),
+                player_id=user.get("user_id"),
+                card_id=item.card_id,
+                target_zone=item.target_zone,
+                position=item.position,
+                data=item.data,
+            )
+            for item in request.actions
+        ]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
+
+    result = GameEngine().execute_actions(actions, state, config, track_inverse=True)
+    key = (room_id, gameplay_id)
+    applied_actions = [actions[index] for index in result.applied]
+    if applied_actions:
+        save_engine_state(gameplay_state, result.new_state, session)
+        if result.inverse:
+            undo_history.record(
+                key,
+                UndoStep(actions=applied_actions, inverse=result.inverse),
+                base_version=state.version,
+                version=result.new_state.version,
+            )
+        else:
+            # 無法還原的動作（ARRANGE）使既有的復原步驟失效
+            undo_history.discard(key)
+
+    return build_actions_response(
+        key,
+        result.new_state.version,
+        applied_actions,
+        result.applied,
+        result.failures,
+    )
+
+
+def replay_history_step(
+    room_id: UUID, gameplay_id: str, session: Session, redo: bool
+) -> GameplayActionsResponse:
+    gameplay_state, state, config = load_engine_state(room_id, gameplay_id, session)
+    key = (room_id, gameplay_id)
+
+    if redo:
+        step = undo_history.pop_redo(key, state.version)
+    else:
+        step = undo_history.pop_undo(key, state.version)
+    if step is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Nothing to redo" if redo else "Nothing to undo",
+        )
+
+    actions = step.actions if redo else step.inverse
+    result = GameEngine().execute_actions(actions, state, config)
+    if result.failures:
+        undo_history.discard(key)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Undo history no longer matches the game state",
+        )
+
+    save_engine_state(gameplay_state, result.new_state, session)
+    if redo:
+        undo_history.push_redone(key, step, result.new_state.version)
+    else:
+        undo_history.push_undone(key, step, result.new_state.version)
+
+    return build_actions_response(
+        key, result.new_state.version, actions, result.applied, {}
+    )
+
+
+@router.post(
+    "/rooms/{room_id}/gameplay-states/{gameplay_id}/undo",
+    response_model=GameplayActionsResponse,
+)
+def undo_gameplay_action(
+    room_id: UUID,
+    gameplay_id: str,
+    user: dict = Depends(get_current_user_from_token),
+    session: Session = Depends(get_session),
+):
+    """Undo the last action batch by applying its inverse actions."""
+    verify_room_access(room_id, user, session)
+    return replay_history_step(room_id, gameplay_id, session, redo=False)
+
+
+@router.post(
+    "/rooms/{room_id}/gameplay-states/{gameplay_id}/redo",
+    response_model=GameplayActionsResponse,
+)
+def redo_gameplay_action(
+    room_id: UUID,
+    gameplay_id: str,
+    user: dict = Depends(get_current_user_from_token),
+    session: Session = Depends(get_session),
+):
+    """Re-apply the last undone action batch."""
+    verify_room_access(room_id, user, session)
+    return replay_history_step(room_id, gameplay_id, session, redo=True)
+
+
+def load_mergeable_board(
+    data: Dict[str, Any], state: GameState
+) -> Tuple[MergeableBoard, Dict[str, int], int]:
+    """Load the stored board metadata, or seed it from the current board.
+
+    Metadata written for another version is stale (the state was replaced by a
+    PUT or changed by /actions) and is rebuilt from the board.
+    Returns (board, card -> version it last changed, version it was seeded at).
+    """
+    meta = data.get(MERGE_METADATA_KEY)
+    if isinstance(meta, dict) and meta.get("version") == state.version:
+        board = MergeableBoard.from_dict(meta["board"], MERGE_NODE_ID)
+        return board, dict(meta.get("touched", {})), meta["base_version"]
+    return MergeableBoard.from_state(state, MERGE_NODE_ID), {}, state.version
+
+
+@router.post(
+    "/rooms/{room_id}/gameplay-states/{gameplay_id}/merge",
+    response_model=GameplayMergeResponse,
+)
+def merge_gameplay_state(
+    room_id: UUID,
+    gameplay_id: str,
+    request: GameplayMergeRequest,
+    user: dict = Depends(get_current_user_from_token),
+    session: Session = Depends(get_session),
+):
+    """Merge concurrent board edits instead of overwriting the whole state.
+
+    Stamps more than MAX_CLOCK_DRIFT_MS ahead of the server clock are rejected
+    with 422. The response carries only the board entries the client has not
+    seen plus the new version; GET the gameplay state for the full board.
+    """
+    verify_room_access(room_id, user, session)
+    gameplay_state, state, config = load_engine_state(room_id, gameplay_id, session)
+    board, touched, base_version = load_mergeable_board(gameplay_state.state, state)
+
+    try:
+        incoming = MergeableBoard.from_dict(
+            request.delta,
+            MERGE_NODE_ID,
+            HybridClock(MERGE_NODE_ID, max_drift_ms=MAX_CLOCK_DRIFT_MS),
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
+
+    changed = board.merge(incoming)
+    if changed:
+        state = replace(board.materialize(state), version=state.version + 1)
+        errors = config.validator.validate_state_dict(state.to_dict())
+        if errors:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={
+                    "message": "Game state violates rule constraints",
+                    "errors": errors,
+                },
+            )
+
+        touched.update(dict.fromkeys(changed, state.version))
+        save_engine_state(
+            gameplay_state,
+            state,
+            session,
+            merge_metadata={
+                "version": state.version,
+                "base_version": base_version,
+                "board": board.to_dict(),
+                "touched": touched,
+            },
+        )
+        undo_history.discard((room_id, gameplay_id))
+
+    if request.since_version is None or request.since_version < base_version:
+        delta = board
+    else:
+        delta = board.subset(
+            card_id
+            for card_id, version in touched.items()
+            if version > request.since_version
+        )
+
+    return GameplayMergeResponse(version=state.version, delta=delta.to_dict())
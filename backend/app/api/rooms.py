@@ -6,11 +6,12 @@ Room API endpoints
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from sqlmodel import Session, select
 
 from app.core.auth import get_current_user_from_token
 from app.core.database import get_session
+from app.core.responses import ORJSONResponse
 from app.core.roles import Permission, has_permission
 from app.models.client import Client, RoomClient
 from app.models.room import Room, RoomCreate, RoomResponse
@@ -80,48 +81,17 @@ def create_room(
     # 如果指定了遊戲規則，查找對應的模板
     game_rule_id = None
     if hasattr(room_data, "game_rule_slug") and room_data.game_rule_slug:
-        from sqlmodel import select
+        from app.services.game_rule_templates import template_cache
 
-        from app.models.game_rule import GameRuleTemplate
-
-        # 查找遊戲規則模板
-        statement = select(GameRuleTemplate).where(
-            GameRuleTemplate.slug == room_data.game_rule_slug,
-            GameRuleTemplate.is_active.is_(True),
+        # 從模板快取查找；內建規則的模板不存在時冪等建立
+        game_rule = template_cache.get_or_create_default(
+            session, room_data.game_rule_slug
         )
-        game_rule = session.exec(statement).first()
-
-        if not game_rule:
-            # 如果沒有找到，嘗試使用預設配置
-            from app.game.config import GameRuleConfig
-
-            # 根據 slug 創建預設規則
-            if room_data.game_rule_slug == "skill_assessment":
-                config = GameRuleConfig.get_skill_assessment_config()
-            elif room_data.game_rule_slug == "value_navigation":
-                config = GameRuleConfig.get_value_navigation_config()
-            elif room_data.game_rule_slug == "career_personality":
-                config = GameRuleConfig.get_career_personality_config()
-            else:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Unknown game rule: {room_data.game_rule_slug}",
-                )
-
-            # 創建新的遊戲規則模板
-            game_rule = GameRuleTemplate(
-                slug=config.id,
-                name=config.name,
-                description=f"預設{config.name}規則",
-                version=config.version,
-                layout_config=config.layout.to_dict(),
-                constraint_config=config.constraints.to_dict(),
-                validation_rules={},
-                is_active=True,
+        if game_rule is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown game rule: {room_data.game_rule_slug}",
             )
-            session.add(game_rule)
-            session.commit()
-            session.refresh(game_rule)
 
         game_rule_id = game_rule.id
 
@@ -226,26 +196,42 @@ def get_room_by_share_code(share_code: str, session: Session = Depends(get_sessi
     return room_dict
 
 
+# Room columns of RoomResponse, in field order (list fast path)
+ROOM_LIST_COLUMNS = (
+    Room.name,
+    Room.description,
+    Room.game_rule_id,
+    Room.card_deck_id,
+    Room.id,
+    Room.counselor_id,
+    Room.share_code,
+    Room.is_active,
+    Room.created_at,
+    Room.expires_at,
+    Room.session_count,
+)
+
+
 @router.get("/", response_model=List[RoomResponse])
 def list_user_rooms(
     session: Session = Depends(get_session),
     current_user: dict = Depends(get_current_user_info),
     include_inactive: Optional[bool] = False,
-):
+) -> Response:
     """
     List rooms where user is counselor, optionally include inactive rooms
 
-    Optimized to avoid N+1 queries:
-    - Use LEFT JOIN to preload client names
+    Optimized for large lists:
+    - Select only the RoomResponse columns (no ORM instances)
     - Cache counselor name (since all rooms belong to current user)
+    - Return orjson bytes built from the rows (no response re-validation)
     """
 
-    # Get all rooms (active and inactive) with client information
+    # Get all rooms (active and inactive); one entry per associated client
     statement = (
-        select(Room, Client.name.label("client_name"))
+        select(*ROOM_LIST_COLUMNS)
         .select_from(Room)
         .outerjoin(RoomClient, Room.id == RoomClient.room_id)
-        .outerjoin(Client, RoomClient.client_id == Client.id)
         .where(Room.counselor_id == current_user["id"])
     )
 
@@ -253,25 +239,24 @@ def list_user_rooms(
     if not include_inactive:
         statement = statement.where(Room.is_active)
 
-    results = session.exec(statement).all()
+    rows = session.exec(statement).all()
 
     # Optimization: Get counselor name once (all rooms belong to current user)
-    counselor = session.get(User, current_user["id"])
-    counselor_name = counselor.name if counselor else "諮詢師"
-
-    # Convert to response format
-    rooms = []
-    for room, client_name in results:
-        room_dict = room.model_dump()
-        if client_name:
-            room_dict["primary_client_name"] = client_name
-
-        # Reuse cached counselor name (no query per room)
-        room_dict["counselor_name"] = counselor_name
-
-        rooms.append(room_dict)
-
-    return rooms
+    counselor_name = session.exec(
+        select(User.name).where(User.id == current_user["id"])
+    ).first()
+
+    return ORJSONResponse(
+        [
+            {
+                **row._mapping,
+                "client_id": None,
+                "client_name": None,
+                "counselor_name": counselor_name or "諮詢師",
+            }
+            for row in rows
+        ]
+    )
 
 
 @router.put("/{room_id}", response_model=RoomResponse)
@@ -27,6 +27,15 @@ class Settings(BaseSettings):
     gcs_bucket_name: str = "career-creator-screenshots-staging"
     google_application_credentials: Optional[str] = None
 
+    # Game rule template cache: seconds between version checks
+    game_rule_template_refresh_seconds: int = 30
+    # Card catalog cache: seconds between deck version checks
+    card_catalog_refresh_seconds: int = 30
+    # Undo/redo steps kept per gameplay
+    undo_history_limit: int = 50
+    # Gameplays whose undo history is kept in memory (least recently used dropped)
+    undo_history_max_games: int = 1000
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -1,4 +1,8 @@
-from sqlalchemy.engine import Engine
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Sequence
+
+from sqlalchemy import Executable
+from sqlalchemy.engine import Engine, Row
 from sqlmodel import Session, SQLModel, create_engine
 
 from app.core.config import settings
@@ -26,3 +30,38 @@ def get_session():
     """Dependency for getting database session"""
     with Session(engine) as session:
         yield session
+
+
+# Worker threads for execute_concurrently (one pooled connection per statement)
+CONCURRENT_QUERY_WORKERS = 8
+_query_executor = ThreadPoolExecutor(
+    max_workers=CONCURRENT_QUERY_WORKERS, thread_name_prefix="db-read"
+)
+
+
+def execute_concurrently(
+    session: Session, statements: Sequence[Executable]
+) -> List[List[Row[Any]]]:
+    """
+    Run independent read statements concurrently, returning each one's rows in order.
+
+    When the session is bound to an Engine every statement runs in its own
+    short-lived Session on a separate pooled (autocommit) connection, so the
+    request waits for the slowest round trip instead of the sum of them. The
+    statements must not depend on uncommitted changes of ``session``. A session
+    bound to a single Connection (tests, explicit outer transactions) runs them
+    sequentially.
+    """
+    bind = session.get_bind()
+    if not isinstance(bind, Engine) or len(statements) < 2:
+        return [session.execute(statement).all() for statement in statements]
+
+    def run(statement: Executable) -> List[Row[Any]]:
+        # A single read needs no transaction: autocommit saves the BEGIN and
+        # ROLLBACK round trips
+        with bind.connect() as connection:
+            connection.execution_options(isolation_level="AUTOCOMMIT")
+            with Session(connection) as worker:
+                return worker.execute(statement).all()
+
+    return list(_query_executor.map(run, statements))
@@ -0,0 +1,105 @@
+"""
+JSON responses
+預先序列化的 JSON 回應（orjson）
+"""
+
+import functools
+import inspect
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any, Callable
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _encode_fallback(value: Any) -> Any:
+    """orjson 不認得的型別，比照 jsonable_encoder 轉換"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, (bytes, memoryview)):
+        # psycopg2 returns bytea columns as memoryview
+        return bytes(value).decode()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson, the project's response class for
+    payloads that skip response_model validation.
+
+    FastAPI sends a returned Response as-is: response_model validation and
+    jsonable_encoder are skipped, while the route's response_model still
+    documents the schema. Callers must therefore build exactly that shape.
+    orjson writes UUID, Enum, date and naive datetime values the same way
+    Pydantic does, so column values can be passed through unconverted.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_encode_fallback)
+
+
+def skip_response_validation(endpoint: Callable) -> Callable:
+    """
+    Send the endpoint's return value as an ORJSONResponse (opt-in).
+
+    For handlers that already build exactly the response_model shape from
+    trusted data: FastAPI would otherwise validate the result against
+    response_model and encode it again. Status code and headers set on an
+    injected `response: Response` parameter are carried over; when the
+    endpoint declares none, a hidden one is added to its signature. Routes
+    declaring a non-200 status_code must set response.status_code as well.
+
+        @router.get("/search", response_model=List[ClientSearchResult])
+        @skip_response_validation
+        async def search_my_clients(...) -> List[dict]:
+    """
+    signature = inspect.signature(endpoint)
+    parameters = list(signature.parameters.values())
+    response_name = next(
+        (param.name for param in parameters if param.annotation is Response), None
+    )
+    injected = response_name is None
+    if injected:
+        response_name = "_skip_validation_response"
+        parameters.append(
+            inspect.Parameter(
+                response_name, inspect.Parameter.KEYWORD_ONLY, annotation=Response
+            )
+        )
+
+    def respond(content: Any, response: Response) -> Response:
+        if isinstance(content, Response):
+            return content
+        result = ORJSONResponse(content, status_code=response.status_code or 200)
+        # Same merge FastAPI applies to validated responses (keeps Set-Cookie too)
+        result.raw_headers.extend(response.raw_headers)
+        return result
+
+    def split(kwargs: dict) -> Response:
+        return kwargs.pop(response_name) if injected else kwargs[response_name]
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            response = split(kwargs)
+            return respond(await endpoint(*args, **kwargs), response)
+
+    else:
+
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            response = split(kwargs)
+            return respond(endpoint(*args, **kwargs), response)
+
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    return wrapper
@@ -6,7 +6,11 @@ Game Configuration - 遊戲規則配置 (Configuration Layer)
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .validator import RuleValidator
 
 
 class ActionType(Enum):
@@ -17,9 +21,10 @@ class ActionType(Enum):
     ARRANGE = "arrange"
     ANNOTATE = "annotate"
     PLACE_CARD = "place_card"
+    REMOVE = "remove"
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """位置"""
 
@@ -27,7 +32,7 @@ class Position:
     y: float
 
 
-@dataclass
+@dataclass(slots=True)
 class DropZoneConfig:
     """放置區域配置"""
 
@@ -103,6 +108,13 @@ class GameRuleConfig:
     layout: LayoutConfig
     constraints: ConstraintConfig
 
+    @cached_property
+    def validator(self) -> "RuleValidator":
+        """編譯後的約束驗證器（每個配置只編譯一次）"""
+        from .validator import RuleValidator
+
+        return RuleValidator(self)
+
     @classmethod
     def get_skill_assessment_config(cls) -> "GameRuleConfig":
         """獲取職能盤點卡規則配置"""
@@ -4,13 +4,36 @@ Game Engine - 遊戲引擎核心 (Engine Layer)
 根據 ARCHITECTURE.md 設計，實現規則無關的核心邏輯
 """
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+import sys
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, FrozenSet, List, Optional
 
 from .config import ActionType, GameRuleConfig
+from .registry import rule_registry
+from .validator import RuleValidator
+
+
+def merge_annotation(
+    current: Optional[Dict[str, Any]], patch: Dict[str, Any]
+) -> Dict[str, Any]:
+    """合併註記（JSON Merge Patch 語意：值為 None 的鍵會被刪除）"""
+    merged = dict(current or {})
+    for key, value in patch.items():
+        if value is None:
+            merged.pop(key, None)
+        else:
+            merged[key] = value
+    return merged
 
 
-@dataclass
+def insert_index(action: "GameAction") -> Optional[int]:
+    """PLACE_CARD / MOVE 的插入位置（data["index"]），未指定時附加到區域最後"""
+    if isinstance(action.data, dict):
+        return action.data.get("index")
+    return None
+
+
+@dataclass(slots=True)
 class Card:
     """牌卡"""
 
@@ -21,7 +44,7 @@ class Card:
     position: Optional[Dict[str, float]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class GameAction:
     """遊戲動作"""
 
@@ -32,25 +55,74 @@ class GameAction:
     position: Optional[Dict[str, float]] = None
     data: Optional[Dict[str, Any]] = None
 
+    def to_dict(self) -> dict:
+        """轉換為字典（省略空欄位）"""
+        result: Dict[str, Any] = {"type": self.type.value, "player_id": self.player_id}
+        if self.card_id is not None:
+            result["card_id"] = self.card_id
+        if self.target_zone is not None:
+            result["target_zone"] = self.target_zone
+        if self.position is not None:
+            result["position"] = self.position
+        if self.data is not None:
+            result["data"] = self.data
+        return result
 
-@dataclass
+    @classmethod
+    def from_dict(cls, data: dict) -> "GameAction":
+        """從字典創建"""
+        card_id = data.get("card_id")
+        target_zone = data.get("target_zone")
+        return cls(
+            type=ActionType(data["type"]),
+            player_id=data.get("player_id", ""),
+            card_id=sys.intern(card_id) if card_id is not None else None,
+            target_zone=sys.intern(target_zone) if target_zone is not None else None,
+            position=data.get("position"),
+            data=data.get("data"),
+        )
+
+
+@dataclass(slots=True)
 class ZoneState:
     """區域狀態"""
 
     zone_id: str
     cards: List[str] = field(default_factory=list)
+    # 區域成員集合，提供 O(1) 成員查詢；未提供時由 cards 建立
+    card_set: FrozenSet[str] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.card_set is None:
+            self.card_set = frozenset(self.cards)
 
-    def add_card(self, card_id: str) -> "ZoneState":
-        """添加牌卡（不可變操作）"""
-        return ZoneState(zone_id=self.zone_id, cards=self.cards + [card_id])
+    def has_card(self, card_id: str) -> bool:
+        """檢查牌卡是否在此區域"""
+        return card_id in self.card_set
+
+    def add_card(self, card_id: str, index: Optional[int] = None) -> "ZoneState":
+        """添加牌卡（不可變操作），index 為插入位置，預設附加到最後"""
+        if index is None:
+            new_cards = self.cards + [card_id]
+        else:
+            new_cards = self.cards[:index] + [card_id] + self.cards[index:]
+        return ZoneState(
+            zone_id=self.zone_id,
+            cards=new_cards,
+            card_set=self.card_set | {card_id},
+        )
 
     def remove_card(self, card_id: str) -> "ZoneState":
         """移除牌卡（不可變操作）"""
         new_cards = [c for c in self.cards if c != card_id]
-        return ZoneState(zone_id=self.zone_id, cards=new_cards)
+        return ZoneState(
+            zone_id=self.zone_id,
+            cards=new_cards,
+            card_set=self.card_set - {card_id},
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class GameState:
     """遊戲狀態（不可變）"""
 
@@ -61,42 +133,124 @@ class GameState:
     deck_remaining: int = 0
     turn_count: int = 0
     current_player: Optional[str] = None
+    flipped_cards: FrozenSet[str] = field(default_factory=frozenset)
+    annotations: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # 牌卡 → 區域索引；未提供時由 zones 建立，之後由各操作同步維護
+    card_locations: Dict[str, str] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.card_locations is None:
+            self.card_locations = {
+                card_id: zone_id
+                for zone_id, zone in self.zones.items()
+                for card_id in zone.cards
+            }
 
     @classmethod
     def create_initial_state(cls, room_id: str, rule_id: str) -> "GameState":
         """創建初始遊戲狀態"""
         # 根據規則創建初始區域
         zones = {}
-        if rule_id == "skill_assessment":
-            zones["advantage"] = ZoneState("advantage")
-            zones["disadvantage"] = ZoneState("disadvantage")
-        elif rule_id == "value_navigation":
-            for i in range(9):
-                zones[f"rank_{i + 1}"] = ZoneState(f"rank_{i + 1}")
-        elif rule_id == "career_personality":
-            zones["like"] = ZoneState("like")
-            zones["neutral"] = ZoneState("neutral")
-            zones["dislike"] = ZoneState("dislike")
+        config = rule_registry.get_config(rule_id)
+        if config is not None:
+            for drop_zone in config.layout.drop_zones:
+                zones[drop_zone.id] = ZoneState(drop_zone.id)
 
         return cls(room_id=room_id, rule_id=rule_id, zones=zones)
 
-    def place_card_in_zone(self, card_id: str, zone_id: str) -> "GameState":
-        """在指定區域放置牌卡（不可變操作）"""
+    def _next_state(self, **changes) -> "GameState":
+        """產生版本號 +1 的新狀態（未變更的欄位沿用原物件）"""
+        return replace(self, version=self.version + 1, **changes)
+
+    def get_card_zone(self, card_id: str) -> Optional[str]:
+        """獲取牌卡目前所在區域（O(1)），不在場上則返回 None"""
+        return self.card_locations.get(card_id)
+
+    def _require_zone(self, zone_id: str) -> None:
         if zone_id not in self.zones:
             raise ValueError(f"Zone {zone_id} not found")
 
+    def _require_card(self, card_id: str) -> str:
+        zone_id = self.card_locations.get(card_id)
+        if zone_id is None:
+            raise ValueError(f"Card {card_id} is not on the board")
+        return zone_id
+
+    def get_zone_cards(self, zone_id: str) -> List[str]:
+        """獲取區域內的牌卡（依順序）"""
+        zone = self.zones.get(zone_id)
+        return zone.cards if zone else []
+
+    def place_card_in_zone(
+        self, card_id: str, zone_id: str, index: Optional[int] = None
+    ) -> "GameState":
+        """在指定區域放置牌卡（不可變操作）"""
+        self._require_zone(zone_id)
+        current_zone = self.card_locations.get(card_id)
+        if current_zone is not None:
+            raise ValueError(f"Card {card_id} already in zone {current_zone}")
+
         new_zones = self.zones.copy()
-        new_zones[zone_id] = self.zones[zone_id].add_card(card_id)
+        new_zones[zone_id] = self.zones[zone_id].add_card(card_id, index)
+        new_locations = self.card_locations.copy()
+        new_locations[card_id] = zone_id
 
-        return GameState(
-            room_id=self.room_id,
-            rule_id=self.rule_id,
-            zones=new_zones,
-            version=self.version + 1,
-            deck_remaining=self.deck_remaining,
-            turn_count=self.turn_count,
-            current_player=self.current_player,
-        )
+        return self._next_state(zones=new_zones, card_locations=new_locations)
+
+    def remove_card_from_zone(self, card_id: str) -> "GameState":
+        """將牌卡移出場上（不可變操作），同時清除其翻面與註記"""
+        zone_id = self._require_card(card_id)
+
+        new_zones = self.zones.copy()
+        new_zones[zone_id] = self.zones[zone_id].remove_card(card_id)
+        new_locations = self.card_locations.copy()
+        del new_locations[card_id]
+
+        changes: Dict[str, Any] = {"zones": new_zones, "card_locations": new_locations}
+        if card_id in self.flipped_cards:
+            changes["flipped_cards"] = self.flipped_cards - {card_id}
+        if card_id in self.annotations:
+            new_annotations = self.annotations.copy()
+            del new_annotations[card_id]
+            changes["annotations"] = new_annotations
+        return self._next_state(**changes)
+
+    def move_card(
+        self, card_id: str, zone_id: str, index: Optional[int] = None
+    ) -> "GameState":
+        """將牌卡移動到另一區域（原子操作：移除 + 加入）"""
+        self._require_zone(zone_id)
+        source_zone = self._require_card(card_id)
+        if source_zone == zone_id:
+            raise ValueError(f"Card {card_id} already in zone {zone_id}")
+
+        new_zones = self.zones.copy()
+        new_zones[source_zone] = self.zones[source_zone].remove_card(card_id)
+        new_zones[zone_id] = self.zones[zone_id].add_card(card_id, index)
+        new_locations = self.card_locations.copy()
+        new_locations[card_id] = zone_id
+
+        return self._next_state(zones=new_zones, card_locations=new_locations)
+
+    def flip_card(self, card_id: str) -> "GameState":
+        """翻轉場上牌卡（不可變操作）"""
+        self._require_card(card_id)
+        if card_id in self.flipped_cards:
+            flipped = self.flipped_cards - {card_id}
+        else:
+            flipped = self.flipped_cards | {card_id}
+        return self._next_state(flipped_cards=flipped)
+
+    def annotate_card(self, card_id: str, annotation: Dict[str, Any]) -> "GameState":
+        """為場上牌卡加上註記（與既有註記合併，值為 None 的鍵會被刪除）"""
+        self._require_card(card_id)
+        new_annotations = self.annotations.copy()
+        merged = merge_annotation(self.annotations.get(card_id), annotation)
+        if merged:
+            new_annotations[card_id] = merged
+        else:
+            new_annotations.pop(card_id, None)
+        return self._next_state(annotations=new_annotations)
 
     def get_zone_card_count(self, zone_id: str) -> int:
         """獲取區域內牌卡數量"""
@@ -104,6 +258,10 @@ class GameState:
             return 0
         return len(self.zones[zone_id].cards)
 
+    def get_total_card_count(self) -> int:
+        """獲取場上牌卡總數"""
+        return len(self.card_locations)
+
     def to_dict(self) -> dict:
         """轉換為字典"""
         return {
@@ -117,18 +275,21 @@ class GameState:
             "deck_remaining": self.deck_remaining,
             "turn_count": self.turn_count,
             "current_player": self.current_player,
+            "flipped_cards": sorted(self.flipped_cards),
+            "annotations": self.annotations,
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> "GameState":
-        """從字典創建"""
-        zones = {
-            zone_id: ZoneState(
-                zone_id=zone_data.get("zone_id", zone_id),
-                cards=zone_data.get("cards", []),
+        """從字典創建（區域與牌卡 id 會被 intern，各房間共用同一個字串物件）"""
+        intern = sys.intern
+        zones = {}
+        for zone_id, zone_data in data.get("zones", {}).items():
+            zone_id = intern(zone_id)
+            zones[zone_id] = ZoneState(
+                zone_id=intern(zone_data.get("zone_id", zone_id)),
+                cards=list(map(intern, zone_data.get("cards", []))),
             )
-            for zone_id, zone_data in data.get("zones", {}).items()
-        }
         return cls(
             room_id=data.get("room_id", ""),
             rule_id=data.get("rule_id", ""),
@@ -137,6 +298,11 @@ class GameState:
             deck_remaining=data.get("deck_remaining", 0),
             turn_count=data.get("turn_count", 0),
             current_player=data.get("current_player"),
+            flipped_cards=frozenset(map(intern, data.get("flipped_cards", []))),
+            annotations={
+                intern(card_id): annotation
+                for card_id, annotation in data.get("annotations", {}).items()
+            },
         )
 
 
@@ -157,6 +323,123 @@ class ActionResult:
         return cls(success=False, error_message=message)
 
 
+class BoardDraft:
+    """批次執行用的可變工作副本（僅在首次修改時複製區域牌卡列表）"""
+
+    def __init__(self, state: GameState, validator: Optional[RuleValidator] = None):
+        self.base = state
+        self.zones = state.zones
+        self.card_locations = dict(state.card_locations)
+        self.flipped_cards = set(state.flipped_cards)
+        self.annotations = dict(state.annotations)
+        self._zone_cards: Dict[str, List[str]] = {}
+        # 規則管理區域的遞增計數器
+        self.counters = (
+            validator.counters_for(
+                {zone_id: zone.cards for zone_id, zone in state.zones.items()}
+            )
+            if validator
+            else None
+        )
+
+    def get_card_zone(self, card_id: str) -> Optional[str]:
+        return self.card_locations.get(card_id)
+
+    def get_total_card_count(self) -> int:
+        return len(self.card_locations)
+
+    def get_zone_card_count(self, zone_id: str) -> int:
+        if self.counters is not None:
+            count = self.counters.zone_count(zone_id)
+            if count is not None:
+                return count
+        cards = self._zone_cards.get(zone_id)
+        if cards is not None:
+            return len(cards)
+        return self.base.get_zone_card_count(zone_id)
+
+    def get_zone_cards(self, zone_id: str) -> List[str]:
+        cards = self._zone_cards.get(zone_id)
+        if cards is not None:
+            return cards
+        return self.base.get_zone_cards(zone_id)
+
+    def _cards(self, zone_id: str) -> List[str]:
+        cards = self._zone_cards.get(zone_id)
+        if cards is None:
+            cards = self._zone_cards[zone_id] = list(self.zones[zone_id].cards)
+        return cards
+
+    def _insert(self, zone_id: str, card_id: str, index: Optional[int]) -> None:
+        if index is None:
+            self._cards(zone_id).append(card_id)
+        else:
+            self._cards(zone_id).insert(index, card_id)
+
+    def apply(self, action: GameAction) -> None:
+        """套用已驗證的動作"""
+        card_id = action.card_id
+        if action.type == ActionType.PLACE_CARD:
+            self._insert(action.target_zone, card_id, insert_index(action))
+            self.card_locations[card_id] = action.target_zone
+            if self.counters is not None:
+                self.counters.place(action.target_zone)
+        elif action.type == ActionType.MOVE:
+            source_zone = self.card_locations[card_id]
+            self._cards(source_zone).remove(card_id)
+            self._insert(action.target_zone, card_id, insert_index(action))
+            self.card_locations[card_id] = action.target_zone
+            if self.counters is not None:
+                self.counters.move(source_zone, action.target_zone)
+        elif action.type == ActionType.REMOVE:
+            source_zone = self.card_locations.pop(card_id)
+            self._cards(source_zone).remove(card_id)
+            self.flipped_cards.discard(card_id)
+            self.annotations.pop(card_id, None)
+            if self.counters is not None:
+                self.counters.remove(source_zone)
+        elif action.type == ActionType.FLIP:
+            if card_id in self.flipped_cards:
+                self.flipped_cards.discard(card_id)
+            else:
+                self.flipped_cards.add(card_id)
+        elif action.type == ActionType.ANNOTATE:
+            merged = merge_annotation(self.annotations.get(card_id), action.data)
+            if merged:
+                self.annotations[card_id] = merged
+            else:
+                self.annotations.pop(card_id, None)
+
+    def build(self) -> GameState:
+        """產生新狀態（版本號只 +1 一次）"""
+        new_zones = self.zones.copy()
+        for zone_id, cards in self._zone_cards.items():
+            new_zones[zone_id] = ZoneState(zone_id=zone_id, cards=cards)
+        return replace(
+            self.base,
+            zones=new_zones,
+            version=self.base.version + 1,
+            card_locations=self.card_locations,
+            flipped_cards=frozenset(self.flipped_cards),
+            annotations=self.annotations,
+        )
+
+
+@dataclass
+class BatchResult:
+    """批次動作執行結果"""
+
+    new_state: GameState
+    applied: List[int] = field(default_factory=list)
+    failures: Dict[int, str] = field(default_factory=dict)
+    # 依序執行即可還原整批動作的反向動作（track_inverse=True 時提供）
+    inverse: List[GameAction] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        return not self.failures
+
+
 class GameEngine:
     """遊戲引擎核心 - 規則無關的邏輯處理"""
 
@@ -165,60 +448,147 @@ class GameEngine:
 
     def validate_action(self, action: GameAction, state: GameState) -> bool:
         """驗證動作是否符合規則"""
+        return self._validate(action, state, self.config)
+
+    def _validate(
+        self, action: GameAction, state: GameState, config: Optional[GameRuleConfig]
+    ) -> bool:
         if action.type == ActionType.PLACE_CARD:
-            return self._validate_place_card_action(action, state)
+            return self._validate_place_card_action(action, state, config)
+        elif action.type == ActionType.MOVE:
+            return self._validate_move_action(action, state, config)
+        elif action.type in (ActionType.FLIP, ActionType.REMOVE):
+            return self._validate_card_on_board(action, state)
+        elif action.type == ActionType.ANNOTATE:
+            return self._validate_card_on_board(action, state) and isinstance(
+                action.data, dict
+            )
 
         # 其他動作類型的驗證...
         return True
 
-    def _validate_place_card_action(self, action: GameAction, state: GameState) -> bool:
+    def _zone_has_capacity(
+        self,
+        zone_id: str,
+        state: GameState,
+        config: Optional[GameRuleConfig],
+        new_card: bool = True,
+    ) -> bool:
+        """檢查區域是否還能放入牌卡（new_card 時一併檢查總數上限）"""
+        if not config:
+            return True
+
+        validator = config.validator
+        if not validator.has_zone(zone_id):
+            return True
+        zone_count = state.get_zone_card_count(zone_id)
+        if new_card:
+            return validator.can_place(
+                zone_id, zone_count, state.get_total_card_count()
+            )
+        return validator.can_receive(zone_id, zone_count)
+
+    def _validate_place_card_action(
+        self, action: GameAction, state: GameState, config: Optional[GameRuleConfig]
+    ) -> bool:
         """驗證放牌動作"""
         if not action.target_zone or not action.card_id:
             return False
 
+        if not self._valid_insert_index(action, state):
+            return False
+
         # 檢查區域是否存在
         if action.target_zone not in state.zones:
             return False
 
         # 檢查區域牌卡數量限制
-        if self.config and self.config.layout:
-            zone_config = self.config.layout.get_zone(action.target_zone)
-            if zone_config and zone_config.max_cards is not None:
-                current_count = state.get_zone_card_count(action.target_zone)
-                if current_count >= zone_config.max_cards:
-                    return False
-
-        # 檢查牌卡是否已存在於該區域
-        zone_state = state.zones[action.target_zone]
-        if action.card_id in zone_state.cards:
+        if not self._zone_has_capacity(action.target_zone, state, config):
+            return False
+
+        # 檢查牌卡是否已在場上（任一區域）
+        if state.get_card_zone(action.card_id) is not None:
             return False
 
         return True
 
+    def _validate_move_action(
+        self, action: GameAction, state: GameState, config: Optional[GameRuleConfig]
+    ) -> bool:
+        """驗證移動動作"""
+        if not action.target_zone or not action.card_id:
+            return False
+
+        if not self._valid_insert_index(action, state):
+            return False
+
+        if action.target_zone not in state.zones:
+            return False
+
+        # 牌卡必須在場上，且目標區域不同於目前區域
+        source_zone = state.get_card_zone(action.card_id)
+        if source_zone is None or source_zone == action.target_zone:
+            return False
+
+        return self._zone_has_capacity(
+            action.target_zone, state, config, new_card=False
+        )
+
+    def _valid_insert_index(self, action: GameAction, state: GameState) -> bool:
+        """插入位置必須是 0 ~ 目標區域牌卡數之間的整數"""
+        index = insert_index(action)
+        if index is None:
+            return True
+        if not isinstance(index, int) or isinstance(index, bool):
+            return False
+        return 0 <= index <= state.get_zone_card_count(action.target_zone)
+
+    def _validate_card_on_board(self, action: GameAction, state: GameState) -> bool:
+        """驗證動作對象牌卡在場上（翻牌、註記）"""
+        if not action.card_id:
+            return False
+        return state.get_card_zone(action.card_id) is not None
+
     def execute_action(self, action: GameAction, state: GameState) -> ActionResult:
         """執行動作並返回新狀態"""
+        return self._execute(action, state, self.config)
+
+    def _execute(
+        self, action: GameAction, state: GameState, config: Optional[GameRuleConfig]
+    ) -> ActionResult:
         # 先驗證動作
-        if not self.validate_action(action, state):
+        if not self._validate(action, state, config):
             return ActionResult.error_result("Action validation failed")
 
         try:
             if action.type == ActionType.PLACE_CARD:
-                new_state = state.place_card_in_zone(action.card_id, action.target_zone)
+                new_state = state.place_card_in_zone(
+                    action.card_id, action.target_zone, insert_index(action)
+                )
+                return ActionResult.success_result(new_state)
+
+            elif action.type == ActionType.MOVE:
+                new_state = state.move_card(
+                    action.card_id, action.target_zone, insert_index(action)
+                )
+                return ActionResult.success_result(new_state)
+
+            elif action.type == ActionType.REMOVE:
+                new_state = state.remove_card_from_zone(action.card_id)
+                return ActionResult.success_result(new_state)
+
+            elif action.type == ActionType.FLIP:
+                new_state = state.flip_card(action.card_id)
+                return ActionResult.success_result(new_state)
+
+            elif action.type == ActionType.ANNOTATE:
+                new_state = state.annotate_card(action.card_id, action.data)
                 return ActionResult.success_result(new_state)
 
             elif action.type == ActionType.ARRANGE:
                 # For ARRANGE action, just increment version to track state change
                 # The actual game state data is passed through action.data
-                new_state = GameState(
-                    room_id=state.room_id,
-                    rule_id=state.rule_id,
-                    zones=state.zones,
-                    version=state.version + 1,
-                    deck_remaining=state.deck_remaining,
-                    turn_count=state.turn_count,
-                    current_player=state.current_player,
-                )
-                return ActionResult.success_result(new_state)
+                return ActionResult.success_result(state._next_state())
 
             # 其他動作類型的處理...
             return ActionResult.error_result(f"Unsupported action type: {action.type}")
@@ -226,6 +596,109 @@ class GameEngine:
         except Exception as e:
             return ActionResult.error_result(str(e))
 
+    def invert_action(self, action: GameAction, state: GameState) -> List[GameAction]:
+        """
+        產生還原動作的反向動作（以執行前的狀態計算）
+
+        PLACE_CARD ↔ REMOVE、MOVE ↔ 移回原區域原位置、FLIP ↔ FLIP、
+        ANNOTATE ↔ 以原值覆寫變更的鍵。REMOVE 的反向會一併恢復翻面與註記。
+        ARRANGE 等無法還原的動作返回空列表。
+        """
+        card_id = action.card_id
+        player_id = action.player_id
+        if action.type == ActionType.PLACE_CARD:
+            return [GameAction(ActionType.REMOVE, player_id, card_id=card_id)]
+
+        if action.type == ActionType.MOVE:
+            source_zone = state.get_card_zone(card_id)
+            index = state.get_zone_cards(source_zone).index(card_id)
+            return [
+                GameAction(
+                    ActionType.MOVE,
+                    player_id,
+                    card_id=card_id,
+                    target_zone=source_zone,
+                    data={"index": index},
+                )
+            ]
+
+        if action.type == ActionType.REMOVE:
+            source_zone = state.get_card_zone(card_id)
+            index = state.get_zone_cards(source_zone).index(card_id)
+            inverse = [
+                GameAction(
+                    ActionType.PLACE_CARD,
+                    player_id,
+                    card_id=card_id,
+                    target_zone=source_zone,
+                    data={"index": index},
+                )
+            ]
+            if card_id in state.flipped_cards:
+                inverse.append(GameAction(ActionType.FLIP, player_id, card_id=card_id))
+            annotation = state.annotations.get(card_id)
+            if annotation:
+                inverse.append(
+                    GameAction(
+                        ActionType.ANNOTATE,
+                        player_id,
+                        card_id=card_id,
+                        data=dict(annotation),
+                    )
+                )
+            return inverse
+
+        if action.type == ActionType.FLIP:
+            return [GameAction(ActionType.FLIP, player_id, card_id=card_id)]
+
+        if action.type == ActionType.ANNOTATE:
+            previous = state.annotations.get(card_id, {})
+            return [
+                GameAction(
+                    ActionType.ANNOTATE,
+                    player_id,
+                    card_id=card_id,
+                    data={key: previous.get(key) for key in action.data},
+                )
+            ]
+
+        return []
+
+    def execute_actions(
+        self,
+        actions: List[GameAction],
+        state: GameState,
+        config: Optional[GameRuleConfig] = None,
+        track_inverse: bool = False,
+    ) -> BatchResult:
+        """
+        批次執行動作
+
+        每個動作依序對工作副本驗證（計數隨已套用的動作遞增），
+        失敗的動作記錄在 failures 中，不會中斷整個批次。
+        全部處理完後只產生一個新狀態、版本號只 +1；沒有任何動作成功時返回原狀態。
+        track_inverse=True 時在 result.inverse 提供還原整批動作的反向動作。
+        不修改引擎本身，可同時被多個請求呼叫。
+        """
+        if config is None:
+            config = self.config
+
+        draft = BoardDraft(state, config.validator if config else None)
+        result = BatchResult(new_state=state)
+        for index, action in enumerate(actions):
+            if not self._validate(action, draft, config):
+                result.failures[index] = "Action validation failed"
+                continue
+            if track_inverse:
+                # 後執行的動作先還原
+                result.inverse[:0] = self.invert_action(action, draft)
+            draft.apply(action)
+            result.applied.append(index)
+
+        if result.applied:
+            result.new_state = draft.build()
+        return result
+
     def initialize_game(self, config: GameRuleConfig) -> GameState:
         """初始化遊戲狀態"""
         self.config = config
@@ -250,11 +723,8 @@ class GameEngine:
     def execute_action_with_config(
         self, action: GameAction, state: GameState, config: GameRuleConfig
     ) -> GameState:
-        """執行動作並返回新狀態（帶配置）"""
-        old_config = self.config
-        self.config = config
-        result = self.execute_action(action, state)
-        self.config = old_config
+        """執行動作並返回新狀態（帶配置，不修改 self.config）"""
+        result = self._execute(action, state, config)
         if result.success:
             return result.new_state
         else:
@@ -0,0 +1,488 @@
+"""
+Mergeable Board - 可合併的遊戲盤面 (Engine Layer)
+
+諮詢師與訪客同時移動牌卡時，以無衝突的方式合併各自的修改：
+- HybridClock：混合邏輯時鐘（牆上時間 + 邏輯計數 + 節點），產生全序的時間戳
+- 區域成員為 OR-set：每次放置 / 移動產生唯一標籤，移除只作廢「已觀察到」的標籤，
+  因此同時發生的移除與移動以移動為準（add-wins）
+- 牌卡位置為 LWW：存活標籤中時間戳最大者決定所在區域，區域內依標籤排序
+- 翻面與註記（每個鍵）各自為 LWW register
+- 遠端時間戳超前本地牆上時間超過 max_drift_ms 時拒收，避免時鐘超前或偽造的
+  時間戳永遠贏得 LWW 並把伺服器時鐘拖到未來
+- 由盤面建立的種子項目帶有盤面版本（base_version）。副本以較新的版本重新建立後，
+  較舊版本的種子項目與其作廢標籤一律丟棄，過期的增量不會影響合併結果，
+  作廢標籤也不會跨版本累積
+
+merge() 為聯集 / 取最大值，滿足交換律、結合律與冪等性，任意順序合併都會收斂。
+不支援 ARRANGE 與指定插入位置（合併後依抵達順序排列）。
+"""
+
+import json
+import time
+from dataclasses import replace
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .config import ActionType
+from .engine import GameAction, GameState, ZoneState
+
+
+class Stamp(NamedTuple):
+    """混合邏輯時間戳（依 wall, logical, node 排序）"""
+
+    wall: int
+    logical: int
+    node: str
+
+    def to_list(self) -> list:
+        return [self.wall, self.logical, self.node]
+
+    @classmethod
+    def from_list(cls, data: Iterable[Any]) -> "Stamp":
+        wall, logical, node = data
+        return cls(int(wall), int(logical), str(node))
+
+
+# 由既有盤面建立的項目以此前綴加上盤面版本作為節點名稱，
+# 相同盤面在各節點產生相同的項目，不同版本的種子項目則互不相同
+SEED_NODE = "seed:"
+
+
+def seed_stamp(version: int, position: int = 0) -> Stamp:
+    """盤面版本 version 的種子時間戳（早於任何本地事件）"""
+    return Stamp(0, position, f"{SEED_NODE}{version}")
+
+
+def seed_version(stamp: Stamp) -> Optional[int]:
+    """種子時間戳的盤面版本，其他時間戳返回 None"""
+    if stamp.wall != 0 or not stamp.node.startswith(SEED_NODE):
+        return None
+    try:
+        return int(stamp.node[len(SEED_NODE) :])
+    except ValueError:
+        return None
+
+
+# 接受的遠端時間戳最多超前本地牆上時間 5 秒
+MAX_CLOCK_DRIFT_MS = 5_000
+
+
+class HybridClock:
+    """混合邏輯時鐘（Hybrid Logical Clock）"""
+
+    def __init__(
+        self,
+        node_id: str,
+        wall_clock: Optional[Callable[[], int]] = None,
+        max_drift_ms: Optional[int] = None,
+    ):
+        self.node_id = node_id
+        self._wall_clock = wall_clock or (lambda: time.time_ns() // 1_000_000)
+        self.max_drift_ms = max_drift_ms
+        self.last = Stamp(0, 0, node_id)
+
+    def check(self, stamp: Stamp) -> None:
+        """遠端時間戳超前本地牆上時間超過 max_drift_ms 時拋出 ValueError"""
+        if self.max_drift_ms is None:
+            return
+        if stamp.wall > self._wall_clock() + self.max_drift_ms:
+            raise ValueError(
+                f"Stamp {stamp.to_list()} is more than {self.max_drift_ms} ms "
+                "ahead of the local clock"
+            )
+
+    def tick(self) -> Stamp:
+        """本地事件的新時間戳"""
+        wall = max(self._wall_clock(), self.last.wall)
+        logical = self.last.logical + 1 if wall == self.last.wall else 0
+        self.last = Stamp(wall, logical, self.node_id)
+        return self.last
+
+    def observe(self, stamp: Stamp) -> None:
+        """收到遠端時間戳，確保之後的時間戳都比它大"""
+        self.check(stamp)
+        last = self.last
+        wall = max(self._wall_clock(), last.wall, stamp.wall)
+        if wall == last.wall == stamp.wall:
+            logical = max(last.logical, stamp.logical) + 1
+        elif wall == last.wall:
+            logical = last.logical + 1
+        elif wall == stamp.wall:
+            logical = stamp.logical + 1
+        else:
+            logical = 0
+        self.last = Stamp(wall, logical, self.node_id)
+
+
+Register = Tuple[Stamp, Any]
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False)
+
+
+def _newer(current: Optional[Register], other: Register) -> bool:
+    """other 是否勝過 current（時間戳相同時以值的正規化 JSON 決定）"""
+    if current is None or other[0] > current[0]:
+        return True
+    return other[0] == current[0] and _canonical(other[1]) > _canonical(current[1])
+
+
+class MergeableBoard:
+    """
+    可合併的盤面副本
+
+    - places：牌卡 → {存活標籤: 區域}
+    - removed：牌卡 → 已作廢的標籤
+    - flips：牌卡 → (時間戳, 是否翻面)
+    - notes：牌卡 → {註記鍵: (時間戳, 值)}，值為 None 表示已刪除
+    - base_version：種子項目的盤面版本，較舊版本的種子項目視為過期
+    """
+
+    def __init__(
+        self,
+        node_id: str,
+        clock: Optional[HybridClock] = None,
+        base_version: int = 0,
+    ):
+        self.clock = clock or HybridClock(node_id)
+        self.base_version = base_version
+        self.places: Dict[str, Dict[Stamp, str]] = {}
+        self.removed: Dict[str, Set[Stamp]] = {}
+        self.flips: Dict[str, Register] = {}
+        self.notes: Dict[str, Dict[str, Register]] = {}
+
+    @classmethod
+    def from_state(
+        cls, state: GameState, node_id: str, clock: Optional[HybridClock] = None
+    ) -> "MergeableBoard":
+        """由既有盤面建立副本（種子項目與節點無關，保留區域內順序）"""
+        board = cls(node_id, clock, base_version=state.version)
+        seed = seed_stamp(state.version)
+        for zone in state.zones.values():
+            for position, card_id in enumerate(zone.cards):
+                board.places[card_id] = {
+                    seed_stamp(state.version, position): zone.zone_id
+                }
+        for card_id in state.flipped_cards:
+            board.flips[card_id] = (seed, True)
+        for card_id, annotation in state.annotations.items():
+            board.notes[card_id] = {key: (seed, v) for key, v in annotation.items()}
+        return board
+
+    # ------------------------------------------------------------------
+    # 本地操作
+    # ------------------------------------------------------------------
+
+    def _tombstone(self, card_id: str) -> None:
+        """作廢目前觀察到的所有放置標籤"""
+        tags = self.places.pop(card_id, None)
+        if tags:
+            self.removed.setdefault(card_id, set()).update(tags)
+
+    def place(self, card_id: str, zone_id: str) -> Stamp:
+        """放置或移動牌卡"""
+        stamp = self.clock.tick()
+        self._tombstone(card_id)
+        self.places[card_id] = {stamp: zone_id}
+        return stamp
+
+    def remove(self, card_id: str) -> Stamp:
+        """將牌卡移出場上，同時清除翻面與註記"""
+        stamp = self.clock.tick()
+        self._tombstone(card_id)
+        if card_id in self.flips:
+            self.flips[card_id] = (stamp, False)
+        for key in self.notes.get(card_id, ()):
+            self.notes[card_id][key] = (stamp, None)
+        return stamp
+
+    def flip(self, card_id: str) -> Stamp:
+        stamp = self.clock.tick()
+        current = self.flips.get(card_id)
+        self.flips[card_id] = (stamp, not (current and current[1]))
+        return stamp
+
+    def annotate(self, card_id: str, patch: Dict[str, Any]) -> Stamp:
+        """合併註記（值為 None 的鍵會被刪除）"""
+        stamp = self.clock.tick()
+        notes = self.notes.setdefault(card_id, {})
+        for key, value in patch.items():
+            notes[key] = (stamp, value)
+        return stamp
+
+    def apply_action(self, action: GameAction) -> Stamp:
+        """套用已驗證的引擎動作"""
+        kind = action.type
+        if kind in (ActionType.PLACE_CARD, ActionType.MOVE):
+            return self.place(action.card_id, action.target_zone)
+        if kind is ActionType.REMOVE:
+            return self.remove(action.card_id)
+        if kind is ActionType.FLIP:
+            return self.flip(action.card_id)
+        if kind is ActionType.ANNOTATE:
+            return self.annotate(action.card_id, action.data or {})
+        raise ValueError(f"Action {kind.value} cannot be merged")
+
+    # ------------------------------------------------------------------
+    # 合併
+    # ------------------------------------------------------------------
+
+    def card_ids(self) -> Set[str]:
+        return set(self.places) | set(self.removed) | set(self.flips) | set(self.notes)
+
+    def stamps(self) -> Iterator[Stamp]:
+        """副本中所有的時間戳（含已作廢的標籤）"""
+        for tags in self.places.values():
+            yield from tags
+        for tags in self.removed.values():
+            yield from tags
+        for stamp, _ in self.flips.values():
+            yield stamp
+        for notes in self.notes.values():
+            for stamp, _ in notes.values():
+                yield stamp
+
+    def _stale(self, stamp: Stamp) -> bool:
+        """是否為較舊盤面版本的種子時間戳"""
+        version = seed_version(stamp)
+        return version is not None and version < self.base_version
+
+    def _prune(self) -> Set[str]:
+        """丟棄較舊盤面版本的種子項目，返回內容有變動的牌卡"""
+        changed: Set[str] = set()
+        for card_id, places in list(self.places.items()):
+            stale = [tag for tag in places if self._stale(tag)]
+            for tag in stale:
+                del places[tag]
+            if stale:
+                changed.add(card_id)
+            if not places:
+                del self.places[card_id]
+        for card_id, tags in list(self.removed.items()):
+            tags -= {tag for tag in tags if self._stale(tag)}
+            if not tags:
+                del self.removed[card_id]
+        for card_id, (stamp, _) in list(self.flips.items()):
+            if self._stale(stamp):
+                del self.flips[card_id]
+                changed.add(card_id)
+        for card_id, notes in list(self.notes.items()):
+            stale = [key for key, (stamp, _) in notes.items() if self._stale(stamp)]
+            for key in stale:
+                del notes[key]
+            if stale:
+                changed.add(card_id)
+            if not notes:
+                del self.notes[card_id]
+        return changed
+
+    def merge(self, other: "MergeableBoard") -> Set[str]:
+        """
+        併入另一個副本，返回內容有變動的牌卡
+
+        base_version 取較大者，較舊版本的種子項目（雙方的）都會被丟棄。
+        """
+        changed: Set[str] = set()
+        latest = self.clock.last
+        if other.base_version > self.base_version:
+            self.base_version = other.base_version
+            changed |= self._prune()
+
+        for card_id, tags in other.removed.items():
+            if tags:
+                latest = max(latest, max(tags))
+            new_tags = {
+                tag
+                for tag in tags - self.removed.get(card_id, set())
+                if not self._stale(tag)
+            }
+            if new_tags:
+                self.removed.setdefault(card_id, set()).update(new_tags)
+                changed.add(card_id)
+                places = self.places.get(card_id)
+                if places:
+                    for tag in new_tags:
+                        places.pop(tag, None)
+                    if not places:
+                        del self.places[card_id]
+
+        for card_id, tags in other.places.items():
+            removed = self.removed.get(card_id, ())
+            places = self.places.get(card_id)
+            for tag, zone_id in tags.items():
+                latest = max(latest, tag)
+                if tag in removed or (places and tag in places) or self._stale(tag):
+                    continue
+                if places is None:
+                    places = self.places[card_id] = {}
+                places[tag] = zone_id
+                changed.add(card_id)
+
+        for card_id, register in other.flips.items():
+            latest = max(latest, register[0])
+            if self._stale(register[0]):
+                continue
+            if _newer(self.flips.get(card_id), register):
+                self.flips[card_id] = register
+                changed.add(card_id)
+
+        for card_id, notes in other.notes.items():
+            own = self.notes.get(card_id, {})
+            for key, register in notes.items():
+                latest = max(latest, register[0])
+                if self._stale(register[0]):
+                    continue
+                if _newer(own.get(key), register):
+                    own = self.notes.setdefault(card_id, own)
+                    own[key] = register
+                    changed.add(card_id)
+
+        if latest > self.clock.last:
+            self.clock.observe(latest)
+        return changed
+
+    def subset(self, card_ids: Iterable[str]) -> "MergeableBoard":
+        """只包含指定牌卡的副本（作為增量傳送）"""
+        board = MergeableBoard(self.clock.node_id, self.clock, self.base_version)
+        for card_id in card_ids:
+            if card_id in self.places:
+                board.places[card_id] = dict(self.places[card_id])
+            if card_id in self.removed:
+                board.removed[card_id] = set(self.removed[card_id])
+            if card_id in self.flips:
+                board.flips[card_id] = self.flips[card_id]
+            if card_id in self.notes:
+                board.notes[card_id] = dict(self.notes[card_id])
+        return board
+
+    # ------------------------------------------------------------------
+    # 實體化與序列化
+    # ------------------------------------------------------------------
+
+    def location(self, card_id: str) -> Optional[str]:
+        """牌卡目前所在區域（存活標籤中最新者）"""
+        tags = self.places.get(card_id)
+        if not tags:
+            return None
+        return tags[max(tags)]
+
+    def materialize(self, base: GameState) -> GameState:
+        """
+        產生對應的 GameState（沿用 base 的區域與其他欄位，版本號不變）
+
+        不在 base 區域內的位置會被忽略；註記依牌卡與鍵排序，輸出與合併順序無關。
+        """
+        arrivals: Dict[str, list] = {zone_id: [] for zone_id in base.zones}
+        for card_id, tags in self.places.items():
+            if not tags:
+                continue
+            tag = max(tags)
+            zone_cards = arrivals.get(tags[tag])
+            if zone_cards is not None:
+                zone_cards.append((tag, card_id))
+
+        zones = {}
+        locations: Dict[str, str] = {}
+        for zone_id, entries in arrivals.items():
+            entries.sort()
+            cards = [card_id for _, card_id in entries]
+            zones[zone_id] = ZoneState(zone_id=zone_id, cards=cards)
+            locations.update(dict.fromkeys(cards, zone_id))
+
+        flipped = frozenset(
+            card_id
+            for card_id, (_, value) in self.flips.items()
+            if value and card_id in locations
+        )
+        annotations = {}
+        for card_id, notes in sorted(self.notes.items()):
+            if card_id not in locations:
+                continue
+            annotation = {
+                key: value
+                for key, (_, value) in sorted(notes.items())
+                if value is not None
+            }
+            if annotation:
+                annotations[card_id] = annotation
+
+        return replace(
+            base,
+            zones=zones,
+            flipped_cards=flipped,
+            annotations=annotations,
+            card_locations=locations,
+        )
+
+    def to_dict(self) -> dict:
+        """轉換為字典（JSON 相容）"""
+        return {
+            "base_version": self.base_version,
+            "places": {
+                card_id: [[tag.to_list(), zone_id] for tag, zone_id in tags.items()]
+                for card_id, tags in self.places.items()
+            },
+            "removed": {
+                card_id: [tag.to_list() for tag in sorted(tags)]
+                for card_id, tags in self.removed.items()
+            },
+            "flips": {
+                card_id: [stamp.to_list(), value]
+                for card_id, (stamp, value) in self.flips.items()
+            },
+            "notes": {
+                card_id: {
+                    key: [stamp.to_list(), value]
+                    for key, (stamp, value) in notes.items()
+                }
+                for card_id, notes in self.notes.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(
+        cls, data: dict, node_id: str, clock: Optional[HybridClock] = None
+    ) -> "MergeableBoard":
+        """
+        從字典創建；格式錯誤時拋出 ValueError
+
+        clock 設有 max_drift_ms 時，任何時間戳超前其牆上時間超過上限也拋出
+        ValueError（整份拒收，不部分合併）
+        """
+        board = cls(node_id, clock)
+        try:
+            incoming = cls(
+                node_id,
+                HybridClock(node_id, wall_clock=lambda: 0),
+                base_version=int(data.get("base_version", 0)),
+            )
+            for card_id, tags in data.get("places", {}).items():
+                incoming.places[card_id] = {
+                    Stamp.from_list(tag): str(zone_id) for tag, zone_id in tags
+                }
+            for card_id, tags in data.get("removed", {}).items():
+                incoming.removed[card_id] = {Stamp.from_list(tag) for tag in tags}
+            for card_id, (stamp, value) in data.get("flips", {}).items():
+                incoming.flips[card_id] = (Stamp.from_list(stamp), bool(value))
+            for card_id, notes in data.get("notes", {}).items():
+                incoming.notes[card_id] = {
+                    key: (Stamp.from_list(stamp), value)
+                    for key, (stamp, value) in notes.items()
+                }
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid mergeable board: {e}") from e
+        for stamp in incoming.stamps():
+            board.clock.check(stamp)
+        # 經由 merge 建立，確保已作廢的標籤不會留在 places
+        board.merge(incoming)
+        return board
@@ -0,0 +1,160 @@
+"""
+Game Rule Registry - 遊戲規則註冊表 (Configuration Layer)
+
+每種規則只註冊一次：配置在啟動時建立一次，
+API 回應預先序列化為 JSON bytes 並附上強 ETag
+"""
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .config import GameRuleConfig
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    """預先序列化的 JSON 回應"""
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_data(cls, data: Any) -> "CachedPayload":
+        # 與 FastAPI JSONResponse 相同的序列化參數
+        body = json.dumps(
+            data,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        return cls(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
+@dataclass(frozen=True)
+class RegisteredRule:
+    """已註冊的遊戲規則"""
+
+    config: GameRuleConfig
+    description: str
+    detail: Dict[str, Any]
+    summary: Dict[str, Any]
+    payload: CachedPayload
+
+
+def _max_cards_per_zone(config: GameRuleConfig) -> Union[Optional[int], List]:
+    """各區域上限相同時返回單一數值，否則返回依區域順序的列表"""
+    limits = [zone.max_cards for zone in config.layout.drop_zones]
+    if limits and all(limit == limits[0] for limit in limits):
+        return limits[0]
+    return limits
+
+
+class GameRuleRegistry:
+    """遊戲規則註冊表"""
+
+    def __init__(self):
+        self._rules: Dict[str, RegisteredRule] = {}
+        self._list_payload: Optional[CachedPayload] = None
+        self._types_payload: Optional[CachedPayload] = None
+
+    def register(
+        self, factory: Callable[[], GameRuleConfig], description: str
+    ) -> RegisteredRule:
+        """註冊規則，立即建立配置並預先序列化"""
+        config = factory()
+        detail = {
+            "id": config.id,
+            "slug": config.id,
+            "name": config.name,
+            "description": description,
+            "version": config.version,
+            "layout_config": config.layout.to_dict(),
+            "constraint_config": config.constraints.to_dict(),
+            "is_active": True,
+        }
+        summary = {
+            "id": config.id,
+            "name": config.name,
+            "description": description,
+            "zones": len(config.layout.drop_zones),
+            "max_cards_per_zone": _max_cards_per_zone(config),
+            "config": asdict(config),
+        }
+        rule = RegisteredRule(
+            config=config,
+            description=description,
+            detail=detail,
+            summary=summary,
+            payload=CachedPayload.from_data(detail),
+        )
+        self._rules[config.id] = rule
+        # 規則集合改變，清除彙總回應
+        self._list_payload = None
+        self._types_payload = None
+        return rule
+
+    def get(self, rule_id: str) -> Optional[RegisteredRule]:
+        return self._rules.get(rule_id)
+
+    def get_config(self, rule_id: str) -> Optional[GameRuleConfig]:
+        """獲取規則配置，未知規則返回 None"""
+        rule = self._rules.get(rule_id)
+        return rule.config if rule else None
+
+    def rule_ids(self) -> List[str]:
+        return list(self._rules)
+
+    def __iter__(self):
+        return iter(self._rules.values())
+
+    def __contains__(self, rule_id: str) -> bool:
+        return rule_id in self._rules
+
+    @property
+    def list_payload(self) -> CachedPayload:
+        """所有規則詳細配置的列表"""
+        if self._list_payload is None:
+            self._list_payload = CachedPayload.from_data(
+                [rule.detail for rule in self._rules.values()]
+            )
+        return self._list_payload
+
+    @property
+    def types_payload(self) -> CachedPayload:
+        """規則類型摘要"""
+        if self._types_payload is None:
+            rule_types = [rule.summary for rule in self._rules.values()]
+            self._types_payload = CachedPayload.from_data(
+                {
+                    "rule_types": rule_types,
+                    "total": len(rule_types),
+                    "architecture": "three_layer_engine",
+                    "engine_version": "1.0",
+                }
+            )
+        return self._types_payload
+
+
+def build_default_registry() -> GameRuleRegistry:
+    """建立包含三種內建規則的註冊表"""
+    registry = GameRuleRegistry()
+    registry.register(
+        GameRuleConfig.get_skill_assessment_config,
+        "評估個人專業技能優勢與待改善領域",
+    )
+    registry.register(
+        GameRuleConfig.get_value_navigation_config,
+        "探索個人價值觀與人生重要性排序",
+    )
+    registry.register(
+        GameRuleConfig.get_career_personality_config,
+        "發現職業興趣偏好與性格特質",
+    )
+    return registry
+
+
+# 應用程式共用的註冊表（匯入時建立一次）
+rule_registry = build_default_registry()
@@ -0,0 +1,416 @@
+"""
+Action Log Replay - 動作日誌重播 (Engine Layer)
+
+以「快照 + 之後的動作」重建 GameState：
+- LogEntry：成功執行的動作與執行後的版本號
+- ActionLog：append-only 日誌，每 snapshot_interval 筆動作保存一次快照，
+  只保留最近 max_snapshots 個快照與其後的動作
+- replay_entries：整批計算動作的淨效果（牌卡最後位置、翻面奇偶、合併註記），
+  只在最後產生一次新狀態
+- ActionJournal：NDJSON 日誌檔（orjson 編碼），程序崩潰後可由檔案重建房間狀態
+"""
+
+import bisect
+import os
+from dataclasses import dataclass, replace
+from typing import IO, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+
+from .config import ActionType, GameRuleConfig
+from .engine import (
+    BatchResult,
+    BoardDraft,
+    GameAction,
+    GameEngine,
+    GameState,
+    ZoneState,
+    merge_annotation,
+)
+from .serialization import GameStateSerializer
+
+# 預設每 500 筆動作保存一次快照
+SNAPSHOT_INTERVAL = 500
+
+# 預設保留的快照數（更早的快照與動作會被丟棄）
+MAX_SNAPSHOTS = 20
+
+# 日誌檔中快照記錄的行首（與 ActionJournal 的序列化格式一致）
+SNAPSHOT_PREFIX = '{"kind":"snapshot"'
+
+
+@dataclass(frozen=True)
+class LogEntry:
+    """日誌項目：序號、執行後的狀態版本與動作"""
+
+    seq: int
+    version: int
+    action: GameAction
+
+    def to_dict(self) -> dict:
+        return {"seq": self.seq, "version": self.version, **self.action.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LogEntry":
+        return cls(
+            seq=data["seq"],
+            version=data["version"],
+            action=GameAction.from_dict(data),
+        )
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """快照：包含序號 seq（含）之前所有動作的狀態"""
+
+    seq: int
+    state: GameState
+
+
+def replay_entries(
+    state: GameState,
+    entries: Sequence[LogEntry],
+    config: Optional[GameRuleConfig] = None,
+    validate: bool = False,
+) -> GameState:
+    """
+    從 state 重播日誌項目
+
+    日誌只記錄已成功執行的動作，預設不再驗證，直接套用到工作副本；
+    validate=True 時以 GameEngine.execute_actions 重新驗證（用於不受信任的日誌），
+    驗證失敗時拋出 ValueError。
+    重播後的版本號為最後一筆項目的版本號，與原本的狀態一致。
+    """
+    if not entries:
+        return state
+
+    if validate:
+        result = GameEngine().execute_actions(
+            [entry.action for entry in entries], state, config
+        )
+        if result.failures:
+            index = min(result.failures)
+            raise ValueError(
+                f"Log entry {entries[index].seq} failed validation: "
+                f"{result.failures[index]}"
+            )
+        new_state = result.new_state
+    else:
+        new_state = _apply_net_effect(state, entries)
+
+    return replace(new_state, version=entries[-1].version)
+
+
+def _apply_net_effect(state: GameState, entries: Sequence[LogEntry]) -> GameState:
+    """
+    一次計算整批已驗證動作的淨效果
+
+    - PLACE / MOVE：只保留每張牌卡最後一次抵達的區域；區域內順序為
+      未移動的原有牌卡，接著依最後抵達順序排列的牌卡（與逐筆 append 相同）
+    - FLIP：翻面次數為奇數的牌卡切換狀態
+    - ANNOTATE：依序合併註記
+
+    含 REMOVE 或指定插入位置的批次無法只看最後位置，改為逐筆套用到工作副本。
+    """
+    place, move = ActionType.PLACE_CARD, ActionType.MOVE
+    flip, annotate = ActionType.FLIP, ActionType.ANNOTATE
+
+    arrivals: dict = {}
+    toggled: set = set()
+    annotations = None
+    for entry in entries:
+        action = entry.action
+        kind = action.type
+        if kind is move or kind is place:
+            if action.data and "index" in action.data:
+                return _apply_sequential(state, entries)
+            card_id = action.card_id
+            arrivals.pop(card_id, None)
+            arrivals[card_id] = action.target_zone
+        elif kind is flip:
+            toggled ^= {action.card_id}
+        elif kind is annotate:
+            if annotations is None:
+                annotations = dict(state.annotations)
+            card_id = action.card_id
+            merged = merge_annotation(annotations.get(card_id), action.data)
+            if merged:
+                annotations[card_id] = merged
+            else:
+                annotations.pop(card_id, None)
+        elif kind is ActionType.REMOVE:
+            return _apply_sequential(state, entries)
+
+    changes: dict = {}
+    if arrivals:
+        locations = state.card_locations
+        touched = {locations[c] for c in arrivals if c in locations}
+        arrived_by_zone: dict = {}
+        for card_id, zone_id in arrivals.items():
+            arrived_by_zone.setdefault(zone_id, []).append(card_id)
+        touched.update(arrived_by_zone)
+
+        new_zones = state.zones.copy()
+        for zone_id in touched:
+            cards = [c for c in state.zones[zone_id].cards if c not in arrivals]
+            cards.extend(arrived_by_zone.get(zone_id, ()))
+            new_zones[zone_id] = ZoneState(zone_id=zone_id, cards=cards)
+        new_locations = dict(locations)
+        new_locations.update(arrivals)
+        changes["zones"] = new_zones
+        changes["card_locations"] = new_locations
+    if toggled:
+        changes["flipped_cards"] = state.flipped_cards ^ toggled
+    if annotations is not None:
+        changes["annotations"] = annotations
+    return replace(state, **changes)
+
+
+def _apply_sequential(state: GameState, entries: Sequence[LogEntry]) -> GameState:
+    """逐筆套用到工作副本，最後產生一次新狀態"""
+    draft = BoardDraft(state)
+    for entry in entries:
+        draft.apply(entry.action)
+    return draft.build()
+
+
+class ActionLog:
+    """
+    append-only 動作日誌與定期快照
+
+    保存快照時只保留最近 max_snapshots 個快照，最舊快照之前的動作一併丟棄，
+    長時間存在的房間記憶體用量有上限；更早的序號無法再重建。
+    """
+
+    def __init__(
+        self,
+        initial_state: GameState,
+        snapshot_interval: int = SNAPSHOT_INTERVAL,
+        max_snapshots: int = MAX_SNAPSHOTS,
+        initial_seq: int = 0,
+    ):
+        if max_snapshots < 1:
+            raise ValueError("max_snapshots must be at least 1")
+        self.snapshot_interval = snapshot_interval
+        self.max_snapshots = max_snapshots
+        self.entries: List[LogEntry] = []
+        self.snapshots: List[Snapshot] = [
+            Snapshot(seq=initial_seq, state=initial_state)
+        ]
+        # 與 snapshots 平行的序號列表，供 bisect 查找
+        self._snapshot_seqs: List[int] = [initial_seq]
+
+    @property
+    def last_seq(self) -> int:
+        return self.entries[-1].seq if self.entries else self.snapshots[-1].seq
+
+    def record(self, actions: Iterable[GameAction], version: int) -> List[LogEntry]:
+        """記錄已成功執行的動作（同一批次共用執行後的版本號）"""
+        seq = self.last_seq
+        new_entries = []
+        for action in actions:
+            seq += 1
+            new_entries.append(LogEntry(seq=seq, version=version, action=action))
+        self.entries.extend(new_entries)
+        return new_entries
+
+    def add_snapshot(self, seq: int, state: GameState) -> None:
+        self.snapshots.append(Snapshot(seq=seq, state=state))
+        self._snapshot_seqs.append(seq)
+        excess = len(self.snapshots) - self.max_snapshots
+        if excess > 0:
+            del self.snapshots[:excess]
+            del self._snapshot_seqs[:excess]
+            # 最舊快照已包含的動作不再需要
+            stale = bisect.bisect_right(
+                self.entries, self._snapshot_seqs[0], key=lambda entry: entry.seq
+            )
+            del self.entries[:stale]
+
+    def should_snapshot(self) -> bool:
+        return self.last_seq - self.snapshots[-1].seq >= self.snapshot_interval
+
+    def nearest_snapshot(self, seq: int) -> Snapshot:
+        """序號 seq 之前（含）最近的快照；seq 早於保留的歷史時拋出 ValueError"""
+        index = bisect.bisect_right(self._snapshot_seqs, seq) - 1
+        if index < 0:
+            raise ValueError(
+                f"seq {seq} is older than the oldest kept snapshot "
+                f"({self._snapshot_seqs[0]})"
+            )
+        return self.snapshots[index]
+
+    def entries_between(self, after_seq: int, until_seq: int) -> List[LogEntry]:
+        """序號介於 (after_seq, until_seq] 的項目"""
+        if not self.entries:
+            return []
+        first_seq = self.entries[0].seq
+        start = max(after_seq + 1 - first_seq, 0)
+        end = max(until_seq + 1 - first_seq, 0)
+        return self.entries[start:end]
+
+    def state_at(
+        self, seq: Optional[int] = None, config: Optional[GameRuleConfig] = None
+    ) -> GameState:
+        """重建序號 seq（預設為最新）時的狀態：最近快照 + 之後的動作"""
+        if seq is None:
+            seq = self.last_seq
+        snapshot = self.nearest_snapshot(seq)
+        return replay_entries(
+            snapshot.state, self.entries_between(snapshot.seq, seq), config
+        )
+
+
+class ActionJournal:
+    """
+    NDJSON 動作日誌檔
+
+    每行一筆記錄：{"kind": "snapshot", "seq", "state"} 或
+    {"kind": "action", "seq", "version", ...動作欄位}。
+    寫入後 flush；durable=True 時另外 fsync。
+    """
+
+    def __init__(self, stream: IO[str], durable: bool = False):
+        self.stream = stream
+        self.durable = durable
+        # 快照之間未變動的區域沿用已編碼的片段
+        self._serializer = GameStateSerializer()
+
+    @classmethod
+    def open(cls, path: str, durable: bool = False) -> "ActionJournal":
+        return cls(open(path, "a", encoding="utf-8"), durable=durable)
+
+    def _write(self, text: str) -> None:
+        self.stream.write(text)
+        self.stream.flush()
+        if self.durable:
+            os.fsync(self.stream.fileno())
+
+    def write_snapshot(self, seq: int, state: GameState) -> None:
+        body = self._serializer.dumps(state).decode("utf-8")
+        self._write(f'{SNAPSHOT_PREFIX},"seq":{seq},"state":{body}}}\n')
+
+    def write_entries(self, entries: Iterable[LogEntry]) -> None:
+        self._write(
+            "".join(
+                orjson.dumps({"kind": "action", **entry.to_dict()}).decode("utf-8")
+                + "\n"
+                for entry in entries
+            )
+        )
+
+    def close(self) -> None:
+        self.stream.close()
+
+    @staticmethod
+    def read(lines: Iterable[str]) -> Tuple[Optional[Snapshot], List[LogEntry]]:
+        """
+        讀取日誌：返回最後一個快照與其後的動作
+
+        崩潰時可能寫到一半的最後一行會被忽略
+        """
+        lines = list(lines)
+        # 由檔尾往前找最後一個完整的快照，只解析其後的記錄
+        snapshot: Optional[Snapshot] = None
+        start = 0
+        for index in range(len(lines) - 1, -1, -1):
+            if not lines[index].startswith(SNAPSHOT_PREFIX):
+                continue
+            try:
+                record = orjson.loads(lines[index])
+            except orjson.JSONDecodeError:
+                continue
+            snapshot = Snapshot(
+                seq=record["seq"], state=GameState.from_dict(record["state"])
+            )
+            start = index + 1
+            break
+
+        entries: List[LogEntry] = []
+        for line in lines[start:]:
+            if not line.strip():
+                continue
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                break
+            if record.get("kind") == "action":
+                entries.append(LogEntry.from_dict(record))
+        return snapshot, entries
+
+
+class ReplayableGame:
+    """
+    以動作日誌保存的遊戲房間狀態
+
+    所有動作經 GameEngine.execute_actions 執行，成功的動作寫入日誌，
+    每 snapshot_interval 筆保存快照；崩潰後以 recover() 從日誌檔重建。
+    """
+
+    def __init__(
+        self,
+        state: GameState,
+        config: Optional[GameRuleConfig] = None,
+        journal: Optional[ActionJournal] = None,
+        snapshot_interval: int = SNAPSHOT_INTERVAL,
+        log: Optional[ActionLog] = None,
+        max_snapshots: int = MAX_SNAPSHOTS,
+    ):
+        self.engine = GameEngine(config)
+        self.config = config
+        self.state = state
+        self.journal = journal
+        self.log = log or ActionLog(
+            state, snapshot_interval=snapshot_interval, max_snapshots=max_snapshots
+        )
+        if journal is not None and log is None:
+            journal.write_snapshot(self.log.last_seq, state)
+
+    def apply(self, actions: List[GameAction]) -> BatchResult:
+        """執行一批動作並寫入日誌"""
+        result = self.engine.execute_actions(actions, self.state, self.config)
+        if not result.applied:
+            return result
+
+        entries = self.log.record(
+            (actions[index] for index in result.applied), result.new_state.version
+        )
+        self.state = result.new_state
+        if self.journal is not None:
+            self.journal.write_entries(entries)
+
+        if self.log.should_snapshot():
+            self.log.add_snapshot(self.log.last_seq, self.state)
+            if self.journal is not None:
+                self.journal.write_snapshot(self.log.last_seq, self.state)
+        return result
+
+    @classmethod
+    def recover(
+        cls,
+        lines: Iterable[str],
+        config: Optional[GameRuleConfig] = None,
+        journal: Optional[ActionJournal] = None,
+        snapshot_interval: int = SNAPSHOT_INTERVAL,
+        max_snapshots: int = MAX_SNAPSHOTS,
+    ) -> "ReplayableGame":
+        """從日誌行重建房間（最後快照 + 之後的動作）"""
+        snapshot, entries = ActionJournal.read(lines)
+        if snapshot is None:
+            raise ValueError("Journal has no snapshot")
+
+        log = ActionLog(
+            snapshot.state,
+            snapshot_interval=snapshot_interval,
+            max_snapshots=max_snapshots,
+            initial_seq=snapshot.seq,
+        )
+        log.entries = entries
+        state = replay_entries(snapshot.state, entries, config)
+        return cls(
+            state,
+            config=config,
+            journal=journal,
+            snapshot_interval=snapshot_interval,
+            log=log,
+        )
@@ -0,0 +1,164 @@
+"""
+GameState Serialization - 遊戲狀態快速序列化 (Engine Layer)
+
+以 orjson 直接把 GameState 寫成 JSON bytes，輸出與
+orjson.dumps(state.to_dict()) 完全相同，但不必先建立巢狀字典：
+- GameStateSerializer 依區域快取已編碼的片段。GameState 為不可變物件，
+  未變動的區域在新狀態中沿用同一個 ZoneState，因此物件相同即代表區域版本未變，
+  只有變動的區域會重新編碼
+- diff() 只輸出變動的區域、翻面與註記，apply_diff() 可把增量套回 to_dict() 格式
+
+每個房間（或每個日誌 / 推送通道）使用一個 GameStateSerializer。
+快取以物件身分比對，只在同一個 GameState 系列跨多次更新存活時有效
+（ActionJournal / ReplayableGame）。app/api/gameplay_states.py 每個請求都從
+資料列重建狀態，快取不會命中，因此以 dumps_state() 單次編碼後直接寫入資料列；
+GET / PUT 回應則以 ORJSONResponse 編碼已儲存的字典。
+"""
+
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+import orjson
+
+from .engine import GameState, ZoneState
+
+
+class GameStateSerializer:
+    """可重複使用的 GameState 序列化器（依區域快取）"""
+
+    def __init__(self):
+        # 區域 id → (ZoneState, b'"zone_id":{...}')
+        self._zones: Dict[str, Tuple[ZoneState, bytes]] = {}
+        self._flipped: Tuple[Optional[FrozenSet[str]], bytes] = (None, b"")
+        self._annotations: Tuple[Optional[Dict[str, Any]], bytes] = (None, b"")
+        # 實際編碼的區域數（測試與效能量測用）
+        self.zones_encoded = 0
+
+    def _zone(self, zone_id: str, zone: ZoneState) -> bytes:
+        cached = self._zones.get(zone_id)
+        if cached is not None and cached[0] is zone:
+            return cached[1]
+        body = (
+            orjson.dumps(zone_id)
+            + b":"
+            + orjson.dumps({"zone_id": zone.zone_id, "cards": zone.cards})
+        )
+        self._zones[zone_id] = (zone, body)
+        self.zones_encoded += 1
+        return body
+
+    def _flipped_cards(self, flipped: FrozenSet[str]) -> bytes:
+        if self._flipped[0] is not flipped:
+            self._flipped = (flipped, orjson.dumps(sorted(flipped)))
+        return self._flipped[1]
+
+    def _annotations_bytes(self, annotations: Dict[str, Any]) -> bytes:
+        if self._annotations[0] is not annotations:
+            self._annotations = (annotations, orjson.dumps(annotations))
+        return self._annotations[1]
+
+    def dumps(self, state: GameState) -> bytes:
+        """完整狀態（與 orjson.dumps(state.to_dict()) 相同）"""
+        head = orjson.dumps({"room_id": state.room_id, "rule_id": state.rule_id})
+        tail = orjson.dumps(
+            {
+                "version": state.version,
+                "deck_remaining": state.deck_remaining,
+                "turn_count": state.turn_count,
+                "current_player": state.current_player,
+            }
+        )
+        zones = b",".join(
+            self._zone(zone_id, zone) for zone_id, zone in state.zones.items()
+        )
+        return b"".join(
+            (
+                head[:-1],
+                b',"zones":{',
+                zones,
+                b"},",
+                tail[1:-1],
+                b',"flipped_cards":',
+                self._flipped_cards(state.flipped_cards),
+                b',"annotations":',
+                self._annotations_bytes(state.annotations),
+                b"}",
+            )
+        )
+
+    def diff(self, previous: GameState, state: GameState) -> bytes:
+        """
+        只含變動部分的增量
+
+        {"base_version", "version", "zones": {變動的區域}, "removed_zones": [...],
+        "flipped_cards": [...]（有變動時）, "annotations": {牌卡: 註記或 null}（有變動時）}
+        """
+        zones = []
+        for zone_id, zone in state.zones.items():
+            old = previous.zones.get(zone_id)
+            if old is zone or (old is not None and old.cards == zone.cards):
+                continue
+            zones.append(self._zone(zone_id, zone))
+
+        changes: Dict[str, Any] = {}
+        removed_zones = [z for z in previous.zones if z not in state.zones]
+        if removed_zones:
+            changes["removed_zones"] = removed_zones
+        if state.flipped_cards != previous.flipped_cards:
+            changes["flipped_cards"] = sorted(state.flipped_cards)
+        if state.annotations is not previous.annotations:
+            annotations = {
+                card_id: annotation
+                for card_id, annotation in state.annotations.items()
+                if previous.annotations.get(card_id) != annotation
+            }
+            annotations.update(
+                dict.fromkeys(previous.annotations.keys() - state.annotations.keys())
+            )
+            if annotations:
+                changes["annotations"] = annotations
+
+        head = orjson.dumps(
+            {"base_version": previous.version, "version": state.version}
+        )
+        parts = [head[:-1], b',"zones":{', b",".join(zones), b"}"]
+        if changes:
+            parts.extend((b",", orjson.dumps(changes)[1:-1]))
+        parts.append(b"}")
+        return b"".join(parts)
+
+
+def dumps_state(state: GameState) -> bytes:
+    """
+    單次序列化（不保留快取）
+
+    沒有可沿用的區域片段時，直接以 orjson 編碼 to_dict() 比逐區域組合快
+    （見 benchmarks/serialization_benchmark.py）。
+    """
+    return orjson.dumps(state.to_dict())
+
+
+def apply_diff(data: Dict[str, Any], diff: Dict[str, Any]) -> Dict[str, Any]:
+    """把 diff() 的增量套用到 to_dict() 格式的狀態，返回新字典"""
+    if data.get("version") != diff["base_version"]:
+        raise ValueError(
+            f"Diff is based on version {diff['base_version']}, "
+            f"state is at version {data.get('version')}"
+        )
+
+    zones = dict(data.get("zones", {}))
+    for zone_id in diff.get("removed_zones", ()):
+        zones.pop(zone_id, None)
+    zones.update(diff["zones"])
+
+    result = {**data, "zones": zones, "version": diff["version"]}
+    if "flipped_cards" in diff:
+        result["flipped_cards"] = diff["flipped_cards"]
+    if "annotations" in diff:
+        annotations = dict(data.get("annotations", {}))
+        for card_id, annotation in diff["annotations"].items():
+            if annotation is None:
+                annotations.pop(card_id, None)
+            else:
+                annotations[card_id] = annotation
+        result["annotations"] = annotations
+    return result
@@ -0,0 +1,194 @@
+"""
+Rule Validator - 編譯後的約束驗證器 (Engine Layer)
+
+將 GameRuleConfig 的 LayoutConfig 與 ConstraintConfig 編譯為
+區域索引 + 陣列形式的上下限，使每個動作的約束檢查為 O(1)
+"""
+
+from array import array
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from .config import GameRuleConfig
+
+# 無上限 / 無下限 的陣列標記值
+UNLIMITED = -1
+
+
+class BoardCounters:
+    """
+    可遞增維護的區域 / 總牌數計數器
+
+    只負責計數；上限判斷一律交給 RuleValidator.can_place / can_receive
+    """
+
+    __slots__ = ("validator", "counts", "total")
+
+    def __init__(self, validator: "RuleValidator", counts: array, total: int):
+        self.validator = validator
+        self.counts = counts
+        self.total = total
+
+    def zone_count(self, zone_id: str) -> Optional[int]:
+        """獲取區域牌卡數（未受規則管理的區域返回 None）"""
+        index = self.validator.zone_index.get(zone_id)
+        if index is None:
+            return None
+        return self.counts[index]
+
+    def place(self, zone_id: str) -> None:
+        index = self.validator.zone_index.get(zone_id)
+        if index is not None:
+            self.counts[index] += 1
+        self.total += 1
+
+    def remove(self, zone_id: str) -> None:
+        index = self.validator.zone_index.get(zone_id)
+        if index is not None:
+            self.counts[index] -= 1
+        self.total -= 1
+
+    def move(self, source_zone: str, target_zone: str) -> None:
+        self.remove(source_zone)
+        self.place(target_zone)
+
+
+class RuleValidator:
+    """由單一 GameRuleConfig 編譯而成的約束驗證器"""
+
+    def __init__(self, config: GameRuleConfig):
+        constraints = config.constraints
+        drop_zones = config.layout.drop_zones
+
+        self.rule_id = config.id
+        self.zone_ids: List[str] = [zone.id for zone in drop_zones]
+        self.zone_index: Dict[str, int] = {
+            zone_id: index for index, zone_id in enumerate(self.zone_ids)
+        }
+
+        # 布局上限與約束上限取較嚴者，下限取較高者
+        self.max_cards = array("l", [UNLIMITED] * len(drop_zones))
+        self.min_cards = array("l", [UNLIMITED] * len(drop_zones))
+        for index, zone in enumerate(drop_zones):
+            limits = [
+                limit
+                for limit in (zone.max_cards, constraints.max_per_zone.get(zone.id))
+                if limit is not None
+            ]
+            if limits:
+                self.max_cards[index] = min(limits)
+            minimums = [
+                minimum
+                for minimum in (zone.min_cards, constraints.min_per_zone.get(zone.id))
+                if minimum is not None
+            ]
+            if minimums:
+                self.min_cards[index] = max(minimums)
+
+        self.total_limit: Optional[int] = constraints.total_limit
+        self.unique_positions: bool = constraints.unique_positions
+
+    def has_zone(self, zone_id: str) -> bool:
+        return zone_id in self.zone_index
+
+    def get_max_cards(self, zone_id: str) -> Optional[int]:
+        """獲取區域上限（無上限返回 None）"""
+        index = self.zone_index.get(zone_id)
+        if index is None or self.max_cards[index] == UNLIMITED:
+            return None
+        return self.max_cards[index]
+
+    def counters_for(self, zones: Mapping[str, Sequence[str]]) -> BoardCounters:
+        """由區域牌卡列表建立計數器"""
+        counts = array("l", [0] * len(self.zone_ids))
+        total = 0
+        for zone_id, cards in zones.items():
+            index = self.zone_index.get(zone_id)
+            if index is not None:
+                counts[index] = len(cards)
+            total += len(cards)
+        return BoardCounters(self, counts, total)
+
+    def can_place(self, zone_id: str, zone_count: int, total_count: int) -> bool:
+        """不建立計數器的單次放牌檢查"""
+        if self.total_limit is not None and total_count >= self.total_limit:
+            return False
+        return self.can_receive(zone_id, zone_count)
+
+    def can_receive(self, zone_id: str, zone_count: int) -> bool:
+        """不建立計數器的單次接收檢查（移動）"""
+        index = self.zone_index.get(zone_id)
+        if index is None:
+            return True
+        max_cards = self.max_cards[index]
+        return max_cards == UNLIMITED or zone_count < max_cards
+
+    def validate_board(
+        self,
+        zones: Mapping[str, Sequence[str]],
+        check_minimums: bool = False,
+    ) -> List[str]:
+        """
+        完整盤面驗證
+
+        zones 為 區域ID → 牌卡ID 列表。返回所有違反約束的錯誤訊息，
+        空列表表示盤面合法。check_minimums 用於結束遊戲時的下限檢查。
+        """
+        errors: List[str] = []
+        seen: Dict[str, str] = {}
+        total = 0
+
+        for zone_id, cards in zones.items():
+            index = self.zone_index.get(zone_id)
+            if index is None:
+                errors.append(f"Unknown zone {zone_id} for rule {self.rule_id}")
+                continue
+
+            count = len(cards)
+            total += count
+            max_cards = self.max_cards[index]
+            if max_cards != UNLIMITED and count > max_cards:
+                errors.append(f"Zone {zone_id} has {count} cards (max {max_cards})")
+            min_cards = self.min_cards[index]
+            if check_minimums and min_cards != UNLIMITED and count < min_cards:
+                errors.append(f"Zone {zone_id} has {count} cards (min {min_cards})")
+
+            for card_id in cards:
+                previous = seen.get(card_id)
+                if previous == zone_id:
+                    errors.append(f"Card {card_id} appears twice in zone {zone_id}")
+                elif previous is not None and self.unique_positions:
+                    errors.append(
+                        f"Card {card_id} appears in both {previous} and {zone_id}"
+                    )
+                seen[card_id] = zone_id
+
+        if check_minimums:
+            for zone_id, index in self.zone_index.items():
+                min_cards = self.min_cards[index]
+                if zone_id not in zones and min_cards not in (UNLIMITED, 0):
+                    errors.append(f"Zone {zone_id} has 0 cards (min {min_cards})")
+
+        if self.total_limit is not None and total > self.total_limit:
+            errors.append(f"Board has {total} cards (limit {self.total_limit})")
+
+        return errors
+
+    def validate_state_dict(
+        self, data: Mapping[str, Any], check_minimums: bool = False
+    ) -> List[str]:
+        """驗證 GameState.to_dict() 格式的狀態"""
+        zones = data.get("zones") or {}
+        if not isinstance(zones, Mapping):
+            return ["zones must be an object"]
+
+        board: Dict[str, Sequence[str]] = {}
+        for zone_id, zone_data in zones.items():
+            cards = (
+                zone_data.get("cards", []) if isinstance(zone_data, Mapping) else None
+            )
+            if not isinstance(cards, list) or not all(
+                isinstance(card_id, str) for card_id in cards
+            ):
+                return [f"Zone {zone_id} cards must be a list of card ids"]
+            board[zone_id] = cards
+        return self.validate_board(board, check_minimums=check_minimums)
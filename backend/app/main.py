@@ -1,10 +1,12 @@
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from app.api.admin import router as admin_router
+from app.api.analytics import router as analytics_router
 from app.api.auth import router as auth_router
 from app.api.clients import router as clients_router
 from app.api.counselor_notes import router as counselor_notes_router
@@ -22,6 +24,28 @@ from app.models.room import Room  # noqa: F401
 from app.models.user import User  # noqa: F401
 from app.models.visitor import Visitor  # noqa: F401
 
+
+def warm_game_rule_templates():
+    """Create missing default game rule templates and load the template cache"""
+    from sqlmodel import Session
+
+    from app.core.database import engine
+    from app.services.game_rule_templates import warm_template_cache
+
+    try:
+        with Session(engine) as session:
+            warm_template_cache(session)
+    except Exception as e:
+        # 資料庫暫時無法連線時不阻擋啟動，快取會在第一次存取時載入
+        print(f"Failed to warm game rule template cache: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_game_rule_templates()
+    yield
+
+
 app = FastAPI(
     title="Career Creator API",
     description="Online card consultation system for career counselors",
@@ -29,6 +53,7 @@ app = FastAPI(
     openapi_url="/api/openapi.json" if settings.environment == "development" else None,
     docs_url="/api/docs" if settings.environment == "development" else None,
     redoc_url="/api/redoc" if settings.environment == "development" else None,
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -69,6 +94,8 @@ app.add_middleware(
     allow_credentials=allow_credentials,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset pagination cursor for GET /api/clients
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers
@@ -77,6 +104,7 @@ app.include_router(rooms_router)
 app.include_router(visitors_router)
 app.include_router(game_rules_router, prefix="/api/game-rules", tags=["game-rules"])
 app.include_router(admin_router)
+app.include_router(analytics_router)
 app.include_router(clients_router)
 app.include_router(counselor_notes_router, prefix="/api")
 app.include_router(gameplay_states_router, prefix="/api")
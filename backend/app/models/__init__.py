@@ -1,7 +1,9 @@
+from .analytics import AnalyticsRefresh
 from .client import (
     Client,
     ClientCreate,
     ClientResponse,
+    ClientStats,
     ClientStatus,
     ClientUpdate,
     ConsultationRecord,
@@ -32,6 +34,7 @@ __all__ = [
     "ClientCreate",
     "ClientUpdate",
     "ClientResponse",
+    "ClientStats",
     "ClientStatus",
     "RoomClient",
     "ConsultationRecord",
@@ -40,4 +43,5 @@ __all__ = [
     "CounselorNote",
     "CounselorNoteResponse",
     "CounselorNoteUpdate",
+    "AnalyticsRefresh",
 ]
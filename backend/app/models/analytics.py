@@ -0,0 +1,144 @@
+"""Analytics rollups: materialized views refreshed in the background."""
+
+from datetime import date, datetime
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import DDL, event
+from sqlmodel import Field, SQLModel
+
+# The views read these tables, so they must be in the metadata before the
+# after_create DDL runs
+from . import client, gameplay_state, room  # noqa: F401
+
+
+class AnalyticsRefresh(SQLModel, table=True):
+    """Last successful refresh of each analytics materialized view."""
+
+    __tablename__ = "analytics_refreshes"
+
+    view_name: str = Field(primary_key=True, max_length=63)
+    refreshed_at: datetime = Field(description="Refresh completion time (UTC)")
+    duration_ms: int = Field(default=0, description="Refresh duration")
+
+
+# Per-counselor rollups. Each view has a unique index so it can be refreshed
+# CONCURRENTLY (readers keep seeing the previous contents meanwhile).
+ANALYTICS_VIEWS = {
+    "analytics_weekly_sessions": (
+        """
+        SELECT counselor_id,
+               date_trunc('week', session_date)::date AS week_start,
+               count(*) AS sessions,
+               count(DISTINCT client_id) AS clients
+        FROM consultation_records
+        GROUP BY counselor_id, date_trunc('week', session_date)::date
+        """,
+        ("counselor_id", "week_start"),
+    ),
+    "analytics_client_activity": (
+        """
+        SELECT c.counselor_id,
+               count(*) AS total_clients,
+               count(*) FILTER (WHERE c.status = 'ACTIVE') AS active_clients,
+               count(*) FILTER (
+                   WHERE s.last_consultation_date
+                       >= now() AT TIME ZONE 'utc' - interval '30 days'
+               ) AS clients_seen_30d
+        FROM clients c
+        LEFT JOIN client_stats s ON s.client_id = c.id
+        GROUP BY c.counselor_id
+        """,
+        ("counselor_id",),
+    ),
+    "analytics_follow_ups": (
+        """
+        SELECT counselor_id, follow_up_date, count(*) AS follow_ups
+        FROM consultation_records
+        WHERE follow_up_required AND follow_up_date IS NOT NULL
+        GROUP BY counselor_id, follow_up_date
+        """,
+        ("counselor_id", "follow_up_date"),
+    ),
+    "analytics_gameplay_usage": (
+        """
+        SELECT r.counselor_id, g.gameplay_id,
+               count(*) AS rooms,
+               max(g.last_played_at) AS last_played_at
+        FROM gameplay_states g
+        JOIN rooms r ON r.id = g.room_id
+        GROUP BY r.counselor_id, g.gameplay_id
+        """,
+        ("counselor_id", "gameplay_id"),
+    ),
+}
+
+
+def analytics_view_ddl(name: str) -> List[str]:
+    """CREATE statements for one analytics materialized view and its index."""
+    query, key = ANALYTICS_VIEWS[name]
+    return [
+        f"CREATE MATERIALIZED VIEW IF NOT EXISTS {name} AS {query.strip()}",
+        f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{name} ON {name} ({', '.join(key)})",
+    ]
+
+
+# Create the views whenever the schema is created from metadata (tests,
+# create_db_and_tables); migrated databases get them from Alembic.
+for _name in ANALYTICS_VIEWS:
+    for _statement in analytics_view_ddl(_name):
+        event.listen(
+            SQLModel.metadata,
+            "after_create",
+            DDL(_statement).execute_if(dialect="postgresql"),
+        )
+
+
+# Response models
+class WeeklySessions(SQLModel):
+    """Consultation records in one week (Monday start)."""
+
+    week_start: date
+    sessions: int = 0
+    clients: int = 0
+
+
+class GameplayUsage(SQLModel):
+    """How many rooms played a gameplay."""
+
+    gameplay_id: str
+    rooms: int
+    last_played_at: datetime
+
+
+class AnalyticsFreshness(SQLModel):
+    """When the rollups behind a response were computed."""
+
+    refreshed_at: Optional[datetime] = Field(
+        default=None, description="Oldest refresh among the views (UTC)"
+    )
+    age_seconds: Optional[int] = None
+    stale: bool = Field(description="Older than the refresh interval")
+    refreshing: bool = Field(
+        default=False, description="A background refresh was scheduled"
+    )
+
+
+class AnalyticsDashboard(SQLModel):
+    """Counselor dashboard rollups."""
+
+    counselor_id: Optional[UUID] = Field(
+        default=None, description="None means all counselors"
+    )
+    total_clients: int = 0
+    active_clients: int = 0
+    clients_seen_30d: int = Field(
+        default=0, description="Clients with a consultation in the last 30 days"
+    )
+    follow_ups_overdue: int = 0
+    follow_ups_due_7d: int = Field(
+        default=0, description="Follow-ups due today or in the next 7 days"
+    )
+    weekly_sessions: List[WeeklySessions] = Field(default_factory=list)
+    top_gameplays: List[GameplayUsage] = Field(default_factory=list)
+    freshness: AnalyticsFreshness
@@ -5,7 +5,15 @@ from enum import Enum
 from typing import Any, Dict, List, Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import TEXT, UniqueConstraint
+from sqlalchemy import (
+    DDL,
+    TEXT,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+    event,
+    text,
+)
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlmodel import JSON, Column, Field, Relationship, SQLModel
 
@@ -46,10 +54,38 @@ class ClientBase(SQLModel):
     )
 
 
+def pg_trgm_available(ddl, target, bind, **kw) -> bool:
+    """Whether the pg_trgm extension can be installed (execute_if / ddl_if hook)."""
+    return (
+        bind.execute(
+            text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        ).first()
+        is not None
+    )
+
+
 class Client(ClientBase, table=True):
     """Client database model."""
 
     __tablename__ = "clients"
+    __table_args__ = (
+        # Keyset pagination of a counselor's clients by (updated_at, id)
+        Index("ix_clients_counselor_updated_id", "counselor_id", "updated_at", "id"),
+        # Trigram index for substring / similarity search (GET /api/clients/search)
+        Index(
+            "ix_clients_search_trgm",
+            "name",
+            "email",
+            "phone",
+            text("(tags::text) gin_trgm_ops"),
+            postgresql_using="gin",
+            postgresql_ops={
+                "name": "gin_trgm_ops",
+                "email": "gin_trgm_ops",
+                "phone": "gin_trgm_ops",
+            },
+        ).ddl_if(dialect="postgresql", callable_=pg_trgm_available),
+    )
 
     id: UUID = Field(
         default_factory=uuid4, primary_key=True, description="Client unique ID"
@@ -111,6 +147,15 @@ class ConsultationRecord(SQLModel, table=True):
     """Consultation session records."""
 
     __tablename__ = "consultation_records"
+    __table_args__ = (
+        # Keyset pagination of a client's history by (session_date, id) DESC
+        Index(
+            "ix_consultation_records_client_session",
+            "client_id",
+            text("session_date DESC"),
+            text("id DESC"),
+        ),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     room_id: UUID = Field(
@@ -165,6 +210,195 @@ class ConsultationRecord(SQLModel, table=True):
     client: Client = Relationship(back_populates="consultation_records")
 
 
+class ClientStats(SQLModel, table=True):
+    """
+    Denormalized per-client statistics.
+
+    Maintained by database triggers on clients, room_clients, rooms and
+    consultation_records (see CLIENT_STATS_DDL) in the same transaction as the
+    change, so reads are a primary-key lookup. Drift is repaired by
+    app.services.client_stats.reconcile_client_stats.
+    """
+
+    __tablename__ = "client_stats"
+
+    client_id: UUID = Field(
+        sa_column=Column(
+            ForeignKey("clients.id", ondelete="CASCADE"), primary_key=True
+        ),
+        description="Client ID",
+    )
+    active_rooms_count: int = Field(
+        default=0, description="Active rooms of the client's counselor"
+    )
+    total_consultations: int = Field(
+        default=0, description="Sum of session_count over the client's rooms"
+    )
+    last_consultation_date: Optional[datetime] = Field(
+        default=None, description="Latest consultation record session date"
+    )
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow, description="Last refresh timestamp"
+    )
+
+
+event.listen(
+    Client.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(
+        dialect="postgresql", callable_=pg_trgm_available
+    ),
+)
+
+
+# Trigger maintenance of client_stats. refresh_client_stats() locks the stats
+# rows before recomputing them, so concurrent writers for the same client are
+# serialized and the last one sees every committed change. Inserts into
+# clients and room_clients refresh every affected client in one set-based call
+# per statement, so bulk imports do not pay a per-row aggregate.
+CLIENT_STATS_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION refresh_client_stats(targets uuid[])
+    RETURNS void AS $$
+    BEGIN
+        INSERT INTO client_stats (client_id, active_rooms_count,
+                                  total_consultations, updated_at)
+        SELECT id, 0, 0, now() AT TIME ZONE 'utc' FROM clients
+        WHERE id = ANY(targets)
+        ON CONFLICT (client_id) DO NOTHING;
+
+        PERFORM 1 FROM client_stats WHERE client_id = ANY(targets)
+        ORDER BY client_id FOR UPDATE;
+
+        UPDATE client_stats AS s
+        SET active_rooms_count = agg.active_rooms_count,
+            total_consultations = agg.total_consultations,
+            last_consultation_date = (
+                SELECT max(cr.session_date) FROM consultation_records cr
+                WHERE cr.client_id = s.client_id
+            ),
+            updated_at = now() AT TIME ZONE 'utc'
+        FROM (
+            SELECT c.id AS client_id,
+                   count(r.id) FILTER (WHERE r.is_active) AS active_rooms_count,
+                   coalesce(sum(r.session_count), 0) AS total_consultations
+            FROM clients c
+            LEFT JOIN room_clients rc ON rc.client_id = c.id
+            LEFT JOIN rooms r
+                ON r.id = rc.room_id AND r.counselor_id = c.counselor_id
+            WHERE c.id = ANY(targets)
+            GROUP BY c.id
+        ) AS agg
+        WHERE s.client_id = agg.client_id;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION refresh_client_stats(target uuid) RETURNS void AS $$
+    BEGIN
+        PERFORM refresh_client_stats(ARRAY[target]);
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION client_stats_on_client() RETURNS trigger AS $$
+    BEGIN
+        PERFORM refresh_client_stats(NEW.id);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION client_stats_on_new_clients() RETURNS trigger AS $$
+    BEGIN
+        PERFORM refresh_client_stats(ARRAY(SELECT id FROM new_rows));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION client_stats_on_client_row() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM refresh_client_stats(OLD.client_id);
+        END IF;
+        IF TG_OP <> 'DELETE' AND (TG_OP = 'INSERT'
+                                  OR NEW.client_id <> OLD.client_id) THEN
+            PERFORM refresh_client_stats(NEW.client_id);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION client_stats_on_client_rows() RETURNS trigger AS $$
+    BEGIN
+        PERFORM refresh_client_stats(
+            ARRAY(SELECT DISTINCT client_id FROM new_rows)
+        );
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION client_stats_on_room() RETURNS trigger AS $$
+    BEGIN
+        PERFORM refresh_client_stats(rc.client_id)
+        FROM (SELECT client_id FROM room_clients
+              WHERE room_id = NEW.id ORDER BY client_id) AS rc;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER client_stats_clients
+    AFTER UPDATE OF counselor_id ON clients
+    FOR EACH ROW EXECUTE FUNCTION client_stats_on_client()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER client_stats_clients_insert
+    AFTER INSERT ON clients REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION client_stats_on_new_clients()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER client_stats_room_clients
+    AFTER UPDATE OR DELETE ON room_clients
+    FOR EACH ROW EXECUTE FUNCTION client_stats_on_client_row()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER client_stats_room_clients_insert
+    AFTER INSERT ON room_clients REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION client_stats_on_client_rows()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER client_stats_consultation_records
+    AFTER INSERT OR DELETE OR UPDATE OF client_id, session_date
+    ON consultation_records
+    FOR EACH ROW EXECUTE FUNCTION client_stats_on_client_row()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER client_stats_rooms
+    AFTER UPDATE OF is_active, session_count, counselor_id ON rooms
+    FOR EACH ROW
+    WHEN (OLD.is_active IS DISTINCT FROM NEW.is_active
+          OR OLD.session_count IS DISTINCT FROM NEW.session_count
+          OR OLD.counselor_id IS DISTINCT FROM NEW.counselor_id)
+    EXECUTE FUNCTION client_stats_on_room()
+    """,
+)
+
+# Install the triggers whenever the schema is created from metadata (tests,
+# create_db_and_tables); migrated databases get them from Alembic. Every
+# statement replaces what exists, so create_all() can run again on a
+# provisioned database.
+for _statement in CLIENT_STATS_DDL:
+    event.listen(
+        SQLModel.metadata,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+
+
 # Request/Response models
 
 
@@ -228,6 +462,35 @@ class ClientResponse(ClientBase):
     )
 
 
+class ClientSearchResult(SQLModel):
+    """Client search hit ranked by relevance."""
+
+    id: UUID
+    name: Optional[str]
+    email: Optional[str]
+    phone: Optional[str]
+    tags: List[str] = Field(default_factory=list)
+    status: ClientStatus
+    updated_at: datetime
+    score: float = Field(description="Relevance score (higher is better)")
+
+
+class ClientImportError(SQLModel):
+    """A rejected row of a bulk client import."""
+
+    row: int = Field(description="1-based data row number in the uploaded file")
+    email: Optional[str] = None
+    message: str
+
+
+class ClientImportResult(SQLModel):
+    """Outcome of POST /api/clients/import."""
+
+    total_rows: int
+    created: int
+    errors: List[ClientImportError] = Field(default_factory=list)
+
+
 class ConsultationRecordCreate(SQLModel):
     """Model for creating consultation record."""
 
@@ -242,6 +505,27 @@ class ConsultationRecordCreate(SQLModel):
     follow_up_date: Optional[date] = Field(default=None)
 
 
+class ConsultationRecordSummary(SQLModel):
+    """Consultation record list item without game_state and screenshot URLs."""
+
+    id: UUID
+    room_id: UUID
+    client_id: UUID
+    counselor_id: UUID
+    session_date: datetime
+    duration_minutes: Optional[int]
+    gameplay: Optional[str] = Field(
+        default=None, description="game_state.gameplay of the record"
+    )
+    screenshot_count: int = Field(default=0, description="Number of screenshots")
+    topics: List[str]
+    notes: Optional[str]
+    follow_up_required: bool
+    follow_up_date: Optional[date]
+    created_at: datetime
+    updated_at: datetime
+
+
 class ConsultationRecordResponse(SQLModel):
     """Consultation record response."""
 
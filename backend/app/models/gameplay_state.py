@@ -1,7 +1,7 @@
 """Gameplay state models for persisting game progress."""
 
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, ConfigDict
@@ -100,3 +100,57 @@ class RoomGameplayStatesResponse(SQLModel):
 
     states: list[GameplayStateResponse]
     summary: Dict[str, Any]
+
+
+class GameplayActionItem(SQLModel):
+    """A single engine action (GameAction without player_id)."""
+
+    type: str
+    card_id: Optional[str] = None
+    target_zone: Optional[str] = None
+    position: Optional[Dict[str, float]] = None
+    data: Optional[Dict[str, Any]] = None
+
+
+class GameplayActionsRequest(SQLModel):
+    """Schema for applying engine actions to a gameplay state."""
+
+    actions: List[GameplayActionItem] = Field(min_length=1, max_length=500)
+    expected_version: Optional[int] = Field(
+        default=None, description="Reject with 409 if the state version differs"
+    )
+
+
+class GameplayActionsResponse(SQLModel):
+    """Result of applying actions, undo or redo (no full state)."""
+
+    version: int
+    applied: List[int]
+    failures: Dict[int, str]
+    actions: List[Dict[str, Any]] = Field(
+        description="Actions the client should apply locally to stay in sync"
+    )
+    can_undo: bool
+    can_redo: bool
+
+
+class GameplayMergeRequest(SQLModel):
+    """Schema for merging a client's board changes (MergeableBoard.to_dict)."""
+
+    delta: Dict[str, Any] = Field(
+        description="Board entries for the cards changed since the last sync"
+    )
+    since_version: Optional[int] = Field(
+        default=None,
+        description="Last state version the client merged; omit for a full board",
+    )
+
+
+class GameplayMergeResponse(SQLModel):
+    """New state version plus the board entries the client has not seen yet."""
+
+    version: int
+    delta: Dict[str, Any] = Field(
+        description="Board entries changed since since_version (the full board "
+        "when since_version is omitted or predates the stored board)"
+    )
@@ -0,0 +1,232 @@
+"""
+Analytics
+儀表板統計（物化視圖）
+
+統計來自 app.models.analytics.ANALYTICS_VIEWS 的物化視圖，請求只讀取
+彙總後的資料列。視圖以 REFRESH MATERIALIZED VIEW CONCURRENTLY 更新
+（更新期間讀取不受阻擋），每次更新時間記錄在 analytics_refreshes，
+回應附上資料新鮮度。超過 ANALYTICS_MAX_AGE 時由端點排程背景更新，
+也可以用 scripts/refresh_analytics.py 定期執行。
+"""
+
+import time
+from datetime import date, datetime, timedelta
+from typing import Optional, Union
+from uuid import UUID
+
+from sqlalchemy import column, func, table, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import Session, select
+
+from app.models.analytics import (
+    ANALYTICS_VIEWS,
+    AnalyticsDashboard,
+    AnalyticsFreshness,
+    AnalyticsRefresh,
+    GameplayUsage,
+    WeeklySessions,
+)
+
+ANALYTICS_MAX_AGE = timedelta(minutes=15)
+
+# pg_try_advisory_xact_lock key: only one refresh runs at a time
+ANALYTICS_REFRESH_LOCK = 4_604_046
+
+weekly_sessions = table(
+    "analytics_weekly_sessions",
+    column("counselor_id"),
+    column("week_start"),
+    column("sessions"),
+    column("clients"),
+)
+client_activity = table(
+    "analytics_client_activity",
+    column("counselor_id"),
+    column("total_clients"),
+    column("active_clients"),
+    column("clients_seen_30d"),
+)
+follow_ups = table(
+    "analytics_follow_ups",
+    column("counselor_id"),
+    column("follow_up_date"),
+    column("follow_ups"),
+)
+gameplay_usage = table(
+    "analytics_gameplay_usage",
+    column("counselor_id"),
+    column("gameplay_id"),
+    column("rooms"),
+    column("last_played_at"),
+)
+
+
+def refresh_analytics(session: Session) -> bool:
+    """
+    更新所有統計視圖並記錄更新時間
+
+    已有其他更新在進行時返回 False。不會 commit，由呼叫端決定交易邊界。
+    """
+    acquired = session.execute(
+        text("SELECT pg_try_advisory_xact_lock(:key)"),
+        {"key": ANALYTICS_REFRESH_LOCK},
+    ).scalar()
+    if not acquired:
+        return False
+
+    for name in ANALYTICS_VIEWS:
+        start = time.perf_counter()
+        session.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {name}"))
+        values = {
+            "refreshed_at": datetime.utcnow(),
+            "duration_ms": int((time.perf_counter() - start) * 1000),
+        }
+        session.execute(
+            insert(AnalyticsRefresh)
+            .values(view_name=name, **values)
+            .on_conflict_do_update(index_elements=["view_name"], set_=values)
+        )
+    return True
+
+
+def refresh_analytics_in_background(bind: Union[Engine, Connection]) -> None:
+    """BackgroundTasks 入口：以獨立 Session 更新並 commit"""
+    try:
+        with Session(bind) as session:
+            if refresh_analytics(session):
+                session.commit()
+    except Exception as e:
+        print(f"Failed to refresh analytics views: {e}")
+
+
+def get_freshness(
+    session: Session, now: Optional[datetime] = None
+) -> AnalyticsFreshness:
+    """以最舊的視圖更新時間計算資料新鮮度"""
+    now = now or datetime.utcnow()
+    count, oldest = session.execute(
+        select(func.count(), func.min(AnalyticsRefresh.refreshed_at)).where(
+            AnalyticsRefresh.view_name.in_(list(ANALYTICS_VIEWS))
+        )
+    ).one()
+    if count < len(ANALYTICS_VIEWS):
+        return AnalyticsFreshness(stale=True)
+    age = now - oldest
+    return AnalyticsFreshness(
+        refreshed_at=oldest,
+        age_seconds=max(int(age.total_seconds()), 0),
+        stale=age > ANALYTICS_MAX_AGE,
+    )
+
+
+def _scoped(query, view, counselor_id: Optional[UUID]):
+    if counselor_id is None:
+        return query
+    return query.where(view.c.counselor_id == counselor_id)
+
+
+def load_dashboard(
+    session: Session,
+    counselor_id: Optional[UUID] = None,
+    weeks: int = 12,
+    top: int = 5,
+    today: Optional[date] = None,
+) -> AnalyticsDashboard:
+    """
+    從統計視圖組合儀表板
+
+    counselor_id 為 None 時彙總所有諮商師。weekly_sessions 包含最近 weeks 週
+    （含本週，沒有紀錄的週為 0）。
+    """
+    today = today or datetime.utcnow().date()
+    this_week = today - timedelta(days=today.weekday())
+    first_week = this_week - timedelta(weeks=weeks - 1)
+
+    activity = session.execute(
+        _scoped(
+            select(
+                func.coalesce(func.sum(client_activity.c.total_clients), 0),
+                func.coalesce(func.sum(client_activity.c.active_clients), 0),
+                func.coalesce(func.sum(client_activity.c.clients_seen_30d), 0),
+            ),
+            client_activity,
+            counselor_id,
+        )
+    ).one()
+
+    due = session.execute(
+        _scoped(
+            select(
+                func.coalesce(
+                    func.sum(follow_ups.c.follow_ups).filter(
+                        follow_ups.c.follow_up_date < today
+                    ),
+                    0,
+                ),
+                func.coalesce(
+                    func.sum(follow_ups.c.follow_ups).filter(
+                        follow_ups.c.follow_up_date >= today
+                    ),
+                    0,
+                ),
+            ).where(follow_ups.c.follow_up_date <= today + timedelta(days=7)),
+            follow_ups,
+            counselor_id,
+        )
+    ).one()
+
+    weekly = {
+        week_start: (sessions, clients)
+        for week_start, sessions, clients in session.execute(
+            _scoped(
+                select(
+                    weekly_sessions.c.week_start,
+                    func.sum(weekly_sessions.c.sessions),
+                    func.sum(weekly_sessions.c.clients),
+                )
+                .where(weekly_sessions.c.week_start >= first_week)
+                .group_by(weekly_sessions.c.week_start),
+                weekly_sessions,
+                counselor_id,
+            )
+        )
+    }
+
+    gameplays = session.execute(
+        _scoped(
+            select(
+                gameplay_usage.c.gameplay_id,
+                func.sum(gameplay_usage.c.rooms).label("rooms"),
+                func.max(gameplay_usage.c.last_played_at),
+            )
+            .group_by(gameplay_usage.c.gameplay_id)
+            .order_by(text("rooms DESC"), gameplay_usage.c.gameplay_id)
+            .limit(top),
+            gameplay_usage,
+            counselor_id,
+        )
+    ).all()
+
+    week_starts = [first_week + timedelta(weeks=n) for n in range(weeks)]
+    return AnalyticsDashboard(
+        counselor_id=counselor_id,
+        total_clients=activity[0],
+        active_clients=activity[1],
+        clients_seen_30d=activity[2],
+        follow_ups_overdue=due[0],
+        follow_ups_due_7d=due[1],
+        weekly_sessions=[
+            WeeklySessions(
+                week_start=week_start,
+                sessions=weekly.get(week_start, (0, 0))[0],
+                clients=weekly.get(week_start, (0, 0))[1],
+            )
+            for week_start in week_starts
+        ],
+        top_gameplays=[
+            GameplayUsage(gameplay_id=gameplay_id, rooms=rooms, last_played_at=last)
+            for gameplay_id, rooms, last in gameplays
+        ],
+        freshness=get_freshness(session),
+    )
@@ -0,0 +1,236 @@
+"""
+Card Catalog
+牌組目錄快取
+
+每個牌組的牌卡只在牌組版本改變時載入一次，序列化為 JSON 並預先壓縮
+（gzip，安裝 brotli 時另含 br）。目錄版本為內容雜湊，
+客戶端可帶上已持有的版本只取得差異。
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models.game_rule import Card, CardDeck
+from app.services.card_search import CardSearchIndex
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli 為選用套件
+    brotli = None
+
+# 每個牌組保留的歷史版本數（用於差異計算）
+MAX_HISTORY_VERSIONS = 5
+
+DeckVersionKey = Tuple[str, int, Optional[datetime]]
+
+
+@dataclass(frozen=True)
+class EncodedPayload:
+    """預先序列化、預先壓縮的 JSON 回應"""
+
+    body: bytes
+    etag: str
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def from_data(cls, data: Any) -> "EncodedPayload":
+        body = json.dumps(
+            data,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        encodings = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            encodings["br"] = brotli.compress(body, mode=brotli.MODE_TEXT)
+        return cls(
+            body=body,
+            etag=hashlib.sha256(body).hexdigest()[:32],
+            encodings=encodings,
+        )
+
+
+def serialize_card(card: Card) -> Dict[str, Any]:
+    """牌卡的公開欄位"""
+    return {
+        "id": str(card.id),
+        "card_key": card.card_key,
+        "title": card.title,
+        "description": card.description,
+        "category": card.category,
+        "subcategory": card.subcategory,
+        "display_order": card.display_order,
+        "card_metadata": card.card_metadata,
+        "assets": card.assets,
+    }
+
+
+def _catalog_version(cards: List[Dict[str, Any]]) -> str:
+    body = json.dumps(cards, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(body).hexdigest()[:16]
+
+
+@dataclass
+class DeckCatalog:
+    """單一牌組某個版本的目錄"""
+
+    deck_id: UUID
+    name: str
+    version: str
+    cards: Dict[str, Dict[str, Any]]
+    payload: EncodedPayload
+    version_key: DeckVersionKey
+    # 舊版本 → 牌卡快照，用於計算差異
+    history: "OrderedDict[str, Dict[str, Dict[str, Any]]]" = field(
+        default_factory=OrderedDict
+    )
+    _deltas: Dict[str, EncodedPayload] = field(default_factory=dict)
+    _search_index: Optional[CardSearchIndex] = None
+
+    @property
+    def search_index(self) -> CardSearchIndex:
+        """搜尋索引，隨目錄版本第一次搜尋時建立"""
+        if self._search_index is None:
+            self._search_index = CardSearchIndex(list(self.cards.values()))
+        return self._search_index
+
+    def delta_payload(self, since: str) -> Optional[EncodedPayload]:
+        """自 since 版本以來的差異，未知版本返回 None"""
+        if since in self._deltas:
+            return self._deltas[since]
+        if since == self.version:
+            base: Dict[str, Dict[str, Any]] = self.cards
+        elif since in self.history:
+            base = self.history[since]
+        else:
+            return None
+
+        upserted = [card for key, card in self.cards.items() if base.get(key) != card]
+        removed = sorted(key for key in base if key not in self.cards)
+        payload = EncodedPayload.from_data(
+            {
+                "deck_id": str(self.deck_id),
+                "version": self.version,
+                "base_version": since,
+                "delta": True,
+                "upserted": upserted,
+                "removed": removed,
+            }
+        )
+        self._deltas[since] = payload
+        return payload
+
+
+class CardCatalog:
+    """程序內的牌組目錄快取"""
+
+    def __init__(self, refresh_interval: float = 30.0):
+        self.refresh_interval = refresh_interval
+        self._decks: Dict[UUID, DeckCatalog] = {}
+        self._checked_at: Dict[UUID, float] = {}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._decks = {}
+            self._checked_at = {}
+
+    @staticmethod
+    def current_version(session: Session, deck_id: UUID) -> Optional[DeckVersionKey]:
+        """牌組版本 + 牌卡數量 + 最新牌卡時間；牌組不存在返回 None"""
+        row = session.exec(
+            select(CardDeck.version, func.count(Card.id), func.max(Card.created_at))
+            .select_from(CardDeck)
+            .outerjoin(Card, Card.deck_id == CardDeck.id)
+            .where(CardDeck.id == deck_id)
+            .group_by(CardDeck.id)
+        ).first()
+        if row is None:
+            return None
+        version, count, latest = row
+        return version, count, latest
+
+    def _load(
+        self,
+        session: Session,
+        deck_id: UUID,
+        version_key: DeckVersionKey,
+        previous: Optional[DeckCatalog],
+    ) -> DeckCatalog:
+        deck = session.get(CardDeck, deck_id)
+        cards = session.exec(
+            select(Card)
+            .where(Card.deck_id == deck_id)
+            .order_by(Card.display_order, Card.card_key)
+        ).all()
+
+        card_list = [serialize_card(card) for card in cards]
+        version = _catalog_version(card_list)
+        history: "OrderedDict[str, Dict[str, Dict[str, Any]]]" = OrderedDict()
+        if previous is not None:
+            history.update(previous.history)
+            if previous.version != version:
+                history[previous.version] = previous.cards
+            history.pop(version, None)
+            while len(history) > MAX_HISTORY_VERSIONS:
+                history.popitem(last=False)
+
+        return DeckCatalog(
+            deck_id=deck_id,
+            name=deck.name,
+            version=version,
+            cards={card["card_key"]: card for card in card_list},
+            payload=EncodedPayload.from_data(
+                {
+                    "deck_id": str(deck_id),
+                    "name": deck.name,
+                    "deck_version": deck.version,
+                    "version": version,
+                    "card_count": len(card_list),
+                    "cards": card_list,
+                }
+            ),
+            version_key=version_key,
+            history=history,
+        )
+
+    def get(self, session: Session, deck_id: UUID) -> Optional[DeckCatalog]:
+        """取得牌組目錄，超過檢查間隔且版本改變時重新載入"""
+        catalog = self._decks.get(deck_id)
+        checked_at = self._checked_at.get(deck_id, 0.0)
+        if (
+            catalog is not None
+            and time.monotonic() - checked_at < self.refresh_interval
+        ):
+            return catalog
+
+        version_key = self.current_version(session, deck_id)
+        if version_key is None:
+            with self._lock:
+                self._decks.pop(deck_id, None)
+                self._checked_at.pop(deck_id, None)
+            return None
+
+        if catalog is None or catalog.version_key != version_key:
+            catalog = self._load(session, deck_id, version_key, catalog)
+
+        with self._lock:
+            self._decks[deck_id] = catalog
+            self._checked_at[deck_id] = time.monotonic()
+        return catalog
+
+
+card_catalog = CardCatalog(refresh_interval=settings.card_catalog_refresh_seconds)
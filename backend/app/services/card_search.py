@@ -0,0 +1,225 @@
+"""
+Card Search Index
+牌卡搜尋索引
+
+以牌組目錄建立的程序內倒排索引：
+- 分面篩選：category / subcategory / card_metadata 純量值
+- 文字搜尋：title / description 以字元 bigram 索引（CJK 無需斷詞），
+  候選集合取交集後再以子字串驗證，前綴與子字串皆可命中
+- 排序：標題完全符合 > 標題前綴 > 標題子字串 > 描述，同分依 display_order
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+# 欄位比對分數
+SCORE_TITLE_EXACT = 10.0
+SCORE_TITLE_PREFIX = 6.0
+SCORE_TITLE_WORD_PREFIX = 5.0
+SCORE_TITLE_SUBSTRING = 4.0
+SCORE_DESCRIPTION_WORD_PREFIX = 2.0
+SCORE_DESCRIPTION_SUBSTRING = 1.0
+
+FACET_FIELDS = ("category", "subcategory")
+
+_WORD_BOUNDARY = re.compile(r"[^\w]|_")
+
+
+def normalize(text: Optional[str]) -> str:
+    """全形轉半形、轉小寫"""
+    if not text:
+        return ""
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def is_cjk(char: str) -> bool:
+    return (
+        "㐀" <= char <= "鿿"
+        or "豈" <= char <= "﫿"
+        or "぀" <= char <= "ヿ"
+        or "가" <= char <= "힯"
+    )
+
+
+def grams(text: str) -> Set[str]:
+    """字元 bigram；單一字元的文字返回其本身"""
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+def word_starts(text: str) -> Set[int]:
+    """
+    可作為「詞首」的位置
+
+    拉丁字母以非字母數字分隔；CJK 沒有空白斷詞，每個字元都視為詞首
+    """
+    starts = {0} if text else set()
+    for index in range(1, len(text)):
+        char = text[index]
+        if is_cjk(char) or _WORD_BOUNDARY.match(text[index - 1]):
+            starts.add(index)
+    return starts
+
+
+def _starts_word(text: str, term: str, starts: Set[int]) -> bool:
+    position = text.find(term)
+    while position != -1:
+        if position in starts:
+            return True
+        position = text.find(term, position + 1)
+    return False
+
+
+def tokenize_query(query: str) -> List[str]:
+    """以空白切分查詢字詞（CJK 查詢視為子字串，不再切分）"""
+    return [term for term in normalize(query).split() if term]
+
+
+class CardSearchIndex:
+    """單一牌組版本的搜尋索引（建立後唯讀）"""
+
+    def __init__(self, cards: Sequence[Mapping[str, Any]]):
+        self.cards: List[Mapping[str, Any]] = sorted(
+            cards, key=lambda card: (card.get("display_order") or 0, card["card_key"])
+        )
+        self._titles: List[str] = []
+        self._descriptions: List[str] = []
+        self._title_starts: List[Set[int]] = []
+        self._description_starts: List[Set[int]] = []
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._facets: Dict[str, Dict[Any, Set[int]]] = {
+            name: defaultdict(set) for name in FACET_FIELDS
+        }
+        self._metadata: Dict[Tuple[str, str], Set[int]] = defaultdict(set)
+
+        for doc_id, card in enumerate(self.cards):
+            title = normalize(card.get("title"))
+            description = normalize(card.get("description"))
+            self._titles.append(title)
+            self._descriptions.append(description)
+            self._title_starts.append(word_starts(title))
+            self._description_starts.append(word_starts(description))
+
+            for gram in grams(title) | grams(description):
+                self._postings[gram].add(doc_id)
+            for char in set(title) | set(description):
+                self._postings[char].add(doc_id)
+
+            for name in FACET_FIELDS:
+                self._facets[name][card.get(name)].add(doc_id)
+            for key, value in (card.get("card_metadata") or {}).items():
+                if isinstance(value, (str, int, float, bool)):
+                    self._metadata[(key, str(value).lower())].add(doc_id)
+
+        self._all: Set[int] = set(range(len(self.cards)))
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def _filter(
+        self,
+        category: Iterable[str] = (),
+        subcategory: Iterable[str] = (),
+        metadata: Iterable[Tuple[str, str]] = (),
+    ) -> Set[int]:
+        """分面篩選：同一欄位內為 OR，不同欄位間為 AND"""
+        result = self._all
+        for name, values in (("category", category), ("subcategory", subcategory)):
+            values = list(values)
+            if values:
+                postings = self._facets[name]
+                matched = set().union(*(postings.get(value, ()) for value in values))
+                result = result & matched
+        for key, value in metadata:
+            result = result & self._metadata.get((key, value.lower()), set())
+        return result
+
+    def _candidates(self, term: str) -> Set[int]:
+        """以 bigram 倒排列表交集取得可能包含 term 的牌卡"""
+        candidates: Optional[Set[int]] = None
+        for gram in sorted(grams(term), key=lambda g: len(self._postings.get(g, ()))):
+            postings = self._postings.get(gram)
+            if not postings:
+                return set()
+            candidates = postings if candidates is None else candidates & postings
+            if not candidates:
+                return set()
+        return set(candidates or ())
+
+    def _score(self, doc_id: int, term: str) -> float:
+        title = self._titles[doc_id]
+        if term in title:
+            if title == term:
+                return SCORE_TITLE_EXACT
+            if title.startswith(term):
+                return SCORE_TITLE_PREFIX
+            if _starts_word(title, term, self._title_starts[doc_id]):
+                return SCORE_TITLE_WORD_PREFIX
+            return SCORE_TITLE_SUBSTRING
+        description = self._descriptions[doc_id]
+        if term in description:
+            if _starts_word(description, term, self._description_starts[doc_id]):
+                return SCORE_DESCRIPTION_WORD_PREFIX
+            return SCORE_DESCRIPTION_SUBSTRING
+        return 0.0
+
+    def facet_counts(self, doc_ids: Iterable[int]) -> Dict[str, Dict[str, int]]:
+        """結果集合中各分面值的數量"""
+        counts: Dict[str, Counter] = {name: Counter() for name in FACET_FIELDS}
+        for doc_id in doc_ids:
+            card = self.cards[doc_id]
+            for name in FACET_FIELDS:
+                value = card.get(name)
+                if value is not None:
+                    counts[name][value] += 1
+        return {name: dict(counter) for name, counter in counts.items()}
+
+    def search(
+        self,
+        query: str = "",
+        category: Iterable[str] = (),
+        subcategory: Iterable[str] = (),
+        metadata: Iterable[Tuple[str, str]] = (),
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        搜尋牌卡
+
+        所有查詢字詞都必須命中（AND），分數為各字詞分數總和。
+        無查詢字詞時依 display_order 返回篩選結果。
+        """
+        doc_ids = self._filter(category, subcategory, metadata)
+        terms = tokenize_query(query)
+
+        scores: Dict[int, float] = {}
+        if terms:
+            for term in terms:
+                doc_ids = doc_ids & self._candidates(term)
+                if not doc_ids:
+                    break
+            for doc_id in doc_ids:
+                total = 0.0
+                for term in terms:
+                    score = self._score(doc_id, term)
+                    if not score:
+                        break
+                    total += score
+                else:
+                    scores[doc_id] = total
+            ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+        else:
+            ranked = sorted(doc_ids)
+
+        page = ranked[offset : offset + limit]
+        return {
+            "total": len(ranked),
+            "results": [
+                {"card": self.cards[doc_id], "score": scores.get(doc_id, 0.0)}
+                for doc_id in page
+            ],
+            "facets": self.facet_counts(ranked),
+        }
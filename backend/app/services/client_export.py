@@ -0,0 +1,175 @@
+"""
+Client Export
+客戶與諮詢記錄匯出（CSV / NDJSON 串流）
+
+資料以伺服器端游標（yield_per）分批讀取，每批編碼後立即輸出，
+記憶體用量只與批次大小有關，與總筆數無關。可選擇以 gzip 串流壓縮。
+匯出只投影需要的欄位（不含 game_state 與截圖網址）。
+"""
+
+import csv
+import io
+import zlib
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, Sequence, Tuple, Union
+from uuid import UUID
+
+import orjson
+from sqlalchemy import Select
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import Session, func, select
+
+from app.models.client import Client, ClientStats, ConsultationRecord
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_DATASETS = ("clients", "consultations")
+EXPORT_FORMATS = ("csv", "ndjson")
+
+
+def _clients_query(counselor_id: UUID) -> Select:
+    return (
+        select(
+            Client.id,
+            Client.name,
+            Client.email,
+            Client.phone,
+            Client.notes,
+            Client.status,
+            Client.tags,
+            Client.email_verified,
+            ClientStats.active_rooms_count,
+            ClientStats.total_consultations,
+            ClientStats.last_consultation_date,
+            Client.created_at,
+            Client.updated_at,
+        )
+        .outerjoin(ClientStats, ClientStats.client_id == Client.id)
+        .where(Client.counselor_id == counselor_id)
+        # Matches ix_clients_counselor_updated_id, so rows stream without a sort
+        .order_by(Client.updated_at, Client.id)
+    )
+
+
+def _consultations_query(counselor_id: UUID) -> Select:
+    return (
+        select(
+            ConsultationRecord.id,
+            ConsultationRecord.client_id,
+            Client.name.label("client_name"),
+            ConsultationRecord.room_id,
+            ConsultationRecord.session_date,
+            ConsultationRecord.duration_minutes,
+            ConsultationRecord.game_state["gameplay"].as_string().label("gameplay"),
+            func.coalesce(func.cardinality(ConsultationRecord.screenshots), 0).label(
+                "screenshot_count"
+            ),
+            ConsultationRecord.topics,
+            ConsultationRecord.notes,
+            ConsultationRecord.follow_up_required,
+            ConsultationRecord.follow_up_date,
+            ConsultationRecord.created_at,
+        )
+        .join(Client, Client.id == ConsultationRecord.client_id)
+        .where(ConsultationRecord.counselor_id == counselor_id)
+        .order_by(ConsultationRecord.session_date, ConsultationRecord.id)
+    )
+
+
+EXPORT_QUERIES = {"clients": _clients_query, "consultations": _consultations_query}
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return ";".join(str(item) for item in value)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _encode_csv(columns: Sequence[str]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def header() -> bytes:
+        # BOM 讓 Excel 以 UTF-8 開啟中文內容
+        writer.writerow(columns)
+        return ("\ufeff" + _drain(buffer)).encode()
+
+    def batch(rows: Iterable[Tuple]) -> bytes:
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        return _drain(buffer).encode()
+
+    return header, batch
+
+
+def _encode_ndjson(columns: Sequence[str]):
+    def header() -> bytes:
+        return b""
+
+    def batch(rows: Iterable[Tuple]) -> bytes:
+        return b"".join(
+            orjson.dumps(dict(zip(columns, row)), option=orjson.OPT_APPEND_NEWLINE)
+            for row in rows
+        )
+
+    return header, batch
+
+
+def _drain(buffer: io.StringIO) -> str:
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def _gzip(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_export(
+    bind: Union[Engine, Connection],
+    counselor_id: UUID,
+    dataset: str = "clients",
+    export_format: str = "csv",
+    compress: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """
+    逐批產生匯出內容（bytes）
+
+    使用獨立的 Session（繫結於請求 Session 的 engine / connection），
+    串流期間不依賴請求相依性的生命週期。
+    """
+    chunks = _iter_rows(bind, counselor_id, dataset, export_format, batch_size)
+    return _gzip(chunks) if compress else chunks
+
+
+def _iter_rows(
+    bind: Union[Engine, Connection],
+    counselor_id: UUID,
+    dataset: str,
+    export_format: str,
+    batch_size: int,
+) -> Iterator[bytes]:
+    query = EXPORT_QUERIES[dataset](counselor_id)
+    columns = [column.name for column in query.selected_columns]
+    encoders: Dict[str, Any] = {"csv": _encode_csv, "ndjson": _encode_ndjson}
+    header, batch = encoders[export_format](columns)
+
+    first = header()
+    if first:
+        yield first
+    with Session(bind) as session:
+        result = session.execute(query.execution_options(yield_per=batch_size))
+        for rows in result.partitions():
+            yield batch(rows)
@@ -0,0 +1,270 @@
+"""
+Client Import
+客戶批次匯入（CSV / NDJSON）
+
+1. 逐列以 ClientCreate 驗證，格式錯誤的列記錄為錯誤
+2. 有效列以 COPY 寫入暫存表 client_import（完成後刪除，失敗時隨交易回滾）
+3. 重複 email（檔案內重複、或諮商師已有相同 email 的客戶）以集合式查詢標記
+4. 客戶、預設諮詢室與 room_clients 各以一個 INSERT ... SELECT 建立
+
+整批在呼叫端的交易中執行，不會 commit。
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.models.client import ClientCreate, ClientImportError, ClientImportResult
+from app.models.room import generate_share_code
+
+MAX_IMPORT_ROWS = 50_000
+IMPORT_COLUMNS = ("name", "email", "phone", "notes", "tags")
+
+DUPLICATE_IN_FILE = "Duplicate email in this file"
+DUPLICATE_EXISTING = "You already have a client with this email address"
+
+_STAGING_COLUMNS = (
+    "row_no",
+    "client_id",
+    "room_id",
+    "share_code",
+    "name",
+    "email",
+    "phone",
+    "notes",
+    "tags",
+)
+
+
+class ImportFileError(ValueError):
+    """The uploaded file cannot be parsed at all."""
+
+
+def _iter_csv(content: str) -> Iterator[Dict[str, Any]]:
+    reader = csv.DictReader(io.StringIO(content))
+    if not reader.fieldnames or not set(IMPORT_COLUMNS) & set(reader.fieldnames):
+        raise ImportFileError(
+            f"CSV header must include at least one of: {', '.join(IMPORT_COLUMNS)}"
+        )
+    for record in reader:
+        tags = record.get("tags")
+        # 與匯出相同，以 ; 分隔多個標籤
+        record["tags"] = [tag.strip() for tag in tags.split(";")] if tags else []
+        yield record
+
+
+def _iter_ndjson(content: str) -> Iterator[Dict[str, Any]]:
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        # Invalid lines still count as a row so numbering matches the file
+        yield record if isinstance(record, dict) else {"__invalid__": True}
+
+
+def _clean(record: Dict[str, Any]) -> Dict[str, Any]:
+    values = {}
+    for column in IMPORT_COLUMNS:
+        value = record.get(column)
+        if isinstance(value, str):
+            value = value.strip() or None
+        values[column] = value
+    if values["tags"] is None:
+        values["tags"] = []
+    elif isinstance(values["tags"], list):
+        values["tags"] = [tag for tag in values["tags"] if tag]
+    # Anything else is left for ClientCreate to report as a row error
+    return values
+
+
+def parse_import_rows(
+    content: str, import_format: str
+) -> Tuple[List[Tuple[int, ClientCreate]], List[ClientImportError]]:
+    """解析並驗證上傳內容，返回 (有效列, 錯誤)，列號從 1 開始"""
+    parser = _iter_csv if import_format == "csv" else _iter_ndjson
+    rows: List[Tuple[int, ClientCreate]] = []
+    errors: List[ClientImportError] = []
+    for row_no, record in enumerate(parser(content), start=1):
+        if row_no > MAX_IMPORT_ROWS:
+            raise ImportFileError(f"Too many rows (max {MAX_IMPORT_ROWS})")
+        if "__invalid__" in record:
+            errors.append(ClientImportError(row=row_no, message="Invalid JSON object"))
+            continue
+        values = _clean(record)
+        try:
+            rows.append((row_no, ClientCreate.model_validate(values)))
+        except ValidationError as exc:
+            message = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                for error in exc.errors()
+            )
+            errors.append(
+                ClientImportError(
+                    row=row_no,
+                    email=values["email"] if isinstance(values["email"], str) else None,
+                    message=message,
+                )
+            )
+    return rows, errors
+
+
+def _copy_rows(session: Session, rows: List[Tuple[int, ClientCreate]]) -> None:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    share_codes = set()
+    for row_no, data in rows:
+        share_code = generate_share_code()
+        while share_code in share_codes:
+            share_code = generate_share_code()
+        share_codes.add(share_code)
+        writer.writerow(
+            (
+                row_no,
+                uuid4(),
+                uuid4(),
+                share_code,
+                # Empty unquoted CSV fields are read as NULL by COPY
+                data.name,
+                data.email,
+                data.phone,
+                data.notes,
+                json.dumps(data.tags, ensure_ascii=False),
+            )
+        )
+    buffer.seek(0)
+
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY client_import ({', '.join(_STAGING_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def _regenerate_taken_share_codes(session: Session) -> None:
+    """暫存的 share_code 與既有諮詢室衝突時重新產生（機率極低）"""
+    while True:
+        taken = session.execute(
+            text(
+                "SELECT s.row_no FROM client_import s "
+                "JOIN rooms r ON r.share_code = s.share_code"
+            )
+        ).all()
+        if not taken:
+            return
+        for (row_no,) in taken:
+            session.execute(
+                text(
+                    "UPDATE client_import SET share_code = :code "
+                    "WHERE row_no = :row_no AND NOT EXISTS ("
+                    "SELECT 1 FROM client_import WHERE share_code = :code)"
+                ),
+                {"code": generate_share_code(), "row_no": row_no},
+            )
+
+
+def import_clients(
+    session: Session,
+    counselor_id: UUID,
+    rows: List[Tuple[int, ClientCreate]],
+    errors: Optional[List[ClientImportError]] = None,
+) -> ClientImportResult:
+    """
+    批次建立客戶及其預設諮詢室
+
+    rows 為 parse_import_rows() 的有效列。重複 email 的列不建立，
+    與 errors 一起依列號返回。
+    """
+    errors = list(errors or [])
+    total_rows = len(rows) + len(errors)
+    if not rows:
+        return ClientImportResult(total_rows=total_rows, created=0, errors=errors)
+
+    session.execute(
+        text(
+            "CREATE TEMP TABLE client_import ("
+            "row_no integer PRIMARY KEY, client_id uuid NOT NULL, "
+            "room_id uuid NOT NULL, share_code varchar(6) NOT NULL, "
+            "name varchar(100), email varchar(255), phone varchar(50), "
+            "notes text, tags json NOT NULL, error text"
+            ")"
+        )
+    )
+    _copy_rows(session, rows)
+    params = {"counselor_id": counselor_id, "now": datetime.utcnow()}
+
+    # 檔案內重複：保留第一次出現的列
+    session.execute(
+        text(
+            "UPDATE client_import AS s SET error = :message FROM ("
+            "SELECT row_no, row_number() OVER (PARTITION BY email ORDER BY row_no) "
+            "AS n FROM client_import WHERE email IS NOT NULL"
+            ") AS d WHERE d.row_no = s.row_no AND d.n > 1"
+        ),
+        {"message": DUPLICATE_IN_FILE},
+    )
+    session.execute(
+        text(
+            "UPDATE client_import AS s SET error = :message FROM clients AS c "
+            "WHERE s.error IS NULL AND c.counselor_id = :counselor_id "
+            "AND c.email = s.email"
+        ),
+        {"message": DUPLICATE_EXISTING, **params},
+    )
+    _regenerate_taken_share_codes(session)
+
+    created = session.execute(
+        text(
+            "INSERT INTO clients (id, counselor_id, name, email, phone, notes, tags, "
+            "status, email_verified, created_at, updated_at) "
+            "SELECT client_id, :counselor_id, name, email, phone, notes, tags, "
+            "'ACTIVE', false, :now, :now FROM client_import "
+            "WHERE error IS NULL ORDER BY row_no"
+        ),
+        params,
+    ).rowcount
+    session.execute(
+        text(
+            "INSERT INTO rooms (id, counselor_id, name, description, share_code, "
+            "is_active, created_at, session_count) "
+            "SELECT room_id, :counselor_id, "
+            "coalesce(name, 'Anonymous') || ' 的諮詢室', '主要諮詢空間', share_code, "
+            "true, :now, 0 FROM client_import WHERE error IS NULL ORDER BY row_no"
+        ),
+        params,
+    )
+    session.execute(
+        text(
+            "INSERT INTO room_clients (id, room_id, client_id, created_at) "
+            "SELECT gen_random_uuid(), room_id, client_id, :now FROM client_import "
+            "WHERE error IS NULL ORDER BY row_no"
+        ),
+        params,
+    )
+
+    duplicates = session.execute(
+        text(
+            "SELECT row_no, email, error FROM client_import "
+            "WHERE error IS NOT NULL ORDER BY row_no"
+        )
+    ).all()
+    session.execute(text("DROP TABLE client_import"))
+    errors.extend(
+        ClientImportError(row=row_no, email=email, message=message)
+        for row_no, email, message in duplicates
+    )
+    errors.sort(key=lambda error: error.row)
+    return ClientImportResult(total_rows=total_rows, created=created, errors=errors)
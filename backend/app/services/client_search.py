@@ -0,0 +1,102 @@
+"""
+Client Search
+客戶搜尋（pg_trgm 三元組索引 + 相似度排序）
+
+查詢字串先做 NFKC 正規化（全形英數與空白轉半形）並依空白切詞，
+中英混合的輸入（例如「王 wang」）每個詞都必須命中 name / email / phone / tags
+其中之一。子字串比對（ILIKE）與單詞相似度（word_similarity, `%>`）都能使用
+ix_clients_search_trgm GIN 索引；資料庫未安裝 pg_trgm 時只做子字串比對。
+"""
+
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, Text, and_, case, cast, literal, or_, text
+from sqlmodel import Session, func, select
+
+from app.models.client import Client
+
+MAX_QUERY_TOKENS = 5
+# 少於 3 個字元的詞沒有完整的三元組，只做子字串比對
+MIN_SIMILARITY_LENGTH = 3
+
+# 資料庫 URL → 是否已安裝 pg_trgm
+_trigram_installed: Dict[str, bool] = {}
+
+
+def normalize_query(q: str) -> List[str]:
+    """NFKC 正規化、轉小寫並依空白切詞（最多 MAX_QUERY_TOKENS 個）"""
+    return unicodedata.normalize("NFKC", q).lower().split()[:MAX_QUERY_TOKENS]
+
+
+def trigram_installed(session: Session) -> bool:
+    """資料庫是否已安裝 pg_trgm（每個資料庫只查詢一次）"""
+    url = str(session.get_bind().engine.url)
+    if url not in _trigram_installed:
+        _trigram_installed[url] = (
+            session.exec(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            ).first()
+            is not None
+        )
+    return _trigram_installed[url]
+
+
+def _escape_like(token: str) -> str:
+    return token.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_search_query(
+    counselor_id: UUID, q: str, limit: int = 20, similarity: bool = True
+) -> Optional[Select]:
+    """
+    建立排序後的搜尋查詢（無有效詞時返回 None）
+
+    每個詞的分數：名稱前綴 1.0、任一欄位子字串 0.5，similarity 為 True 時
+    再加上各欄位中最高的 word_similarity。總分為各詞分數相加，
+    同分依 updated_at 新到舊。
+    """
+    tokens = normalize_query(q)
+    if not tokens:
+        return None
+
+    fields = (Client.name, Client.email, Client.phone, cast(Client.tags, Text))
+    conditions = []
+    score = literal(0.0)
+    for token in tokens:
+        escaped = _escape_like(token)
+        matches = [field.ilike(f"%{escaped}%", escape="\\") for field in fields]
+        token_score = case(
+            (Client.name.ilike(f"{escaped}%", escape="\\"), 1.0),
+            (or_(*matches), 0.5),
+            else_=0.0,
+        )
+        if similarity and len(token) >= MIN_SIMILARITY_LENGTH:
+            # field %> token 等同 token <% field，索引欄位在左側才能使用 GIN
+            matches += [field.op("%>")(token) for field in fields]
+            token_score = token_score + func.coalesce(
+                func.greatest(*(func.word_similarity(token, f) for f in fields)), 0.0
+            )
+        conditions.append(or_(*matches))
+        score = score + token_score
+
+    score = score.label("score")
+    return (
+        select(Client, score)
+        .where(Client.counselor_id == counselor_id, and_(*conditions))
+        .order_by(score.desc(), Client.updated_at.desc(), Client.id.desc())
+        .limit(limit)
+    )
+
+
+def search_clients(
+    session: Session, counselor_id: UUID, q: str, limit: int = 20
+) -> List[Tuple[Client, float]]:
+    """搜尋諮詢師的客戶，返回 (客戶, 分數)，依相關度排序"""
+    query = build_search_query(counselor_id, q, limit, trigram_installed(session))
+    if query is None:
+        return []
+    return [
+        (client, round(float(score), 4)) for client, score in session.exec(query).all()
+    ]
@@ -0,0 +1,121 @@
+"""
+Client Stats
+客戶統計（client_stats 表）
+
+client_stats 由資料庫觸發器在 rooms / room_clients / consultation_records
+變動的同一個交易中更新，讀取只需主鍵查詢。
+load_client_detail() 以單一查詢取得客戶資料與統計，供客戶詳細資料端點共用。
+reconcile_client_stats() 以單一集合式 upsert 從來源表重新計算，修復漂移
+（例如觸發器建立前的資料或手動修改）。
+"""
+
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, func, select
+
+from app.models.client import (
+    Client,
+    ClientResponse,
+    ClientStats,
+    ConsultationRecord,
+    RoomClient,
+)
+from app.models.room import Room
+
+STAT_COLUMNS = ("active_rooms_count", "total_consultations", "last_consultation_date")
+
+
+def load_client_detail(session: Session, client_id: UUID) -> Optional[ClientResponse]:
+    """客戶資料與統計（單一查詢），客戶不存在時返回 None"""
+    row = session.execute(
+        select(
+            Client.id,
+            Client.email,
+            Client.name,
+            Client.phone,
+            Client.notes,
+            Client.tags,
+            Client.status,
+            Client.counselor_id,
+            Client.email_verified,
+            Client.verified_at,
+            Client.created_at,
+            Client.updated_at,
+            func.coalesce(ClientStats.active_rooms_count, 0).label(
+                "active_rooms_count"
+            ),
+            func.coalesce(ClientStats.total_consultations, 0).label(
+                "total_consultations"
+            ),
+            ClientStats.last_consultation_date,
+        )
+        .outerjoin(ClientStats, ClientStats.client_id == Client.id)
+        .where(Client.id == client_id)
+    ).first()
+    if row is None:
+        return None
+    return ClientResponse(**{**row._mapping, "tags": row.tags or []})
+
+
+def reconcile_client_stats(
+    session: Session, client_ids: Optional[Iterable[UUID]] = None
+) -> int:
+    """
+    從來源表重新計算統計並修復不一致的資料列
+
+    client_ids 為 None 時處理全部客戶。只寫入缺少或數值不同的資料列，
+    返回修復的列數。不會 commit，由呼叫端決定交易邊界。
+    """
+    rooms = (
+        select(
+            RoomClient.client_id,
+            func.count().filter(Room.is_active).label("active_rooms_count"),
+            func.coalesce(func.sum(Room.session_count), 0).label("total_consultations"),
+        )
+        .join(Room, Room.id == RoomClient.room_id)
+        .join(Client, Client.id == RoomClient.client_id)
+        .where(Room.counselor_id == Client.counselor_id)
+        .group_by(RoomClient.client_id)
+        .subquery()
+    )
+    records = (
+        select(
+            ConsultationRecord.client_id,
+            func.max(ConsultationRecord.session_date).label("last_consultation_date"),
+        )
+        .group_by(ConsultationRecord.client_id)
+        .subquery()
+    )
+    fresh = (
+        select(
+            Client.id,
+            func.coalesce(rooms.c.active_rooms_count, 0),
+            func.coalesce(rooms.c.total_consultations, 0),
+            records.c.last_consultation_date,
+            func.timezone("utc", func.now()),
+        )
+        .outerjoin(rooms, rooms.c.client_id == Client.id)
+        .outerjoin(records, records.c.client_id == Client.id)
+    )
+    if client_ids is not None:
+        client_ids = list(client_ids)
+        if not client_ids:
+            return 0
+        fresh = fresh.where(Client.id.in_(client_ids))
+
+    table = ClientStats.__table__
+    stmt = insert(table).from_select(["client_id", *STAT_COLUMNS, "updated_at"], fresh)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.client_id],
+        set_={
+            **{name: stmt.excluded[name] for name in STAT_COLUMNS},
+            "updated_at": stmt.excluded.updated_at,
+        },
+        where=tuple_(*(table.c[name] for name in STAT_COLUMNS)).is_distinct_from(
+            tuple_(*(stmt.excluded[name] for name in STAT_COLUMNS))
+        ),
+    )
+    return session.connection().execute(stmt).rowcount
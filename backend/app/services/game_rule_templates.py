@@ -0,0 +1,184 @@
+"""
+Game Rule Template Cache
+遊戲規則模板快取
+
+啟動時載入所有啟用中的 GameRuleTemplate，以 slug 與 id 建立索引。
+每隔 refresh_interval 秒以 max(updated_at) + count 做一次輕量版本檢查，
+版本改變時才重新載入，因此穩定狀態下建立諮詢室不需要查詢模板。
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.game.registry import rule_registry
+from app.models.game_rule import GameRuleTemplate
+
+TemplateVersion = Tuple[Optional[datetime], int]
+
+
+@dataclass(frozen=True)
+class CachedTemplate:
+    """模板快照（不綁定 Session）"""
+
+    id: UUID
+    slug: str
+    name: str
+    version: str
+    is_active: bool
+
+
+def ensure_default_templates(session: Session) -> int:
+    """
+    為註冊表中的內建規則建立預設模板（冪等）
+
+    使用 INSERT ... ON CONFLICT (slug) DO NOTHING，
+    多個程序同時執行也不會重複建立。返回新建立的數量。
+    """
+    now = datetime.utcnow()
+    created = 0
+    for rule in rule_registry:
+        config = rule.config
+        statement = (
+            insert(GameRuleTemplate)
+            .values(
+                id=uuid4(),
+                slug=config.id,
+                name=config.name,
+                description=f"預設{config.name}規則",
+                version=config.version,
+                layout_config=config.layout.to_dict(),
+                constraint_config=config.constraints.to_dict(),
+                validation_rules={},
+                is_active=True,
+                created_at=now,
+            )
+            .on_conflict_do_nothing(index_elements=["slug"])
+        )
+        created += session.exec(statement).rowcount or 0
+    session.commit()
+    return created
+
+
+class GameRuleTemplateCache:
+    """程序內的遊戲規則模板快取"""
+
+    def __init__(self, refresh_interval: float = 30.0):
+        self.refresh_interval = refresh_interval
+        self._by_slug: Dict[str, CachedTemplate] = {}
+        self._by_id: Dict[UUID, CachedTemplate] = {}
+        self._version: Optional[TemplateVersion] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._version is not None
+
+    def clear(self) -> None:
+        """清除快取，下次存取時重新載入"""
+        with self._lock:
+            self._by_slug = {}
+            self._by_id = {}
+            self._version = None
+            self._checked_at = 0.0
+
+    @staticmethod
+    def current_version(session: Session) -> TemplateVersion:
+        """輕量版本檢查：最新修改時間與模板數量"""
+        latest, count = session.exec(
+            select(
+                func.max(
+                    func.coalesce(
+                        GameRuleTemplate.updated_at, GameRuleTemplate.created_at
+                    )
+                ),
+                func.count(GameRuleTemplate.id),
+            )
+        ).one()
+        return latest, count
+
+    def load(self, session: Session) -> None:
+        """從資料庫載入所有模板"""
+        version = self.current_version(session)
+        templates = session.exec(select(GameRuleTemplate)).all()
+
+        by_slug: Dict[str, CachedTemplate] = {}
+        by_id: Dict[UUID, CachedTemplate] = {}
+        for template in templates:
+            cached = CachedTemplate(
+                id=template.id,
+                slug=template.slug,
+                name=template.name,
+                version=template.version,
+                is_active=template.is_active,
+            )
+            by_id[cached.id] = cached
+            if cached.is_active:
+                by_slug[cached.slug] = cached
+
+        with self._lock:
+            self._by_slug = by_slug
+            self._by_id = by_id
+            self._version = version
+            self._checked_at = time.monotonic()
+
+    def refresh_if_stale(self, session: Session) -> None:
+        """超過檢查間隔時比對版本，版本改變才重新載入"""
+        if not self.loaded:
+            self.load(session)
+            return
+        if time.monotonic() - self._checked_at < self.refresh_interval:
+            return
+
+        version = self.current_version(session)
+        if version != self._version:
+            self.load(session)
+        else:
+            self._checked_at = time.monotonic()
+
+    def get_by_slug(self, session: Session, slug: str) -> Optional[CachedTemplate]:
+        """依 slug 取得啟用中的模板"""
+        self.refresh_if_stale(session)
+        return self._by_slug.get(slug)
+
+    def get_by_id(
+        self, session: Session, template_id: UUID
+    ) -> Optional[CachedTemplate]:
+        self.refresh_if_stale(session)
+        return self._by_id.get(template_id)
+
+    def get_or_create_default(
+        self, session: Session, slug: str
+    ) -> Optional[CachedTemplate]:
+        """
+        依 slug 取得模板；內建規則的模板不存在時冪等建立後重新載入
+
+        未知的 slug 返回 None
+        """
+        template = self.get_by_slug(session, slug)
+        if template is not None or slug not in rule_registry:
+            return template
+
+        ensure_default_templates(session)
+        self.load(session)
+        return self._by_slug.get(slug)
+
+
+template_cache = GameRuleTemplateCache(
+    refresh_interval=settings.game_rule_template_refresh_seconds
+)
+
+
+def warm_template_cache(session: Session) -> None:
+    """啟動時建立預設模板並載入快取"""
+    ensure_default_templates(session)
+    template_cache.load(session)
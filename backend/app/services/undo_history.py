@@ -0,0 +1,121 @@
+"""
+Undo History
+遊戲動作的復原 / 重做堆疊
+
+每個 (room_id, gameplay_id) 保留有上限的復原堆疊。每一步保存執行的動作與
+其反向動作，復原只需執行反向動作，不必重新上傳整個狀態。
+堆疊記錄其對應的狀態版本；狀態被其他途徑改寫（版本不符）時整組作廢。
+堆疊保存在程序記憶體中，服務重啟後清空；最多保留 max_games 個遊戲的歷史，
+超過時丟棄最久未使用者（LRU）。
+"""
+
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Deque, List, Optional, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.game.engine import GameAction
+
+HistoryKey = Tuple[UUID, str]
+
+
+@dataclass(frozen=True)
+class UndoStep:
+    """一步可復原的操作"""
+
+    actions: List[GameAction]
+    inverse: List[GameAction]
+
+
+@dataclass
+class RoomHistory:
+    """單一遊戲的復原 / 重做堆疊"""
+
+    limit: int
+    version: Optional[int] = None
+    undo: Deque[UndoStep] = field(default_factory=deque)
+    redo: Deque[UndoStep] = field(default_factory=deque)
+
+    def __post_init__(self):
+        self.undo = deque(self.undo, maxlen=self.limit)
+        self.redo = deque(self.redo, maxlen=self.limit)
+
+
+class UndoHistory:
+    """程序內所有遊戲的復原歷史"""
+
+    def __init__(self, limit: int = 50, max_games: int = 1000):
+        self.limit = limit
+        self.max_games = max_games
+        self._rooms: OrderedDict[HistoryKey, RoomHistory] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: HistoryKey, version: int) -> RoomHistory:
+        """取得堆疊（標記為最近使用），版本不符時重設"""
+        history = self._rooms.get(key)
+        if history is None or history.version != version:
+            history = self._rooms[key] = RoomHistory(limit=self.limit)
+            history.version = version
+        self._rooms.move_to_end(key)
+        while len(self._rooms) > self.max_games:
+            self._rooms.popitem(last=False)
+        return history
+
+    def record(self, key: HistoryKey, step: UndoStep, base_version: int, version: int):
+        """記錄新操作（清空重做堆疊）"""
+        with self._lock:
+            history = self._get(key, base_version)
+            history.undo.append(step)
+            history.redo.clear()
+            history.version = version
+
+    def pop_undo(self, key: HistoryKey, version: int) -> Optional[UndoStep]:
+        with self._lock:
+            history = self._get(key, version)
+            return history.undo.pop() if history.undo else None
+
+    def pop_redo(self, key: HistoryKey, version: int) -> Optional[UndoStep]:
+        with self._lock:
+            history = self._get(key, version)
+            return history.redo.pop() if history.redo else None
+
+    def push_undone(self, key: HistoryKey, step: UndoStep, version: int) -> None:
+        """復原完成，步驟移到重做堆疊（歷史已被作廢時略過）"""
+        with self._lock:
+            history = self._rooms.get(key)
+            if history is None:
+                return
+            history.redo.append(step)
+            history.version = version
+
+    def push_redone(self, key: HistoryKey, step: UndoStep, version: int) -> None:
+        """重做完成，步驟移回復原堆疊（歷史已被作廢時略過）"""
+        with self._lock:
+            history = self._rooms.get(key)
+            if history is None:
+                return
+            history.undo.append(step)
+            history.version = version
+
+    def status(self, key: HistoryKey, version: int) -> Tuple[bool, bool]:
+        """返回 (可復原, 可重做)"""
+        with self._lock:
+            history = self._rooms.get(key)
+            if history is None or history.version != version:
+                return False, False
+            return bool(history.undo), bool(history.redo)
+
+    def discard(self, key: HistoryKey) -> None:
+        with self._lock:
+            self._rooms.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rooms = OrderedDict()
+
+
+undo_history = UndoHistory(
+    limit=settings.undo_history_limit, max_games=settings.undo_history_max_games
+)
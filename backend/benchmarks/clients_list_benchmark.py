@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Client list benchmark - 客戶列表效能測試
+
+在一個最後會 rollback 的交易中為一位諮詢師建立大量客戶（預設 10,000 位，
+每位 1 間諮詢室與 1 筆諮詢紀錄），比較 GET /api/clients 的：
+- 完整列表（舊行為：所有客戶 + rooms + stats）
+- keyset 分頁第一頁 / 深層頁面（include=stats 或不展開）
+
+    python benchmarks/clients_list_benchmark.py --clients 10000
+    TEST_DATABASE_URL=postgresql://... python benchmarks/clients_list_benchmark.py
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, create_engine, select
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api.clients import encode_keyset_cursor  # noqa: E402
+from app.core.auth import create_access_token  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import get_session  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.client import Client, ConsultationRecord, RoomClient  # noqa: E402
+from app.models.room import Room  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+DATABASE_URL = os.getenv(
+    "TEST_DATABASE_URL",
+    str(settings.database_url).replace("/career_creator", "/career_creator_test"),
+)
+
+
+def seed(session: Session, clients: int) -> User:
+    counselor = User(
+        email=f"benchmark-{uuid4().hex[:8]}@example.com",
+        name="Benchmark Counselor",
+        hashed_password="-",
+        roles=["counselor"],
+    )
+    session.add(counselor)
+    session.flush()
+
+    base = datetime(2025, 1, 1)
+    for start in range(0, clients, 1000):
+        batch = range(start, min(start + 1000, clients))
+        client_rows = [
+            Client(
+                counselor_id=counselor.id,
+                name=f"Client {i:05d}",
+                email=f"client{i}@example.com",
+                updated_at=base + timedelta(seconds=i),
+            )
+            for i in batch
+        ]
+        rooms = [
+            Room(counselor_id=counselor.id, name=f"Room {i}", session_count=1)
+            for i in batch
+        ]
+        session.add_all(client_rows + rooms)
+        session.flush()
+        session.add_all(
+            [
+                RoomClient(room_id=room.id, client_id=client.id)
+                for client, room in zip(client_rows, rooms)
+            ]
+            + [
+                ConsultationRecord(
+                    room_id=room.id,
+                    client_id=client.id,
+                    counselor_id=counselor.id,
+                    session_date=base,
+                )
+                for client, room in zip(client_rows, rooms)
+            ]
+        )
+        session.flush()
+    for table in ("clients", "rooms", "room_clients", "consultation_records"):
+        session.execute(text(f"ANALYZE {table}"))
+    return counselor
+
+
+def timed(label: str, func, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<44} {best * 1000:9.1f} ms  {len(result.content):>10} bytes")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GET /api/clients")
+    parser.add_argument("--clients", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = create_engine(DATABASE_URL)
+    SQLModel.metadata.create_all(engine)
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection)
+    try:
+        start = time.perf_counter()
+        counselor = seed(session, args.clients)
+        print(f"seeded {args.clients} clients in {time.perf_counter() - start:.1f}s")
+
+        app.dependency_overrides[get_session] = lambda: session
+        client = TestClient(app)
+        token = create_access_token(
+            {"sub": str(counselor.id), "email": counselor.email, "roles": ["counselor"]}
+        )
+        headers = {"Authorization": f"Bearer {token}"}
+
+        def get(**params):
+            response = client.get("/api/clients", params=params, headers=headers)
+            assert response.status_code == 200, response.text
+            return response
+
+        timed("full list (rooms,stats)", get, args.repeat)
+        page = args.page_size
+        timed(f"first page limit={page} (rooms,stats)", lambda: get(limit=page), 5)
+        timed(
+            f"first page limit={page} include=stats",
+            lambda: get(limit=page, include="stats"),
+            5,
+        )
+        first = timed(
+            f"first page limit={page} include=",
+            lambda: get(limit=page, include=""),
+            5,
+        )
+
+        # 深層頁面：從約 90% 的位置開始
+        deep = session.exec(
+            select(Client)
+            .where(Client.counselor_id == counselor.id)
+            .order_by(Client.updated_at.desc(), Client.id.desc())
+            .offset(int(args.clients * 0.9))
+        ).first()
+        cursor = encode_keyset_cursor(deep.updated_at, deep.id)
+        timed(
+            f"deep page limit={page} include=stats",
+            lambda: get(limit=page, include="stats", cursor=cursor),
+            5,
+        )
+        assert first.headers.get("X-Next-Cursor")
+    finally:
+        app.dependency_overrides.clear()
+        session.close()
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Compare benchmarks - 比較兩份基準測試結果
+
+比較 engine_benchmark.py 產生的 JSON，耗時或峰值記憶體超過門檻即視為退步，
+有退步時以 exit code 1 結束（可用於 CI）。
+
+    python benchmarks/compare_benchmarks.py baseline.json current.json
+    python benchmarks/compare_benchmarks.py baseline.json current.json \\
+        --time-threshold 0.3 --memory-threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# 指標 → 門檻參數名稱
+METRICS = {"ns_per_op": "time_threshold", "peak_bytes_per_op": "memory_threshold"}
+
+
+def compare(
+    baseline: Dict[str, dict],
+    current: Dict[str, dict],
+    thresholds: Dict[str, float],
+) -> Tuple[List[str], List[str]]:
+    """返回 (報表行, 退步項目)；只比較兩邊都有的項目"""
+    lines: List[str] = []
+    regressions: List[str] = []
+    for name in sorted(baseline.keys() & current.keys()):
+        for metric, threshold in thresholds.items():
+            old = baseline[name].get(metric)
+            new = current[name].get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{name} {metric}")
+            elif change < -threshold:
+                flag = "  improved"
+            lines.append(
+                f"{name:<48} {metric:<18} {old:>12} -> {new:>12} "
+                f"({change:+7.1%}){flag}"
+            )
+    for name in sorted(baseline.keys() - current.keys()):
+        lines.append(f"{name:<48} missing from current results")
+    for name in sorted(current.keys() - baseline.keys()):
+        lines.append(f"{name:<48} new (no baseline)")
+    return lines, regressions
+
+
+def load_results(path: str) -> Dict[str, dict]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))["results"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare benchmark results")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--time-threshold",
+        type=float,
+        default=0.25,
+        help="allowed relative slowdown (default 0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=0.10,
+        help="allowed relative growth of peak allocations (default 0.10)",
+    )
+    args = parser.parse_args()
+
+    thresholds = {metric: getattr(args, attr) for metric, attr in METRICS.items()}
+    lines, regressions = compare(
+        load_results(args.baseline), load_results(args.current), thresholds
+    )
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for item in regressions:
+            print(f"  {item}")
+        sys.exit(1)
+    print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Concurrent queries benchmark - 獨立查詢並行效能測試
+
+在本機 PostgreSQL 前面放一個延遲代理（每個方向的封包延遲 --latency ms，
+模擬遠端資料庫的往返時間），比較獨立查詢依序執行與 execute_concurrently
+的耗時：
+
+- clients: GET /api/clients/ 的 rooms / counselor 預載（統計已併入分頁查詢）
+- tables: GET /api/admin/db/tables 的每表 COUNT(*)
+
+測試資料會 commit 到測試資料庫，結束時刪除。
+
+    python benchmarks/concurrent_queries_benchmark.py --latency 5 --clients 50
+"""
+
+import argparse
+import os
+import queue
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy import delete, text
+from sqlalchemy.engine import make_url
+from sqlmodel import Session, SQLModel, create_engine, select
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api.clients import client_list_rooms_query  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import execute_concurrently  # noqa: E402
+from app.models.client import Client, RoomClient  # noqa: E402
+from app.models.room import Room  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+DATABASE_URL = os.getenv(
+    "TEST_DATABASE_URL",
+    str(settings.database_url).replace("/career_creator", "/career_creator_test"),
+)
+
+
+class LatencyProxy:
+    """TCP proxy that adds a fixed one-way latency to each direction"""
+
+    def __init__(self, target_host: str, target_port: int, latency: float):
+        self.target = (target_host, target_port)
+        self.latency = latency
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self.listener.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            client, _ = self.listener.accept()
+            upstream = socket.create_connection(self.target)
+            for sock in (client, upstream):
+                # Forward small packets at once; Nagle would add its own delay
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            for source, sink in ((client, upstream), (upstream, client)):
+                pending = queue.Queue()
+                threading.Thread(
+                    target=self._read, args=(source, pending), daemon=True
+                ).start()
+                threading.Thread(
+                    target=self._write, args=(sink, pending), daemon=True
+                ).start()
+
+    def _read(self, source: socket.socket, pending: queue.Queue):
+        try:
+            while chunk := source.recv(65536):
+                pending.put((time.perf_counter() + self.latency, chunk))
+        except OSError:
+            pass
+        pending.put((0, b""))
+
+    def _write(self, sink: socket.socket, pending: queue.Queue):
+        # Every chunk is delivered `latency` after it was read, so a response
+        # split over several packets still costs one delay, like a real link
+        try:
+            while True:
+                due, chunk = pending.get()
+                if not chunk:
+                    break
+                time.sleep(max(due - time.perf_counter(), 0))
+                sink.sendall(chunk)
+        except OSError:
+            pass
+        sink.close()
+
+
+def seed(session: Session, clients: int) -> User:
+    counselor = User(
+        email=f"bench-{uuid4().hex[:8]}@example.com",
+        name="Benchmark Counselor",
+        hashed_password="x",
+        roles=["counselor"],
+    )
+    session.add(counselor)
+    session.flush()
+    for n in range(clients):
+        client = Client(counselor_id=counselor.id, name=f"Client {n}")
+        room = Room(counselor_id=counselor.id, name=f"Room {n}")
+        session.add_all([client, room])
+        session.flush()
+        session.add(RoomClient(room_id=room.id, client_id=client.id))
+    session.commit()
+    return counselor
+
+
+def client_preloads(session: Session, counselor_id, limit: int):
+    client_ids = session.exec(
+        select(Client.id)
+        .where(Client.counselor_id == counselor_id)
+        .order_by(Client.updated_at.desc(), Client.id.desc())
+        .limit(limit)
+    ).all()
+    return [
+        client_list_rooms_query(client_ids, counselor_id),
+        select(User.name).where(User.id == counselor_id),
+    ]
+
+
+def table_counts(session: Session):
+    names = session.execute(
+        text(
+            "SELECT table_name FROM information_schema.tables "
+            "WHERE table_schema = current_schema() AND table_type = 'BASE TABLE' "
+            "ORDER BY table_name"
+        )
+    ).scalars()
+    return [text(f'SELECT COUNT(*) FROM "{name}"') for name in names]
+
+
+def measure(engine, statements, repeat: int):
+    sequential, concurrent = [], []
+    for _ in range(repeat):
+        with Session(engine) as session:
+            start = time.perf_counter()
+            for statement in statements:
+                session.execute(statement).all()
+            sequential.append(time.perf_counter() - start)
+        with Session(engine) as session:
+            start = time.perf_counter()
+            execute_concurrently(session, statements)
+            concurrent.append(time.perf_counter() - start)
+    return statistics.median(sequential), statistics.median(concurrent)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent read queries")
+    parser.add_argument("--latency", type=float, default=5.0, help="One-way ms")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    url = make_url(DATABASE_URL)
+    local = create_engine(url)
+    SQLModel.metadata.create_all(local)
+    proxy = LatencyProxy(url.host, url.port or 5432, args.latency / 1000)
+    remote = create_engine(url.set(host="127.0.0.1", port=proxy.port), pool_size=10)
+
+    with Session(local) as session:
+        counselor = seed(session, args.clients)
+        counselor_id = counselor.id
+
+    try:
+        with Session(remote) as session:
+            cases = {
+                "clients": client_preloads(session, counselor_id, args.clients),
+                "tables": table_counts(session),
+            }
+        # Warm the pool so connection setup is not measured
+        with Session(remote) as session:
+            execute_concurrently(session, cases["tables"])
+
+        print(f"Simulated latency: {args.latency:.1f} ms each way\n")
+        print(f"{'case':<10}{'queries':>8}{'sequential':>14}{'concurrent':>14}")
+        for name, statements in cases.items():
+            seq, con = measure(remote, statements, args.repeat)
+            print(
+                f"{name:<10}{len(statements):>8}"
+                f"{seq * 1000:>11.1f} ms{con * 1000:>11.1f} ms"
+            )
+    finally:
+        with Session(local) as session:
+            client_ids = select(Client.id).where(Client.counselor_id == counselor_id)
+            session.exec(delete(RoomClient).where(RoomClient.client_id.in_(client_ids)))
+            session.exec(delete(Room).where(Room.counselor_id == counselor_id))
+            session.exec(delete(Client).where(Client.counselor_id == counselor_id))
+            session.exec(delete(User).where(User.id == counselor_id))
+            session.commit()
+
+
+if __name__ == "__main__":
+    main()
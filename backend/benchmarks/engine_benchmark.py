@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Engine benchmark - 遊戲引擎微基準測試
+
+量測 app/game 核心操作在三個內建規則、一般與 10 倍牌卡數量下的耗時與記憶體配置：
+- create_initial_state
+- place_card_in_zone（逐張放滿盤面）
+- execute_action（翻面 / 移動，含驗證）
+- to_dict / from_dict 往返
+
+結果寫成 JSON；與 benchmarks/baselines/engine_benchmark.json 比較請用
+compare_benchmarks.py。
+
+    python benchmarks/engine_benchmark.py --output current.json
+    python benchmarks/compare_benchmarks.py \\
+        benchmarks/baselines/engine_benchmark.json current.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game.config import ActionType  # noqa: E402
+from app.game.engine import GameAction, GameEngine, GameState  # noqa: E402
+from app.game.registry import rule_registry  # noqa: E402
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "engine_benchmark.json"
+
+# 一般諮詢中盤面上的牌卡數（職能盤點與價值導航為規則上限，職游旅人為整副牌）
+REALISTIC_CARDS = {
+    "skill_assessment": 10,
+    "value_navigation": 9,
+    "career_personality": 106,
+}
+SCALES = (1, 10)
+
+# (名稱, 每次呼叫的操作數, 無參數的函式)
+Case = Tuple[str, int, Callable[[], object]]
+
+
+def fill_board(rule_id: str, cards: int) -> GameState:
+    """依序把牌卡平均放到各區域（不檢查規則上限）"""
+    state = GameState.create_initial_state("benchmark", rule_id)
+    zone_ids = list(state.zones)
+    for index in range(cards):
+        state = state.place_card_in_zone(
+            f"card_{index:04d}", zone_ids[index % len(zone_ids)]
+        )
+    return state
+
+
+def board_actions(state: GameState) -> List[GameAction]:
+    """每張牌卡一個動作：偶數翻面、奇數移到下一個區域"""
+    zone_ids = list(state.zones)
+    actions = []
+    for index, (card_id, zone_id) in enumerate(sorted(state.card_locations.items())):
+        if index % 2:
+            target = zone_ids[(zone_ids.index(zone_id) + 1) % len(zone_ids)]
+            actions.append(
+                GameAction(
+                    type=ActionType.MOVE,
+                    player_id="counselor",
+                    card_id=card_id,
+                    target_zone=target,
+                )
+            )
+        else:
+            actions.append(
+                GameAction(type=ActionType.FLIP, player_id="counselor", card_id=card_id)
+            )
+    return actions
+
+
+def build_cases(rule_ids: List[str]) -> List[Case]:
+    cases: List[Case] = []
+    for rule_id in rule_ids:
+        config = rule_registry.get_config(rule_id)
+        cases.append(
+            (
+                f"{rule_id}/create_initial_state",
+                1,
+                lambda rule_id=rule_id: GameState.create_initial_state(
+                    "benchmark", rule_id
+                ),
+            )
+        )
+        for scale in SCALES:
+            cards = REALISTIC_CARDS[rule_id] * scale
+            board = fill_board(rule_id, cards)
+            actions = board_actions(board)
+            engine = GameEngine(config)
+
+            def execute(board=board, actions=actions, engine=engine):
+                state = board
+                for action in actions:
+                    result = engine.execute_action(action, state)
+                    if result.success:
+                        state = result.new_state
+                return state
+
+            cases.extend(
+                [
+                    (
+                        f"{rule_id}/place_card_in_zone/{cards}",
+                        cards,
+                        lambda rule_id=rule_id, cards=cards: fill_board(rule_id, cards),
+                    ),
+                    (f"{rule_id}/execute_action/{cards}", len(actions), execute),
+                    (
+                        f"{rule_id}/dict_round_trip/{cards}",
+                        1,
+                        lambda board=board: GameState.from_dict(board.to_dict()),
+                    ),
+                ]
+            )
+    return cases
+
+
+def measure_time(func: Callable[[], object], operations: int, repeat: int) -> float:
+    """最佳一輪的每次操作耗時（奈秒）"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / (number * operations) * 1e9
+
+
+def measure_memory(func: Callable[[], object], operations: int) -> Dict[str, int]:
+    """tracemalloc：單次呼叫的峰值配置與保留下來的結果大小"""
+    func()  # 預熱（快取、延遲初始化）
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {
+        "peak_bytes": peak - before,
+        "peak_bytes_per_op": (peak - before) // operations,
+        "retained_bytes": current - before,
+    }
+
+
+def run(rule_ids: List[str], repeat: int) -> dict:
+    results = {}
+    for name, operations, func in build_cases(rule_ids):
+        ns_per_op = measure_time(func, operations, repeat)
+        results[name] = {
+            "operations": operations,
+            "ns_per_op": round(ns_per_op, 1),
+            **measure_memory(func, operations),
+        }
+        print(
+            f"{name:<48} {ns_per_op:12.1f} ns/op "
+            f"{results[name]['peak_bytes_per_op']:10d} B/op peak"
+        )
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the game engine")
+    parser.add_argument(
+        "--rules", nargs="+", default=sorted(REALISTIC_CARDS), help="rule ids"
+    )
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="also overwrite the checked-in baseline",
+    )
+    args = parser.parse_args()
+
+    report = run(args.rules, args.repeat)
+    outputs = [Path(args.output)] if args.output else []
+    if args.update_baseline:
+        outputs.append(BASELINE_PATH)
+    for path in outputs:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
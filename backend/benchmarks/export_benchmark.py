@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Client export benchmark - 客戶匯出效能測試
+
+在一個最後會 rollback 的交易中為一位諮詢師建立大量客戶與諮詢紀錄
+（預設各 100,000 筆），量測 iter_export 各格式的輸出時間、輸出大小與
+tracemalloc 記憶體峰值（峰值只與批次大小有關）。
+
+    python benchmarks/export_benchmark.py --rows 100000
+    python benchmarks/export_benchmark.py --batch-size 500
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, create_engine
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.client_export import EXPORT_BATCH_SIZE, iter_export  # noqa: E402
+
+DATABASE_URL = os.getenv(
+    "TEST_DATABASE_URL",
+    str(settings.database_url).replace("/career_creator", "/career_creator_test"),
+)
+
+
+def seed(session: Session, rows: int) -> User:
+    """以 generate_series 建立 rows 位客戶，每位一間諮詢室與一筆紀錄"""
+    counselor = User(
+        email=f"benchmark-{uuid4().hex[:8]}@example.com",
+        name="Benchmark Counselor",
+        hashed_password="-",
+        roles=["counselor"],
+    )
+    session.add(counselor)
+    session.flush()
+
+    params = {
+        "counselor_id": counselor.id,
+        "rows": rows,
+        "tags": '["career"]',
+        "game_state": '{"gameplay": "life_transformation"}',
+    }
+    session.execute(
+        text(
+            "INSERT INTO clients (id, counselor_id, name, email, notes, tags, status, "
+            "email_verified, created_at, updated_at) "
+            "SELECT gen_random_uuid(), :counselor_id, 'Client ' || n, "
+            "'client' || n || '@example.com', repeat('note ', 20), "
+            "CAST(:tags AS json), 'ACTIVE', false, now(), now() "
+            "FROM generate_series(1, :rows) AS n"
+        ),
+        params,
+    )
+    session.execute(
+        text(
+            "INSERT INTO rooms (id, name, counselor_id, share_code, is_active, "
+            "session_count, created_at) "
+            "SELECT gen_random_uuid(), 'Room', :counselor_id, "
+            "substr(md5(random()::text), 1, 6), true, 1, now() "
+            "FROM generate_series(1, 1)"
+        ),
+        params,
+    )
+    session.execute(
+        text(
+            "INSERT INTO consultation_records (id, room_id, client_id, counselor_id, "
+            "session_date, screenshots, game_state, topics, follow_up_required, "
+            "created_at, updated_at) "
+            "SELECT gen_random_uuid(), r.id, c.id, :counselor_id, now(), "
+            "ARRAY['https://storage.example/a.png'], "
+            "CAST(:game_state AS json), "
+            "CAST('[]' AS json), false, now(), now() "
+            "FROM clients c, rooms r "
+            "WHERE c.counselor_id = :counselor_id AND r.counselor_id = :counselor_id"
+        ),
+        params,
+    )
+    for table in ("clients", "client_stats", "consultation_records"):
+        session.execute(text(f"ANALYZE {table}"))
+    return counselor
+
+
+def measure(session: Session, counselor: User, dataset: str, fmt: str, **kwargs):
+    size = 0
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        for chunk in iter_export(
+            session.connection(), counselor.id, dataset, fmt, **kwargs
+        ):
+            size += len(chunk)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    label = f"{dataset} {fmt}{' gzip' if kwargs.get('compress') else ''}"
+    print(
+        f"{label:<28} {elapsed * 1000:9.1f} ms  {size / 1e6:8.1f} MB out  "
+        f"peak {peak / 1e6:6.2f} MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark client export streaming")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    engine = create_engine(DATABASE_URL)
+    SQLModel.metadata.create_all(engine)
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection)
+    try:
+        start = time.perf_counter()
+        counselor = seed(session, args.rows)
+        print(f"seeded {args.rows} rows in {time.perf_counter() - start:.1f}s")
+
+        for dataset in ("clients", "consultations"):
+            for fmt in ("csv", "ndjson"):
+                measure(session, counselor, dataset, fmt, batch_size=args.batch_size)
+        measure(
+            session,
+            counselor,
+            "consultations",
+            "ndjson",
+            compress=True,
+            batch_size=args.batch_size,
+        )
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Client import benchmark - 客戶批次匯入效能測試
+
+在一個最後會 rollback 的交易中，以 import_clients 為一位諮詢師匯入
+大量客戶（預設 10,000 筆，含少量重複 email），列出每個 SQL 語句的時間。
+
+    python benchmarks/import_benchmark.py --rows 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.client_import import import_clients, parse_import_rows  # noqa: E402
+
+DATABASE_URL = os.getenv(
+    "TEST_DATABASE_URL",
+    str(settings.database_url).replace("/career_creator", "/career_creator_test"),
+)
+
+
+def build_csv(rows: int) -> str:
+    lines = ["name,email,phone,tags"]
+    for n in range(rows):
+        # Every 100th row repeats an earlier email
+        email = f"client{n - 1 if n % 100 == 99 else n}@example.com"
+        lines.append(f"Client {n},{email},0912{n:06d},career;import")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk client import")
+    parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+
+    engine = create_engine(DATABASE_URL)
+    SQLModel.metadata.create_all(engine)
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection)
+
+    @event.listens_for(connection, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_start"] = time.perf_counter()
+
+    @event.listens_for(connection, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info.pop("query_start")
+        print(f"  {elapsed * 1000:9.1f} ms  {' '.join(statement.split())[:60]}")
+
+    try:
+        counselor = User(
+            email=f"benchmark-{uuid4().hex[:8]}@example.com",
+            name="Benchmark Counselor",
+            hashed_password="-",
+            roles=["counselor"],
+        )
+        session.add(counselor)
+        session.flush()
+
+        content = build_csv(args.rows)
+        start = time.perf_counter()
+        rows, errors = parse_import_rows(content, "csv")
+        parsed = time.perf_counter()
+        result = import_clients(session, counselor.id, rows, errors)
+        done = time.perf_counter()
+
+        print(f"parse:  {(parsed - start) * 1000:9.1f} ms")
+        print(f"import: {(done - parsed) * 1000:9.1f} ms (COPY not listed)")
+        print(f"created {result.created} of {result.total_rows} rows, ", end="")
+        print(f"{len(result.errors)} errors")
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+List endpoints benchmark - 列表端點效能測試
+
+在一個最後會 rollback 的交易中，為每個規模（預設 1,000 與 10,000）建立
+一位諮詢師，每位客戶一間諮詢室與一筆關聯，量測完整列表請求
+（查詢 + 組裝 + JSON 編碼）的耗時與 CPU 時間：
+
+- GET /api/clients（rooms,stats 與 include=stats）
+- GET /api/rooms/?include_inactive=true
+
+端點只經由 HTTP 呼叫，可在舊版程式碼上執行同一支腳本比較前後差異。
+
+    python benchmarks/list_endpoints_benchmark.py --sizes 1000,10000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, create_engine
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.auth import create_access_token  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import get_session  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+DATABASE_URL = os.getenv(
+    "TEST_DATABASE_URL",
+    str(settings.database_url).replace("/career_creator", "/career_creator_test"),
+)
+
+
+def seed(session: Session, size: int, offset: int) -> User:
+    """以 generate_series 建立 size 位客戶與諮詢室，並兩兩關聯"""
+    counselor = User(
+        email=f"benchmark-{uuid4().hex[:8]}@example.com",
+        name="Benchmark Counselor",
+        hashed_password="-",
+        roles=["counselor"],
+    )
+    session.add(counselor)
+    session.flush()
+
+    # Deterministic ids (md5 of the series value) pair each client with its room
+    params = {
+        "counselor_id": counselor.id,
+        "seed": str(counselor.id),
+        "first": offset + 1,
+        "last": offset + size,
+        "tags": '["career", "benchmark"]',
+    }
+    session.execute(
+        text(
+            "INSERT INTO clients (id, counselor_id, name, email, phone, notes, tags, "
+            "status, email_verified, created_at, updated_at) "
+            "SELECT md5(:seed || 'c' || n)::uuid, :counselor_id, 'Client ' || n, "
+            "'client' || n || '@example.com', '0912' || lpad(n::text, 6, '0'), "
+            "'notes', CAST(:tags AS json), 'ACTIVE', false, "
+            "now() - n * interval '1 second', now() - n * interval '1 second' "
+            "FROM generate_series(:first, :last) AS n"
+        ),
+        params,
+    )
+    session.execute(
+        text(
+            "INSERT INTO rooms (id, name, description, counselor_id, share_code, "
+            "is_active, session_count, created_at, expires_at) "
+            "SELECT md5(:seed || 'r' || n)::uuid, 'Room ' || n, 'Benchmark room', "
+            ":counselor_id, lpad(upper(to_hex(n)), 6, '0'), true, n % 5, "
+            "now() - n * interval '1 second', now() + interval '30 days' "
+            "FROM generate_series(:first, :last) AS n"
+        ),
+        params,
+    )
+    session.execute(
+        text(
+            "INSERT INTO room_clients (id, room_id, client_id, created_at) "
+            "SELECT gen_random_uuid(), md5(:seed || 'r' || n)::uuid, "
+            "md5(:seed || 'c' || n)::uuid, now() "
+            "FROM generate_series(:first, :last) AS n"
+        ),
+        params,
+    )
+    return counselor
+
+
+def measure(label: str, request, repeat: int):
+    wall, cpu = [], []
+    for _ in range(repeat):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        response = request()
+        cpu.append(time.process_time() - cpu_start)
+        wall.append(time.perf_counter() - wall_start)
+        assert response.status_code == 200, response.text
+    print(
+        f"{label:<36} {statistics.median(wall) * 1000:9.1f} ms  "
+        f"cpu {statistics.median(cpu) * 1000:9.1f} ms  "
+        f"{len(response.content) / 1e6:6.2f} MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list endpoints")
+    parser.add_argument("--sizes", default="1000,10000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    engine = create_engine(DATABASE_URL)
+    SQLModel.metadata.create_all(engine)
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection)
+    try:
+        counselors = {}
+        offset = 0
+        for size in sizes:
+            counselors[size] = seed(session, size, offset)
+            offset += size
+        for table in ("clients", "client_stats", "rooms", "room_clients"):
+            session.execute(text(f"ANALYZE {table}"))
+
+        app.dependency_overrides[get_session] = lambda: session
+        client = TestClient(app)
+        for size, counselor in counselors.items():
+            token = create_access_token(
+                {
+                    "sub": str(counselor.id),
+                    "email": counselor.email,
+                    "roles": ["counselor"],
+                }
+            )
+            headers = {"Authorization": f"Bearer {token}"}
+
+            def get(url, **params):
+                return lambda: client.get(url, params=params, headers=headers)
+
+            print(f"\n{size} clients / rooms")
+            measure("clients (rooms,stats)", get("/api/clients"), args.repeat)
+            measure(
+                "clients include=stats",
+                get("/api/clients", include="stats"),
+                args.repeat,
+            )
+            measure(
+                "rooms include_inactive",
+                get("/api/rooms/", include_inactive=True),
+                args.repeat,
+            )
+    finally:
+        app.dependency_overrides.clear()
+        session.close()
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
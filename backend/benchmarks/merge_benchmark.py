@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Merge benchmark - 可合併盤面效能測試
+
+多個副本（諮詢師 + 訪客）同時隨機操作同一盤面，量測本地操作、
+增量合併、整體合併與實體化為 GameState 的吞吐量，並確認所有副本收斂。
+
+    python benchmarks/merge_benchmark.py --replicas 4 --operations 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game.engine import GameState  # noqa: E402
+from app.game.merge import MergeableBoard  # noqa: E402
+from app.game.registry import rule_registry  # noqa: E402
+
+
+def timed(label: str, count: int, func, repeat: int = 1):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    per_ms = count / (best * 1000) if best else float("inf")
+    print(f"{label:<32} {best * 1000:9.3f} ms  {per_ms:10.1f} ops/ms")
+    return result
+
+
+def run_operations(boards, operations: int, zone_ids, seed: int):
+    """各副本輪流執行隨機操作，返回每個副本變動過的牌卡"""
+    rng = random.Random(seed)
+    card_ids = [f"card_{i:03d}" for i in range(100)]
+    touched = [set() for _ in boards]
+    for step in range(operations):
+        index = step % len(boards)
+        board = boards[index]
+        card_id = rng.choice(card_ids)
+        kind = rng.random()
+        if kind < 0.6:
+            board.place(card_id, rng.choice(zone_ids))
+        elif kind < 0.7:
+            board.remove(card_id)
+        elif kind < 0.85:
+            board.flip(card_id)
+        else:
+            board.annotate(card_id, {"note": rng.randint(0, 9)})
+        touched[index].add(card_id)
+    return touched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mergeable boards")
+    parser.add_argument("--rule", default="career_personality")
+    parser.add_argument("--replicas", type=int, default=4)
+    parser.add_argument("--operations", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    config = rule_registry.get_config(args.rule)
+    zone_ids = [zone.id for zone in config.layout.drop_zones]
+    base = GameState.create_initial_state("benchmark", args.rule)
+    boards = [MergeableBoard.from_state(base, f"node{i}") for i in range(args.replicas)]
+    print(f"rule={args.rule} replicas={args.replicas} operations={args.operations}")
+
+    touched = timed(
+        "local operations",
+        args.operations,
+        lambda: run_operations(boards, args.operations, zone_ids, args.seed),
+    )
+
+    payloads = [board.subset(cards).to_dict() for board, cards in zip(boards, touched)]
+
+    def server_merge():
+        """伺服器依序併入各副本的增量（含反序列化）"""
+        server = MergeableBoard("server")
+        for payload in payloads:
+            server.merge(MergeableBoard.from_dict(payload, "server"))
+        return server
+
+    server = timed("server merge (deltas)", args.operations, server_merge, args.repeat)
+    timed(
+        "materialize GameState",
+        len(server.card_ids()),
+        lambda: server.materialize(base),
+        args.repeat,
+    )
+    timed(
+        "serialize board",
+        len(server.card_ids()),
+        server.to_dict,
+        args.repeat,
+    )
+
+    expected = server.materialize(base).to_dict()
+    for board in boards:
+        board.merge(server)
+        assert board.materialize(base).to_dict() == expected
+    print("all replicas converged to the server state")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Replay benchmark - 動作日誌重播效能測試
+
+錄製一場隨機但合法的遊戲（或讀取既有的 NDJSON 日誌檔），
+量測從快照重播、從日誌檔崩潰復原、以及重新驗證重播的吞吐量。
+
+    python benchmarks/replay_benchmark.py --actions 20000
+    python benchmarks/replay_benchmark.py --journal session.ndjson
+"""
+
+import argparse
+import io
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game.config import ActionType  # noqa: E402
+from app.game.engine import GameAction, GameState  # noqa: E402
+from app.game.registry import rule_registry  # noqa: E402
+from app.game.replay import (  # noqa: E402
+    ActionJournal,
+    LogEntry,
+    ReplayableGame,
+    replay_entries,
+)
+
+
+def record_session(rule_id: str, actions: int, seed: int, stream) -> ReplayableGame:
+    """錄製隨機遊戲：每次 1~8 個動作的批次，只有成功的動作會進入日誌"""
+    rng = random.Random(seed)
+    config = rule_registry.get_config(rule_id)
+    zone_ids = [zone.id for zone in config.layout.drop_zones]
+    card_ids = [f"card_{i:03d}" for i in range(100)]
+    action_types = [
+        ActionType.PLACE_CARD,
+        ActionType.MOVE,
+        ActionType.MOVE,
+        ActionType.FLIP,
+        ActionType.ANNOTATE,
+    ]
+
+    game = ReplayableGame(
+        GameState.create_initial_state("benchmark", rule_id),
+        config=config,
+        journal=ActionJournal(stream),
+    )
+    while game.log.last_seq < actions:
+        batch = [
+            GameAction(
+                type=rng.choice(action_types),
+                player_id="counselor",
+                card_id=rng.choice(card_ids),
+                target_zone=rng.choice(zone_ids),
+                data={"note": rng.randint(0, 9)},
+            )
+            for _ in range(rng.randint(1, 8))
+        ]
+        game.apply(batch)
+    return game
+
+
+def read_session(lines):
+    """日誌檔的第一個快照與其後所有動作（完整重播整場遊戲）"""
+    records = [json.loads(line) for line in lines if line.strip()]
+    initial = GameState.from_dict(records[0]["state"])
+    entries = [LogEntry.from_dict(r) for r in records if r["kind"] == "action"]
+    return initial, entries
+
+
+def timed(label: str, count: int, func, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    per_ms = count / (best * 1000) if best else float("inf")
+    print(f"{label:<32} {best * 1000:9.3f} ms  {per_ms:10.0f} actions/ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark action-log replay")
+    parser.add_argument("--rule", default="career_personality")
+    parser.add_argument("--actions", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--journal", help="replay an existing NDJSON journal file")
+    parser.add_argument("--record", help="write the recorded session to this file")
+    args = parser.parse_args()
+
+    if args.journal:
+        lines = Path(args.journal).read_text(encoding="utf-8").splitlines()
+        expected = None
+    else:
+        stream = io.StringIO()
+        game = record_session(args.rule, args.actions, args.seed, stream)
+        lines = stream.getvalue().splitlines()
+        if args.record:
+            Path(args.record).write_text(stream.getvalue(), encoding="utf-8")
+        expected = game.state
+
+    initial, entries = read_session(lines)
+    config = rule_registry.get_config(initial.rule_id)
+    print(f"rule={initial.rule_id} journal_lines={len(lines)} actions={len(entries)}")
+
+    state = timed(
+        "full replay (trusted)",
+        len(entries),
+        lambda: replay_entries(initial, entries, config),
+        args.repeat,
+    )
+    timed(
+        "full replay (validated)",
+        len(entries),
+        lambda: replay_entries(initial, entries, config, validate=True),
+        args.repeat,
+    )
+    _, tail = ActionJournal.read(lines)
+    recovered = timed(
+        f"recover (snapshot + {len(tail)} actions)",
+        len(tail),
+        lambda: ReplayableGame.recover(lines, config),
+        args.repeat,
+    )
+
+    if expected is not None:
+        assert state.to_dict() == expected.to_dict()
+        assert recovered.state.to_dict() == expected.to_dict()
+        print("replayed and recovered states match the live state")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Response encoding benchmark - 回應驗證與編碼 CPU 測試
+
+在一個最後會 rollback 的交易中建立一位諮詢師（2,000 位客戶，其中一位有
+200 間諮詢室與 100 筆諮詢記錄）、100 位使用者與 200 張牌卡，量測每個
+端點單次請求的 CPU 時間中位數（查詢 + 驗證 + JSON 編碼）：
+
+- GET /api/clients/{id}/consultation-records（full 與 summary）
+- GET /api/clients/{id}/rooms
+- GET /api/clients/search
+- GET /api/game-rules/decks/{id}/search
+- GET /api/admin/users 與 /api/admin/db/table/consultation_records
+
+GET /health 的 CPU 時間是每次請求本身（TestClient + 路由）的基準線。
+端點只經由 HTTP 呼叫，可在舊版程式碼上執行同一支腳本比較前後差異；
+ENVIRONMENT 不為 development 時不會記錄 SQL。
+
+    ENVIRONMENT=test python benchmarks/response_encoding_benchmark.py --repeat 30
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, create_engine
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.auth import create_access_token  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import get_session  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.client import Client, ConsultationRecord, RoomClient  # noqa: E402
+from app.models.game_rule import Card, CardDeck, GameRuleTemplate  # noqa: E402
+from app.models.room import Room  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+DATABASE_URL = os.getenv(
+    "TEST_DATABASE_URL",
+    str(settings.database_url).replace("/career_creator", "/career_creator_test"),
+)
+
+
+def seed(session: Session):
+    """建立測試資料，返回 (諮詢師, 管理員, 客戶, 牌組)"""
+    tag = uuid4().hex[:8]
+    counselor = User(
+        email=f"bench-{tag}@example.com",
+        name="Benchmark Counselor",
+        hashed_password="-",
+        roles=["counselor"],
+    )
+    admin = User(
+        email=f"bench-admin-{tag}@example.com",
+        name="Benchmark Admin",
+        hashed_password="-",
+        roles=["admin"],
+    )
+    session.add_all(
+        [counselor, admin]
+        + [
+            User(
+                email=f"bench-{tag}-{n}@example.com",
+                name=f"User {n}",
+                hashed_password="-",
+                roles=["counselor"],
+            )
+            for n in range(100)
+        ]
+    )
+    session.flush()
+
+    session.execute(
+        text(
+            "INSERT INTO clients (id, counselor_id, name, email, phone, notes, tags, "
+            "status, email_verified, created_at, updated_at) "
+            "SELECT gen_random_uuid(), :counselor_id, 'Client ' || n, "
+            "'client' || n || '@example.com', '0912' || lpad(n::text, 6, '0'), "
+            "'notes', CAST(:tags AS json), 'ACTIVE', false, now(), now() "
+            "FROM generate_series(1, 2000) AS n"
+        ),
+        {"counselor_id": counselor.id, "tags": '["career", "benchmark"]'},
+    )
+
+    client = Client(counselor_id=counselor.id, name="Benchmark Client")
+    rooms = [
+        Room(
+            counselor_id=counselor.id,
+            name=f"Room {n}",
+            description="Benchmark room",
+            expires_at=datetime.utcnow() + timedelta(days=30),
+            session_count=n % 5,
+        )
+        for n in range(200)
+    ]
+    session.add_all([client, *rooms])
+    session.flush()
+    session.add_all(RoomClient(room_id=room.id, client_id=client.id) for room in rooms)
+    session.add_all(
+        ConsultationRecord(
+            room_id=rooms[n].id,
+            client_id=client.id,
+            counselor_id=counselor.id,
+            session_date=datetime.utcnow() - timedelta(days=n),
+            duration_minutes=50,
+            screenshots=[
+                f"https://cdn.example.com/shots/{n}-{i}.png" for i in range(3)
+            ],
+            game_state={
+                "gameplay": "life_transformation",
+                "cards": [{"id": f"card-{i}", "x": i * 10, "y": i} for i in range(20)],
+            },
+            topics=["career", "values"],
+            notes="Session notes",
+            follow_up_required=n % 2 == 0,
+            follow_up_date=date.today() + timedelta(days=7),
+        )
+        for n in range(100)
+    )
+
+    rule = GameRuleTemplate(
+        name="Benchmark Rule",
+        slug=f"benchmark-{tag}",
+        layout_config={},
+        constraint_config={},
+        validation_rules={},
+    )
+    session.add(rule)
+    session.flush()
+    deck = CardDeck(game_rule_id=rule.id, name="Benchmark Deck")
+    session.add(deck)
+    session.flush()
+    session.add_all(
+        Card(
+            deck_id=deck.id,
+            card_key=f"card-{n}",
+            title=f"職業卡 {n}",
+            description="牌卡描述 " * 10,
+            category=f"category-{n % 5}",
+            subcategory=f"sub-{n % 20}",
+            display_order=n,
+            card_metadata={"holland": "RIASEC"[n % 6], "level": n % 3, "tags": ["a"]},
+            assets={"image": f"https://cdn.example.com/cards/{n}.png"},
+        )
+        for n in range(200)
+    )
+    session.flush()
+    for table in ("clients", "rooms", "room_clients", "consultation_records"):
+        session.execute(text(f"ANALYZE {table}"))
+    return counselor, admin, client, deck
+
+
+def measure(label: str, request, repeat: int):
+    request()  # warm caches (deck catalog, table inspector)
+    cpu = []
+    for _ in range(repeat):
+        cpu_start = time.process_time()
+        response = request()
+        cpu.append(time.process_time() - cpu_start)
+        assert response.status_code == 200, response.text
+    print(
+        f"{label:<32} cpu {statistics.median(cpu) * 1000:7.2f} ms  "
+        f"{len(response.content) / 1e3:7.1f} KB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response encoding")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    engine = create_engine(DATABASE_URL)
+    SQLModel.metadata.create_all(engine)
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection)
+    try:
+        counselor, admin, client_record, deck = seed(session)
+        session.commit()
+
+        def headers_for(user: User):
+            token = create_access_token(
+                {"sub": str(user.id), "email": user.email, "roles": user.roles}
+            )
+            return {"Authorization": f"Bearer {token}"}
+
+        app.dependency_overrides[get_session] = lambda: session
+        client = TestClient(app)
+
+        def get(url, user, **params):
+            headers = headers_for(user)
+            return lambda: client.get(url, params=params, headers=headers)
+
+        records = f"/api/clients/{client_record.id}/consultation-records"
+        cases = [
+            ("health (request floor)", get("/health", counselor)),
+            ("consultation records full", get(records, counselor, limit=100)),
+            (
+                "consultation records summary",
+                get(records, counselor, limit=100, view="summary"),
+            ),
+            ("client rooms", get(f"/api/clients/{client_record.id}/rooms", admin)),
+            (
+                "client search",
+                get("/api/clients/search", counselor, q="Client", limit=100),
+            ),
+            (
+                "deck search",
+                get(f"/api/game-rules/decks/{deck.id}/search", counselor, limit=200),
+            ),
+            ("admin users", get("/api/admin/users", admin, limit=100)),
+            (
+                "admin table data",
+                get("/api/admin/db/table/consultation_records", admin, limit=100),
+            ),
+        ]
+        for label, request in cases:
+            measure(label, request, args.repeat)
+    finally:
+        app.dependency_overrides.clear()
+        session.close()
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Room memory benchmark - 房間狀態記憶體用量
+
+模擬伺服器同時保存多個進行中房間的 GameState：每個房間的狀態都由 JSON
+載入（與從資料庫讀出相同，字串各自獨立），三種規則輪流分配，
+以 tracemalloc 量測每個房間的平均記憶體用量。
+
+    python benchmarks/room_memory_benchmark.py --rooms 100 1000
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game.engine import GameState  # noqa: E402
+from app.game.registry import rule_registry  # noqa: E402
+
+# 一般諮詢中盤面上的牌卡數
+BOARD_CARDS = {
+    "skill_assessment": 10,
+    "value_navigation": 9,
+    "career_personality": 106,
+}
+
+
+def board_payload(rule_id: str) -> str:
+    """規則的典型盤面（約四分之一翻面、十分之一有註記）"""
+    state = GameState.create_initial_state("room", rule_id)
+    zone_ids = list(state.zones)
+    for index in range(BOARD_CARDS[rule_id]):
+        card_id = f"{rule_id}_card_{index:03d}"
+        state = state.place_card_in_zone(card_id, zone_ids[index % len(zone_ids)])
+        if index % 4 == 0:
+            state = state.flip_card(card_id)
+        if index % 10 == 0:
+            state = state.annotate_card(card_id, {"note": "reason"})
+    return json.dumps(state.to_dict())
+
+
+def measure(rooms: int, payloads) -> int:
+    """載入 rooms 個房間後每個房間的平均位元組數"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        states = [
+            GameState.from_dict(json.loads(payloads[index % len(payloads)]))
+            for index in range(rooms)
+        ]
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del states
+    return (after - before) // rooms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure live room state memory")
+    parser.add_argument("--rooms", type=int, nargs="+", default=[100, 1000])
+    args = parser.parse_args()
+
+    payloads = [board_payload(rule_id) for rule_id in sorted(BOARD_CARDS)]
+    # 預先載入規則配置，避免計入一次性的快取
+    for rule_id in BOARD_CARDS:
+        rule_registry.get_config(rule_id)
+        GameState.from_dict(json.loads(payloads[0]))
+
+    for rooms in args.rooms:
+        per_room = measure(rooms, payloads)
+        print(
+            f"{rooms:>6} rooms  {per_room:>8} B/room  "
+            f"{per_room * rooms / 1024 / 1024:8.2f} MiB total"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark - 遊戲狀態序列化效能測試
+
+比較目前的序列化路徑與 GameStateSerializer：
+- json.dumps(state.to_dict())（日誌 / 自動儲存原本的作法）
+- Pydantic 回應模型（state.to_dict() 再經 model_dump_json）
+- orjson.dumps(state.to_dict())（dumps_state，自動儲存目前的作法）
+- GameStateSerializer.dumps（冷快取 / 每次只移動一張牌卡）
+- GameStateSerializer.diff（只輸出變動區域）
+
+    python benchmarks/serialization_benchmark.py --cards 106 1060
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+import orjson
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.game.engine import GameState  # noqa: E402
+from app.game.serialization import GameStateSerializer, dumps_state  # noqa: E402
+from app.models.gameplay_state import GameplayMergeResponse  # noqa: E402
+
+
+def build_states(rule_id: str, cards: int, moves: int):
+    """放滿 cards 張牌卡後，再逐次移動一張牌卡的狀態序列"""
+    state = GameState.create_initial_state("benchmark", rule_id)
+    zone_ids = list(state.zones)
+    for index in range(cards):
+        card_id = f"card_{index:04d}"
+        state = state.place_card_in_zone(card_id, zone_ids[index % len(zone_ids)])
+        if index % 10 == 0:
+            state = state.annotate_card(card_id, {"note": "理由"})
+    states = [state]
+    for index in range(moves):
+        card_id = f"card_{index % cards:04d}"
+        current = state.get_card_zone(card_id)
+        target = zone_ids[(zone_ids.index(current) + 1) % len(zone_ids)]
+        state = state.move_card(card_id, target)
+        states.append(state)
+    return states
+
+
+def timed(label: str, func, count: int, repeat: int) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / (number * count)
+    print(f"  {label:<36} {best * 1e6:10.2f} us/state")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GameState serialization")
+    parser.add_argument("--rule", default="career_personality")
+    parser.add_argument("--cards", type=int, nargs="+", default=[106, 1060])
+    parser.add_argument("--moves", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for cards in args.cards:
+        states = build_states(args.rule, cards, args.moves)
+        state = states[-1]
+        for s in states:
+            assert GameStateSerializer().dumps(s) == orjson.dumps(s.to_dict())
+        size = len(dumps_state(state))
+        print(f"rule={args.rule} cards={cards} bytes={size}")
+
+        def stdlib_json():
+            for s in states:
+                json.dumps(s.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+        def pydantic_response():
+            for s in states:
+                GameplayMergeResponse(
+                    version=s.version, delta=s.to_dict()
+                ).model_dump_json()
+
+        def orjson_to_dict():
+            for s in states:
+                orjson.dumps(s.to_dict())
+
+        def serializer_cold():
+            for s in states:
+                GameStateSerializer().dumps(s)
+
+        def serializer_warm():
+            serializer = GameStateSerializer()
+            for s in states:
+                serializer.dumps(s)
+
+        def serializer_diff():
+            serializer = GameStateSerializer()
+            for previous, s in zip(states, states[1:]):
+                serializer.diff(previous, s)
+
+        count = len(states)
+        base = timed("json.dumps(to_dict())", stdlib_json, count, args.repeat)
+        timed("pydantic response", pydantic_response, count, args.repeat)
+        timed("orjson.dumps(to_dict())", orjson_to_dict, count, args.repeat)
+        timed("GameStateSerializer (cold)", serializer_cold, count, args.repeat)
+        warm = timed("GameStateSerializer (memoized)", serializer_warm, count, 5)
+        timed("GameStateSerializer.diff", serializer_diff, count - 1, args.repeat)
+        print(f"  memoized speedup vs json.dumps: {base / warm:.1f}x")
+        diff_size = len(GameStateSerializer().diff(states[-2], states[-1]))
+        print(f"  diff size for one move: {diff_size} bytes (full: {size})")
+
+
+if __name__ == "__main__":
+    main()
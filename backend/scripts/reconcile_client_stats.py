@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""Recompute client_stats from rooms and consultation records, repairing drift."""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session  # noqa: E402
+
+from app.core.database import engine  # noqa: E402
+from app.services.client_stats import reconcile_client_stats  # noqa: E402
+
+
+def main():
+    """Reconcile every client's statistics in one transaction."""
+    with Session(engine) as session:
+        repaired = reconcile_client_stats(session)
+        session.commit()
+    print(f"✅ Reconciled client stats: {repaired} row(s) repaired")
+
+
+if __name__ == "__main__":
+    main()
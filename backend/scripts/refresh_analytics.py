@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""Refresh the analytics materialized views (run periodically, e.g. every 15 min)."""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session  # noqa: E402
+
+from app.core.database import engine  # noqa: E402
+from app.services.analytics import get_freshness, refresh_analytics  # noqa: E402
+
+
+def main():
+    """Refresh every analytics view in one transaction."""
+    with Session(engine) as session:
+        if not refresh_analytics(session):
+            print("⏭️  Another analytics refresh is running, skipped")
+            return
+        session.commit()
+        freshness = get_freshness(session)
+    print(f"✅ Refreshed analytics views at {freshness.refreshed_at}")
+
+
+if __name__ == "__main__":
+    main()
@@ -76,3 +76,19 @@ def session_fixture(engine):
     session.close()
     transaction.rollback()
     connection.close()
+
+
+@pytest.fixture(autouse=True)
+def clear_app_caches():
+    """Clear in-process caches (test transactions roll back)"""
+    from app.services.card_catalog import card_catalog
+    from app.services.game_rule_templates import template_cache
+    from app.services.undo_history import undo_history
+
+    template_cache.clear()
+    card_catalog.clear()
+    undo_history.clear()
+    yield
+    template_cache.clear()
+    card_catalog.clear()
+    undo_history.clear()
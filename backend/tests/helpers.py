@@ -3,6 +3,8 @@ Test helpers and utilities
 測試輔助工具
 """
 
+from pydantic import TypeAdapter
+
 from app.core.auth import create_access_token
 from app.models.user import User
 
@@ -12,3 +14,9 @@ def create_auth_headers(user: User) -> dict:
     token_data = {"sub": str(user.id), "email": user.email, "roles": user.roles}
     token = create_access_token(token_data)
     return {"Authorization": f"Bearer {token}"}
+
+
+def assert_matches_schema(payload, model):
+    """Re-validating through the response model must give back the same JSON"""
+    adapter = TypeAdapter(model)
+    assert adapter.dump_python(adapter.validate_python(payload), mode="json") == payload
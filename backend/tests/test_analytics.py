@@ -0,0 +1,224 @@
+"""
+Test analytics - 儀表板統計測試
+
+1. GET /api/analytics/dashboard 需要 VIEW_ANALYTICS 權限
+2. 統計來自物化視圖，更新後才反映新資料，回應附上新鮮度
+3. 資料過期時排程背景更新；同時只允許一個更新
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlmodel import Session
+
+from app.core.database import get_session
+from app.main import app
+from app.models.analytics import AnalyticsRefresh
+from app.models.client import Client, ClientStatus, ConsultationRecord, RoomClient
+from app.models.gameplay_state import GameplayState
+from app.models.room import Room
+from app.services.analytics import (
+    ANALYTICS_MAX_AGE,
+    ANALYTICS_REFRESH_LOCK,
+    load_dashboard,
+    refresh_analytics,
+)
+from tests.factories import UserFactory
+from tests.helpers import create_auth_headers
+
+TODAY = datetime.utcnow().date()
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    app.dependency_overrides[get_session] = lambda: session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="admin")
+def admin_fixture(session: Session):
+    return UserFactory.create_admin(session, email="analytics-admin@test.com")
+
+
+@pytest.fixture(name="counselor")
+def counselor_fixture(session: Session):
+    """兩位客戶（一位封存）、三筆本週與上週的紀錄、三間諮詢室的玩法"""
+    counselor = UserFactory.create_counselor(session, email="analytics@test.com")
+    rooms = [Room(counselor_id=counselor.id, name=f"Room {n}") for n in range(3)]
+    active = Client(counselor_id=counselor.id, name="Active")
+    archived = Client(
+        counselor_id=counselor.id, name="Archived", status=ClientStatus.ARCHIVED
+    )
+    session.add_all([*rooms, active, archived])
+    session.flush()
+    session.add(RoomClient(room_id=rooms[0].id, client_id=active.id))
+
+    now = datetime.utcnow()
+    for session_date, follow_up in (
+        (now, TODAY - timedelta(days=1)),
+        (now, TODAY + timedelta(days=3)),
+        (now - timedelta(weeks=1), TODAY + timedelta(days=30)),
+    ):
+        session.add(
+            ConsultationRecord(
+                room_id=rooms[0].id,
+                client_id=active.id,
+                counselor_id=counselor.id,
+                session_date=session_date,
+                follow_up_required=True,
+                follow_up_date=follow_up,
+            )
+        )
+    for room, gameplay_id in zip(
+        rooms, ("life_transformation", "life_transformation", "skill_assessment")
+    ):
+        session.add(GameplayState(room_id=room.id, gameplay_id=gameplay_id))
+    session.commit()
+    return counselor
+
+
+def dashboard(client: TestClient, user, **params):
+    response = client.get(
+        "/api/analytics/dashboard", params=params, headers=create_auth_headers(user)
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+class TestAnalyticsPermissions:
+    """測試權限"""
+
+    def test_counselor_forbidden(self, client: TestClient, counselor):
+        for method, url in (
+            ("get", "/api/analytics/dashboard"),
+            ("post", "/api/analytics/refresh"),
+        ):
+            response = client.request(
+                method, url, headers=create_auth_headers(counselor)
+            )
+            assert response.status_code == 403
+
+
+class TestAnalyticsDashboard:
+    """測試統計內容"""
+
+    def test_rollups_after_refresh(self, client: TestClient, admin, counselor):
+        refreshed = client.post(
+            "/api/analytics/refresh", headers=create_auth_headers(admin)
+        )
+        assert refreshed.status_code == 200
+        assert refreshed.json()["stale"] is False
+
+        data = dashboard(client, admin, counselor_id=str(counselor.id), weeks=4)
+
+        assert data["total_clients"] == 2
+        assert data["active_clients"] == 1
+        assert data["clients_seen_30d"] == 1
+        assert data["follow_ups_overdue"] == 1
+        assert data["follow_ups_due_7d"] == 1
+        weeks = data["weekly_sessions"]
+        assert len(weeks) == 4 and weeks[0]["sessions"] == 0
+        this_week = TODAY - timedelta(days=TODAY.weekday())
+        assert weeks[-1] == {
+            "week_start": this_week.isoformat(),
+            "sessions": 2,
+            "clients": 1,
+        }
+        assert weeks[-2]["sessions"] == 1
+        assert [(g["gameplay_id"], g["rooms"]) for g in data["top_gameplays"]] == [
+            ("life_transformation", 2),
+            ("skill_assessment", 1),
+        ]
+        assert data["freshness"]["stale"] is False
+        assert data["freshness"]["refreshing"] is False
+
+    def test_all_counselors_and_scoping(
+        self, session: Session, admin, counselor, client: TestClient
+    ):
+        other = UserFactory.create_counselor(session, email="analytics-2@test.com")
+        session.add(Client(counselor_id=other.id, name="Other"))
+        session.commit()
+        refresh_analytics(session)
+
+        assert load_dashboard(session).total_clients >= 3
+        assert load_dashboard(session, counselor.id).total_clients == 2
+        assert load_dashboard(session, other.id).total_clients == 1
+
+    def test_reads_only_rollups(self, session: Session, counselor):
+        refresh_analytics(session)
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(session.bind, "before_cursor_execute", record)
+        try:
+            load_dashboard(session, counselor.id)
+        finally:
+            event.remove(session.bind, "before_cursor_execute", record)
+
+        for source in ("consultation_records", "clients ", "gameplay_states"):
+            assert not any(f"FROM {source}" in s for s in statements)
+
+
+class TestAnalyticsFreshness:
+    """測試新鮮度與背景更新"""
+
+    def test_stale_view_refreshes_in_background(
+        self, client: TestClient, session: Session, admin, counselor
+    ):
+        refresh_analytics(session)
+        session.execute(
+            text("UPDATE analytics_refreshes SET refreshed_at = :old"),
+            {"old": datetime.utcnow() - ANALYTICS_MAX_AGE - timedelta(minutes=1)},
+        )
+        session.add(Client(counselor_id=counselor.id, name="New"))
+        session.commit()
+
+        stale = dashboard(client, admin, counselor_id=str(counselor.id))
+        # The background task has run by the time TestClient returns
+        fresh = dashboard(client, admin, counselor_id=str(counselor.id))
+
+        assert stale["freshness"]["stale"] is True
+        assert stale["freshness"]["refreshing"] is True
+        assert stale["freshness"]["age_seconds"] > ANALYTICS_MAX_AGE.total_seconds()
+        assert stale["total_clients"] == 2
+        assert fresh["freshness"]["stale"] is False
+        assert fresh["total_clients"] == 3
+
+    def test_never_refreshed(self, client: TestClient, session: Session, admin):
+        session.execute(text("DELETE FROM analytics_refreshes"))
+
+        data = dashboard(client, admin)
+
+        assert data["freshness"]["refreshed_at"] is None
+        assert data["freshness"]["refreshing"] is True
+        assert session.get(AnalyticsRefresh, "analytics_follow_ups") is not None
+
+    def test_refresh_in_progress_conflicts(
+        self, client: TestClient, engine, admin, counselor
+    ):
+        with engine.connect() as other:
+            with other.begin():
+                other.execute(
+                    text("SELECT pg_advisory_xact_lock(:key)"),
+                    {"key": ANALYTICS_REFRESH_LOCK},
+                )
+                response = client.post(
+                    "/api/analytics/refresh", headers=create_auth_headers(admin)
+                )
+
+        assert response.status_code == 409
+
+
+def test_week_buckets_start_on_monday(session: Session, counselor):
+    refresh_analytics(session)
+
+    weeks = load_dashboard(session, counselor.id, weeks=3).weekly_sessions
+
+    assert all(week.week_start.weekday() == 0 for week in weeks)
+    assert weeks[-1].week_start <= TODAY < weeks[-1].week_start + timedelta(days=7)
+    assert isinstance(weeks[0].week_start, date)
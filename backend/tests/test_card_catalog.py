@@ -0,0 +1,197 @@
+"""
+Test card catalog API - 牌組目錄 API 測試
+
+1. GET /api/game-rules/decks/{deck_id}/cards 返回預先壓縮的 JSON
+2. 內容雜湊 ETag，If-None-Match 命中時返回 304
+3. since 參數返回自該版本以來的差異
+4. 版本未改變時不重新載入牌卡
+"""
+
+import gzip
+
+import brotli
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.database import get_session
+from app.main import app
+from app.models.game_rule import Card, CardDeck, GameRuleTemplate
+from app.services.card_catalog import card_catalog
+
+URL = "/api/game-rules/decks/{deck_id}/cards"
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    app.dependency_overrides[get_session] = lambda: session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="deck")
+def deck_fixture(session: Session):
+    """建立含 3 張牌卡的牌組"""
+    rule = GameRuleTemplate(
+        slug="catalog_test",
+        name="目錄測試",
+        layout_config={},
+        constraint_config={},
+        validation_rules={},
+    )
+    session.add(rule)
+    session.commit()
+
+    deck = CardDeck(game_rule_id=rule.id, name="職業探索卡組", is_official=True)
+    session.add(deck)
+    session.commit()
+
+    for index, title in enumerate(["軟體工程師", "設計師", "教師"]):
+        session.add(
+            Card(
+                deck_id=deck.id,
+                card_key=f"card_{index}",
+                title=title,
+                category="career",
+                display_order=index,
+            )
+        )
+    session.commit()
+    return deck
+
+
+class TestDeckCards:
+    """測試牌組牌卡端點"""
+
+    def test_returns_cards_in_display_order(self, client: TestClient, deck: CardDeck):
+        response = client.get(URL.format(deck_id=deck.id))
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["deck_id"] == str(deck.id)
+        assert data["card_count"] == 3
+        assert [card["title"] for card in data["cards"]] == [
+            "軟體工程師",
+            "設計師",
+            "教師",
+        ]
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.headers["etag"].startswith('"')
+
+    def test_unknown_deck_returns_404(self, client: TestClient):
+        response = client.get(
+            URL.format(deck_id="00000000-0000-0000-0000-000000000000")
+        )
+
+        assert response.status_code == 404
+
+    @pytest.mark.parametrize(
+        "encoding,decompress", [("gzip", gzip.decompress), ("br", brotli.decompress)]
+    )
+    def test_precompressed_encodings(
+        self, client: TestClient, session: Session, deck: CardDeck, encoding, decompress
+    ):
+        """依 Accept-Encoding 返回預先壓縮的內容"""
+        identity = client.get(
+            URL.format(deck_id=deck.id), headers={"Accept-Encoding": "identity"}
+        )
+        assert "content-encoding" not in identity.headers
+
+        catalog = card_catalog.get(session, deck.id)
+        assert decompress(catalog.payload.encodings[encoding]) == identity.content
+
+        response = client.get(
+            URL.format(deck_id=deck.id), headers={"Accept-Encoding": encoding}
+        )
+        assert response.headers["content-encoding"] == encoding
+        assert response.content == identity.content
+        assert response.headers["etag"] != identity.headers["etag"]
+
+    def test_prefers_brotli(self, client: TestClient, deck: CardDeck):
+        response = client.get(
+            URL.format(deck_id=deck.id),
+            headers={"Accept-Encoding": "gzip, deflate, br"},
+        )
+
+        assert response.headers["content-encoding"] == "br"
+
+    def test_if_none_match_returns_304(self, client: TestClient, deck: CardDeck):
+        """任一編碼的 ETag 都可用於重新驗證"""
+        first = client.get(
+            URL.format(deck_id=deck.id), headers={"Accept-Encoding": "gzip"}
+        )
+
+        response = client.get(
+            URL.format(deck_id=deck.id),
+            headers={"If-None-Match": first.headers["etag"], "Accept-Encoding": "br"},
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_catalog_loaded_once_per_version(
+        self, client: TestClient, session: Session, deck: CardDeck
+    ):
+        """檢查間隔內不查詢資料庫"""
+        client.get(URL.format(deck_id=deck.id))
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(session.bind, "before_cursor_execute", record)
+        try:
+            for _ in range(5):
+                assert client.get(URL.format(deck_id=deck.id)).status_code == 200
+        finally:
+            event.remove(session.bind, "before_cursor_execute", record)
+
+        assert not [s for s in statements if "cards" in s]
+
+
+class TestDeckCardsDelta:
+    """測試差異取得"""
+
+    def test_delta_since_previous_version(
+        self, client: TestClient, session: Session, deck: CardDeck, monkeypatch
+    ):
+        monkeypatch.setattr(card_catalog, "refresh_interval", 0)
+        old_version = client.get(URL.format(deck_id=deck.id)).json()["version"]
+
+        session.add(
+            Card(deck_id=deck.id, card_key="card_new", title="護理師", display_order=9)
+        )
+        session.commit()
+
+        full = client.get(URL.format(deck_id=deck.id)).json()
+        assert full["version"] != old_version
+        assert full["card_count"] == 4
+
+        delta = client.get(
+            URL.format(deck_id=deck.id), params={"since": old_version}
+        ).json()
+        assert delta["delta"] is True
+        assert delta["base_version"] == old_version
+        assert delta["version"] == full["version"]
+        assert [card["card_key"] for card in delta["upserted"]] == ["card_new"]
+        assert delta["removed"] == []
+
+    def test_delta_with_current_version_is_empty(
+        self, client: TestClient, deck: CardDeck
+    ):
+        version = client.get(URL.format(deck_id=deck.id)).json()["version"]
+
+        delta = client.get(URL.format(deck_id=deck.id), params={"since": version})
+
+        assert delta.json()["upserted"] == []
+        assert delta.json()["removed"] == []
+
+    def test_unknown_since_returns_full_catalog(
+        self, client: TestClient, deck: CardDeck
+    ):
+        response = client.get(URL.format(deck_id=deck.id), params={"since": "stale"})
+
+        assert response.json()["card_count"] == 3
+        assert "delta" not in response.json()
@@ -0,0 +1,243 @@
+"""
+Test card search index - 牌卡搜尋索引測試
+
+1. 中文子字串 / 英文前綴搜尋
+2. 分面篩選與分面計數
+3. 相關度排序
+4. GET /api/game-rules/decks/{deck_id}/search
+"""
+
+import sys
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.database import get_session
+from app.main import app
+from app.models.game_rule import Card, CardDeck, GameRuleTemplate
+from app.services.card_search import CardSearchIndex
+
+CARDS = [
+    {
+        "card_key": "tech_001",
+        "title": "軟體工程師",
+        "description": "設計和開發軟體應用程式，解決技術問題",
+        "category": "technology",
+        "subcategory": "engineering",
+        "display_order": 1,
+        "card_metadata": {"level": "senior"},
+    },
+    {
+        "card_key": "tech_004",
+        "title": "UI/UX設計師",
+        "description": "設計使用者介面和體驗，提升產品易用性",
+        "category": "technology",
+        "subcategory": "design",
+        "display_order": 4,
+        "card_metadata": {"level": "junior"},
+    },
+    {
+        "card_key": "creative_001",
+        "title": "平面設計師",
+        "description": "創作視覺作品，傳達品牌訊息",
+        "category": "creative",
+        "subcategory": "design",
+        "display_order": 11,
+    },
+    {
+        "card_key": "tech_006",
+        "title": "Data Engineer",
+        "description": "Build reliable data pipelines",
+        "category": "technology",
+        "subcategory": "engineering",
+        "display_order": 6,
+    },
+    {
+        "card_key": "biz_003",
+        "title": "設計",
+        "description": "規劃與設計",
+        "category": "business",
+        "display_order": 20,
+    },
+]
+
+
+def keys(result):
+    return [item["card"]["card_key"] for item in result["results"]]
+
+
+class TestCardSearchIndex:
+    """測試搜尋索引"""
+
+    def test_cjk_substring(self):
+        index = CardSearchIndex(CARDS)
+
+        result = index.search("工程")
+
+        assert keys(result) == ["tech_001"]
+
+    def test_single_cjk_character(self):
+        index = CardSearchIndex(CARDS)
+
+        assert set(keys(index.search("師"))) == {
+            "tech_001",
+            "tech_004",
+            "creative_001",
+        }
+
+    def test_latin_prefix_is_case_insensitive(self):
+        index = CardSearchIndex(CARDS)
+
+        assert keys(index.search("ENG")) == ["tech_006"]
+        assert keys(index.search("pipe")) == ["tech_006"]
+
+    def test_fullwidth_query_is_normalized(self):
+        index = CardSearchIndex(CARDS)
+
+        assert keys(index.search("ｄａｔａ")) == ["tech_006"]
+
+    def test_all_terms_must_match(self):
+        index = CardSearchIndex(CARDS)
+
+        assert keys(index.search("設計 品牌")) == ["creative_001"]
+        assert keys(index.search("設計 不存在")) == []
+
+    def test_ranking_prefers_title_matches(self):
+        """標題完全符合 > 標題前綴 > 標題子字串 > 描述"""
+        index = CardSearchIndex(CARDS)
+
+        result = index.search("設計")
+
+        assert keys(result) == [
+            "biz_003",  # 標題完全符合
+            "tech_004",  # 標題子字串（UI/UX 之後）
+            "creative_001",
+            "tech_001",  # 只有描述命中
+        ]
+        scores = [item["score"] for item in result["results"]]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_facet_filters(self):
+        """同一欄位 OR，不同欄位 AND"""
+        index = CardSearchIndex(CARDS)
+
+        assert keys(index.search(category=["technology"], subcategory=["design"])) == [
+            "tech_004"
+        ]
+        assert keys(index.search(category=["creative"], subcategory=["design"])) == [
+            "creative_001"
+        ]
+        assert keys(index.search(metadata=[("level", "SENIOR")])) == ["tech_001"]
+
+    def test_empty_query_orders_by_display_order(self):
+        index = CardSearchIndex(CARDS)
+
+        result = index.search(category=["technology", "creative"])
+
+        assert keys(result) == ["tech_001", "tech_004", "tech_006", "creative_001"]
+
+    def test_facet_counts_and_pagination(self):
+        index = CardSearchIndex(CARDS)
+
+        result = index.search("設計", limit=2, offset=1)
+
+        assert result["total"] == 4
+        assert len(result["results"]) == 2
+        assert result["facets"]["category"] == {
+            "business": 1,
+            "technology": 2,
+            "creative": 1,
+        }
+        assert result["facets"]["subcategory"] == {"design": 2, "engineering": 1}
+
+    @pytest.mark.skipif(
+        sys.gettrace() is not None, reason="coverage tracing inflates timings"
+    )
+    def test_query_latency_at_1000_cards(self):
+        """1000 張牌卡的查詢中位數低於 1ms"""
+        cards = [
+            dict(card, card_key=f"{card['card_key']}_{i}", display_order=i)
+            for i in range(200)
+            for card in CARDS
+        ]
+        index = CardSearchIndex(cards)
+
+        timings = []
+        for query in ["設計", "工程師", "eng", "師 設計"] * 25:
+            start = time.perf_counter()
+            index.search(query, category=["technology"], limit=20)
+            timings.append(time.perf_counter() - start)
+
+        timings.sort()
+        assert timings[len(timings) // 2] < 0.001
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    app.dependency_overrides[get_session] = lambda: session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="deck")
+def deck_fixture(session: Session):
+    rule = GameRuleTemplate(
+        slug="search_test",
+        name="搜尋測試",
+        layout_config={},
+        constraint_config={},
+        validation_rules={},
+    )
+    session.add(rule)
+    session.commit()
+
+    deck = CardDeck(game_rule_id=rule.id, name="搜尋牌組")
+    session.add(deck)
+    session.commit()
+
+    for card in CARDS:
+        session.add(Card(deck_id=deck.id, **card))
+    session.commit()
+    return deck
+
+
+class TestSearchEndpoint:
+    """測試搜尋端點"""
+
+    def test_search(self, client: TestClient, deck: CardDeck):
+        response = client.get(
+            f"/api/game-rules/decks/{deck.id}/search",
+            params={"q": "設計", "category": ["technology", "creative"]},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert data["results"][0]["card"]["title"] == "UI/UX設計師"
+        assert data["facets"]["category"] == {"technology": 2, "creative": 1}
+
+    def test_metadata_filter(self, client: TestClient, deck: CardDeck):
+        response = client.get(
+            f"/api/game-rules/decks/{deck.id}/search",
+            params={"metadata": "level:junior"},
+        )
+
+        assert [item["card"]["card_key"] for item in response.json()["results"]] == [
+            "tech_004"
+        ]
+
+    def test_invalid_metadata_filter(self, client: TestClient, deck: CardDeck):
+        response = client.get(
+            f"/api/game-rules/decks/{deck.id}/search", params={"metadata": "level"}
+        )
+
+        assert response.status_code == 422
+
+    def test_unknown_deck(self, client: TestClient):
+        response = client.get(
+            "/api/game-rules/decks/00000000-0000-0000-0000-000000000000/search"
+        )
+
+        assert response.status_code == 404
@@ -0,0 +1,181 @@
+"""
+Test client export - 客戶匯出測試
+
+1. GET /api/clients/export 以 CSV / NDJSON 串流客戶或諮詢記錄
+2. gzip 壓縮與諮商師範圍
+3. 伺服器端游標分批讀取，記憶體上限與筆數無關
+"""
+
+import csv
+import gzip
+import io
+import tracemalloc
+from datetime import datetime
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlmodel import Session
+
+from app.core.database import get_session
+from app.main import app
+from app.models.client import Client, ConsultationRecord, RoomClient
+from app.models.room import Room
+from app.services.client_export import iter_export
+from tests.factories import UserFactory
+from tests.helpers import create_auth_headers
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    app.dependency_overrides[get_session] = lambda: session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="counselor")
+def counselor_fixture(session: Session):
+    counselor = UserFactory.create_counselor(session, email="export@test.com")
+    room = Room(counselor_id=counselor.id, name="Export Room", session_count=3)
+    session.add(room)
+    for index in range(3):
+        customer = Client(
+            counselor_id=counselor.id,
+            name=f"匯出客戶 {index}",
+            email=f"export{index}@test.com",
+            tags=["career", "2025"],
+            updated_at=datetime(2025, 1, 1 + index),
+        )
+        session.add(customer)
+        session.flush()
+        session.add(RoomClient(room_id=room.id, client_id=customer.id))
+        session.add(
+            ConsultationRecord(
+                room_id=room.id,
+                client_id=customer.id,
+                counselor_id=counselor.id,
+                session_date=datetime(2025, 2, 1 + index),
+                screenshots=["https://storage.test/a.png"],
+                game_state={"gameplay": "life_transformation", "cards": ["x"] * 20},
+                topics=["career"],
+            )
+        )
+    other = UserFactory.create_counselor(session, email="export-other@test.com")
+    session.add(Client(counselor_id=other.id, name="Not Mine"))
+    session.commit()
+    return counselor
+
+
+def export(client: TestClient, counselor, **params):
+    response = client.get(
+        "/api/clients/export", params=params, headers=create_auth_headers(counselor)
+    )
+    assert response.status_code == 200, response.text
+    return response
+
+
+class TestClientExportEndpoint:
+    """測試匯出端點"""
+
+    def test_csv_clients(self, client: TestClient, counselor):
+        response = export(client, counselor)
+
+        assert response.headers["content-type"].startswith("text/csv")
+        assert ".csv" in response.headers["content-disposition"]
+        body = response.content.decode("utf-8")
+        assert body.startswith("\ufeff")
+        rows = list(csv.DictReader(io.StringIO(body.lstrip("\ufeff"))))
+        assert [row["name"] for row in rows] == [f"匯出客戶 {i}" for i in range(3)]
+        assert rows[0]["tags"] == "career;2025"
+        assert rows[0]["status"] == "active"
+        assert rows[0]["active_rooms_count"] == "1"
+        assert rows[0]["total_consultations"] == "3"
+
+    def test_ndjson_consultations(self, client: TestClient, counselor):
+        response = export(client, counselor, format="ndjson", dataset="consultations")
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [orjson.loads(line) for line in response.content.splitlines()]
+        assert len(lines) == 3
+        assert lines[0]["gameplay"] == "life_transformation"
+        assert lines[0]["screenshot_count"] == 1
+        assert lines[0]["client_name"] == "匯出客戶 0"
+        assert "game_state" not in lines[0] and "screenshots" not in lines[0]
+
+    def test_gzip(self, client: TestClient, counselor):
+        plain = export(client, counselor, format="ndjson").content
+        compressed = export(client, counselor, format="ndjson", gzip=True)
+
+        assert compressed.headers["content-type"] == "application/gzip"
+        assert compressed.headers["content-disposition"].endswith('.ndjson.gz"')
+        assert gzip.decompress(compressed.content) == plain
+
+    def test_uses_server_side_cursor(
+        self, client: TestClient, counselor, session: Session
+    ):
+        cursors = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if "FROM clients" in statement and "client_stats" in statement:
+                cursors.append(cursor.name)
+
+        event.listen(session.bind, "before_cursor_execute", record)
+        try:
+            export(client, counselor)
+        finally:
+            event.remove(session.bind, "before_cursor_execute", record)
+
+        # psycopg2 named cursor = server-side cursor
+        assert cursors and all(name for name in cursors)
+
+    def test_invalid_params(self, client: TestClient, counselor):
+        headers = create_auth_headers(counselor)
+
+        for params in ({"format": "xlsx"}, {"dataset": "rooms"}):
+            response = client.get("/api/clients/export", params=params, headers=headers)
+            assert response.status_code == 422
+
+
+class TestExportMemory:
+    """測試串流匯出的記憶體上限"""
+
+    ROWS = 20_000
+    BATCH_SIZE = 500
+    # Peak memory depends on the batch size (about 2 MB for 500 rows here),
+    # not on the number of exported rows
+    PEAK_LIMIT = 4 * 1024 * 1024
+
+    def test_memory_ceiling(self, session: Session, counselor):
+        session.execute(
+            text(
+                "INSERT INTO clients (id, counselor_id, name, email, notes, tags, "
+                "status, email_verified, created_at, updated_at) "
+                "SELECT gen_random_uuid(), :counselor_id, 'Bulk client ' || n, "
+                "'bulk' || n || '@test.com', repeat('note ', 60), "
+                "CAST(:tags AS json), 'ACTIVE', false, now(), now() "
+                "FROM generate_series(1, :rows) AS n"
+            ),
+            {"counselor_id": counselor.id, "rows": self.ROWS, "tags": '["bulk"]'},
+        )
+
+        exported = rows = 0
+        tracemalloc.start()
+        try:
+            for chunk in iter_export(
+                session.connection(),
+                counselor.id,
+                "clients",
+                "ndjson",
+                batch_size=self.BATCH_SIZE,
+            ):
+                exported += len(chunk)
+                rows += chunk.count(b"\n")
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert rows == self.ROWS + 3
+        # The stream is several times larger than the memory it needed
+        assert exported > 3 * self.PEAK_LIMIT
+        assert peak < self.PEAK_LIMIT
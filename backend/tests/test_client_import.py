@@ -0,0 +1,181 @@
+"""
+Test client import - 客戶批次匯入測試
+
+1. POST /api/clients/import 以 CSV / NDJSON 建立客戶、預設諮詢室與關聯
+2. 重複 email 與格式錯誤以列號回報，其餘列照常建立
+3. 建立以集合式 INSERT ... SELECT 完成，語句數與筆數無關
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app.core.database import get_session
+from app.main import app
+from app.models.client import Client, ClientStats, RoomClient
+from app.models.room import Room
+from tests.factories import UserFactory
+from tests.helpers import create_auth_headers
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    app.dependency_overrides[get_session] = lambda: session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="counselor")
+def counselor_fixture(session: Session):
+    counselor = UserFactory.create_counselor(session, email="import@test.com")
+    session.add(
+        Client(counselor_id=counselor.id, name="Existing", email="taken@test.com")
+    )
+    session.commit()
+    return counselor
+
+
+def upload(client: TestClient, counselor, content: str, filename="clients.csv", **kw):
+    return client.post(
+        "/api/clients/import",
+        files={"file": (filename, content.encode("utf-8"), "text/plain")},
+        headers=create_auth_headers(counselor),
+        **kw,
+    )
+
+
+def imported(session: Session, counselor):
+    return session.exec(
+        select(Client)
+        .where(Client.counselor_id == counselor.id, Client.name != "Existing")
+        .order_by(Client.name)
+    ).all()
+
+
+class TestClientImport:
+    """測試批次匯入"""
+
+    def test_csv_creates_clients_rooms_and_links(
+        self, client: TestClient, session: Session, counselor
+    ):
+        content = (
+            "﻿name,email,phone,tags\n"
+            "王小明,ming@test.com,0912,career;2025\n"
+            "李小華,,,\n"
+        )
+
+        response = upload(client, counselor, content)
+
+        assert response.status_code == 200, response.text
+        assert response.json() == {"total_rows": 2, "created": 2, "errors": []}
+        clients = imported(session, counselor)
+        assert [c.name for c in clients] == ["李小華", "王小明"]
+        ming = clients[1]
+        assert ming.tags == ["career", "2025"] and ming.phone == "0912"
+        assert clients[0].email is None and clients[0].tags == []
+
+        room = session.exec(
+            select(Room)
+            .join(RoomClient, RoomClient.room_id == Room.id)
+            .where(RoomClient.client_id == ming.id)
+        ).one()
+        assert room.name == "王小明 的諮詢室"
+        assert room.counselor_id == counselor.id and len(room.share_code) == 6
+        stats = session.get(ClientStats, ming.id, populate_existing=True)
+        assert stats.active_rooms_count == 1
+
+    def test_ndjson(self, client: TestClient, session: Session, counselor):
+        content = "\n".join(
+            json.dumps(row, ensure_ascii=False)
+            for row in ({"name": "Ann", "tags": ["a"]}, {"name": "Bob"})
+        )
+
+        response = upload(client, counselor, content, filename="clients.ndjson")
+
+        assert response.json()["created"] == 2
+        assert [c.name for c in imported(session, counselor)] == ["Ann", "Bob"]
+
+    def test_reports_errors_per_row(
+        self, client: TestClient, session: Session, counselor
+    ):
+        content = (
+            "name,email\n"
+            "One,dup@test.com\n"
+            "Two,dup@test.com\n"
+            "Three,taken@test.com\n"
+            f"{'x' * 101},long@test.com\n"
+            "Five,five@test.com\n"
+        )
+
+        data = upload(client, counselor, content).json()
+
+        assert data["total_rows"] == 5 and data["created"] == 2
+        assert [(e["row"], e["email"]) for e in data["errors"]] == [
+            (2, "dup@test.com"),
+            (3, "taken@test.com"),
+            (4, "long@test.com"),
+        ]
+        assert "already have a client" in data["errors"][1]["message"]
+        assert data["errors"][2]["message"].startswith("name:")
+        assert [c.name for c in imported(session, counselor)] == ["Five", "One"]
+
+    def test_invalid_ndjson_line(self, client: TestClient, counselor):
+        content = '{"name": "Ok"}\n{broken\n[1, 2]\n'
+
+        data = upload(client, counselor, content, params={"format": "ndjson"}).json()
+
+        assert data["created"] == 1
+        assert [e["row"] for e in data["errors"]] == [2, 3]
+
+    def test_ndjson_tags_must_be_a_list(
+        self, client: TestClient, session: Session, counselor
+    ):
+        content = "\n".join(
+            json.dumps(row)
+            for row in (
+                {"name": "Num", "tags": 5},
+                {"name": "Str", "tags": "ab"},
+                {"name": "Ok", "tags": ["a", ""]},
+            )
+        )
+
+        data = upload(client, counselor, content, filename="clients.ndjson").json()
+
+        assert data["created"] == 1
+        assert [e["row"] for e in data["errors"]] == [1, 2]
+        assert all(e["message"].startswith("tags:") for e in data["errors"])
+        assert [c.tags for c in imported(session, counselor)] == [["a"]]
+
+    def test_unreadable_files(self, client: TestClient, counselor):
+        assert upload(client, counselor, "foo,bar\n1,2\n").status_code == 400
+        response = client.post(
+            "/api/clients/import",
+            files={"file": ("c.csv", "name\nÉ\n".encode("latin-1"), "text/csv")},
+            headers=create_auth_headers(counselor),
+        )
+        assert response.status_code == 400
+
+    def test_statement_count_does_not_grow_with_rows(
+        self, client: TestClient, session: Session, counselor
+    ):
+        def count_statements(rows: int, offset: int) -> int:
+            statements = []
+
+            def record(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+
+            content = "name,email\n" + "".join(
+                f"C{n},c{n}@test.com\n" for n in range(offset, offset + rows)
+            )
+            event.listen(session.bind, "before_cursor_execute", record)
+            try:
+                response = upload(client, counselor, content)
+            finally:
+                event.remove(session.bind, "before_cursor_execute", record)
+            assert response.json()["created"] == rows
+            return len(statements)
+
+        assert count_statements(5, 0) == count_statements(500, 5)
@@ -0,0 +1,178 @@
+"""
+Test client search - 客戶搜尋測試
+
+1. GET /api/clients/search 依相關度排序並限制筆數
+2. 查詢正規化（全形、大小寫、多詞）與 LIKE 萬用字元跳脫
+3. EXPLAIN 確認搜尋使用 ix_clients_search_trgm（需要 pg_trgm）
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session, or_, select
+
+from app.core.database import get_session
+from app.main import app
+from app.models.client import Client
+from app.services.client_search import (
+    build_search_query,
+    normalize_query,
+    trigram_installed,
+)
+from tests.factories import UserFactory
+from tests.helpers import create_auth_headers
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    app.dependency_overrides[get_session] = lambda: session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="counselor")
+def counselor_fixture(session: Session):
+    counselor = UserFactory.create_counselor(session, email="search@test.com")
+    for name, email, phone, tags in [
+        ("Wang Xiaoming", "xm.wang@test.com", "0912-345-678", ["career"]),
+        ("Lin Mei", "wangmei@test.com", None, []),
+        ("Chen Wei", "chen@test.com", "0987-654-321", ["wang-referral"]),
+        ("Huang Li", "100%real@test.com", None, []),
+        ("Zhang San", "zhang@test.com", None, ["student"]),
+    ]:
+        session.add(
+            Client(
+                counselor_id=counselor.id,
+                name=name,
+                email=email,
+                phone=phone,
+                tags=tags,
+            )
+        )
+    other = UserFactory.create_counselor(session, email="search-other@test.com")
+    session.add(Client(counselor_id=other.id, name="Wang Other"))
+    session.commit()
+    return counselor
+
+
+def search(client: TestClient, counselor, **params):
+    response = client.get(
+        "/api/clients/search", params=params, headers=create_auth_headers(counselor)
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def explain(session: Session, query) -> str:
+    compiled = query.compile(dialect=postgresql.psycopg2.dialect())
+    connection = session.connection()
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    rows = connection.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params)
+    return "\n".join(row[0] for row in rows)
+
+
+class TestNormalizeQuery:
+    """測試查詢正規化"""
+
+    def test_fullwidth_and_case(self):
+        assert normalize_query("ＷＡＮＧ　Ｍｅｉ") == ["wang", "mei"]
+
+    def test_blank_and_token_limit(self):
+        assert normalize_query("   ") == []
+        assert len(normalize_query("a b c d e f g")) == 5
+
+
+class TestClientSearchEndpoint:
+    """測試搜尋端點"""
+
+    def test_name_prefix_ranks_first(self, client: TestClient, counselor):
+        results = search(client, counselor, q="wang")
+
+        names = [result["name"] for result in results]
+        assert names[0] == "Wang Xiaoming"
+        assert set(names) >= {"Wang Xiaoming", "Lin Mei", "Chen Wei"}
+        assert "Wang Other" not in names
+        scores = [result["score"] for result in results]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_matches_phone_and_tags(self, client: TestClient, counselor):
+        assert [r["name"] for r in search(client, counselor, q="654")] == ["Chen Wei"]
+        assert [r["name"] for r in search(client, counselor, q="student")] == [
+            "Zhang San"
+        ]
+
+    def test_every_term_must_match(self, client: TestClient, counselor):
+        results = search(client, counselor, q="wang mei")
+
+        assert [result["name"] for result in results] == ["Lin Mei"]
+
+    def test_fullwidth_query(self, client: TestClient, counselor):
+        results = search(client, counselor, q="ＺＨＡＮＧ")
+
+        assert [result["name"] for result in results] == ["Zhang San"]
+
+    def test_like_wildcards_are_literal(self, client: TestClient, counselor):
+        assert [r["name"] for r in search(client, counselor, q="0%r")] == ["Huang Li"]
+        assert search(client, counselor, q="w_ng") == []
+
+    def test_limit(self, client: TestClient, counselor):
+        assert len(search(client, counselor, q="test.com", limit=2)) == 2
+
+    def test_mixed_cjk_and_latin(self, client: TestClient, counselor, session: Session):
+        encoding = session.exec(text("SHOW server_encoding")).one()[0]
+        if encoding != "UTF8":
+            pytest.skip(f"server_encoding is {encoding}, CJK text not storable")
+        session.add(
+            Client(counselor_id=counselor.id, name="王小明", email="xiaoming@test.com")
+        )
+        session.commit()
+
+        results = search(client, counselor, q="小明 xiaoming")
+
+        assert [result["name"] for result in results] == ["王小明"]
+
+    def test_validation(self, client: TestClient, counselor):
+        headers = create_auth_headers(counselor)
+
+        assert client.get("/api/clients/search", headers=headers).status_code == 422
+        assert (
+            client.get(
+                "/api/clients/search", params={"q": "a", "limit": 0}, headers=headers
+            ).status_code
+            == 422
+        )
+
+
+class TestClientSearchIndex:
+    """EXPLAIN 確認三元組索引可用於搜尋"""
+
+    @pytest.fixture(autouse=True)
+    def filler_clients(self, session: Session, counselor):
+        """大量不相符的客戶，讓 counselor_id 索引不再具選擇性"""
+        if not trigram_installed(session):
+            pytest.skip("pg_trgm extension is not installed")
+        session.execute(
+            text(
+                "INSERT INTO clients (id, counselor_id, name, email, tags, status, "
+                "email_verified, created_at, updated_at) "
+                "SELECT gen_random_uuid(), :counselor_id, 'Filler ' || n, "
+                "'filler' || n || '@test.com', '[]', 'ACTIVE', false, now(), now() "
+                "FROM generate_series(1, 2000) AS n"
+            ),
+            {"counselor_id": counselor.id},
+        )
+        session.execute(text("ANALYZE clients"))
+
+    def test_search_uses_trigram_index(self, session: Session, counselor):
+        plan = explain(session, build_search_query(counselor.id, "wang"))
+
+        assert "ix_clients_search_trgm" in plan
+
+    def test_list_search_filter_uses_trigram_index(self, session: Session, counselor):
+        query = select(Client).where(
+            Client.counselor_id == counselor.id,
+            or_(Client.name.ilike("%wang%"), Client.email.ilike("%wang%")),
+        )
+
+        assert "ix_clients_search_trgm" in explain(session, query)
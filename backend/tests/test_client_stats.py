@@ -0,0 +1,367 @@
+"""
+Test client stats - 客戶統計表測試
+
+1. 觸發器在同一交易中維護 client_stats
+2. reconcile_client_stats 修復漂移
+3. 客戶端點以主鍵讀取 client_stats
+4. 客戶詳細資料端點以單一查詢載入客戶與統計
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlmodel import Session, SQLModel
+
+from app.core.database import get_session
+from app.main import app
+from app.models.client import Client, ClientStats, ConsultationRecord, RoomClient
+from app.models.room import Room
+from app.services.client_stats import (
+    load_client_detail,
+    reconcile_client_stats,
+)
+from tests.factories import UserFactory
+from tests.helpers import create_auth_headers
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    app.dependency_overrides[get_session] = lambda: session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="counselor")
+def counselor_fixture(session: Session):
+    return UserFactory.create_counselor(session, email="stats@test.com")
+
+
+def add_client(session: Session, counselor, name: str = "Stats Client") -> Client:
+    client = Client(counselor_id=counselor.id, name=name)
+    session.add(client)
+    session.flush()
+    return client
+
+
+def add_room(
+    session: Session, counselor, client: Client, session_count: int = 0
+) -> Room:
+    room = Room(
+        counselor_id=counselor.id, name="Stats Room", session_count=session_count
+    )
+    session.add(room)
+    session.flush()
+    session.add(RoomClient(room_id=room.id, client_id=client.id))
+    session.flush()
+    return room
+
+
+def add_record(session: Session, counselor, room: Room, client: Client, when):
+    record = ConsultationRecord(
+        room_id=room.id,
+        client_id=client.id,
+        counselor_id=counselor.id,
+        session_date=when,
+    )
+    session.add(record)
+    session.flush()
+    return record
+
+
+def stats_of(session: Session, client: Client):
+    # 觸發器在 ORM 之外更新資料列，重新讀取避免身分對應表中的舊值
+    stats = session.get(ClientStats, client.id, populate_existing=True)
+    return (
+        stats.active_rooms_count,
+        stats.total_consultations,
+        stats.last_consultation_date,
+    )
+
+
+class TestClientStatsTriggers:
+    """測試觸發器維護統計"""
+
+    def test_new_client_gets_empty_stats(self, session: Session, counselor):
+        client = add_client(session, counselor)
+
+        assert stats_of(session, client) == (0, 0, None)
+
+    def test_room_link_and_session_count(self, session: Session, counselor):
+        client = add_client(session, counselor)
+        room = add_room(session, counselor, client, session_count=2)
+        assert stats_of(session, client) == (1, 2, None)
+
+        room.session_count = 5
+        session.add(room)
+        session.flush()
+        assert stats_of(session, client) == (1, 5, None)
+
+    def test_room_deactivation_and_restore(self, session: Session, counselor):
+        client = add_client(session, counselor)
+        room = add_room(session, counselor, client, session_count=1)
+
+        room.is_active = False
+        session.add(room)
+        session.flush()
+        assert stats_of(session, client) == (0, 1, None)
+
+        room.is_active = True
+        session.add(room)
+        session.flush()
+        assert stats_of(session, client)[0] == 1
+
+    def test_room_unlink(self, session: Session, counselor):
+        client = add_client(session, counselor)
+        add_room(session, counselor, client, session_count=3)
+
+        link = session.query(RoomClient).filter_by(client_id=client.id).one()
+        session.delete(link)
+        session.flush()
+
+        assert stats_of(session, client) == (0, 0, None)
+
+    def test_consultation_records(self, session: Session, counselor):
+        client = add_client(session, counselor)
+        room = add_room(session, counselor, client)
+        latest = datetime(2025, 3, 1, 10, 0)
+
+        add_record(session, counselor, room, client, latest - timedelta(days=7))
+        newest = add_record(session, counselor, room, client, latest)
+        assert stats_of(session, client)[2] == latest
+
+        session.delete(newest)
+        session.flush()
+        assert stats_of(session, client)[2] == latest - timedelta(days=7)
+
+    def test_other_counselors_rooms_are_ignored(self, session: Session, counselor):
+        other = UserFactory.create_counselor(session, email="other-stats@test.com")
+        client = add_client(session, counselor)
+        add_room(session, other, client, session_count=4)
+
+        assert stats_of(session, client) == (0, 0, None)
+
+    def test_create_all_is_repeatable(self, session: Session, counselor):
+        """觸發器 DDL 可在已建立的資料庫上重複執行（create_db_and_tables 重啟）"""
+        SQLModel.metadata.create_all(session.connection())
+        SQLModel.metadata.create_all(session.connection())
+
+        client = add_client(session, counselor)
+        add_room(session, counselor, client, session_count=1)
+
+        assert stats_of(session, client)[:2] == (1, 1)
+
+    def test_client_delete_removes_stats(self, session: Session, counselor):
+        client = add_client(session, counselor)
+        client_id = client.id
+        session.delete(client)
+        session.flush()
+
+        assert session.get(ClientStats, client_id) is None
+
+
+class TestReconcileClientStats:
+    """測試漂移修復"""
+
+    def test_repairs_drift_and_missing_rows(self, session: Session, counselor):
+        drifted = add_client(session, counselor, name="Drifted")
+        add_room(session, counselor, drifted, session_count=3)
+        missing = add_client(session, counselor, name="Missing")
+        intact = add_client(session, counselor, name="Intact")
+        session.execute(
+            text(
+                "UPDATE client_stats SET active_rooms_count = 9, "
+                "total_consultations = 0 WHERE client_id = :id"
+            ),
+            {"id": drifted.id},
+        )
+        session.execute(
+            text("DELETE FROM client_stats WHERE client_id = :id"), {"id": missing.id}
+        )
+
+        repaired = reconcile_client_stats(session)
+
+        assert repaired == 2
+        assert stats_of(session, drifted) == (1, 3, None)
+        assert stats_of(session, missing) == (0, 0, None)
+        assert stats_of(session, intact) == (0, 0, None)
+        assert reconcile_client_stats(session) == 0
+
+    def test_limited_to_client_ids(self, session: Session, counselor):
+        first = add_client(session, counselor, name="First")
+        second = add_client(session, counselor, name="Second")
+        session.execute(text("UPDATE client_stats SET active_rooms_count = 7"))
+
+        assert reconcile_client_stats(session, [first.id]) == 1
+        assert stats_of(session, first)[0] == 0
+        assert stats_of(session, second)[0] == 7
+        assert reconcile_client_stats(session, []) == 0
+
+
+class TestClientStatsEndpoints:
+    """測試端點讀取 client_stats"""
+
+    def test_get_client_reads_stats_row(
+        self, client: TestClient, session: Session, counselor
+    ):
+        customer = add_client(session, counselor)
+        room = add_room(session, counselor, customer, session_count=2)
+        add_record(session, counselor, room, customer, datetime(2025, 5, 1))
+        admin = UserFactory.create_admin(session, email="stats-admin@test.com")
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(session.bind, "before_cursor_execute", record)
+        try:
+            response = client.get(
+                f"/api/clients/{customer.id}", headers=create_auth_headers(admin)
+            )
+        finally:
+            event.remove(session.bind, "before_cursor_execute", record)
+
+        data = response.json()
+        assert response.status_code == 200
+        assert data["active_rooms_count"] == 1
+        assert data["total_consultations"] == 2
+        assert data["last_consultation_date"].startswith("2025-05-01")
+        assert any("client_stats" in statement for statement in statements)
+        assert not any("consultation_records" in statement for statement in statements)
+
+    def test_consultation_record_endpoint_updates_stats(
+        self, client: TestClient, session: Session, counselor
+    ):
+        customer = add_client(session, counselor)
+        room = add_room(session, counselor, customer)
+        session.commit()
+        headers = create_auth_headers(counselor)
+
+        created = client.post(
+            f"/api/clients/{customer.id}/consultation-records",
+            json={
+                "room_id": str(room.id),
+                "client_id": str(customer.id),
+                "session_date": "2025-06-01T09:30:00",
+            },
+            headers=headers,
+        )
+        data = client.get("/api/clients", headers=headers).json()
+
+        assert created.status_code == 200
+        assert data[0]["last_consultation_date"].startswith("2025-06-01T09:30")
+
+
+def capture_statements(session: Session, call):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(session.bind, "before_cursor_execute", record)
+    try:
+        response = call()
+    finally:
+        event.remove(session.bind, "before_cursor_execute", record)
+    return response, statements
+
+
+class TestClientDetailLoader:
+    """測試客戶詳細資料的單一查詢載入"""
+
+    @pytest.fixture(name="customer")
+    def customer_fixture(self, session: Session, counselor):
+        customer = add_client(session, counselor)
+        room = add_room(session, counselor, customer, session_count=3)
+        add_record(session, counselor, room, customer, datetime(2025, 5, 1))
+        session.commit()
+        return customer
+
+    def test_get_client_is_one_query(
+        self, client: TestClient, session: Session, counselor, customer
+    ):
+        url, headers = f"/api/clients/{customer.id}", create_auth_headers(counselor)
+
+        response, statements = capture_statements(
+            session, lambda: client.get(url, headers=headers)
+        )
+
+        data = response.json()
+        assert response.status_code == 200
+        assert (data["active_rooms_count"], data["total_consultations"]) == (1, 3)
+        assert data["last_consultation_date"].startswith("2025-05-01")
+        assert len(statements) == 1
+
+    def test_update_client_reuses_loaded_stats(
+        self, client: TestClient, session: Session, counselor, customer
+    ):
+        url, headers = f"/api/clients/{customer.id}", create_auth_headers(counselor)
+
+        response, statements = capture_statements(
+            session,
+            lambda: client.put(
+                url, json={"name": "Renamed", "tags": ["vip"]}, headers=headers
+            ),
+        )
+
+        data = response.json()
+        assert response.status_code == 200
+        assert (data["name"], data["tags"]) == ("Renamed", ["vip"])
+        assert data["total_consultations"] == 3
+        assert len(statements) == 2 and statements[1].lstrip().startswith("UPDATE")
+        assert load_client_detail(session, customer.id).name == "Renamed"
+
+    def test_bind_email(
+        self, client: TestClient, session: Session, counselor, customer
+    ):
+        url = f"/api/clients/{customer.id}/bind-email"
+        body = {"client_id": str(customer.id), "email": "bound@test.com"}
+        headers = create_auth_headers(counselor)
+
+        response, statements = capture_statements(
+            session, lambda: client.post(url, json=body, headers=headers)
+        )
+
+        data = response.json()
+        assert response.status_code == 200
+        assert data["email"] == "bound@test.com" and data["active_rooms_count"] == 1
+        assert len(statements) == 3
+        token = session.exec(
+            text("SELECT verification_token FROM clients WHERE id = :id").bindparams(
+                id=customer.id
+            )
+        ).one()[0]
+        assert token
+
+    def test_access_checks(
+        self, client: TestClient, session: Session, counselor, customer
+    ):
+        other = UserFactory.create_counselor(session, email="stats-other@test.com")
+        admin = UserFactory.create_admin(session, email="stats-admin2@test.com")
+        url = f"/api/clients/{customer.id}"
+
+        assert client.get(url, headers=create_auth_headers(other)).status_code == 403
+        assert client.get(url, headers=create_auth_headers(admin)).status_code == 200
+        bind = client.post(
+            f"{url}/bind-email",
+            json={"client_id": str(customer.id), "email": "admin@test.com"},
+            headers=create_auth_headers(admin),
+        )
+        missing = client.get(
+            f"/api/clients/{counselor.id}", headers=create_auth_headers(counselor)
+        )
+        assert bind.status_code == 403
+        assert missing.status_code == 404
+
+    def test_client_without_stats_row(self, session: Session, counselor):
+        customer = add_client(session, counselor)
+        session.execute(
+            text("DELETE FROM client_stats WHERE client_id = :id"), {"id": customer.id}
+        )
+
+        detail = load_client_detail(session, customer.id)
+
+        assert (detail.active_rooms_count, detail.total_consultations) == (0, 0)
+        assert detail.last_consultation_date is None
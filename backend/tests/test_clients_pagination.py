@@ -0,0 +1,193 @@
+"""
+Test client list pagination - 客戶列表分頁測試
+
+1. ?limit= 以 (updated_at, id) keyset 分頁，X-Next-Cursor 取得下一頁
+2. ?include= 選擇要載入的展開資料（rooms, stats）
+3. 統計查詢只涵蓋當頁客戶
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.database import get_session
+from app.main import app
+from app.models.client import Client, ConsultationRecord, RoomClient
+from app.models.room import Room
+from tests.factories import UserFactory
+from tests.helpers import create_auth_headers
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    app.dependency_overrides[get_session] = lambda: session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="counselor")
+def counselor_fixture(session: Session):
+    """諮詢師與 12 位客戶（部分同一 updated_at），每位客戶 1 間諮詢室與 1 筆紀錄"""
+    counselor = UserFactory.create_counselor(session, email="paging@test.com")
+    base = datetime(2025, 1, 1)
+    for index in range(12):
+        client = Client(
+            counselor_id=counselor.id,
+            name=f"Client {index:02d}",
+            email=f"paging{index}@test.com",
+            updated_at=base + timedelta(minutes=index // 3),
+        )
+        room = Room(counselor_id=counselor.id, name=f"Room {index}", session_count=2)
+        session.add(client)
+        session.add(room)
+        session.flush()
+        session.add(RoomClient(room_id=room.id, client_id=client.id))
+        session.add(
+            ConsultationRecord(
+                room_id=room.id,
+                client_id=client.id,
+                counselor_id=counselor.id,
+                session_date=base,
+            )
+        )
+    session.commit()
+    return counselor
+
+
+def fetch_pages(client: TestClient, headers: dict, **params):
+    pages = []
+    cursor = None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get("/api/clients", params=query, headers=headers)
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+
+
+class TestClientListPagination:
+    """測試 keyset 分頁"""
+
+    def test_pages_cover_every_client_once_in_order(
+        self, client: TestClient, counselor
+    ):
+        headers = create_auth_headers(counselor)
+        full = client.get("/api/clients", headers=headers).json()
+
+        pages = fetch_pages(client, headers, limit=5)
+
+        assert [len(page) for page in pages] == [5, 5, 2]
+        assert [c["id"] for page in pages for c in page] == [c["id"] for c in full]
+        keys = [(c["updated_at"], c["id"]) for c in full]
+        assert keys == sorted(keys, reverse=True)
+
+    def test_last_page_has_no_cursor(self, client: TestClient, counselor):
+        response = client.get(
+            "/api/clients", params={"limit": 12}, headers=create_auth_headers(counselor)
+        )
+
+        assert len(response.json()) == 12
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_invalid_cursor(self, client: TestClient, counselor):
+        response = client.get(
+            "/api/clients",
+            params={"limit": 5, "cursor": "not-a-cursor"},
+            headers=create_auth_headers(counselor),
+        )
+
+        assert response.status_code == 400
+
+    def test_pagination_with_search(self, client: TestClient, counselor):
+        pages = fetch_pages(
+            client, create_auth_headers(counselor), limit=2, search="Client 0"
+        )
+
+        names = [c["name"] for page in pages for c in page]
+        assert sorted(names) == [f"Client {i:02d}" for i in range(10)]
+
+
+class TestClientListIncludes:
+    """測試 ?include= 展開選擇"""
+
+    def test_default_includes_rooms_and_stats(self, client: TestClient, counselor):
+        data = client.get("/api/clients", headers=create_auth_headers(counselor))
+
+        first = data.json()[0]
+        assert len(first["rooms"]) == 1
+        assert first["default_room_id"] is not None
+        assert first["active_rooms_count"] == 1
+        assert first["total_consultations"] == 2
+        assert first["last_consultation_date"] is not None
+
+    def test_stats_only_skips_rooms(self, client: TestClient, counselor):
+        data = client.get(
+            "/api/clients",
+            params={"include": "stats"},
+            headers=create_auth_headers(counselor),
+        )
+
+        first = data.json()[0]
+        assert first["rooms"] == []
+        assert first["default_room_id"] is None
+        assert first["active_rooms_count"] == 1
+
+    def test_empty_include_skips_all_expansions(
+        self, client: TestClient, counselor, session: Session
+    ):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        event.listen(session.bind, "before_cursor_execute", record)
+        try:
+            data = client.get(
+                "/api/clients",
+                params={"include": "", "limit": 5},
+                headers=create_auth_headers(counselor),
+            )
+        finally:
+            event.remove(session.bind, "before_cursor_execute", record)
+
+        assert data.status_code == 200
+        assert data.json()[0]["rooms"] == []
+        assert data.json()[0]["active_rooms_count"] == 0
+        assert not any("room_clients" in statement for statement in statements)
+
+    def test_unknown_include(self, client: TestClient, counselor):
+        response = client.get(
+            "/api/clients",
+            params={"include": "rooms,visits"},
+            headers=create_auth_headers(counselor),
+        )
+
+        assert response.status_code == 422
+
+    def test_stat_queries_are_scoped_to_page(
+        self, client: TestClient, counselor, session: Session
+    ):
+        batches = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if ".client_id IN" in statement:
+                batches.append(len(parameters))
+
+        event.listen(session.bind, "before_cursor_execute", record)
+        try:
+            client.get(
+                "/api/clients",
+                params={"limit": 3},
+                headers=create_auth_headers(counselor),
+            )
+        finally:
+            event.remove(session.bind, "before_cursor_execute", record)
+
+        # client_stats: 3 page ids; rooms: 3 page ids plus the counselor id
+        assert batches and all(count <= 5 for count in batches)
@@ -0,0 +1,252 @@
+"""
+Test consultation record pagination - 諮詢記錄分頁測試
+
+1. ?cursor= 以 (session_date, id) keyset 分頁
+2. view=summary 不載入 game_state 與截圖網址
+3. GET /api/clients/consultation-records/{record_id} 返回完整記錄
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlmodel import Session
+
+from app.core.database import get_session
+from app.main import app
+from app.models.client import Client, ConsultationRecord, RoomClient
+from app.models.room import Room
+from tests.factories import UserFactory
+from tests.helpers import create_auth_headers
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    app.dependency_overrides[get_session] = lambda: session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="history")
+def history_fixture(session: Session):
+    """一位客戶的 9 筆紀錄（每 3 筆同一 session_date），含截圖與遊戲狀態"""
+    counselor = UserFactory.create_counselor(session, email="records@test.com")
+    customer = Client(counselor_id=counselor.id, name="Long-term Client")
+    room = Room(counselor_id=counselor.id, name="History Room")
+    session.add(customer)
+    session.add(room)
+    session.flush()
+    session.add(RoomClient(room_id=room.id, client_id=customer.id))
+    base = datetime(2025, 1, 1, 9, 0)
+    for index in range(9):
+        session.add(
+            ConsultationRecord(
+                room_id=room.id,
+                client_id=customer.id,
+                counselor_id=counselor.id,
+                session_date=base + timedelta(days=index // 3),
+                screenshots=[f"https://storage.test/{index}-{n}.png" for n in range(2)],
+                game_state={"gameplay": "life_transformation", "cards": ["x"] * 50},
+                topics=[f"topic {index}"],
+            )
+        )
+    session.commit()
+    return counselor, customer
+
+
+def records_url(customer: Client) -> str:
+    return f"/api/clients/{customer.id}/consultation-records"
+
+
+class TestConsultationRecordKeyset:
+    """測試 keyset 分頁"""
+
+    def test_pages_cover_every_record_once_in_order(
+        self, client: TestClient, history, session: Session
+    ):
+        counselor, customer = history
+        headers = create_auth_headers(counselor)
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 4, **({"cursor": cursor} if cursor else {})}
+            response = client.get(records_url(customer), params=params, headers=headers)
+            assert response.status_code == 200
+            seen.extend(record["id"] for record in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        expected = session.exec(
+            text(
+                "SELECT id::text FROM consultation_records WHERE client_id = :id "
+                "ORDER BY session_date DESC, id DESC"
+            ).bindparams(id=customer.id)
+        ).all()
+        assert seen == [row[0] for row in expected]
+
+    def test_last_page_has_no_cursor(self, client: TestClient, history):
+        counselor, customer = history
+
+        response = client.get(
+            records_url(customer),
+            params={"limit": 9},
+            headers=create_auth_headers(counselor),
+        )
+
+        assert len(response.json()) == 9
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_invalid_cursor(self, client: TestClient, history):
+        counselor, customer = history
+
+        response = client.get(
+            records_url(customer),
+            params={"cursor": "not-a-cursor"},
+            headers=create_auth_headers(counselor),
+        )
+
+        assert response.status_code == 400
+
+    def test_keyset_uses_composite_index(self, session: Session, history):
+        _, customer = history
+        connection = session.connection()
+        # A long history so the planner prefers the ordered index over a sort
+        connection.execute(
+            text(
+                "INSERT INTO consultation_records (id, room_id, client_id, "
+                "counselor_id, session_date, topics, follow_up_required, "
+                "created_at, updated_at) "
+                "SELECT gen_random_uuid(), room_id, client_id, counselor_id, "
+                "session_date - n * interval '1 day', '[]', false, now(), now() "
+                "FROM consultation_records, generate_series(1, 300) AS n "
+                "WHERE client_id = :id"
+            ),
+            {"id": customer.id},
+        )
+        connection.exec_driver_sql("ANALYZE consultation_records")
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+
+        plan = connection.execute(
+            text(
+                "EXPLAIN SELECT id FROM consultation_records WHERE client_id = :id "
+                "AND (session_date, id) < (:date, :rid) "
+                "ORDER BY session_date DESC, id DESC LIMIT 11"
+            ),
+            {"id": customer.id, "date": datetime(2025, 1, 3), "rid": customer.id},
+        ).all()
+
+        plan_text = "\n".join(row[0] for row in plan)
+        assert "ix_consultation_records_client_session" in plan_text
+        assert "Sort" not in plan_text
+
+
+class TestConsultationRecordSummary:
+    """測試摘要投影"""
+
+    def test_summary_omits_heavy_columns(
+        self, client: TestClient, history, session: Session
+    ):
+        counselor, customer = history
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if "FROM consultation_records" in statement:
+                statements.append(statement)
+
+        event.listen(session.bind, "before_cursor_execute", record)
+        try:
+            response = client.get(
+                records_url(customer),
+                params={"view": "summary", "limit": 3},
+                headers=create_auth_headers(counselor),
+            )
+        finally:
+            event.remove(session.bind, "before_cursor_execute", record)
+
+        first = response.json()[0]
+        assert response.status_code == 200
+        assert first["gameplay"] == "life_transformation"
+        assert first["screenshot_count"] == 2
+        assert "game_state" not in first and "screenshots" not in first
+        assert "X-Next-Cursor" in response.headers
+        assert statements
+        assert not any(
+            "consultation_records.game_state," in statement
+            or "consultation_records.screenshots," in statement
+            for statement in statements
+        )
+
+    def test_full_view_is_default(self, client: TestClient, history):
+        counselor, customer = history
+
+        response = client.get(
+            records_url(customer), headers=create_auth_headers(counselor)
+        )
+
+        first = response.json()[0]
+        assert len(response.json()) == 9
+        assert first["game_state"]["gameplay"] == "life_transformation"
+        assert len(first["screenshots"]) == 2
+
+    def test_unknown_view(self, client: TestClient, history):
+        counselor, customer = history
+
+        response = client.get(
+            records_url(customer),
+            params={"view": "compact"},
+            headers=create_auth_headers(counselor),
+        )
+
+        assert response.status_code == 422
+
+
+class TestConsultationRecordDetail:
+    """測試單筆記錄端點"""
+
+    def test_returns_full_record(self, client: TestClient, history, session: Session):
+        counselor, customer = history
+        record = session.exec(
+            text(
+                "SELECT id FROM consultation_records WHERE client_id = :id LIMIT 1"
+            ).bindparams(id=customer.id)
+        ).first()
+
+        response = client.get(
+            f"/api/clients/consultation-records/{record[0]}",
+            headers=create_auth_headers(counselor),
+        )
+
+        data = response.json()
+        assert response.status_code == 200
+        assert data["id"] == str(record[0])
+        assert len(data["game_state"]["cards"]) == 50
+        assert len(data["screenshots"]) == 2
+
+    def test_other_counselor_forbidden(
+        self, client: TestClient, history, session: Session
+    ):
+        _, customer = history
+        other = UserFactory.create_counselor(session, email="records-other@test.com")
+        record = session.exec(
+            text(
+                "SELECT id FROM consultation_records WHERE client_id = :id LIMIT 1"
+            ).bindparams(id=customer.id)
+        ).first()
+
+        response = client.get(
+            f"/api/clients/consultation-records/{record[0]}",
+            headers=create_auth_headers(other),
+        )
+
+        assert response.status_code == 403
+
+    def test_missing_record(self, client: TestClient, history):
+        counselor, customer = history
+
+        response = client.get(
+            f"/api/clients/consultation-records/{customer.id}",
+            headers=create_auth_headers(counselor),
+        )
+
+        assert response.status_code == 404
@@ -0,0 +1,276 @@
+"""
+Test consultation screenshots - 諮詢記錄截圖上傳測試
+
+1. 截圖以伺服器端 array_append / array_cat 追加，不會遺失並行上傳的網址
+2. 批次上傳只執行一次 UPDATE
+3. game_state 以正規化 JSON 保存，內容（jsonb）相同時不改寫
+"""
+
+import itertools
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlmodel import Session
+
+from app.core.database import get_session
+from app.main import app
+from app.models.client import Client, ConsultationRecord
+from app.models.room import Room
+from tests.factories import UserFactory
+from tests.helpers import create_auth_headers
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    app.dependency_overrides[get_session] = lambda: session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="record")
+def record_fixture(session: Session):
+    counselor = UserFactory.create_counselor(session, email="shots@test.com")
+    customer = Client(counselor_id=counselor.id, name="Screenshot Client")
+    room = Room(counselor_id=counselor.id, name="Screenshot Room")
+    session.add(customer)
+    session.add(room)
+    session.flush()
+    record = ConsultationRecord(
+        room_id=room.id,
+        client_id=customer.id,
+        counselor_id=counselor.id,
+        session_date=datetime(2025, 2, 1),
+    )
+    session.add(record)
+    session.commit()
+    return counselor, record
+
+
+@pytest.fixture(autouse=True)
+def fake_storage():
+    """以遞增網址取代實際上傳"""
+    counter = itertools.count()
+
+    async def upload(file, counselor_id, record_id):
+        return f"https://storage.test/{record_id}/{next(counter)}.png"
+
+    with patch(
+        "app.services.storage.upload_screenshot", AsyncMock(side_effect=upload)
+    ) as mock:
+        yield mock
+
+
+def image(name: str = "shot.png"):
+    return (name, b"\x89PNG fake", "image/png")
+
+
+def stored(session: Session, record: ConsultationRecord):
+    return session.execute(
+        text(
+            "SELECT screenshots, game_state::text FROM consultation_records "
+            "WHERE id = :id"
+        ),
+        {"id": record.id},
+    ).one()
+
+
+class TestScreenshotAppend:
+    """測試單張上傳"""
+
+    def test_appends_and_returns_total(
+        self, client: TestClient, session: Session, record
+    ):
+        counselor, rec = record
+        url = f"/api/clients/consultation-records/{rec.id}/screenshots"
+        headers = create_auth_headers(counselor)
+
+        first = client.post(url, files={"file": image()}, headers=headers)
+        second = client.post(url, files={"file": image()}, headers=headers)
+
+        assert first.status_code == 200
+        assert second.json()["total_screenshots"] == 2
+        assert stored(session, rec)[0] == [first.json()["url"], second.json()["url"]]
+
+    def test_keeps_urls_appended_by_other_writers(
+        self, client: TestClient, session: Session, record
+    ):
+        counselor, rec = record
+        # Another request appends after this session loaded the (now stale) row
+        session.execute(
+            text(
+                "UPDATE consultation_records SET screenshots = "
+                "array_append(screenshots, 'https://storage.test/other.png') "
+                "WHERE id = :id"
+            ),
+            {"id": rec.id},
+        )
+
+        response = client.post(
+            f"/api/clients/consultation-records/{rec.id}/screenshots",
+            files={"file": image()},
+            headers=create_auth_headers(counselor),
+        )
+
+        assert response.json()["total_screenshots"] == 2
+        assert stored(session, rec)[0][0] == "https://storage.test/other.png"
+
+    def test_single_update_without_reading_heavy_columns(
+        self, client: TestClient, session: Session, record
+    ):
+        counselor, rec = record
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if "consultation_records" in statement:
+                statements.append(statement)
+
+        event.listen(session.bind, "before_cursor_execute", capture)
+        try:
+            client.post(
+                f"/api/clients/consultation-records/{rec.id}/screenshots",
+                files={"file": image()},
+                data={"game_state": '{"gameplay": "life_transformation"}'},
+                headers=create_auth_headers(counselor),
+            )
+        finally:
+            event.remove(session.bind, "before_cursor_execute", capture)
+
+        updates = [s for s in statements if s.lstrip().startswith("UPDATE")]
+        assert len(updates) == 1
+        assert "RETURNING" in updates[0]
+        assert not any(
+            "consultation_records.screenshots," in s
+            or "consultation_records.game_state," in s
+            for s in statements
+            if s.lstrip().startswith("SELECT")
+        )
+
+    def test_permissions(self, client: TestClient, session: Session, record):
+        _, rec = record
+        other = UserFactory.create_counselor(session, email="shots-other@test.com")
+
+        forbidden = client.post(
+            f"/api/clients/consultation-records/{rec.id}/screenshots",
+            files={"file": image()},
+            headers=create_auth_headers(other),
+        )
+        missing = client.post(
+            f"/api/clients/consultation-records/{rec.client_id}/screenshots",
+            files={"file": image()},
+            headers=create_auth_headers(other),
+        )
+
+        assert forbidden.status_code == 403
+        assert missing.status_code == 404
+        assert stored(session, rec)[0] == []
+
+
+class TestScreenshotBatch:
+    """測試批次上傳"""
+
+    def test_batch_appends_in_order(self, client: TestClient, session: Session, record):
+        counselor, rec = record
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().startswith("UPDATE"):
+                statements.append(statement)
+
+        event.listen(session.bind, "before_cursor_execute", capture)
+        try:
+            response = client.post(
+                f"/api/clients/consultation-records/{rec.id}/screenshots/batch",
+                files=[("files", image(f"{n}.png")) for n in range(3)],
+                headers=create_auth_headers(counselor),
+            )
+        finally:
+            event.remove(session.bind, "before_cursor_execute", capture)
+
+        data = response.json()
+        assert response.status_code == 200
+        assert data["total_screenshots"] == 3
+        assert stored(session, rec)[0] == data["urls"]
+        assert len(statements) == 1
+
+    def test_batch_limits(
+        self, client: TestClient, session: Session, record, fake_storage
+    ):
+        counselor, rec = record
+        url = f"/api/clients/consultation-records/{rec.id}/screenshots/batch"
+        headers = create_auth_headers(counselor)
+
+        too_many = client.post(
+            url, files=[("files", image()) for _ in range(11)], headers=headers
+        )
+        not_image = client.post(
+            url,
+            files=[("files", image()), ("files", ("a.txt", b"x", "text/plain"))],
+            headers=headers,
+        )
+
+        assert too_many.status_code == 400
+        assert not_image.status_code == 400
+        fake_storage.assert_not_called()
+
+
+class TestGameStateWrite:
+    """測試 game_state 正規化與 jsonb 比對"""
+
+    def post(self, client, counselor, rec, game_state):
+        return client.post(
+            f"/api/clients/consultation-records/{rec.id}/screenshots",
+            files={"file": image()},
+            data={"game_state": game_state},
+            headers=create_auth_headers(counselor),
+        )
+
+    def test_canonical_json_and_changes(
+        self, client: TestClient, session: Session, record
+    ):
+        counselor, rec = record
+
+        saved = self.post(client, counselor, rec, '{"b": 1, "a": {"y": 2, "x": 1}}')
+        assert saved.json()["game_state_saved"] is True
+        assert stored(session, rec)[1] == '{"a":{"x":1,"y":2},"b":1}'
+
+        # Same content in a different key order keeps the stored value
+        self.post(client, counselor, rec, '{"a": {"x": 1, "y": 2}, "b": 1}')
+        assert stored(session, rec)[1] == '{"a":{"x":1,"y":2},"b":1}'
+
+        self.post(client, counselor, rec, '{"a": 3}')
+        assert stored(session, rec)[1] == '{"a":3}'
+
+    def test_compares_content_of_non_canonical_rows(
+        self, client: TestClient, session: Session, record
+    ):
+        counselor, rec = record
+        # Written by another path: original key order and whitespace kept
+        session.execute(
+            text(
+                "UPDATE consultation_records "
+                'SET game_state = \'{"b": 1,  "a": 2}\' WHERE id = :id'
+            ),
+            {"id": rec.id},
+        )
+
+        self.post(client, counselor, rec, '{"a": 2, "b": 1}')
+        assert stored(session, rec)[1] == '{"b": 1,  "a": 2}'
+
+        self.post(client, counselor, rec, '{"a": 2, "b": 2}')
+        assert stored(session, rec)[1] == '{"a":2,"b":2}'
+
+    def test_invalid_json_is_ignored(
+        self, client: TestClient, session: Session, record
+    ):
+        counselor, rec = record
+        self.post(client, counselor, rec, '{"gameplay": "x"}')
+
+        response = self.post(client, counselor, rec, "{not json")
+
+        assert response.status_code == 200
+        assert response.json()["game_state_saved"] is False
+        assert response.json()["total_screenshots"] == 2
+        assert stored(session, rec)[1] == '{"gameplay":"x"}'
@@ -0,0 +1,101 @@
+"""
+Test execute_concurrently - 獨立查詢並行執行測試
+
+1. Engine 綁定的 Session：每個語句使用獨立連線並行執行，結果依序返回
+2. Connection 綁定的 Session（測試交易）：在同一連線上依序執行
+3. 管理員資料庫狀態 / 資料表端點
+"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.database import execute_concurrently, get_session
+from app.main import app
+from tests.factories import UserFactory
+from tests.helpers import create_auth_headers
+
+
+class TestExecuteConcurrently:
+    """測試並行執行"""
+
+    def test_engine_session_runs_statements_in_parallel(self, engine):
+        statements = [
+            text(f"SELECT {n}, pg_backend_pid() FROM pg_sleep(0.3)") for n in range(4)
+        ]
+
+        with Session(engine) as session:
+            start = time.perf_counter()
+            results = execute_concurrently(session, statements)
+            elapsed = time.perf_counter() - start
+
+        assert [rows[0][0] for rows in results] == [0, 1, 2, 3]
+        assert len({rows[0][1] for rows in results}) == 4
+        # Sequential execution would take at least 1.2s
+        assert elapsed < 0.9
+
+    def test_connection_session_runs_sequentially(self, session: Session):
+        session.execute(text("CREATE TEMP TABLE pending (n int)"))
+        session.execute(text("INSERT INTO pending VALUES (1), (2)"))
+
+        results = execute_concurrently(
+            session,
+            [
+                text("SELECT count(*) FROM pending"),
+                text("SELECT pg_backend_pid()"),
+                text("SELECT pg_backend_pid()"),
+            ],
+        )
+
+        # Same connection, so uncommitted rows are visible
+        assert results[0] == [(2,)]
+        assert results[1] == results[2]
+
+    def test_empty_and_single(self, engine):
+        with Session(engine) as session:
+            assert execute_concurrently(session, []) == []
+            assert execute_concurrently(session, [text("SELECT 1")]) == [[(1,)]]
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    app.dependency_overrides[get_session] = lambda: session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+class TestAdminDatabaseEndpoints:
+    """測試管理員資料庫端點"""
+
+    def test_status(self, client: TestClient, session: Session):
+        admin = UserFactory.create_admin(session, email="db-admin@test.com")
+
+        data = client.get(
+            "/api/admin/db/status", headers=create_auth_headers(admin)
+        ).json()
+
+        assert data["status"] == "connected"
+        assert (
+            data["database"]
+            == session.execute(text("SELECT current_database()")).scalar()
+        )
+        assert data["size"]
+
+    def test_tables(self, client: TestClient, session: Session):
+        admin = UserFactory.create_admin(session, email="db-admin@test.com")
+        users = session.execute(text("SELECT count(*) FROM users")).scalar()
+
+        response = client.get(
+            "/api/admin/db/tables", headers=create_auth_headers(admin)
+        )
+
+        tables = {table["name"]: table for table in response.json()}
+        assert response.status_code == 200
+        assert list(tables) == sorted(tables)
+        assert tables["users"]["row_count"] == users
+        assert tables["client_stats"]["column_count"] == 5
+        # Materialized views are not tables
+        assert "analytics_follow_ups" not in tables
@@ -308,3 +308,55 @@ class TestGameIntegration:
         result_overflow = engine.execute_action(action_overflow, state)
         assert result_overflow.success is False
         assert "validation failed" in result_overflow.error_message.lower()
+
+
+class TestCompactRepresentation:
+    """測試引擎資料類別的精簡表示（__slots__ 與字串 intern）"""
+
+    def test_engine_dataclasses_have_no_instance_dict(self):
+        from app.game.config import ActionType, DropZoneConfig, Position
+        from app.game.engine import Card, GameAction, GameState, ZoneState
+
+        position = Position(x=1, y=2)
+        instances = [
+            position,
+            DropZoneConfig(id="zone", name="區域", position=position),
+            Card(id="card", name="牌卡", category="skill"),
+            GameAction(type=ActionType.FLIP, player_id="p", card_id="card"),
+            ZoneState("zone", ["card"]),
+            GameState.create_initial_state("room_1", "skill_assessment"),
+        ]
+
+        for instance in instances:
+            assert not hasattr(instance, "__dict__"), type(instance).__name__
+
+    def test_ids_are_shared_between_loaded_rooms(self):
+        """從 JSON 載入的牌卡 / 區域 id 在各房間共用同一個字串物件"""
+        import json
+
+        from app.game.engine import GameState
+
+        state = GameState.create_initial_state("room_1", "skill_assessment")
+        state = state.place_card_in_zone("card_1", "advantage").flip_card("card_1")
+        payload = json.dumps(state.to_dict())
+
+        first = GameState.from_dict(json.loads(payload))
+        second = GameState.from_dict(json.loads(payload))
+
+        assert first == second
+        assert first.zones["advantage"].cards[0] is second.zones["advantage"].cards[0]
+        assert next(iter(first.flipped_cards)) is next(iter(second.flipped_cards))
+        assert next(iter(first.zones)) is next(iter(second.zones))
+
+    def test_public_api_unchanged(self):
+        """cards 仍是 list，replace / 比較行為不變"""
+        from dataclasses import replace
+
+        from app.game.engine import GameState
+
+        state = GameState.create_initial_state("room_1", "skill_assessment")
+        state = state.place_card_in_zone("card_1", "advantage")
+
+        assert state.zones["advantage"].cards == ["card_1"]
+        assert replace(state, version=9).get_card_zone("card_1") == "advantage"
+        assert GameState.from_dict(state.to_dict()) == state
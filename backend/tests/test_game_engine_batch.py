@@ -0,0 +1,161 @@
+"""
+Test GameEngine batched execution - 批次動作執行測試
+
+1. 批次執行只產生一個新狀態、版本號只 +1
+2. 失敗的動作不中斷批次，並逐筆回報
+3. 批次結果與逐筆執行結果一致（property-based）
+4. execute_actions / execute_action_with_config 不修改引擎的 config
+"""
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from app.game.config import ActionType, GameRuleConfig
+from app.game.engine import GameAction, GameEngine, GameState
+
+
+def place(card_id: str, zone_id: str) -> GameAction:
+    return GameAction(
+        type=ActionType.PLACE_CARD,
+        player_id="player_1",
+        card_id=card_id,
+        target_zone=zone_id,
+    )
+
+
+class TestExecuteActions:
+    """測試批次執行"""
+
+    def test_batch_bumps_version_once(self):
+        """整批動作只產生一次版本遞增"""
+        config = GameRuleConfig.get_skill_assessment_config()
+        engine = GameEngine()
+        state = GameState.create_initial_state("room_1", "skill_assessment")
+
+        actions = [
+            place("card_1", "advantage"),
+            place("card_2", "advantage"),
+            GameAction(
+                type=ActionType.MOVE,
+                player_id="player_1",
+                card_id="card_1",
+                target_zone="disadvantage",
+            ),
+            GameAction(type=ActionType.FLIP, player_id="player_1", card_id="card_2"),
+        ]
+
+        result = engine.execute_actions(actions, state, config)
+
+        assert result.success is True
+        assert result.applied == [0, 1, 2, 3]
+        assert result.new_state.version == state.version + 1
+        assert result.new_state.zones["advantage"].cards == ["card_2"]
+        assert result.new_state.zones["disadvantage"].cards == ["card_1"]
+        assert result.new_state.flipped_cards == frozenset({"card_2"})
+        # 原狀態不變
+        assert state.get_zone_card_count("advantage") == 0
+
+    def test_failures_do_not_abort_batch(self):
+        """超出容量的動作失敗，其後的動作仍會執行"""
+        config = GameRuleConfig.get_skill_assessment_config()
+        engine = GameEngine()
+        state = GameState.create_initial_state("room_1", "skill_assessment")
+
+        actions = [place(f"card_{i}", "advantage") for i in range(6)]
+        actions.append(place("card_6", "disadvantage"))
+
+        result = engine.execute_actions(actions, state, config)
+
+        assert result.success is False
+        assert result.applied == [0, 1, 2, 3, 4, 6]
+        assert result.failures == {5: "Action validation failed"}
+        assert result.new_state.get_zone_card_count("advantage") == 5
+        assert result.new_state.get_card_zone("card_6") == "disadvantage"
+
+    def test_all_failed_returns_original_state(self):
+        """沒有任何動作成功時返回原狀態"""
+        engine = GameEngine(GameRuleConfig.get_skill_assessment_config())
+        state = GameState.create_initial_state("room_1", "skill_assessment")
+
+        result = engine.execute_actions([place("card_1", "unknown_zone")], state)
+
+        assert result.new_state is state
+        assert list(result.failures) == [0]
+
+    def test_config_is_not_stored_on_engine(self):
+        """傳入的 config 不會寫回引擎"""
+        engine = GameEngine()
+        state = GameState.create_initial_state("room_1", "skill_assessment")
+        config = GameRuleConfig.get_skill_assessment_config()
+
+        engine.execute_actions([place("card_1", "advantage")], state, config)
+        engine.execute_action_with_config(place("card_2", "advantage"), state, config)
+
+        assert engine.config is None
+
+
+CARD_IDS = [f"card_{i}" for i in range(8)]
+
+actions_strategy = st.lists(
+    st.tuples(
+        st.sampled_from(
+            [
+                ActionType.PLACE_CARD,
+                ActionType.MOVE,
+                ActionType.FLIP,
+                ActionType.ANNOTATE,
+            ]
+        ),
+        st.sampled_from(CARD_IDS),
+        st.integers(min_value=0, max_value=8),
+    ),
+    max_size=40,
+)
+
+
+class TestBatchMatchesSequential:
+    """Property-based：批次結果與逐筆執行一致"""
+
+    @settings(max_examples=100, deadline=None)
+    @given(
+        rule_id=st.sampled_from(
+            ["skill_assessment", "value_navigation", "career_personality"]
+        ),
+        steps=actions_strategy,
+    )
+    def test_batch_equals_sequential(self, rule_id, steps):
+        config = {
+            "skill_assessment": GameRuleConfig.get_skill_assessment_config,
+            "value_navigation": GameRuleConfig.get_value_navigation_config,
+            "career_personality": GameRuleConfig.get_career_personality_config,
+        }[rule_id]()
+        engine = GameEngine(config)
+        zone_ids = [zone.id for zone in config.layout.drop_zones]
+        actions = [
+            GameAction(
+                type=action_type,
+                player_id="player_1",
+                card_id=card_id,
+                target_zone=zone_ids[zone_index % len(zone_ids)],
+                data={"step": zone_index},
+            )
+            for action_type, card_id, zone_index in steps
+        ]
+
+        initial = GameState.create_initial_state("room_1", rule_id)
+        sequential = initial
+        applied = []
+        for index, action in enumerate(actions):
+            result = engine.execute_action(action, sequential)
+            if result.success:
+                sequential = result.new_state
+                applied.append(index)
+
+        batch = GameEngine().execute_actions(actions, initial, config)
+
+        assert batch.applied == applied
+        assert sorted(batch.failures) == sorted(set(range(len(actions))) - set(applied))
+        assert batch.new_state.zones == sequential.zones
+        assert batch.new_state.card_locations == sequential.card_locations
+        assert batch.new_state.flipped_cards == sequential.flipped_cards
+        assert batch.new_state.annotations == sequential.annotations
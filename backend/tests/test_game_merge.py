@@ -0,0 +1,389 @@
+"""
+Test mergeable board - 可合併盤面測試
+
+1. 混合邏輯時鐘
+2. 同時發生的移動 / 移除的合併規則（LWW、add-wins）
+3. 任意順序合併皆收斂（property-based）
+4. 單一副本的結果與 GameEngine 一致
+"""
+
+import itertools
+from dataclasses import replace
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from app.game.config import ActionType, GameRuleConfig
+from app.game.engine import GameAction, GameEngine, GameState
+from app.game.merge import HybridClock, MergeableBoard, Stamp, seed_version
+
+
+class FakeWallClock:
+    """可控制的牆上時間（毫秒）"""
+
+    def __init__(self, now: int = 1000):
+        self.now = now
+
+    def __call__(self) -> int:
+        return self.now
+
+
+def replica(node_id: str, state: GameState = None, now: int = 1000):
+    clock = HybridClock(node_id, wall_clock=FakeWallClock(now))
+    if state is None:
+        return MergeableBoard(node_id, clock)
+    return MergeableBoard.from_state(state, node_id, clock)
+
+
+def merged(*boards: MergeableBoard) -> MergeableBoard:
+    result = MergeableBoard("observer")
+    for board in boards:
+        result.merge(board)
+    return result
+
+
+def initial_state() -> GameState:
+    state = GameState.create_initial_state("room_1", "career_personality")
+    for card_id in ["a", "b", "c"]:
+        state = state.place_card_in_zone(card_id, "like")
+    return state
+
+
+class TestHybridClock:
+    """測試混合邏輯時鐘"""
+
+    def test_tick_is_monotonic_when_wall_clock_stalls(self):
+        clock = HybridClock("n1", wall_clock=FakeWallClock(5))
+
+        assert clock.tick() < clock.tick() < clock.tick()
+
+    def test_observe_moves_past_remote_stamp(self):
+        clock = HybridClock("n1", wall_clock=FakeWallClock(5))
+        remote = Stamp(100, 7, "n2")
+
+        clock.observe(remote)
+
+        assert clock.tick() > remote
+
+
+class TestClockDrift:
+    """測試超前時間戳的上限"""
+
+    def test_far_future_stamp_is_rejected(self):
+        clock = HybridClock("server", wall_clock=FakeWallClock(1000), max_drift_ms=50)
+        forged = replica("visitor", now=10**15)
+        forged.place("a", "like")
+
+        try:
+            MergeableBoard.from_dict(forged.to_dict(), "server", clock)
+        except ValueError as e:
+            assert "ahead of the local clock" in str(e)
+        else:
+            raise AssertionError("expected ValueError")
+        assert clock.last == Stamp(0, 0, "server")
+
+    def test_stamp_within_bound_is_accepted(self):
+        clock = HybridClock("server", wall_clock=FakeWallClock(1000), max_drift_ms=50)
+        visitor = replica("visitor", now=1050)
+        visitor.place("a", "like")
+
+        board = MergeableBoard.from_dict(visitor.to_dict(), "server", clock)
+
+        assert board.location("a") == "like"
+
+    @settings(max_examples=150, deadline=None)
+    @given(
+        walls=st.lists(st.integers(min_value=0, max_value=10**15), max_size=8),
+        now=st.integers(min_value=0, max_value=10**13),
+        drift=st.integers(min_value=0, max_value=10_000),
+    )
+    def test_accepted_boards_never_push_clock_past_bound(self, walls, now, drift):
+        """接受與否只取決於最大時間戳；接受後伺服器時鐘不會超過 now + drift"""
+        remote = MergeableBoard("visitor")
+        for index, wall in enumerate(walls):
+            card_id = CARD_IDS[index % len(CARD_IDS)]
+            remote.places.setdefault(card_id, {})[Stamp(wall, 0, "visitor")] = "like"
+        clock = HybridClock("server", wall_clock=FakeWallClock(now), max_drift_ms=drift)
+
+        try:
+            MergeableBoard.from_dict(remote.to_dict(), "server", clock)
+        except ValueError:
+            assert max(walls) > now + drift
+        else:
+            assert not walls or max(walls) <= now + drift
+            assert clock.last.wall <= now + drift
+            assert clock.tick().wall <= now + drift
+
+
+class TestMergeRules:
+    """測試同時修改的合併規則"""
+
+    def test_concurrent_moves_last_writer_wins(self):
+        state = initial_state()
+        counselor = replica("counselor", state, now=1000)
+        visitor = replica("visitor", state, now=2000)
+
+        counselor.place("a", "neutral")
+        visitor.place("a", "dislike")
+
+        for order in itertools.permutations([counselor, visitor]):
+            board = merged(*order).materialize(state)
+            assert board.get_card_zone("a") == "dislike"
+            assert board.get_zone_cards("like") == ["b", "c"]
+
+    def test_concurrent_remove_and_move_keeps_card(self):
+        """OR-set：移除只作廢看過的放置，同時的移動保留（add-wins）"""
+        state = initial_state()
+        counselor = replica("counselor", state, now=5000)
+        visitor = replica("visitor", state, now=1000)
+
+        counselor.remove("b")
+        visitor.place("b", "neutral")
+
+        board = merged(counselor, visitor).materialize(state)
+
+        assert board.get_card_zone("b") == "neutral"
+
+    def test_remove_after_observing_move_removes_card(self):
+        state = initial_state()
+        counselor = replica("counselor", state)
+        visitor = replica("visitor", state)
+
+        visitor.place("b", "neutral")
+        counselor.merge(visitor)
+        counselor.remove("b")
+
+        board = merged(visitor, counselor).materialize(state)
+
+        assert board.get_card_zone("b") is None
+
+    def test_independent_edits_are_all_kept(self):
+        state = initial_state()
+        counselor = replica("counselor", state)
+        visitor = replica("visitor", state)
+
+        counselor.flip("a")
+        counselor.annotate("a", {"note": "x"})
+        visitor.place("d", "dislike")
+        visitor.annotate("a", {"color": "red"})
+
+        board = merged(counselor, visitor).materialize(state)
+
+        assert board.flipped_cards == {"a"}
+        assert board.annotations == {"a": {"note": "x", "color": "red"}}
+        assert board.get_zone_cards("dislike") == ["d"]
+
+    def test_seeded_replicas_agree_on_order(self):
+        state = initial_state()
+
+        board = merged(replica("n1", state), replica("n2", state)).materialize(state)
+
+        assert board.to_dict() == state.to_dict()
+
+    def test_reseeded_board_drops_stale_seed_entries(self):
+        """盤面重建（PUT / actions）後，舊版本的種子項目不論合併順序都被丟棄"""
+        state = initial_state()
+        stale = replica("visitor", state)
+        stale.remove("c")
+        reseeded = GameState.create_initial_state("room_1", "career_personality")
+        for card_id, zone_id in [("b", "like"), ("a", "like"), ("c", "dislike")]:
+            reseeded = reseeded.place_card_in_zone(card_id, zone_id)
+        reseeded = replace(reseeded, version=state.version + 10)
+        server = replica("server", reseeded)
+
+        for order in itertools.permutations([server, stale]):
+            board = merged(*order)
+            assert board.materialize(reseeded).to_dict() == reseeded.to_dict()
+            assert board.removed == {}
+            assert {seed_version(stamp) for stamp in board.stamps()} == {
+                reseeded.version
+            }
+        stale.merge(server)
+        assert stale.materialize(reseeded).to_dict() == reseeded.to_dict()
+
+    def test_round_trip(self):
+        state = initial_state()
+        board = replica("n1", state)
+        board.place("a", "neutral")
+        board.remove("b")
+        board.flip("c")
+        board.annotate("c", {"note": "x", "gone": None})
+
+        restored = MergeableBoard.from_dict(board.to_dict(), "n2")
+
+        assert restored.to_dict() == board.to_dict()
+        assert restored.clock.tick() > board.clock.last
+
+    def test_invalid_payload_raises_value_error(self):
+        try:
+            MergeableBoard.from_dict({"places": {"a": [["bad", "like"]]}}, "n1")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError")
+
+    def test_arrange_cannot_be_merged(self):
+        board = replica("n1")
+        action = GameAction(type=ActionType.ARRANGE, player_id="p")
+
+        try:
+            board.apply_action(action)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError")
+
+
+CARD_IDS = ["a", "b", "c", "d", "e"]
+ZONE_IDS = ["like", "neutral", "dislike"]
+
+operation = st.tuples(
+    st.integers(min_value=0, max_value=2),  # 副本
+    st.sampled_from(["place", "remove", "flip", "annotate", "sync"]),
+    st.sampled_from(CARD_IDS),
+    st.sampled_from(ZONE_IDS),
+    st.integers(min_value=0, max_value=3),  # 註記值 / 同步對象 / 時間前進量
+)
+
+
+def run_replicas(operations):
+    """三個副本各自操作、偶爾互相同步，返回副本"""
+    state = initial_state()
+    wall_clocks = [FakeWallClock(1000) for _ in range(3)]
+    boards = [
+        MergeableBoard.from_state(
+            state, f"node{i}", HybridClock(f"node{i}", wall_clock=wall_clocks[i])
+        )
+        for i in range(3)
+    ]
+    for index, kind, card_id, zone_id, value in operations:
+        board = boards[index]
+        wall_clocks[index].now += value
+        if kind == "place":
+            board.place(card_id, zone_id)
+        elif kind == "remove":
+            board.remove(card_id)
+        elif kind == "flip":
+            board.flip(card_id)
+        elif kind == "annotate":
+            board.annotate(card_id, {"note": value or None})
+        else:
+            board.merge(boards[value % 3])
+    return state, boards
+
+
+class TestConvergenceProperties:
+    """Property-based：任意順序合併皆收斂"""
+
+    @settings(max_examples=150, deadline=None)
+    @given(operations=st.lists(operation, max_size=40))
+    def test_merge_order_does_not_matter(self, operations):
+        state, boards = run_replicas(operations)
+
+        results = {
+            str(merged(*order).materialize(state).to_dict())
+            for order in itertools.permutations(boards)
+        }
+
+        assert len(results) == 1
+
+    @settings(max_examples=100, deadline=None)
+    @given(operations=st.lists(operation, max_size=40))
+    def test_merge_is_idempotent_and_associative(self, operations):
+        state, (a, b, c) = run_replicas(operations)
+
+        left = merged(merged(a, b), c)
+        right = merged(a, merged(b, c))
+        twice = merged(a, b, c, a, b, c)
+
+        assert left.to_dict() == right.to_dict()
+        assert twice.materialize(state) == left.materialize(state)
+
+    @settings(max_examples=100, deadline=None)
+    @given(operations=st.lists(operation, max_size=40))
+    def test_replicas_converge_after_exchange(self, operations):
+        """每個副本都併入其他副本後，結果一致"""
+        state, boards = run_replicas(operations)
+        snapshots = [MergeableBoard.from_dict(b.to_dict(), "copy") for b in boards]
+
+        for board in boards:
+            for other in snapshots:
+                board.merge(other)
+
+        results = {str(board.materialize(state).to_dict()) for board in boards}
+        assert len(results) == 1
+
+    @settings(max_examples=100, deadline=None)
+    @given(operations=st.lists(operation, max_size=40))
+    def test_subset_delta_reproduces_changes(self, operations):
+        """只傳送有變動牌卡的增量，結果與合併整個副本相同"""
+        state, (server, client, _) = run_replicas(operations)
+        full = merged(server, client)
+
+        incremental = MergeableBoard.from_dict(server.to_dict(), "server")
+        changed = MergeableBoard.from_dict(server.to_dict(), "probe").merge(client)
+        incremental.merge(client.subset(changed))
+
+        assert incremental.materialize(state) == full.materialize(state)
+
+    @settings(max_examples=100, deadline=None)
+    @given(operations=st.lists(operation, max_size=40))
+    def test_reseeded_replica_converges(self, operations):
+        """其中一方以較新版本重建盤面，任意順序合併仍收斂且不留舊種子"""
+        state, boards = run_replicas(operations)
+        reseeded = replace(boards[0].materialize(state), version=state.version + 10)
+        server = MergeableBoard.from_state(reseeded, "server")
+
+        results = set()
+        for order in itertools.permutations([server, *boards]):
+            board = merged(*order)
+            results.add(str(board.materialize(reseeded).to_dict()))
+            assert all(
+                seed_version(stamp) in (None, reseeded.version)
+                for stamp in board.stamps()
+            )
+        assert len(results) == 1
+
+
+class TestEngineEquivalence:
+    """Property-based：單一副本的結果與 GameEngine 依序執行一致"""
+
+    @settings(max_examples=100, deadline=None)
+    @given(
+        steps=st.lists(
+            st.tuples(
+                st.sampled_from(
+                    [
+                        ActionType.PLACE_CARD,
+                        ActionType.MOVE,
+                        ActionType.REMOVE,
+                        ActionType.FLIP,
+                        ActionType.ANNOTATE,
+                    ]
+                ),
+                st.sampled_from(CARD_IDS),
+                st.sampled_from(ZONE_IDS),
+                st.sampled_from([None, 1, 2]),
+            ),
+            max_size=40,
+        )
+    )
+    def test_matches_engine(self, steps):
+        engine = GameEngine(GameRuleConfig.get_career_personality_config())
+        state = initial_state()
+        board = replica("n1", state)
+
+        for action_type, card_id, zone_id, value in steps:
+            action = GameAction(
+                type=action_type,
+                player_id="p",
+                card_id=card_id,
+                target_zone=zone_id,
+                data={"note": value} if action_type == ActionType.ANNOTATE else None,
+            )
+            result = engine.execute_action(action, state)
+            if result.success:
+                state = result.new_state
+                board.apply_action(action)
+
+        assert board.materialize(state).to_dict() == state.to_dict()
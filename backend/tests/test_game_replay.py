@@ -0,0 +1,293 @@
+"""
+Test action-log replay - 動作日誌重播測試
+
+1. GameAction 序列化往返
+2. 快照 + 動作重播結果與即時狀態一致（property-based）
+3. 日誌檔崩潰復原（含寫到一半的最後一行）
+4. 重播吞吐量
+"""
+
+import io
+import sys
+import time
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from app.game.config import ActionType, GameRuleConfig
+from app.game.engine import GameAction, GameState
+from app.game.replay import (
+    ActionJournal,
+    LogEntry,
+    ReplayableGame,
+    replay_entries,
+)
+
+RULE_CONFIGS = {
+    "skill_assessment": GameRuleConfig.get_skill_assessment_config,
+    "value_navigation": GameRuleConfig.get_value_navigation_config,
+    "career_personality": GameRuleConfig.get_career_personality_config,
+}
+
+
+def place(card_id: str, zone_id: str) -> GameAction:
+    return GameAction(
+        type=ActionType.PLACE_CARD,
+        player_id="player_1",
+        card_id=card_id,
+        target_zone=zone_id,
+    )
+
+
+def move(card_id: str, zone_id: str) -> GameAction:
+    return GameAction(
+        type=ActionType.MOVE, player_id="player_1", card_id=card_id, target_zone=zone_id
+    )
+
+
+def new_game(rule_id="skill_assessment", **kwargs) -> ReplayableGame:
+    return ReplayableGame(
+        GameState.create_initial_state("room_1", rule_id),
+        config=RULE_CONFIGS[rule_id](),
+        **kwargs,
+    )
+
+
+class TestActionLogFormat:
+    """測試日誌格式"""
+
+    def test_action_round_trip(self):
+        action = GameAction(
+            type=ActionType.ANNOTATE,
+            player_id="p",
+            card_id="card_1",
+            data={"note": "重要"},
+        )
+
+        assert GameAction.from_dict(action.to_dict()) == action
+        assert "target_zone" not in action.to_dict()
+
+    def test_log_entry_round_trip(self):
+        entry = LogEntry(seq=3, version=7, action=place("card_1", "advantage"))
+
+        assert LogEntry.from_dict(entry.to_dict()) == entry
+
+    def test_batch_entries_share_version(self):
+        game = new_game()
+
+        game.apply([place("card_1", "advantage"), place("card_2", "disadvantage")])
+
+        assert [entry.seq for entry in game.log.entries] == [1, 2]
+        assert {entry.version for entry in game.log.entries} == {game.state.version}
+
+
+class TestReplay:
+    """測試重播"""
+
+    def test_replay_matches_live_state(self):
+        game = new_game()
+        game.apply([place("card_1", "advantage"), place("card_2", "advantage")])
+        game.apply([move("card_1", "disadvantage")])
+        game.apply([GameAction(type=ActionType.FLIP, player_id="p", card_id="card_2")])
+
+        replayed = replay_entries(game.log.snapshots[0].state, game.log.entries)
+
+        assert replayed.to_dict() == game.state.to_dict()
+        assert replayed.card_locations == game.state.card_locations
+
+    def test_zone_order_follows_last_arrival(self):
+        """區域順序與逐筆執行相同：未移動的牌卡在前，之後依最後抵達順序"""
+        game = new_game("career_personality")
+        game.apply([place(f"card_{i}", "like") for i in range(3)])
+        initial = game.state
+        game.apply([move("card_0", "neutral"), move("card_0", "like")])
+        game.apply([place("card_9", "like"), move("card_1", "dislike")])
+
+        replayed = replay_entries(initial, game.log.entries[3:])
+
+        assert replayed.zones["like"].cards == ["card_2", "card_0", "card_9"]
+        assert replayed.zones == game.state.zones
+
+    def test_snapshots_taken_every_interval(self):
+        game = new_game("career_personality", snapshot_interval=4)
+        for i in range(10):
+            game.apply([place(f"card_{i}", "neutral")])
+
+        assert [snapshot.seq for snapshot in game.log.snapshots] == [0, 4, 8]
+        assert game.log.nearest_snapshot(7).seq == 4
+        assert game.log.state_at(6).get_total_card_count() == 6
+        assert game.log.state_at().to_dict() == game.state.to_dict()
+
+    def test_old_snapshots_and_entries_are_dropped(self):
+        """只保留最近 max_snapshots 個快照，之前的動作一併丟棄"""
+        game = new_game("career_personality", snapshot_interval=2, max_snapshots=3)
+        for i in range(10):
+            game.apply([place(f"card_{i}", "neutral")])
+
+        assert [snapshot.seq for snapshot in game.log.snapshots] == [6, 8, 10]
+        assert [entry.seq for entry in game.log.entries] == [7, 8, 9, 10]
+        assert game.log.state_at(7).get_total_card_count() == 7
+        assert game.log.state_at().to_dict() == game.state.to_dict()
+        with pytest.raises(ValueError, match="older than the oldest kept snapshot"):
+            game.log.state_at(5)
+
+    def test_validated_replay_rejects_invalid_log(self):
+        initial = GameState.create_initial_state("room_1", "skill_assessment")
+        entries = [
+            LogEntry(seq=1, version=2, action=place("card_1", "advantage")),
+            LogEntry(seq=2, version=3, action=place("card_1", "disadvantage")),
+        ]
+
+        with pytest.raises(ValueError, match="Log entry 2"):
+            replay_entries(
+                initial,
+                entries,
+                GameRuleConfig.get_skill_assessment_config(),
+                validate=True,
+            )
+
+
+class TestCrashRecovery:
+    """測試由日誌檔復原"""
+
+    def test_recover_from_journal_file(self, tmp_path):
+        path = tmp_path / "room.ndjson"
+        journal = ActionJournal.open(str(path))
+        game = new_game("career_personality", journal=journal, snapshot_interval=5)
+        for i in range(12):
+            game.apply([place(f"card_{i}", "neutral")])
+        game.apply([move("card_3", "like")])
+        journal.close()
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        recovered = ReplayableGame.recover(lines, game.config, snapshot_interval=5)
+
+        assert recovered.state.to_dict() == game.state.to_dict()
+        assert recovered.log.last_seq == game.log.last_seq
+        # 只重播最後快照之後的動作
+        assert len(recovered.log.entries) == game.log.last_seq - 10
+
+    def test_truncated_last_line_is_ignored(self):
+        stream = io.StringIO()
+        game = new_game(journal=ActionJournal(stream))
+        game.apply([place("card_1", "advantage")])
+        expected = game.state.to_dict()
+        game.apply([place("card_2", "advantage")])
+
+        lines = stream.getvalue().splitlines()
+        lines[-1] = lines[-1][:20]
+        recovered = ReplayableGame.recover(lines, game.config)
+
+        assert recovered.state.to_dict() == expected
+
+    def test_recovered_game_keeps_journaling(self):
+        stream = io.StringIO()
+        game = new_game(journal=ActionJournal(stream))
+        game.apply([place("card_1", "advantage")])
+
+        recovered = ReplayableGame.recover(
+            stream.getvalue().splitlines(), game.config, journal=ActionJournal(stream)
+        )
+        recovered.apply([place("card_2", "disadvantage")])
+
+        again = ReplayableGame.recover(stream.getvalue().splitlines(), game.config)
+        assert again.state.to_dict() == recovered.state.to_dict()
+
+    def test_journal_without_snapshot(self):
+        with pytest.raises(ValueError):
+            ReplayableGame.recover([])
+
+
+CARD_IDS = [f"card_{i}" for i in range(10)]
+
+batches_strategy = st.lists(
+    st.lists(
+        st.tuples(
+            st.sampled_from(
+                [
+                    ActionType.PLACE_CARD,
+                    ActionType.MOVE,
+                    ActionType.FLIP,
+                    ActionType.ANNOTATE,
+                ]
+            ),
+            st.sampled_from(CARD_IDS),
+            st.integers(min_value=0, max_value=8),
+        ),
+        min_size=1,
+        max_size=6,
+    ),
+    max_size=15,
+)
+
+
+class TestReplayProperties:
+    """Property-based：任意快照位置重播都與即時狀態一致"""
+
+    @settings(max_examples=100, deadline=None)
+    @given(
+        rule_id=st.sampled_from(sorted(RULE_CONFIGS)),
+        batches=batches_strategy,
+        snapshot_interval=st.integers(min_value=1, max_value=10),
+    )
+    def test_replay_from_any_snapshot(self, rule_id, batches, snapshot_interval):
+        config = RULE_CONFIGS[rule_id]()
+        zone_ids = [zone.id for zone in config.layout.drop_zones]
+        stream = io.StringIO()
+        game = new_game(
+            rule_id, journal=ActionJournal(stream), snapshot_interval=snapshot_interval
+        )
+
+        history = {0: game.state}
+        for batch in batches:
+            game.apply(
+                [
+                    GameAction(
+                        type=action_type,
+                        player_id="player_1",
+                        card_id=card_id,
+                        target_zone=zone_ids[zone_index % len(zone_ids)],
+                        data={"step": zone_index},
+                    )
+                    for action_type, card_id, zone_index in batch
+                ]
+            )
+            history[game.log.last_seq] = game.state
+
+        for seq, state in history.items():
+            assert game.log.state_at(seq).to_dict() == state.to_dict()
+
+        recovered = ReplayableGame.recover(stream.getvalue().splitlines(), config)
+        assert recovered.state.to_dict() == game.state.to_dict()
+        assert recovered.state.card_locations == game.state.card_locations
+
+
+class TestReplayThroughput:
+    """測試重播吞吐量"""
+
+    @pytest.mark.skipif(
+        sys.gettrace() is not None, reason="coverage tracing inflates timings"
+    )
+    def test_replays_thousands_of_actions_per_millisecond(self):
+        game = new_game("career_personality")
+        game.apply([place(f"card_{i}", "neutral") for i in range(40)])
+        zones = ["like", "neutral", "dislike"]
+        batch = []
+        for i in range(20000):
+            card_id = f"card_{i % 40}"
+            if i % 2:
+                batch.append(
+                    GameAction(type=ActionType.FLIP, player_id="p", card_id=card_id)
+                )
+            else:
+                batch.append(move(card_id, zones[(i // 40) % 3]))
+        entries = [
+            LogEntry(seq=i + 41, version=3, action=a) for i, a in enumerate(batch)
+        ]
+
+        start = time.perf_counter()
+        replay_entries(game.state, entries)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        assert len(entries) / elapsed_ms > 1000
@@ -0,0 +1,170 @@
+"""
+Test game rule template cache - 遊戲規則模板快取測試
+
+1. 預設模板的建立是冪等的
+2. 穩定狀態下建立諮詢室不查詢 game_rule_templates
+3. 模板版本（max updated_at）改變後重新載入
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app.core.database import get_session
+from app.game.registry import rule_registry
+from app.main import app
+from app.models.game_rule import GameRuleTemplate
+from app.services.game_rule_templates import (
+    GameRuleTemplateCache,
+    ensure_default_templates,
+    template_cache,
+)
+from tests.factories import UserFactory
+from tests.helpers import create_auth_headers
+
+
+class TemplateQueryCounter:
+    """記錄觸及 game_rule_templates 的 SQL"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if "game_rule_templates" in statement:
+            self.statements.append(statement)
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    app.dependency_overrides[get_session] = lambda: session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+class TestEnsureDefaultTemplates:
+    """測試預設模板建立"""
+
+    def test_creates_each_registered_rule_once(self, session: Session):
+        first = ensure_default_templates(session)
+        second = ensure_default_templates(session)
+
+        slugs = session.exec(select(GameRuleTemplate.slug)).all()
+        assert first == len(rule_registry.rule_ids())
+        assert second == 0
+        assert sorted(slugs) == sorted(rule_registry.rule_ids())
+
+    def test_keeps_existing_template(self, session: Session):
+        existing = GameRuleTemplate(
+            slug="skill_assessment",
+            name="自訂職能評估",
+            layout_config={},
+            constraint_config={},
+            validation_rules={},
+        )
+        session.add(existing)
+        session.commit()
+
+        ensure_default_templates(session)
+
+        template = session.exec(
+            select(GameRuleTemplate).where(GameRuleTemplate.slug == "skill_assessment")
+        ).one()
+        assert template.id == existing.id
+        assert template.name == "自訂職能評估"
+
+
+class TestTemplateCache:
+    """測試模板快取"""
+
+    def test_create_room_does_not_query_templates(
+        self, client: TestClient, session: Session
+    ):
+        """快取暖機後建立諮詢室不查詢模板表"""
+        counselor = UserFactory.create_counselor(session)
+        headers = create_auth_headers(counselor)
+        ensure_default_templates(session)
+        template_cache.load(session)
+
+        counter = TemplateQueryCounter()
+        event.listen(session.bind, "before_cursor_execute", counter)
+        try:
+            for slug in rule_registry.rule_ids():
+                response = client.post(
+                    "/api/rooms/",
+                    headers=headers,
+                    json={"name": f"Room {slug}", "game_rule_slug": slug},
+                )
+                assert response.status_code == 201
+                assert response.json()["game_rule_id"] == str(
+                    template_cache.get_by_slug(session, slug).id
+                )
+        finally:
+            event.remove(session.bind, "before_cursor_execute", counter)
+
+        assert counter.statements == []
+
+    def test_missing_default_is_created_on_demand(
+        self, client: TestClient, session: Session
+    ):
+        """冷快取 + 空資料表時仍可建立諮詢室"""
+        counselor = UserFactory.create_counselor(session)
+
+        response = client.post(
+            "/api/rooms/",
+            headers=create_auth_headers(counselor),
+            json={"name": "Room", "game_rule_slug": "value_navigation"},
+        )
+
+        assert response.status_code == 201
+        template = session.exec(
+            select(GameRuleTemplate).where(GameRuleTemplate.slug == "value_navigation")
+        ).one()
+        assert response.json()["game_rule_id"] == str(template.id)
+
+    def test_unknown_slug_rejected(self, client: TestClient, session: Session):
+        counselor = UserFactory.create_counselor(session)
+
+        response = client.post(
+            "/api/rooms/",
+            headers=create_auth_headers(counselor),
+            json={"name": "Room", "game_rule_slug": "no_such_rule"},
+        )
+
+        assert response.status_code == 400
+
+    def test_reloads_when_version_changes(self, session: Session):
+        """updated_at 改變後，下一次版本檢查會重新載入"""
+        cache = GameRuleTemplateCache(refresh_interval=0)
+        ensure_default_templates(session)
+        cache.load(session)
+        assert cache.get_by_slug(session, "career_personality") is not None
+
+        template = session.exec(
+            select(GameRuleTemplate).where(
+                GameRuleTemplate.slug == "career_personality"
+            )
+        ).one()
+        template.is_active = False
+        template.updated_at = datetime.utcnow() + timedelta(seconds=1)
+        session.add(template)
+        session.commit()
+
+        assert cache.get_by_slug(session, "career_personality") is None
+        assert cache.get_by_id(session, template.id).is_active is False
+
+    def test_within_interval_skips_version_check(self, session: Session):
+        cache = GameRuleTemplateCache(refresh_interval=3600)
+        ensure_default_templates(session)
+        cache.load(session)
+
+        counter = TemplateQueryCounter()
+        event.listen(session.bind, "before_cursor_execute", counter)
+        try:
+            cache.get_by_slug(session, "skill_assessment")
+        finally:
+            event.remove(session.bind, "before_cursor_execute", counter)
+
+        assert counter.statements == []
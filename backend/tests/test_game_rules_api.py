@@ -0,0 +1,120 @@
+"""
+Test Game Rules API - 遊戲規則 API 測試
+
+1. 規則配置由註冊表預先序列化，回應附帶 ETag 與 Cache-Control
+2. If-None-Match 命中時返回 304
+3. 新增規則只需註冊一次
+"""
+
+from fastapi.testclient import TestClient
+
+from app.game.config import GameRuleConfig
+from app.game.registry import GameRuleRegistry, rule_registry
+from app.main import app
+
+client = TestClient(app)
+
+
+class TestGameRulesEndpoints:
+    """測試遊戲規則端點"""
+
+    def test_list_game_rules(self):
+        response = client.get("/api/game-rules/")
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == rule_registry.list_payload.etag
+        assert "max-age" in response.headers["cache-control"]
+
+        rules = response.json()
+        assert [rule["id"] for rule in rules] == [
+            "skill_assessment",
+            "value_navigation",
+            "career_personality",
+        ]
+        skill = rules[0]
+        config = GameRuleConfig.get_skill_assessment_config()
+        assert skill["name"] == "職能盤點卡"
+        assert skill["layout_config"] == config.layout.to_dict()
+        assert skill["constraint_config"] == config.constraints.to_dict()
+
+    def test_get_game_rule_and_by_slug(self):
+        response = client.get("/api/game-rules/value_navigation")
+        by_slug = client.get("/api/game-rules/by-slug/value_navigation")
+
+        assert response.status_code == 200
+        assert response.json()["id"] == "value_navigation"
+        assert len(response.json()["layout_config"]["drop_zones"]) == 9
+        assert by_slug.content == response.content
+        assert by_slug.headers["etag"] == response.headers["etag"]
+
+    def test_unknown_game_rule(self):
+        response = client.get("/api/game-rules/unknown_rule")
+
+        assert response.status_code == 404
+
+    def test_list_game_rule_types(self):
+        response = client.get("/api/game-rules/types")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        max_cards = {t["id"]: t["max_cards_per_zone"] for t in data["rule_types"]}
+        assert max_cards == {
+            "skill_assessment": 5,
+            "value_navigation": 1,
+            "career_personality": [20, None, 20],
+        }
+        skill_config = data["rule_types"][0]["config"]
+        assert skill_config["layout"]["drop_zones"][0]["position"] == {
+            "x": 60,
+            "y": 20,
+        }
+
+    def test_not_modified_when_etag_matches(self):
+        first = client.get("/api/game-rules/skill_assessment")
+
+        second = client.get(
+            "/api/game-rules/skill_assessment",
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == first.headers["etag"]
+
+    def test_stale_etag_returns_body(self):
+        response = client.get(
+            "/api/game-rules/skill_assessment",
+            headers={"If-None-Match": '"stale"'},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["id"] == "skill_assessment"
+
+
+class TestGameRuleRegistry:
+    """測試規則註冊表"""
+
+    def test_register_new_rule(self):
+        """註冊後即可查詢，彙總回應隨之更新"""
+        registry = GameRuleRegistry()
+        registry.register(GameRuleConfig.get_skill_assessment_config, "技能")
+        list_etag = registry.list_payload.etag
+
+        def custom_config():
+            config = GameRuleConfig.get_skill_assessment_config()
+            config.id = "custom_rule"
+            return config
+
+        registry.register(custom_config, "自訂")
+
+        assert "custom_rule" in registry
+        assert registry.get_config("custom_rule").id == "custom_rule"
+        assert registry.list_payload.etag != list_etag
+        assert b"custom_rule" in registry.types_payload.body
+
+    def test_payload_built_once(self):
+        """重複請求使用同一份預先序列化內容"""
+        assert rule_registry.list_payload is rule_registry.list_payload
+        rule = rule_registry.get("career_personality")
+        assert rule.config is rule_registry.get_config("career_personality")
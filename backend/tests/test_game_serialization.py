@@ -0,0 +1,137 @@
+"""
+Test GameState serialization - 遊戲狀態快速序列化測試
+
+1. 輸出與 orjson.dumps(state.to_dict()) 逐位元組相同（property-based）
+2. 只重新編碼變動的區域
+3. 變動區域增量套用後與新狀態一致
+"""
+
+import orjson
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from app.game.config import ActionType, GameRuleConfig
+from app.game.engine import GameAction, GameEngine, GameState
+from app.game.serialization import GameStateSerializer, apply_diff, dumps_state
+
+CARD_IDS = [f"card_{i}" for i in range(12)]
+ZONE_IDS = ["like", "neutral", "dislike"]
+
+steps_strategy = st.lists(
+    st.lists(
+        st.tuples(
+            st.sampled_from(
+                [
+                    ActionType.PLACE_CARD,
+                    ActionType.MOVE,
+                    ActionType.REMOVE,
+                    ActionType.FLIP,
+                    ActionType.ANNOTATE,
+                ]
+            ),
+            st.sampled_from(CARD_IDS),
+            st.sampled_from(ZONE_IDS),
+            st.sampled_from([None, "理由", 3]),
+        ),
+        min_size=1,
+        max_size=5,
+    ),
+    max_size=15,
+)
+
+
+def batches(steps):
+    """依序產生 (前一個狀態, 新狀態)"""
+    engine = GameEngine(GameRuleConfig.get_career_personality_config())
+    state = GameState.create_initial_state("room_1", "career_personality")
+    for batch in steps:
+        actions = [
+            GameAction(
+                type=action_type,
+                player_id="p",
+                card_id=card_id,
+                target_zone=zone_id,
+                data={"note": note} if action_type == ActionType.ANNOTATE else None,
+            )
+            for action_type, card_id, zone_id, note in batch
+        ]
+        new_state = engine.execute_actions(actions, state).new_state
+        yield state, new_state
+        state = new_state
+
+
+class TestGameStateSerializer:
+    """測試序列化器"""
+
+    def test_matches_to_dict(self):
+        state = GameState.create_initial_state("room_1", "career_personality")
+        state = state.place_card_in_zone("a", "like").annotate_card("a", {"n": "中"})
+
+        assert GameStateSerializer().dumps(state) == orjson.dumps(state.to_dict())
+        assert dumps_state(state) == orjson.dumps(state.to_dict())
+
+    def test_only_changed_zones_are_reencoded(self):
+        serializer = GameStateSerializer()
+        state = GameState.create_initial_state("room_1", "career_personality")
+        serializer.dumps(state)
+        assert serializer.zones_encoded == 3
+
+        state = state.place_card_in_zone("a", "like")
+        serializer.dumps(state)
+        assert serializer.zones_encoded == 4
+
+        state = state.move_card("a", "dislike")
+        serializer.dumps(state)
+        assert serializer.zones_encoded == 6
+
+        serializer.dumps(state.flip_card("a"))
+        assert serializer.zones_encoded == 6
+
+    def test_diff_contains_only_changes(self):
+        serializer = GameStateSerializer()
+        previous = GameState.create_initial_state("room_1", "career_personality")
+        state = previous.place_card_in_zone("a", "like")
+
+        diff = orjson.loads(serializer.diff(previous, state))
+
+        assert diff == {
+            "base_version": 1,
+            "version": 2,
+            "zones": {"like": {"zone_id": "like", "cards": ["a"]}},
+        }
+
+    def test_diff_reports_removed_annotations(self):
+        serializer = GameStateSerializer()
+        previous = GameState.create_initial_state("room_1", "career_personality")
+        previous = previous.place_card_in_zone("a", "like").annotate_card("a", {"n": 1})
+        state = previous.remove_card_from_zone("a")
+
+        diff = orjson.loads(serializer.diff(previous, state))
+
+        assert diff["annotations"] == {"a": None}
+        assert apply_diff(previous.to_dict(), diff) == state.to_dict()
+
+    def test_apply_diff_rejects_wrong_base(self):
+        previous = GameState.create_initial_state("room_1", "career_personality")
+        state = previous.place_card_in_zone("a", "like")
+        diff = orjson.loads(GameStateSerializer().diff(previous, state))
+
+        with pytest.raises(ValueError):
+            apply_diff(state.to_dict(), diff)
+
+    @settings(max_examples=100, deadline=None)
+    @given(steps=steps_strategy)
+    def test_reused_serializer_matches_to_dict(self, steps):
+        serializer = GameStateSerializer()
+        for _, state in batches(steps):
+            assert serializer.dumps(state) == orjson.dumps(state.to_dict())
+
+    @settings(max_examples=100, deadline=None)
+    @given(steps=steps_strategy)
+    def test_diffs_rebuild_state(self, steps):
+        serializer = GameStateSerializer()
+        data = GameState.create_initial_state("room_1", "career_personality").to_dict()
+        for previous, state in batches(steps):
+            data = apply_diff(data, orjson.loads(serializer.diff(previous, state)))
+            assert data == state.to_dict()
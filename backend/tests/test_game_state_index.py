@@ -0,0 +1,239 @@
+"""
+Test GameState card-location index - 牌卡位置索引測試
+
+1. MOVE / FLIP / ANNOTATE 動作可以透過索引執行
+2. 任意動作序列後，牌卡→區域索引與區域成員集合保持一致（property-based）
+"""
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from app.game.config import ActionType, GameRuleConfig
+from app.game.engine import GameAction, GameEngine, GameState
+
+RULE_CONFIGS = {
+    "skill_assessment": GameRuleConfig.get_skill_assessment_config,
+    "value_navigation": GameRuleConfig.get_value_navigation_config,
+    "career_personality": GameRuleConfig.get_career_personality_config,
+}
+
+
+def assert_index_consistent(state: GameState):
+    """索引、成員集合與區域牌卡列表三者一致"""
+    rebuilt = {}
+    for zone_id, zone in state.zones.items():
+        assert zone.card_set == frozenset(zone.cards)
+        assert len(zone.cards) == len(zone.card_set), "區域內不應有重複牌卡"
+        for card_id in zone.cards:
+            assert card_id not in rebuilt, "牌卡不應同時存在於兩個區域"
+            rebuilt[card_id] = zone_id
+
+    assert state.card_locations == rebuilt
+    assert state.flipped_cards <= rebuilt.keys()
+    assert state.annotations.keys() <= rebuilt.keys()
+
+
+class TestCardLocationIndex:
+    """測試牌卡位置索引"""
+
+    def test_index_built_from_zones(self):
+        """從字典還原時自動建立索引"""
+        state = GameState.from_dict(
+            {
+                "room_id": "room_1",
+                "rule_id": "skill_assessment",
+                "zones": {
+                    "advantage": {"zone_id": "advantage", "cards": ["a", "b"]},
+                    "disadvantage": {"zone_id": "disadvantage", "cards": ["c"]},
+                },
+            }
+        )
+
+        assert state.get_card_zone("a") == "advantage"
+        assert state.get_card_zone("c") == "disadvantage"
+        assert state.get_card_zone("missing") is None
+        assert state.zones["advantage"].has_card("b")
+        assert_index_consistent(state)
+
+    def test_place_rejects_card_already_on_board(self):
+        """已在其他區域的牌卡不能再次放置"""
+        engine = GameEngine(GameRuleConfig.get_skill_assessment_config())
+        state = GameState.create_initial_state("room_1", "skill_assessment")
+        state = state.place_card_in_zone("card_1", "advantage")
+
+        action = GameAction(
+            type=ActionType.PLACE_CARD,
+            player_id="player_1",
+            card_id="card_1",
+            target_zone="disadvantage",
+        )
+
+        assert engine.validate_action(action, state) is False
+
+    def test_move_card_between_zones(self):
+        """MOVE 為原子的移除 + 加入"""
+        engine = GameEngine(GameRuleConfig.get_skill_assessment_config())
+        state = GameState.create_initial_state("room_1", "skill_assessment")
+        state = state.place_card_in_zone("card_1", "advantage")
+
+        result = engine.execute_action(
+            GameAction(
+                type=ActionType.MOVE,
+                player_id="player_1",
+                card_id="card_1",
+                target_zone="disadvantage",
+            ),
+            state,
+        )
+
+        assert result.success is True
+        new_state = result.new_state
+        assert new_state.get_card_zone("card_1") == "disadvantage"
+        assert new_state.zones["advantage"].cards == []
+        assert new_state.zones["disadvantage"].cards == ["card_1"]
+        assert new_state.version == state.version + 1
+        # 原狀態不變
+        assert state.get_card_zone("card_1") == "advantage"
+        assert_index_consistent(new_state)
+
+    def test_move_respects_target_capacity(self):
+        """MOVE 到已滿的區域應被拒絕"""
+        engine = GameEngine(GameRuleConfig.get_value_navigation_config())
+        state = GameState.create_initial_state("room_1", "value_navigation")
+        state = state.place_card_in_zone("card_1", "rank_1")
+        state = state.place_card_in_zone("card_2", "rank_2")
+
+        result = engine.execute_action(
+            GameAction(
+                type=ActionType.MOVE,
+                player_id="player_1",
+                card_id="card_1",
+                target_zone="rank_2",
+            ),
+            state,
+        )
+
+        assert result.success is False
+
+    def test_move_card_not_on_board_fails(self):
+        """不在場上的牌卡無法移動"""
+        engine = GameEngine(GameRuleConfig.get_skill_assessment_config())
+        state = GameState.create_initial_state("room_1", "skill_assessment")
+
+        result = engine.execute_action(
+            GameAction(
+                type=ActionType.MOVE,
+                player_id="player_1",
+                card_id="ghost",
+                target_zone="advantage",
+            ),
+            state,
+        )
+
+        assert result.success is False
+
+    def test_flip_and_annotate(self):
+        """FLIP 切換翻面狀態，ANNOTATE 合併註記"""
+        engine = GameEngine(GameRuleConfig.get_career_personality_config())
+        state = GameState.create_initial_state("room_1", "career_personality")
+        state = state.place_card_in_zone("card_1", "like")
+
+        flip = GameAction(type=ActionType.FLIP, player_id="p", card_id="card_1")
+        state = engine.execute_action(flip, state).new_state
+        assert "card_1" in state.flipped_cards
+
+        state = engine.execute_action(flip, state).new_state
+        assert "card_1" not in state.flipped_cards
+
+        annotate = GameAction(
+            type=ActionType.ANNOTATE,
+            player_id="p",
+            card_id="card_1",
+            data={"note": "很重要"},
+        )
+        state = engine.execute_action(annotate, state).new_state
+        assert state.annotations["card_1"] == {"note": "很重要"}
+
+        # 不在場上的牌卡無法翻面
+        missing = GameAction(type=ActionType.FLIP, player_id="p", card_id="ghost")
+        assert engine.execute_action(missing, state).success is False
+
+    def test_round_trip_preserves_flips_and_annotations(self):
+        """to_dict / from_dict 保留翻面與註記"""
+        state = GameState.create_initial_state("room_1", "skill_assessment")
+        state = state.place_card_in_zone("card_1", "advantage")
+        state = state.flip_card("card_1").annotate_card("card_1", {"note": "x"})
+
+        restored = GameState.from_dict(state.to_dict())
+
+        assert restored.flipped_cards == frozenset({"card_1"})
+        assert restored.annotations == {"card_1": {"note": "x"}}
+        assert_index_consistent(restored)
+
+    def test_remove_clears_card_metadata(self):
+        """移除牌卡時一併清除翻面與註記"""
+        state = GameState.create_initial_state("room_1", "skill_assessment")
+        state = state.place_card_in_zone("card_1", "advantage")
+        state = state.flip_card("card_1").annotate_card("card_1", {"note": "x"})
+
+        state = state.remove_card_from_zone("card_1")
+
+        assert state.get_card_zone("card_1") is None
+        assert state.flipped_cards == frozenset()
+        assert state.annotations == {}
+        assert_index_consistent(state)
+
+
+CARD_IDS = [f"card_{i}" for i in range(12)]
+
+actions_strategy = st.lists(
+    st.tuples(
+        st.sampled_from(
+            [
+                ActionType.PLACE_CARD,
+                ActionType.MOVE,
+                ActionType.FLIP,
+                ActionType.ANNOTATE,
+            ]
+        ),
+        st.sampled_from(CARD_IDS),
+        st.integers(min_value=0, max_value=8),
+    ),
+    max_size=60,
+)
+
+
+class TestIndexProperties:
+    """Property-based：任意動作序列後索引保持一致"""
+
+    @settings(max_examples=100, deadline=None)
+    @given(
+        rule_id=st.sampled_from(sorted(RULE_CONFIGS)),
+        steps=actions_strategy,
+    )
+    def test_index_consistent_after_any_action_sequence(self, rule_id, steps):
+        config = RULE_CONFIGS[rule_id]()
+        engine = GameEngine(config)
+        state = GameState.create_initial_state("room_1", rule_id)
+        zone_ids = [zone.id for zone in config.layout.drop_zones]
+
+        for action_type, card_id, zone_index in steps:
+            action = GameAction(
+                type=action_type,
+                player_id="player_1",
+                card_id=card_id,
+                target_zone=zone_ids[zone_index % len(zone_ids)],
+                data={"step": zone_index},
+            )
+            result = engine.execute_action(action, state)
+            if result.success:
+                assert result.new_state.version == state.version + 1
+                state = result.new_state
+            assert_index_consistent(state)
+
+            # 容量限制始終成立
+            for zone in config.layout.drop_zones:
+                if zone.max_cards is not None:
+                    assert state.get_zone_card_count(zone.id) <= zone.max_cards
+
+        assert_index_consistent(GameState.from_dict(state.to_dict()))
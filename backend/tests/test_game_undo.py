@@ -0,0 +1,248 @@
+"""
+Test inverse actions - 反向動作測試
+
+1. 每種動作的反向動作可精確還原狀態（含區域內順序、翻面、註記）
+2. 批次的反向動作可還原整批（property-based）
+3. 復原 / 重做堆疊的上限與版本檢查
+"""
+
+from uuid import uuid4
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from app.game.config import ActionType, GameRuleConfig
+from app.game.engine import GameAction, GameEngine, GameState
+from app.services.undo_history import UndoHistory, UndoStep
+
+RULE_CONFIGS = {
+    "skill_assessment": GameRuleConfig.get_skill_assessment_config,
+    "value_navigation": GameRuleConfig.get_value_navigation_config,
+    "career_personality": GameRuleConfig.get_career_personality_config,
+}
+
+
+def board(state: GameState) -> dict:
+    """比較用：狀態去掉版本號"""
+    data = state.to_dict()
+    del data["version"]
+    return data
+
+
+def action(action_type: ActionType, card_id: str, zone_id=None, data=None):
+    return GameAction(
+        type=action_type,
+        player_id="player_1",
+        card_id=card_id,
+        target_zone=zone_id,
+        data=data,
+    )
+
+
+def undo(engine: GameEngine, act: GameAction, state: GameState) -> GameState:
+    """執行動作後再執行反向動作"""
+    inverse = engine.invert_action(act, state)
+    state = engine.execute_action(act, state).new_state
+    result = engine.execute_actions(inverse, state)
+    assert result.success, result.failures
+    return result.new_state
+
+
+class TestInverseActions:
+    """測試單一動作的反向動作"""
+
+    def setup_method(self):
+        self.engine = GameEngine(GameRuleConfig.get_career_personality_config())
+        state = GameState.create_initial_state("room_1", "career_personality")
+        for card_id in ["a", "b", "c"]:
+            state = state.place_card_in_zone(card_id, "like")
+        self.state = state.flip_card("b").annotate_card("b", {"note": "x"})
+
+    def test_place_inverse_is_remove(self):
+        act = action(ActionType.PLACE_CARD, "d", "dislike")
+
+        assert self.engine.invert_action(act, self.state) == [
+            action(ActionType.REMOVE, "d")
+        ]
+        assert board(undo(self.engine, act, self.state)) == board(self.state)
+
+    def test_move_restores_original_position(self):
+        act = action(ActionType.MOVE, "b", "neutral")
+
+        restored = undo(self.engine, act, self.state)
+
+        assert restored.zones["like"].cards == ["a", "b", "c"]
+        assert board(restored) == board(self.state)
+
+    def test_remove_restores_flip_and_annotation(self):
+        act = action(ActionType.REMOVE, "b")
+
+        restored = undo(self.engine, act, self.state)
+
+        assert "b" in restored.flipped_cards
+        assert restored.annotations == {"b": {"note": "x"}}
+        assert board(restored) == board(self.state)
+
+    def test_flip_inverse_is_flip(self):
+        assert board(
+            undo(self.engine, action(ActionType.FLIP, "a"), self.state)
+        ) == board(self.state)
+
+    def test_annotate_restores_previous_values(self):
+        """新增的鍵被刪除，被覆寫的鍵還原"""
+        act = action(ActionType.ANNOTATE, "b", data={"note": "y", "color": "red"})
+
+        restored = undo(self.engine, act, self.state)
+
+        assert restored.annotations == {"b": {"note": "x"}}
+
+    def test_annotate_none_deletes_key(self):
+        state = self.state.annotate_card("b", {"note": None})
+
+        assert state.annotations == {}
+
+    def test_arrange_has_no_inverse(self):
+        act = GameAction(type=ActionType.ARRANGE, player_id="player_1")
+
+        assert self.engine.invert_action(act, self.state) == []
+
+    def test_place_at_index(self):
+        act = action(ActionType.PLACE_CARD, "d", "like", data={"index": 1})
+
+        state = self.engine.execute_action(act, self.state).new_state
+
+        assert state.zones["like"].cards == ["a", "d", "b", "c"]
+
+    def test_invalid_index_rejected(self):
+        act = action(ActionType.PLACE_CARD, "d", "like", data={"index": 9})
+
+        assert self.engine.validate_action(act, self.state) is False
+
+
+CARD_IDS = [f"card_{i}" for i in range(8)]
+
+actions_strategy = st.lists(
+    st.tuples(
+        st.sampled_from(
+            [
+                ActionType.PLACE_CARD,
+                ActionType.MOVE,
+                ActionType.REMOVE,
+                ActionType.FLIP,
+                ActionType.ANNOTATE,
+            ]
+        ),
+        st.sampled_from(CARD_IDS),
+        st.integers(min_value=0, max_value=8),
+        st.sampled_from(["note", "color"]),
+    ),
+    max_size=30,
+)
+
+
+class TestBatchInverseProperties:
+    """Property-based：任意批次的反向動作都能還原原狀態"""
+
+    @settings(max_examples=100, deadline=None)
+    @given(
+        rule_id=st.sampled_from(sorted(RULE_CONFIGS)),
+        setup=actions_strategy,
+        steps=actions_strategy,
+    )
+    def test_inverse_restores_state(self, rule_id, setup, steps):
+        config = RULE_CONFIGS[rule_id]()
+        engine = GameEngine(config)
+        zone_ids = [zone.id for zone in config.layout.drop_zones]
+
+        def to_actions(items):
+            return [
+                action(
+                    action_type,
+                    card_id,
+                    zone_ids[zone_index % len(zone_ids)],
+                    {key: zone_index} if action_type == ActionType.ANNOTATE else None,
+                )
+                for action_type, card_id, zone_index, key in items
+            ]
+
+        initial = GameState.create_initial_state("room_1", rule_id)
+        state = engine.execute_actions(to_actions(setup), initial).new_state
+
+        result = engine.execute_actions(to_actions(steps), state, track_inverse=True)
+        undone = engine.execute_actions(result.inverse, result.new_state)
+
+        assert undone.success
+        assert board(undone.new_state) == board(state)
+        assert undone.new_state.card_locations == state.card_locations
+
+
+class TestUndoHistory:
+    """測試復原堆疊"""
+
+    def step(self, card_id: str) -> UndoStep:
+        return UndoStep(
+            actions=[action(ActionType.FLIP, card_id)],
+            inverse=[action(ActionType.FLIP, card_id)],
+        )
+
+    def test_bounded_stack(self):
+        history = UndoHistory(limit=3)
+        key = (uuid4(), "game")
+        for version in range(1, 6):
+            history.record(key, self.step(f"c{version}"), version, version + 1)
+
+        popped = []
+        version = 6
+        while (step := history.pop_undo(key, version)) is not None:
+            popped.append(step.actions[0].card_id)
+            history.push_undone(key, step, version)
+
+        assert popped == ["c5", "c4", "c3"]
+
+    def test_version_mismatch_resets_history(self):
+        history = UndoHistory()
+        key = (uuid4(), "game")
+        history.record(key, self.step("a"), 1, 2)
+
+        assert history.status(key, 2) == (True, False)
+        assert history.pop_undo(key, 7) is None
+        assert history.status(key, 2) == (False, False)
+
+    def test_new_action_clears_redo(self):
+        history = UndoHistory()
+        key = (uuid4(), "game")
+        history.record(key, self.step("a"), 1, 2)
+        step = history.pop_undo(key, 2)
+        history.push_undone(key, step, 3)
+        assert history.status(key, 3) == (False, True)
+
+        history.record(key, self.step("b"), 3, 4)
+
+        assert history.status(key, 4) == (True, False)
+
+    def test_discard_before_push_is_ignored(self):
+        """復原已寫入後歷史被其他請求作廢，推回堆疊時不拋出例外"""
+        history = UndoHistory()
+        key = (uuid4(), "game")
+        history.record(key, self.step("a"), 1, 2)
+        step = history.pop_undo(key, 2)
+
+        history.discard(key)
+        history.push_undone(key, step, 3)
+        history.push_redone(key, step, 3)
+
+        assert history.status(key, 3) == (False, False)
+
+    def test_least_recently_used_games_are_dropped(self):
+        history = UndoHistory(max_games=2)
+        first, second, third = [(uuid4(), "game") for _ in range(3)]
+        history.record(first, self.step("a"), 1, 2)
+        history.record(second, self.step("b"), 1, 2)
+        history.pop_undo(first, 2)
+        history.push_undone(first, self.step("a"), 2)
+
+        history.record(third, self.step("c"), 1, 2)
+
+        assert history.status(first, 2) == (False, True)
+        assert history.status(second, 2) == (False, False)
+        assert history.status(third, 2) == (True, False)
@@ -14,7 +14,7 @@ from app.core.database import get_session
 from app.main import app
 from app.models.room import Room
 from app.models.user import User
-from tests.helpers import create_auth_headers
+from tests.helpers import assert_matches_schema, create_auth_headers
 
 
 @pytest.fixture(name="client")
@@ -228,3 +228,408 @@ class TestGameplayStateFileUpload:
         # Currently this passes because JSONB accepts any structure
         # If we add strict validation later, this should return 422
         assert response.status_code in [200, 422]
+
+
+class TestGameplayStateRuleValidation:
+    """Test engine-format states are validated against their game rule"""
+
+    def test_engine_state_within_limits_is_saved(
+        self, client: TestClient, test_user: User, test_room: Room
+    ):
+        """Engine-format state that satisfies the rule is stored"""
+        from app.game.engine import GameState
+
+        state = GameState.create_initial_state(str(test_room.id), "skill_assessment")
+        state = state.place_card_in_zone("card_1", "advantage")
+
+        response = client.put(
+            f"/api/rooms/{test_room.id}/gameplay-states/advantage_analysis",
+            json={"state": state.to_dict()},
+            headers=create_auth_headers(test_user),
+        )
+
+        assert response.status_code == 200
+        assert response.json()["state"]["zones"]["advantage"]["cards"] == ["card_1"]
+
+    def test_engine_state_over_zone_limit_is_rejected(
+        self, client: TestClient, test_user: User, test_room: Room
+    ):
+        """Engine-format state exceeding a zone limit returns 422"""
+        state = {
+            "rule_id": "skill_assessment",
+            "zones": {
+                "advantage": {
+                    "zone_id": "advantage",
+                    "cards": [f"card_{i}" for i in range(6)],
+                },
+            },
+        }
+
+        response = client.put(
+            f"/api/rooms/{test_room.id}/gameplay-states/advantage_analysis",
+            json={"state": state},
+            headers=create_auth_headers(test_user),
+        )
+
+        assert response.status_code == 422
+        assert response.json()["detail"]["errors"] == [
+            "Zone advantage has 6 cards (max 5)"
+        ]
+
+
+class TestGameplayUndoRedo:
+    """Test engine actions with undo/redo over the gameplay API"""
+
+    @pytest.fixture
+    def engine_state(self, client: TestClient, test_user: User, test_room: Room):
+        from app.game.engine import GameState
+
+        state = GameState.create_initial_state(str(test_room.id), "skill_assessment")
+        response = client.put(
+            f"/api/rooms/{test_room.id}/gameplay-states/advantage_analysis",
+            json={"state": state.to_dict()},
+            headers=create_auth_headers(test_user),
+        )
+        assert response.status_code == 200
+        return f"/api/rooms/{test_room.id}/gameplay-states/advantage_analysis"
+
+    def test_apply_undo_redo(self, client: TestClient, test_user: User, engine_state):
+        headers = create_auth_headers(test_user)
+
+        response = client.post(
+            f"{engine_state}/actions",
+            json={
+                "actions": [
+                    {"type": "place_card", "card_id": "c1", "target_zone": "advantage"},
+                    {"type": "place_card", "card_id": "c2", "target_zone": "advantage"},
+                ],
+                "expected_version": 1,
+            },
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["applied"] == [0, 1]
+        assert response.json()["can_undo"] is True
+
+        response = client.post(f"{engine_state}/undo", headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert [a["type"] for a in data["actions"]] == ["remove", "remove"]
+        assert data["can_undo"] is False
+        assert data["can_redo"] is True
+
+        stored = client.get(engine_state, headers=headers).json()["state"]
+        assert stored["zones"]["advantage"]["cards"] == []
+
+        response = client.post(f"{engine_state}/redo", headers=headers)
+        assert response.status_code == 200
+        stored = client.get(engine_state, headers=headers).json()["state"]
+        assert stored["zones"]["advantage"]["cards"] == ["c1", "c2"]
+        assert stored["version"] == response.json()["version"]
+
+    def test_saved_state_is_encoded_with_orjson(
+        self, client: TestClient, session: Session, test_user: User, engine_state
+    ):
+        """自動存檔直接寫入 dumps_state 的輸出，GET / PUT 回應符合 schema"""
+        from sqlalchemy import event
+
+        from app.game.engine import GameState
+        from app.game.serialization import dumps_state
+        from app.models.gameplay_state import GameplayStateResponse
+
+        headers = create_auth_headers(test_user)
+        parameters = []
+
+        def capture(conn, cursor, statement, params, context, executemany):
+            if statement.lstrip().startswith("UPDATE gameplay_states"):
+                parameters.append(params)
+
+        event.listen(session.bind, "before_cursor_execute", capture)
+        try:
+            client.post(
+                f"{engine_state}/actions",
+                json={
+                    "actions": [
+                        {
+                            "type": "place_card",
+                            "card_id": "c1",
+                            "target_zone": "advantage",
+                        }
+                    ]
+                },
+                headers=headers,
+            )
+        finally:
+            event.remove(session.bind, "before_cursor_execute", capture)
+
+        response = client.get(engine_state, headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert_matches_schema(data, GameplayStateResponse)
+        stored = GameState.from_dict(data["state"])
+        assert dumps_state(stored).decode() in parameters[0].values()
+
+        put = client.put(engine_state, json={"state": data["state"]}, headers=headers)
+        assert put.status_code == 200
+        assert_matches_schema(put.json(), GameplayStateResponse)
+        assert put.json()["state"] == data["state"]
+
+    def test_failed_actions_are_reported(
+        self, client: TestClient, test_user: User, engine_state
+    ):
+        response = client.post(
+            f"{engine_state}/actions",
+            json={
+                "actions": [{"type": "move", "card_id": "ghost", "target_zone": "x"}]
+            },
+            headers=create_auth_headers(test_user),
+        )
+
+        assert response.status_code == 200
+        assert response.json()["failures"] == {"0": "Action validation failed"}
+        assert response.json()["can_undo"] is False
+
+    def test_nothing_to_undo(self, client: TestClient, test_user: User, engine_state):
+        response = client.post(
+            f"{engine_state}/undo", headers=create_auth_headers(test_user)
+        )
+
+        assert response.status_code == 409
+
+    def test_full_snapshot_put_invalidates_history(
+        self, client: TestClient, test_user: User, test_room: Room, engine_state
+    ):
+        from app.game.engine import GameState
+
+        headers = create_auth_headers(test_user)
+        client.post(
+            f"{engine_state}/actions",
+            json={
+                "actions": [
+                    {"type": "place_card", "card_id": "c1", "target_zone": "advantage"}
+                ]
+            },
+            headers=headers,
+        )
+        state = GameState.create_initial_state(str(test_room.id), "skill_assessment")
+        client.put(engine_state, json={"state": state.to_dict()}, headers=headers)
+
+        response = client.post(f"{engine_state}/undo", headers=headers)
+
+        assert response.status_code == 409
+
+    def test_version_conflict(self, client: TestClient, test_user: User, engine_state):
+        response = client.post(
+            f"{engine_state}/actions",
+            json={
+                "actions": [{"type": "flip", "card_id": "c1"}],
+                "expected_version": 5,
+            },
+            headers=create_auth_headers(test_user),
+        )
+
+        assert response.status_code == 409
+
+    def test_unknown_action_type(
+        self, client: TestClient, test_user: User, engine_state
+    ):
+        response = client.post(
+            f"{engine_state}/actions",
+            json={"actions": [{"type": "teleport", "card_id": "c1"}]},
+            headers=create_auth_headers(test_user),
+        )
+
+        assert response.status_code == 422
+
+    def test_frontend_snapshot_is_not_engine_state(
+        self, client: TestClient, test_user: User, test_room: Room
+    ):
+        headers = create_auth_headers(test_user)
+        url = f"/api/rooms/{test_room.id}/gameplay-states/personality_assessment"
+        client.put(url, json={"state": {"cardPlacements": {}}}, headers=headers)
+
+        response = client.post(
+            f"{url}/actions",
+            json={"actions": [{"type": "flip", "card_id": "c1"}]},
+            headers=headers,
+        )
+
+        assert response.status_code == 422
+
+
+class TestGameplayMerge:
+    """Test merging concurrent board edits over the gameplay API"""
+
+    @pytest.fixture
+    def engine_state(self, client: TestClient, test_user: User, test_room: Room):
+        from app.game.engine import GameState
+
+        state = GameState.create_initial_state(str(test_room.id), "career_personality")
+        state = state.place_card_in_zone("a", "like").place_card_in_zone("b", "like")
+        url = f"/api/rooms/{test_room.id}/gameplay-states/personality_assessment"
+        response = client.put(
+            url, json={"state": state.to_dict()}, headers=create_auth_headers(test_user)
+        )
+        assert response.status_code == 200
+        return url, state
+
+    def test_concurrent_edits_are_merged(
+        self, client: TestClient, test_user: User, engine_state
+    ):
+        from app.game.merge import MergeableBoard
+
+        url, state = engine_state
+        headers = create_auth_headers(test_user)
+        counselor = MergeableBoard.from_state(state, "counselor")
+        visitor = MergeableBoard.from_state(state, "visitor")
+        counselor.place("a", "neutral")
+        visitor.flip("b")
+        visitor.place("c", "dislike")
+
+        first = client.post(
+            f"{url}/merge",
+            json={"delta": counselor.to_dict(), "since_version": state.version},
+            headers=headers,
+        )
+        second = client.post(
+            f"{url}/merge",
+            json={"delta": visitor.to_dict(), "since_version": state.version},
+            headers=headers,
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert set(second.json()) == {"version", "delta"}
+        assert second.json()["version"] == state.version + 2
+        merged = client.get(url, headers=headers).json()["state"]
+        assert merged["version"] == state.version + 2
+        assert merged["zones"]["neutral"]["cards"] == ["a"]
+        assert merged["zones"]["like"]["cards"] == ["b"]
+        assert merged["zones"]["dislike"]["cards"] == ["c"]
+        assert merged["flipped_cards"] == ["b"]
+
+        # The visitor receives the counselor's move without refetching the board
+        visitor.merge(MergeableBoard.from_dict(second.json()["delta"], "server"))
+        assert visitor.location("a") == "neutral"
+
+    def test_delta_contains_only_unseen_cards(
+        self, client: TestClient, test_user: User, engine_state
+    ):
+        from app.game.merge import MergeableBoard
+
+        url, state = engine_state
+        headers = create_auth_headers(test_user)
+        counselor = MergeableBoard.from_state(state, "counselor")
+        counselor.place("a", "neutral")
+        version = client.post(
+            f"{url}/merge", json={"delta": counselor.to_dict()}, headers=headers
+        ).json()["version"]
+
+        counselor.flip("b")
+        response = client.post(
+            f"{url}/merge",
+            json={"delta": counselor.subset(["b"]).to_dict(), "since_version": version},
+            headers=headers,
+        )
+
+        assert response.status_code == 200
+        delta = response.json()["delta"]
+        assert set(delta["flips"]) == {"b"}
+        assert set(delta["places"]) == {"b"}
+
+    def test_no_change_keeps_version(
+        self, client: TestClient, test_user: User, engine_state
+    ):
+        url, state = engine_state
+
+        response = client.post(
+            f"{url}/merge",
+            json={"delta": {}, "since_version": state.version},
+            headers=create_auth_headers(test_user),
+        )
+
+        assert response.status_code == 200
+        assert response.json()["version"] == state.version
+
+    def test_invalid_delta(self, client: TestClient, test_user: User, engine_state):
+        url, _ = engine_state
+
+        response = client.post(
+            f"{url}/merge",
+            json={"delta": {"places": {"a": "like"}}},
+            headers=create_auth_headers(test_user),
+        )
+
+        assert response.status_code == 422
+
+    def test_stamp_ahead_of_server_clock_is_rejected(
+        self, client: TestClient, test_user: User, engine_state
+    ):
+        """時鐘超前或偽造的時間戳不能永遠贏得 LWW"""
+        from app.game.merge import MergeableBoard, Stamp
+
+        url, state = engine_state
+        headers = create_auth_headers(test_user)
+        board = MergeableBoard.from_state(state, "visitor")
+        board.places["a"] = {Stamp(10**15, 0, "visitor"): "dislike"}
+
+        response = client.post(
+            f"{url}/merge", json={"delta": board.to_dict()}, headers=headers
+        )
+
+        assert response.status_code == 422
+        assert "ahead of the local clock" in response.json()["detail"]
+        stored = client.get(url, headers=headers).json()["state"]
+        assert stored["zones"]["like"]["cards"] == ["a", "b"]
+
+    def test_stale_seed_entries_after_actions_are_ignored(
+        self, client: TestClient, test_user: User, engine_state
+    ):
+        """/actions 重建盤面後，舊版本的種子項目不影響合併，也不會寫回"""
+        from app.game.merge import MergeableBoard, seed_version
+
+        url, state = engine_state
+        headers = create_auth_headers(test_user)
+        visitor = MergeableBoard.from_state(state, "visitor")
+        visitor.flip("b")
+        moved = client.post(
+            f"{url}/actions",
+            json={
+                "actions": [{"type": "move", "card_id": "a", "target_zone": "dislike"}]
+            },
+            headers=headers,
+        ).json()["version"]
+
+        response = client.post(
+            f"{url}/merge", json={"delta": visitor.to_dict()}, headers=headers
+        )
+
+        assert response.status_code == 200
+        stored = client.get(url, headers=headers).json()["state"]
+        assert stored["zones"]["dislike"]["cards"] == ["a"]
+        assert stored["zones"]["like"]["cards"] == ["b"]
+        assert stored["flipped_cards"] == ["b"]
+        board = MergeableBoard.from_dict(stored["crdt"]["board"], "check")
+        assert board.base_version == moved
+        assert all(seed_version(stamp) in (None, moved) for stamp in board.stamps())
+
+    def test_merge_result_must_satisfy_rules(
+        self, client: TestClient, test_user: User, test_room: Room
+    ):
+        from app.game.engine import GameState
+        from app.game.merge import MergeableBoard
+
+        headers = create_auth_headers(test_user)
+        state = GameState.create_initial_state(str(test_room.id), "skill_assessment")
+        url = f"/api/rooms/{test_room.id}/gameplay-states/advantage_analysis"
+        client.put(url, json={"state": state.to_dict()}, headers=headers)
+
+        board = MergeableBoard.from_state(state, "visitor")
+        for index in range(6):
+            board.place(f"card_{index}", "advantage")
+
+        response = client.post(
+            f"{url}/merge", json={"delta": board.to_dict()}, headers=headers
+        )
+
+        assert response.status_code == 422
@@ -0,0 +1,182 @@
+"""
+Test list fast path - 列表端點欄位投影測試
+
+客戶、諮詢室與玩法狀態列表直接選取欄位並回傳 orjson bytes，
+不經 response_model 驗證，因此：
+1. 回應必須與以 response_model 驗證後的 JSON 完全相同
+2. OpenAPI 仍記載原本的回應 schema
+"""
+
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.database import get_session
+from app.main import app
+from app.models.client import (
+    Client,
+    ClientResponse,
+    ClientStatus,
+    ConsultationRecord,
+    RoomClient,
+)
+from app.models.gameplay_state import GameplayState, RoomGameplayStatesResponse
+from app.models.room import Room, RoomResponse
+from tests.factories import UserFactory
+from tests.helpers import assert_matches_schema, create_auth_headers
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    app.dependency_overrides[get_session] = lambda: session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="counselor")
+def counselor_fixture(session: Session):
+    """兩位客戶（一位無標籤且封存）、三間諮詢室（A 有 2 次會談）、一筆紀錄與兩個玩法狀態"""
+    counselor = UserFactory.create_counselor(session, email="fast-path@test.com")
+    tagged = Client(
+        counselor_id=counselor.id,
+        name="王小明",
+        email="fast@test.com",
+        tags=["career", "轉職"],
+        # Whole seconds: both encoders must drop the fraction
+        updated_at=datetime(2025, 1, 1, 9, 30),
+    )
+    archived = Client(
+        counselor_id=counselor.id, name="Archived", status=ClientStatus.ARCHIVED
+    )
+    rooms = [
+        Room(
+            counselor_id=counselor.id,
+            name="Room A",
+            expires_at=datetime(2030, 1, 1, 12, 0, 0, 123456),
+            session_count=2,
+        ),
+        Room(counselor_id=counselor.id, name="Room B", is_active=False),
+        Room(counselor_id=counselor.id, name="Room C"),
+    ]
+    session.add_all([tagged, archived, *rooms])
+    session.flush()
+    session.execute(
+        text("UPDATE clients SET tags = NULL WHERE id = :id"), {"id": archived.id}
+    )
+    session.add_all(
+        [
+            RoomClient(room_id=rooms[0].id, client_id=tagged.id),
+            RoomClient(room_id=rooms[1].id, client_id=tagged.id),
+            ConsultationRecord(
+                room_id=rooms[0].id,
+                client_id=tagged.id,
+                counselor_id=counselor.id,
+                session_date=datetime.utcnow() - timedelta(days=1),
+            ),
+            GameplayState(
+                room_id=rooms[0].id,
+                gameplay_id="life_transformation",
+                state={"cards": ["a", "b"], "score": 1.5, "nested": {"ok": True}},
+            ),
+            GameplayState(
+                room_id=rooms[0].id,
+                gameplay_id="skill_assessment",
+                last_played_at=datetime.utcnow() - timedelta(hours=1),
+            ),
+        ]
+    )
+    session.commit()
+    return counselor
+
+
+class TestClientListFastPath:
+    """測試客戶列表"""
+
+    def test_matches_response_model(self, client: TestClient, counselor):
+        response = client.get("/api/clients", headers=create_auth_headers(counselor))
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert_matches_schema(data, List[ClientResponse])
+        by_name = {row["name"]: row for row in data}
+        assert by_name["Archived"]["tags"] == []
+        assert by_name["Archived"]["status"] == "archived"
+        assert by_name["王小明"]["updated_at"] == "2025-01-01T09:30:00"
+        assert by_name["王小明"]["total_consultations"] == 2
+        assert [room["name"] for room in by_name["王小明"]["rooms"]] == [
+            "Room B",
+            "Room A",
+        ]
+        assert by_name["王小明"]["default_room_name"] == "Room B"
+
+    def test_keeps_cursor_header(self, client: TestClient, counselor):
+        response = client.get(
+            "/api/clients",
+            params={"limit": 1, "include": ""},
+            headers=create_auth_headers(counselor),
+        )
+
+        assert len(response.json()) == 1
+        assert response.json()[0]["rooms"] == []
+        assert "X-Next-Cursor" in response.headers
+
+
+class TestRoomListFastPath:
+    """測試諮詢室列表"""
+
+    def test_matches_response_model(self, client: TestClient, counselor):
+        response = client.get(
+            "/api/rooms/",
+            params={"include_inactive": True},
+            headers=create_auth_headers(counselor),
+        )
+
+        data = response.json()
+        assert_matches_schema(data, List[RoomResponse])
+        assert sorted(room["name"] for room in data) == ["Room A", "Room B", "Room C"]
+        room_a = next(room for room in data if room["name"] == "Room A")
+        assert room_a["expires_at"] == "2030-01-01T12:00:00.123456"
+        assert room_a["counselor_name"] == counselor.name
+
+
+class TestGameplayStatesFastPath:
+    """測試玩法狀態列表"""
+
+    def test_matches_response_model(
+        self, client: TestClient, session: Session, counselor
+    ):
+        room_id = session.execute(
+            text("SELECT room_id FROM gameplay_states LIMIT 1")
+        ).scalar()
+
+        response = client.get(
+            f"/api/rooms/{room_id}/gameplay-states",
+            headers=create_auth_headers(counselor),
+        )
+
+        data = response.json()
+        assert_matches_schema(data, RoomGameplayStatesResponse)
+        assert [s["gameplay_id"] for s in data["states"]] == [
+            "life_transformation",
+            "skill_assessment",
+        ]
+        assert data["states"][0]["state"]["nested"] == {"ok": True}
+        assert data["summary"]["most_recent_gameplay"] == "life_transformation"
+        assert data["summary"]["last_played_at"] == data["states"][0]["last_played_at"]
+
+
+def test_openapi_still_documents_response_models():
+    paths = app.openapi()["paths"]
+
+    for path, schema in (
+        ("/api/clients", "ClientResponse"),
+        ("/api/rooms/", "RoomResponse"),
+        ("/api/rooms/{room_id}/gameplay-states", "RoomGameplayStatesResponse"),
+    ):
+        content = paths[path]["get"]["responses"]["200"]["content"]
+        assert schema in str(content["application/json"]["schema"])
@@ -0,0 +1,283 @@
+"""
+Test responses - orjson 回應與略過 response_model 驗證測試
+
+1. ORJSONResponse 的輸出與 FastAPI 預設編碼相同
+2. skip_response_validation 保留 status code、headers 與 OpenAPI schema
+3. 套用的端點回應仍符合 response_model
+"""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import List
+from uuid import UUID
+
+import orjson
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlmodel import Session, SQLModel
+
+from app.core.database import get_session
+from app.core.responses import ORJSONResponse, skip_response_validation
+from app.main import app
+from app.models.client import (
+    Client,
+    ClientSearchResult,
+    ClientStatus,
+    ConsultationRecord,
+    ConsultationRecordResponse,
+    ConsultationRecordSummary,
+    RoomClient,
+)
+from app.models.room import Room
+from tests.factories import UserFactory
+from tests.helpers import assert_matches_schema, create_auth_headers
+
+
+class Item(SQLModel):
+    id: UUID
+    status: ClientStatus
+    created_at: datetime
+    due: date
+
+
+ITEM = {
+    "id": UUID("12345678-1234-5678-1234-567812345678"),
+    "status": ClientStatus.ACTIVE,
+    "created_at": datetime(2025, 1, 1, 9, 30, 0, 123456),
+    "due": date(2025, 2, 1),
+}
+
+
+class TestORJSONResponse:
+    """測試 orjson 編碼"""
+
+    def test_matches_pydantic_encoding(self):
+        body = ORJSONResponse([ITEM]).body
+
+        assert body == TypeAdapter(List[Item]).dump_json([Item(**ITEM)])
+
+    def test_encodes_models_like_jsonable_encoder(self):
+        content = {"item": Item(**ITEM), "price": Decimal("1.5"), "count": Decimal(3)}
+
+        response = ORJSONResponse(content)
+
+        assert response.media_type == "application/json"
+        assert orjson.loads(response.body) == jsonable_encoder(content)
+
+    def test_encodes_bytes_and_timedelta_like_jsonable_encoder(self):
+        content = {"raw": b"abc", "interval": timedelta(days=1, milliseconds=500)}
+
+        body = orjson.loads(ORJSONResponse(content).body)
+
+        assert body == jsonable_encoder(content)
+        assert orjson.loads(ORJSONResponse([memoryview(b"abc")]).body) == ["abc"]
+
+    def test_rejects_unknown_types(self):
+        with pytest.raises(TypeError):
+            ORJSONResponse({"value": object()})
+
+
+@pytest.fixture(name="decorated")
+def decorated_fixture():
+    demo = FastAPI()
+
+    @demo.get("/sync", response_model=List[Item])
+    @skip_response_validation
+    def sync_items(count: int = 1):
+        return [ITEM] * count
+
+    @demo.get("/async", response_model=List[Item])
+    @skip_response_validation
+    async def async_items(response: Response):
+        response.headers["X-Next-Cursor"] = "abc"
+        response.set_cookie("seen", "1")
+        response.status_code = 206
+        return [ITEM]
+
+    @demo.get("/passthrough")
+    @skip_response_validation
+    def passthrough():
+        return Response(content=b"raw", media_type="text/plain")
+
+    return demo
+
+
+class TestSkipResponseValidation:
+    """測試略過驗證的裝飾器"""
+
+    def test_sync_handler(self, decorated: FastAPI):
+        response = TestClient(decorated).get("/sync", params={"count": 2})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == [jsonable_encoder(Item(**ITEM))] * 2
+
+    def test_async_handler_keeps_status_and_headers(self, decorated: FastAPI):
+        response = TestClient(decorated).get("/async")
+
+        assert response.status_code == 206
+        assert response.headers["X-Next-Cursor"] == "abc"
+        assert response.cookies["seen"] == "1"
+        assert response.json()[0]["id"] == str(ITEM["id"])
+
+    def test_returned_response_is_sent_as_is(self, decorated: FastAPI):
+        response = TestClient(decorated).get("/passthrough")
+
+        assert response.text == "raw"
+        assert response.headers["content-type"].startswith("text/plain")
+
+    def test_openapi_unchanged(self, decorated: FastAPI):
+        operation = decorated.openapi()["paths"]["/sync"]["get"]
+
+        assert [param["name"] for param in operation["parameters"]] == ["count"]
+        schema = operation["responses"]["200"]["content"]["application/json"]
+        assert "Item" in str(schema["schema"])
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    app.dependency_overrides[get_session] = lambda: session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="records_client")
+def records_client_fixture(session: Session):
+    """一位客戶、兩間諮詢室與三筆諮詢記錄"""
+    counselor = UserFactory.create_counselor(session, email="responses@test.com")
+    client = Client(counselor_id=counselor.id, name="王小明", tags=["career"])
+    rooms = [
+        Room(counselor_id=counselor.id, name="Room A"),
+        Room(
+            counselor_id=counselor.id,
+            name="Room B",
+            expires_at=datetime(2030, 1, 1, 12, 0, 0, 123456),
+        ),
+    ]
+    session.add_all([client, *rooms])
+    session.flush()
+    session.add_all(RoomClient(room_id=room.id, client_id=client.id) for room in rooms)
+    session.add_all(
+        ConsultationRecord(
+            room_id=rooms[0].id,
+            client_id=client.id,
+            counselor_id=counselor.id,
+            session_date=datetime(2025, 1, 1) + timedelta(days=n),
+            screenshots=["https://cdn.example.com/a.png"],
+            game_state={"gameplay": "life_transformation", "cards": [n]},
+            topics=["career"],
+            follow_up_date=date(2025, 3, 1),
+        )
+        for n in range(3)
+    )
+    session.commit()
+    return counselor, client
+
+
+class TestDecoratedEndpoints:
+    """測試套用裝飾器的端點"""
+
+    def test_consultation_records_full(self, client: TestClient, records_client):
+        counselor, record_client = records_client
+
+        response = client.get(
+            f"/api/clients/{record_client.id}/consultation-records",
+            params={"limit": 2},
+            headers=create_auth_headers(counselor),
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert_matches_schema(data, List[ConsultationRecordResponse])
+        assert list(data[0]) == list(ConsultationRecordResponse.model_fields)
+        assert data[0]["game_state"] == {
+            "gameplay": "life_transformation",
+            "cards": [2],
+        }
+        assert data[0]["follow_up_date"] == "2025-03-01"
+        assert "X-Next-Cursor" in response.headers
+
+    def test_consultation_records_summary(self, client: TestClient, records_client):
+        counselor, record_client = records_client
+
+        response = client.get(
+            f"/api/clients/{record_client.id}/consultation-records",
+            params={"view": "summary"},
+            headers=create_auth_headers(counselor),
+        )
+
+        data = response.json()
+        assert_matches_schema(data, List[ConsultationRecordSummary])
+        assert data[0]["gameplay"] == "life_transformation"
+        assert data[0]["screenshot_count"] == 1
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_client_rooms(self, client: TestClient, session: Session, records_client):
+        _, record_client = records_client
+        admin = UserFactory.create_admin(session, email="responses-admin@test.com")
+
+        response = client.get(
+            f"/api/clients/{record_client.id}/rooms",
+            headers=create_auth_headers(admin),
+        )
+
+        data = response.json()
+        assert [room["name"] for room in data] == ["Room B", "Room A"]
+        assert data[0]["expires_at"] == "2030-01-01T12:00:00.123456"
+        assert list(data[0]) == [
+            "id",
+            "name",
+            "description",
+            "is_active",
+            "expires_at",
+            "session_count",
+            "created_at",
+        ]
+
+    def test_client_rooms_owner_access(
+        self, client: TestClient, session: Session, records_client
+    ):
+        counselor, record_client = records_client
+        other = UserFactory.create_counselor(session, email="responses-other@test.com")
+        path = f"/api/clients/{record_client.id}/rooms"
+
+        response = client.get(path, headers=create_auth_headers(counselor))
+
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+        assert client.get(path, headers=create_auth_headers(other)).status_code == 403
+
+    def test_client_search(self, client: TestClient, records_client):
+        counselor, _ = records_client
+
+        response = client.get(
+            "/api/clients/search",
+            params={"q": "王小明"},
+            headers=create_auth_headers(counselor),
+        )
+
+        data = response.json()
+        assert_matches_schema(data, List[ClientSearchResult])
+        assert data[0]["status"] == "active"
+        assert data[0]["tags"] == ["career"]
+
+    def test_openapi_keeps_response_models(self):
+        paths = app.openapi()["paths"]
+
+        for path, schema in (
+            ("/api/clients/search", "ClientSearchResult"),
+            (
+                "/api/clients/{client_id}/consultation-records",
+                "ConsultationRecordSummary",
+            ),
+        ):
+            operation = paths[path]["get"]
+            content = operation["responses"]["200"]["content"]
+            assert schema in str(content["application/json"]["schema"])
+            assert all(
+                not param["name"].startswith("_")
+                for param in operation.get("parameters", [])
+            )
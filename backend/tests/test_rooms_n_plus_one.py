@@ -8,6 +8,7 @@ Following TDD approach:
 3. REFACTOR: Clean up if needed
 """
 
+import orjson
 import pytest
 from sqlalchemy import event
 from sqlmodel import Session
@@ -128,11 +129,12 @@ def test_list_rooms_should_not_have_n_plus_one_query(
     }
 
     # Call the endpoint (this will trigger queries)
-    result = list_user_rooms(
+    response = list_user_rooms(
         session=session,
         current_user=current_user,
         include_inactive=True,
     )
+    result = orjson.loads(response.body)
 
     # Remove event listener
     event.remove(session.bind, "before_cursor_execute", query_counter)
@@ -208,11 +210,12 @@ def test_list_rooms_performance_with_scaling(
         "roles": counselor.roles,
     }
 
-    result = list_user_rooms(
+    response = list_user_rooms(
         session=session,
         current_user=current_user,
         include_inactive=False,
     )
+    result = orjson.loads(response.body)
 
     event.remove(session.bind, "before_cursor_execute", query_counter)
 
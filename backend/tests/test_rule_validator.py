@@ -0,0 +1,140 @@
+"""
+Test compiled rule validator - 編譯後約束驗證器測試
+
+1. ConstraintConfig 與 LayoutConfig 編譯為區域索引與陣列上下限
+2. 遞增計數器在放牌 / 移動時維持正確
+3. 完整盤面驗證回報所有違反的約束
+"""
+
+from app.game.config import (
+    ConstraintConfig,
+    DropZoneConfig,
+    GameRuleConfig,
+    LayoutConfig,
+    Position,
+)
+from app.game.validator import UNLIMITED
+
+
+class TestRuleValidatorCompilation:
+    """測試規則編譯"""
+
+    def test_validator_is_compiled_once(self):
+        """同一配置只編譯一次"""
+        config = GameRuleConfig.get_skill_assessment_config()
+
+        assert config.validator is config.validator
+
+    def test_limits_combine_layout_and_constraints(self):
+        """布局上限與約束上限取較嚴者"""
+        config = GameRuleConfig(
+            id="custom",
+            name="Custom",
+            version="1.0",
+            layout=LayoutConfig(
+                deck_area={},
+                drop_zones=[
+                    DropZoneConfig(id="a", name="A", position=Position(0, 0)),
+                    DropZoneConfig(
+                        id="b", name="B", position=Position(0, 0), max_cards=3
+                    ),
+                ],
+            ),
+            constraints=ConstraintConfig(
+                max_per_zone={"a": 4, "b": 10},
+                min_per_zone={"a": 1},
+            ),
+        )
+        validator = config.validator
+
+        assert validator.zone_index == {"a": 0, "b": 1}
+        assert validator.get_max_cards("a") == 4
+        assert validator.get_max_cards("b") == 3
+        assert list(validator.min_cards) == [1, UNLIMITED]
+
+    def test_career_neutral_zone_is_unlimited(self):
+        """職游旅人卡中立區沒有上限"""
+        validator = GameRuleConfig.get_career_personality_config().validator
+
+        assert validator.get_max_cards("neutral") is None
+        assert validator.can_place("neutral", 1000, 1000) is True
+
+
+def can_place(validator, counters, zone_id):
+    """以計數器的目前數量呼叫驗證器（與引擎草稿盤面相同的用法）"""
+    return validator.can_place(zone_id, counters.zone_count(zone_id), counters.total)
+
+
+class TestBoardCounters:
+    """測試遞增計數器"""
+
+    def test_counters_track_place_and_move(self):
+        validator = GameRuleConfig.get_skill_assessment_config().validator
+        counters = validator.counters_for({"advantage": ["a", "b"]})
+
+        assert counters.zone_count("advantage") == 2
+        assert counters.total == 2
+
+        counters.move("advantage", "disadvantage")
+        assert counters.zone_count("advantage") == 1
+        assert counters.zone_count("disadvantage") == 1
+        assert counters.total == 2
+
+        for _ in range(4):
+            assert can_place(validator, counters, "advantage") is True
+            counters.place("advantage")
+        assert can_place(validator, counters, "advantage") is False
+        assert validator.can_receive(
+            "disadvantage", counters.zone_count("disadvantage")
+        )
+
+    def test_total_limit(self):
+        """總數上限在各區域仍有空位時也會生效"""
+        validator = GameRuleConfig.get_value_navigation_config().validator
+        counters = validator.counters_for(
+            {f"rank_{i + 1}": [f"card_{i}"] for i in range(8)}
+        )
+
+        assert can_place(validator, counters, "rank_9") is True
+        counters.place("rank_9")
+        assert counters.total == 9
+        assert can_place(validator, counters, "rank_9") is False
+
+
+class TestBoardValidation:
+    """測試完整盤面驗證"""
+
+    def test_valid_board(self):
+        validator = GameRuleConfig.get_skill_assessment_config().validator
+
+        assert validator.validate_board({"advantage": ["a"], "disadvantage": []}) == []
+
+    def test_reports_all_violations(self):
+        validator = GameRuleConfig.get_value_navigation_config().validator
+
+        errors = validator.validate_board(
+            {"rank_1": ["a", "b"], "rank_2": ["a"], "bogus": []}
+        )
+
+        assert "Zone rank_1 has 2 cards (max 1)" in errors
+        assert "Card a appears in both rank_1 and rank_2" in errors
+        assert "Unknown zone bogus for rule value_navigation" in errors
+
+    def test_minimums_checked_on_request(self):
+        validator = GameRuleConfig.get_career_personality_config().validator
+        board = {"like": [], "neutral": ["a"]}
+
+        assert validator.validate_board(board) == []
+        assert validator.validate_board(board, check_minimums=True) == [
+            "Zone like has 0 cards (min 1)",
+            "Zone dislike has 0 cards (min 1)",
+        ]
+
+    def test_validate_state_dict_rejects_malformed_zones(self):
+        validator = GameRuleConfig.get_skill_assessment_config().validator
+
+        errors = validator.validate_state_dict(
+            {"zones": {"advantage": {"cards": [{"id": "a"}]}}}
+        )
+
+        assert errors == ["Zone advantage cards must be a list of card ids"]